@@ -0,0 +1,4 @@
+"""
+모더레이션 파이프라인 벤치마크
+- 실행: backend 디렉터리에서 `python -m benchmarks.run_benchmarks`
+"""
@@ -0,0 +1,130 @@
+"""
+벤치마크용 합성 한국어 댓글 생성기
+- 같은 seed/size/mix이면 항상 같은 코퍼스를 만듭니다. (커밋 간 결과 비교용)
+- 종류: clean(정상), profane(욕설), obfuscated(특수문자/공백을 섞은 변형 욕설), spam(광고/연락처)
+"""
+import os
+import json
+import random
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY_PATH = os.path.join(BACKEND_DIR, "resources", "dictionaries", "word_dictionary.json")
+
+DEFAULT_MIX = {"clean": 0.6, "profane": 0.2, "obfuscated": 0.1, "spam": 0.1}
+
+# 길이 구간별 (문장 조각 수 범위, 비율)
+LENGTH_BUCKETS = {
+    "short": ((1, 1), 0.5),
+    "medium": ((2, 4), 0.35),
+    "long": ((6, 12), 0.15),
+}
+
+CLEAN_PHRASES = [
+    "영상 잘 봤습니다", "오늘도 좋은 정보 감사해요", "편집 진짜 깔끔하네요", "다음 편 언제 올라오나요",
+    "이 노래 제목 아시는 분", "배경음악 너무 좋아요", "처음부터 끝까지 집중해서 봤어요", "구독하고 갑니다",
+    "설명이 이해하기 쉬워요", "3분 20초 장면 최고", "ㅋㅋㅋㅋ 너무 웃겨요", "와 이건 몰랐네",
+    "주말에 따라 해봐야겠어요", "목소리가 차분해서 좋아요", "자막 달아주셔서 감사합니다", "항상 응원합니다",
+    "저도 비슷한 경험 있어요", "썸네일 보고 들어왔어요", "이거 보고 바로 샀습니다", "질문 있는데 답변 가능할까요",
+    "화질이 정말 좋네요", "고양이 너무 귀엽다", "요리 레시피 공유 부탁드려요", "초보자도 따라 할 수 있겠네요",
+    "댓글 보러 왔다가 영상까지 봄", "오랜만에 보니 반갑네요", "이번 편은 좀 아쉬웠어요", "다들 좋은 하루 보내세요",
+]
+
+SPAM_TEMPLATES = [
+    "지금 바로 https://bit.ly/{code} 들어오면 무료 쿠폰 드려요",
+    "부업 문의는 010-{a:04d}-{b:04d} 로 연락주세요",
+    "오픈채팅 open.kakao.com/o/{code} 수익 인증 방 입장",
+    "텔레그램 @{code} 로 연락주시면 고수익 보장",
+    "www.{code}.com 가입만 해도 현금 지급 이벤트",
+]
+
+OBFUSCATION_CHARS = "!@#$%^&*._-~ "
+
+
+def load_profanity(dictionary_path: str = DICTIONARY_PATH) -> list:
+    """시스템 사전에서 벤치마크에 쓸 욕설 단어 (한글 음절 2글자 이상만)"""
+    with open(dictionary_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    words = set()
+    for entry in data.values():
+        for word in entry.get('words', []):
+            if len(word) >= 2 and all('가' <= ch <= '힣' for ch in word):
+                words.add(word)
+    return sorted(words)
+
+
+class CommentCorpus:
+    """
+    재현 가능한 합성 댓글 생성기
+    - generate(n): [(kind, text), ...]
+    """
+
+    def __init__(self, seed: int = 42, mix: dict = None, profanity: list = None):
+        self.seed = seed
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.profanity = profanity if profanity is not None else load_profanity()
+        self.rng = random.Random(seed)
+
+    def _pick_weighted(self, table):
+        keys = list(table.keys())
+        return self.rng.choices(keys, weights=[table[k] for k in keys], k=1)[0]
+
+    def _clean_phrases(self):
+        (low, high), _ = LENGTH_BUCKETS[self._pick_weighted({k: v[1] for k, v in LENGTH_BUCKETS.items()})]
+        return [self.rng.choice(CLEAN_PHRASES) for _ in range(self.rng.randint(low, high))]
+
+    def _obfuscate(self, word):
+        """글자 사이에 특수문자/공백을 끼워 넣은 변형 (예: 씨#발, 병 신)"""
+        pieces = [word[0]]
+        for ch in word[1:]:
+            if self.rng.random() < 0.7:
+                pieces.append(self.rng.choice(OBFUSCATION_CHARS) * self.rng.randint(1, 2))
+            pieces.append(ch)
+        return "".join(pieces)
+
+    def _insert(self, phrases, word):
+        phrases.insert(self.rng.randint(0, len(phrases)), word)
+        return " ".join(phrases)
+
+    def comment(self, kind: str) -> str:
+        phrases = self._clean_phrases()
+        if kind == "clean" or not self.profanity:
+            return " ".join(phrases)
+
+        if kind == "profane":
+            for _ in range(self.rng.randint(1, 3)):
+                phrases.insert(self.rng.randint(0, len(phrases)), self.rng.choice(self.profanity))
+            return " ".join(phrases)
+
+        if kind == "obfuscated":
+            return self._insert(phrases, self._obfuscate(self.rng.choice(self.profanity)))
+
+        if kind == "spam":
+            template = self.rng.choice(SPAM_TEMPLATES)
+            code = "".join(self.rng.choice("abcdefghijkmnpqrstuvwxyz23456789") for _ in range(6))
+            spam = template.format(code=code, a=self.rng.randint(0, 9999), b=self.rng.randint(0, 9999))
+            return self._insert(phrases, spam)
+
+        raise ValueError(f"알 수 없는 댓글 종류: {kind}")
+
+    def generate(self, n: int) -> list:
+        return [(kind, self.comment(kind)) for kind in (self._pick_weighted(self.mix) for _ in range(n))]
+
+
+def generate_corpus(n: int, seed: int = 42, mix: dict = None) -> list:
+    """n개의 합성 댓글 텍스트 리스트"""
+    return [text for _, text in CommentCorpus(seed=seed, mix=mix).generate(n)]
+
+
+def parse_mix(value: str) -> dict:
+    """'clean=0.6,profane=0.2,...' 형식의 비율 문자열을 dict로 변환"""
+    mix = {}
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition('=')
+        mix[kind.strip()] = float(weight)
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise ValueError(f"알 수 없는 댓글 종류: {', '.join(sorted(unknown))}")
+    return mix
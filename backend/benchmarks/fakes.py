@@ -0,0 +1,234 @@
+"""
+벤치마크용 오프라인 OpenAI / YouTube 대역
+- 실제 네트워크 호출 없이 응답 형식만 흉내 내며, 호출마다 지정한 지연(latency ± jitter)을 줍니다.
+- 응답 내용은 입력 텍스트만으로 결정되므로 같은 코퍼스면 같은 판정이 나옵니다.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+import types
+
+from googleapiclient.errors import HttpError
+
+# 배치 프롬프트의 댓글 줄 (형식: id: "댓글")
+BATCH_LINE_PATTERN = re.compile(r'^\s*(\d+): (".*")\s*$', re.M)
+SINGLE_LINE_PATTERN = re.compile(r'^\s*분석할 댓글: "(.*)"\s*$', re.M)
+
+SPAM_PATTERN = re.compile(r'(https?://\S+|www\.\S+|open\.kakao\.com/\S+|@\w+)')
+PRIVACY_PATTERN = re.compile(r'01[016789]-?\d{3,4}-?\d{4}')
+
+
+def _detect(text: str) -> list:
+    items = [{"keyword": m.group(0), "category": "SPAM"} for m in SPAM_PATTERN.finditer(text)]
+    items += [{"keyword": m.group(0), "category": "PRIVACY"} for m in PRIVACY_PATTERN.finditer(text)]
+    return items
+
+
+class _Latency:
+    """호출 지연 (latency ± jitter 초, seed 고정)"""
+
+    def __init__(self, latency: float, jitter: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def next(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        with self._lock:
+            offset = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset)
+
+
+class FakeRateLimitError(Exception):
+    """openai.RateLimitError 대역 (status_code 429)"""
+    status_code = 429
+    response = None
+
+
+class _FakeCompletions:
+    def __init__(self, delay: _Latency, error_rate: float = 0.0, seed: int = 0):
+        self.delay = delay
+        self.error_rate = error_rate
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _maybe_fail(self):
+        """error_rate 비율로 429 응답 흉내"""
+        if self.error_rate <= 0:
+            return
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if failed:
+            raise FakeRateLimitError("Rate limit reached (benchmark)")
+
+    def _respond(self, messages):
+        with self._lock:
+            self.calls += 1
+        prompt = messages[-1]['content']
+
+        lines = BATCH_LINE_PATTERN.findall(prompt)
+        if lines:
+            results = [
+                {"id": int(item_id), "detected_items": _detect(json.loads(text)), "reason": "benchmark", "severity": 1}
+                for item_id, text in lines
+            ]
+            content = json.dumps({"results": results}, ensure_ascii=False)
+        else:
+            match = SINGLE_LINE_PATTERN.search(prompt)
+            items = _detect(match.group(1)) if match else []
+            content = json.dumps({"detected_items": items, "reason": "benchmark", "severity": 1}, ensure_ascii=False)
+
+        usage = types.SimpleNamespace(prompt_tokens=len(prompt), completion_tokens=len(content))
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+
+    def create(self, model, messages, **kwargs):
+        time.sleep(self.delay.next())
+        self._maybe_fail()
+        return self._respond(messages)
+
+
+class _FakeAsyncCompletions(_FakeCompletions):
+    async def create(self, model, messages, **kwargs):
+        await asyncio.sleep(self.delay.next())
+        self._maybe_fail()
+        return self._respond(messages)
+
+
+class FakeOpenAI:
+    """openai.OpenAI 대역 (client.chat.completions.create)"""
+
+    def __init__(self, latency: float = 0.3, jitter: float = 0.0, seed: int = 0, error_rate: float = 0.0):
+        self.chat = types.SimpleNamespace(completions=_FakeCompletions(_Latency(latency, jitter, seed), error_rate, seed))
+
+
+class FakeAsyncOpenAI:
+    """openai.AsyncOpenAI 대역"""
+
+    def __init__(self, latency: float = 0.3, jitter: float = 0.0, seed: int = 0, error_rate: float = 0.0):
+        self.chat = types.SimpleNamespace(completions=_FakeAsyncCompletions(_Latency(latency, jitter, seed), error_rate, seed))
+
+
+# -------------------------------------------------
+# YouTube Data API 대역
+# -------------------------------------------------
+
+class _FakeRequest:
+    def __init__(self, service, method_id, params, page_token=None):
+        self.service = service
+        self.methodId = method_id
+        self.params = params
+        self.page_token = page_token or 0
+        self.headers = {}
+
+    def execute(self, http=None):
+        time.sleep(self.service.delay.next())
+        with self.service._lock:
+            self.service.calls += 1
+        return self.service.respond(self)
+
+
+class _FakeCollection:
+    def __init__(self, service, method_id):
+        self.service = service
+        self.method_id = method_id
+
+    def list(self, **params):
+        return _FakeRequest(self.service, self.method_id, params)
+
+    def list_next(self, previous_request=None, previous_response=None):
+        token = (previous_response or {}).get('nextPageToken')
+        if token is None:
+            return None
+        return _FakeRequest(self.service, self.method_id, previous_request.params, token)
+
+
+class FakeYouTubeService:
+    """
+    googleapiclient YouTube 서비스 대역
+    - videos().list / commentThreads().list / comments().list 와 list_next를 지원합니다.
+    - 댓글 본문은 주어진 텍스트 목록을 순서대로 사용하며, reply_every번째 스레드마다 답글 replies_per_thread개를 붙입니다.
+    - 실제 API처럼 스레드 응답에는 답글이 최대 5개만 포함되므로, 그보다 많으면 comments().list 호출이 추가로 일어납니다.
+    """
+    PAGE_SIZE = 100
+    INLINE_REPLIES = 5
+
+    def __init__(self, texts: list, latency: float = 0.15, jitter: float = 0.0, seed: int = 0,
+                 reply_every: int = 10, replies_per_thread: int = 6):
+        self.delay = _Latency(latency, jitter, seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.threads = []
+        self.replies = {}
+
+        for idx, text in enumerate(texts):
+            thread_id = f"thread{idx:06d}"
+            published = f"2025-01-01T00:{idx // 60 % 60:02d}:{idx % 60:02d}Z"
+            self.threads.append({"id": thread_id, "text": text, "published": published})
+            if reply_every and idx % reply_every == 0:
+                self.replies[thread_id] = [
+                    {"id": f"{thread_id}.r{n}", "text": texts[(idx + n + 1) % len(texts)], "published": published}
+                    for n in range(replies_per_thread)
+                ]
+
+    def videos(self):
+        return _FakeCollection(self, "youtube.videos.list")
+
+    def commentThreads(self):
+        return _FakeCollection(self, "youtube.commentThreads.list")
+
+    def comments(self):
+        return _FakeCollection(self, "youtube.comments.list")
+
+    @staticmethod
+    def _snippet(comment):
+        return {
+            "textOriginal": comment["text"],
+            "authorDisplayName": "benchmark",
+            "publishedAt": comment["published"],
+            "updatedAt": comment["published"],
+        }
+
+    def respond(self, request):
+        if request.methodId == "youtube.videos.list":
+            return {"items": [{"snippet": {"title": "benchmark", "description": "", "tags": [], "categoryId": "22"}}]}
+
+        if request.methodId == "youtube.comments.list":
+            replies = self.replies.get(request.params.get('parentId'), [])
+            return {"items": [{"id": r["id"], "snippet": self._snippet(r)} for r in replies]}
+
+        etag = f"bench-{len(self.threads)}"
+        if request.headers.get('If-None-Match') == etag and not request.page_token:
+            raise HttpError(types.SimpleNamespace(status=304, reason="Not Modified"), b"")
+
+        start = request.page_token
+        page_size = min(int(request.params.get('maxResults', self.PAGE_SIZE)), self.PAGE_SIZE)
+        include_replies = 'replies' in request.params.get('part', '')
+
+        items = []
+        for thread in self.threads[start:start + page_size]:
+            replies = self.replies.get(thread["id"], [])
+            item = {
+                "id": thread["id"],
+                "snippet": {"totalReplyCount": len(replies), "topLevelComment": {"snippet": self._snippet(thread)}},
+            }
+            if include_replies and replies:
+                # 실제 API처럼 답글은 INLINE_REPLIES개까지만 포함 (나머지는 comments().list로 수집)
+                item["replies"] = {
+                    "comments": [{"id": r["id"], "snippet": self._snippet(r)} for r in replies[:self.INLINE_REPLIES]]
+                }
+            items.append(item)
+
+        response = {"items": items, "etag": etag}
+        if start + page_size < len(self.threads):
+            response["nextPageToken"] = start + page_size
+        return response
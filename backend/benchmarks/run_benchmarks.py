@@ -0,0 +1,651 @@
+"""
+모더레이션 파이프라인 벤치마크 실행기
+- 합성 코퍼스 + 오프라인 OpenAI/YouTube 대역으로 단계별/전체 처리량, p50/p99 지연, 최대 메모리를 측정합니다.
+- 결과는 JSON 파일로 저장되며, --compare로 이전 결과와 비교해 허용 범위를 넘는 성능 저하를 표시합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.run_benchmarks --size 2000 --tokenizer surface
+    python -m benchmarks.run_benchmarks --scenarios stages,batch --compare benchmarks/results/<이전 결과>.json
+    python -m benchmarks.run_benchmarks --scenarios scaling --processes 1,2,4,8 --no-memory
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .corpus import CommentCorpus, DEFAULT_MIX, parse_mix
+from .fakes import FakeOpenAI, FakeAsyncOpenAI, FakeYouTubeService
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+SCENARIOS = ("stages", "single", "batch", "youtube", "cold_start", "scaling")
+
+# 비교 대상 지표: (경로, 클수록 좋은지)
+COMPARE_METRICS = (
+    (("throughput_per_sec",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("peak_python_mb",), False),
+)
+
+
+# -------------------------------------------------
+# 측정 도구
+# -------------------------------------------------
+
+def percentile(values: list, pct: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(latencies: list, items: int, seconds: float) -> dict:
+    """지연 목록(초) + 처리 항목 수 + 소요 시간 -> 요약 (지연은 ms)"""
+    return {
+        "items": items,
+        "calls": len(latencies),
+        "seconds": round(seconds, 4),
+        "throughput_per_sec": round(items / seconds, 2) if seconds > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(max(latencies) * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def max_rss_mb():
+    """프로세스 최대 RSS (MB, 측정 불가 시 None)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def stage_totals() -> dict:
+    """현재까지 기록된 단계별 {stage: [호출 수, 누적 시간, 처리 항목 수]}"""
+    from filter_api.metrics import STAGE_SECONDS, STAGE_ITEMS
+
+    totals = {}
+    for name, labels, value in STAGE_SECONDS.samples():
+        entry = totals.setdefault(labels['stage'], [0, 0.0, 0])
+        if name.endswith("_count"):
+            entry[0] = value
+        elif name.endswith("_sum"):
+            entry[1] = value
+    for _, labels, value in STAGE_ITEMS.samples():
+        totals.setdefault(labels['stage'], [0, 0.0, 0])[2] = value
+    return totals
+
+
+def stage_breakdown(before: dict, after: dict) -> dict:
+    """두 시점 사이 단계별 호출 수/누적 시간/처리 항목 수"""
+    breakdown = {}
+    for stage, (calls, seconds, items) in after.items():
+        prev_calls, prev_seconds, prev_items = before.get(stage, (0, 0.0, 0))
+        if calls - prev_calls <= 0:
+            continue
+        breakdown[stage] = {
+            "calls": calls - prev_calls,
+            "items": items - prev_items,
+            "seconds": round(seconds - prev_seconds, 4),
+        }
+    return breakdown
+
+
+def measure(name: str, scenario, memory: bool) -> dict:
+    """
+    시나리오 한 개 측정
+    - scenario(): (지연 목록, 처리 항목 수)를 반환하며, 호출할 때마다 새 파이프라인으로 처음부터 실행해야 합니다.
+    - memory=True이면 tracemalloc을 켠 채로 한 번 더 실행해 파이썬 힙 최대 사용량을 잽니다.
+      (tracemalloc은 실행 속도를 떨어뜨리므로 시간 측정과 분리)
+    """
+    print(f"[Benchmark] {name} 실행 중...")
+    before = stage_totals()
+    started = time.perf_counter()
+    latencies, items = scenario()
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, items, elapsed)
+    result["stages"] = stage_breakdown(before, stage_totals())
+
+    if memory:
+        tracemalloc.start()
+        try:
+            scenario()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_python_mb"] = round(peak / (1024 * 1024), 2)
+
+    latency = result["latency_ms"]
+    print(f"  ㄴ {result['throughput_per_sec']} items/s, p50 {latency['p50']}ms, p99 {latency['p99']}ms"
+          + (f", peak {result['peak_python_mb']}MB" if memory else ""))
+    return result
+
+
+# -------------------------------------------------
+# 벤치마크 구성
+# -------------------------------------------------
+
+class Bench:
+    """벤치마크에 필요한 실제 파이프라인 구성 요소 + 오프라인 대역"""
+
+    def __init__(self, args):
+        # config/모듈은 환경 변수를 설정한 뒤에 임포트해야 설정이 반영됩니다.
+        import config
+        from filter_api.core.first_pass_filter import FirstPassFilter
+        from filter_api.core.second_pass_filter import SecondPassFilter
+        from filter_api.core.risk_scorer import RiskScorer
+        from filter_api.core.policy_manager import PolicyManager
+
+        self.config = config
+        self.args = args
+        self.first_filter = FirstPassFilter()
+        self.second_filter = SecondPassFilter()
+        self.second_filter.client = FakeOpenAI(args.llm_latency, args.llm_jitter, args.seed, args.llm_error_rate)
+        self.second_filter.async_client = FakeAsyncOpenAI(args.llm_latency, args.llm_jitter, args.seed, args.llm_error_rate)
+        self.risk_scorer = RiskScorer()
+        self.policy_manager = PolicyManager()
+
+        self.texts = [text for _, text in CommentCorpus(seed=args.seed, mix=args.mix).generate(args.size)]
+
+        # 서버처럼 루프 하나에서 모든 시나리오를 실행합니다. (2차 필터의 동시 호출 수 조절 상태도 이어짐)
+        self.loop = asyncio.new_event_loop()
+        self.worker_memory = {}  # scaling 시나리오: 프로세스 수 -> 워커별 메모리
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def pipeline(self):
+        """시나리오마다 새 파이프라인 (판정 캐시가 시나리오 간에 공유되지 않도록)"""
+        from filter_api.core.pipeline import ModerationPipeline
+        from filter_api.core.verdict_cache import VerdictCache
+        from filter_api.core.early_exit_gate import EarlyExitGate
+
+        config = self.config
+        verdict_cache = None
+        if self.args.with_cache:
+            verdict_cache = VerdictCache(max_entries=config.VERDICT_CACHE_SIZE, ttl=config.VERDICT_CACHE_TTL)
+
+        return ModerationPipeline(
+            self.first_filter, self.second_filter, self.risk_scorer, self.policy_manager,
+            cpu_workers=config.PIPELINE_CPU_WORKERS,
+            verdict_cache=verdict_cache,
+            early_exit_gate=EarlyExitGate(
+                self.risk_scorer, self.policy_manager,
+                enabled=config.EARLY_EXIT_ENABLED,
+                clean_max_length=config.EARLY_EXIT_CLEAN_MAX_LENGTH
+            )
+        )
+
+    def near_duplicate_index(self):
+        """서버와 같은 설정의 근접 중복 색인 (비활성화 시 None)"""
+        from filter_api.core.near_duplicates import NearDuplicateIndex
+
+        config = self.config
+        if not config.NEAR_DUPLICATE_ENABLED:
+            return None
+        return NearDuplicateIndex(threshold=config.NEAR_DUPLICATE_THRESHOLD, min_length=config.NEAR_DUPLICATE_MIN_LENGTH)
+
+    def youtube_client(self, texts):
+        from filter_api.clients.youtube_client import YouTubeClient
+
+        client = YouTubeClient()
+        client.youtube = FakeYouTubeService(texts, self.args.yt_latency, self.args.yt_jitter, self.args.seed)
+        client.cache = None  # 매 실행마다 전체 수집 경로를 측정
+        return client
+
+    # --- 단계별 ---
+
+    def stage_scenarios(self):
+        texts = self.texts
+
+        def first_pass():
+            latencies = []
+            for text in texts:
+                started = time.perf_counter()
+                self.first_filter.execute(text)
+                latencies.append(time.perf_counter() - started)
+            return latencies, len(texts)
+
+        def first_pass_batch():
+            started = time.perf_counter()
+            self.first_filter.execute_batch(texts)
+            return [time.perf_counter() - started], len(texts)
+
+        first_results = self.first_filter.execute_batch(texts)
+
+        def second_pass_batch():
+            results = [dict(res) for res in first_results]
+            started = time.perf_counter()
+            self.run(self.second_filter.execute_batch_async(results))
+            return [time.perf_counter() - started], len(results)
+
+        scores = self.risk_scorer.execute_batch(first_results)
+
+        def risk_score():
+            latencies = []
+            for res in first_results:
+                started = time.perf_counter()
+                self.risk_scorer.execute(res)
+                latencies.append(time.perf_counter() - started)
+            return latencies, len(first_results)
+
+        def policy():
+            latencies = []
+            for score, res in zip(scores, first_results):
+                started = time.perf_counter()
+                self.policy_manager.decide_action(score, res)
+                latencies.append(time.perf_counter() - started)
+            return latencies, len(first_results)
+
+        return {
+            "stage.first_pass": first_pass,
+            "stage.first_pass_batch": first_pass_batch,
+            "stage.second_pass_batch": second_pass_batch,
+            "stage.risk_score": risk_score,
+            "stage.policy": policy,
+        }
+
+    # --- 전체 흐름 ---
+
+    def single(self):
+        """단건 분석 요청(analyze-text) 동시 처리: 요청 하나당 댓글 하나"""
+        texts = self.texts[:self.args.single_size]
+        concurrency = self.args.concurrency
+
+        async def drive(pipeline):
+            semaphore = asyncio.Semaphore(concurrency)
+            latencies = []
+
+            async def one(text):
+                async with semaphore:
+                    started = time.perf_counter()
+                    await pipeline.run_async(text)
+                    latencies.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(one(text) for text in texts))
+            return latencies
+
+        pipeline = self.pipeline()
+        try:
+            return self.run(drive(pipeline)), len(texts)
+        finally:
+            pipeline.executor.shutdown()
+
+    def batch(self):
+        """일괄 분석(analyze-batch): batch_size개씩 순서대로 요청"""
+        size = self.args.batch_size
+        chunks = [self.texts[i:i + size] for i in range(0, len(self.texts), size)]
+
+        async def drive(pipeline):
+            latencies = []
+            for chunk in chunks:
+                started = time.perf_counter()
+                await pipeline.run_batch_async(chunk)
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        pipeline = self.pipeline()
+        try:
+            return self.run(drive(pipeline)), len(self.texts)
+        finally:
+            pipeline.executor.shutdown()
+
+    def youtube(self):
+        """
+        영상 댓글 분석(analyze-youtube)과 같은 흐름
+        - 페이지를 받는 동안 이전 페이지 분석을 진행하며, 지연은 페이지 단위(수집 시작 ~ 분석 완료)로 잽니다.
+        """
+        client = self.youtube_client(self.texts)
+
+        async def drive(pipeline):
+            loop = asyncio.get_running_loop()
+            video_task = loop.run_in_executor(None, client.get_video_details, "benchmark")
+            pages = client.iter_comment_pages("benchmark", max_pages=10 ** 6, include_replies=self.args.include_replies)
+
+            latencies = []
+            count = 0
+            near_duplicates = self.near_duplicate_index()
+
+            async def analyze(page, started):
+                texts = [comment['text_original'] for comment in page]
+                if near_duplicates is not None:
+                    await pipeline.run_clustered_async(texts, near_duplicates)
+                else:
+                    await pipeline.run_batch_async(texts)
+                latencies.append(time.perf_counter() - started)
+
+            tasks = []
+            while True:
+                started = time.perf_counter()
+                page = await loop.run_in_executor(None, next, pages, None)
+                if page is None:
+                    break
+                count += len(page)
+                tasks.append(asyncio.ensure_future(analyze(page, started)))
+
+            await asyncio.gather(*tasks)
+            await video_task
+            return latencies, count
+
+        pipeline = self.pipeline()
+        try:
+            return self.run(drive(pipeline))
+        finally:
+            pipeline.executor.shutdown()
+            client._reply_executor.shutdown()
+
+    def scaling(self, processes: int):
+        """
+        1차 필터를 프로세스 processes개로 나눠 실행 (0이면 이 프로세스에서만)
+        - 워커 생성/공유 매칭 엔진 열기는 측정에서 제외하고, 실행 직후 워커별 메모리(rss/pss/shared)를 기록합니다.
+        """
+        from filter_api.core.first_pass_pool import FirstPassProcessPool
+
+        pool = None
+        if processes:
+            pool = FirstPassProcessPool(processes, min_batch=self.config.FIRST_PASS_PROCESS_MIN_BATCH)
+            pool.start(self.first_filter.snapshot.shared_path)
+        self.first_filter.process_pool = pool
+        try:
+            started = time.perf_counter()
+            self.first_filter.execute_batch(self.texts)
+            latency = time.perf_counter() - started
+            if pool is not None:
+                self.worker_memory[processes] = pool.stats()["workers"]
+        finally:
+            self.first_filter.process_pool = None
+            if pool is not None:
+                pool.shutdown()
+        return [latency], len(self.texts)
+
+    def cold_start(self, lazy: bool):
+        """
+        서버 콜드 스타트: 새 프로세스에서 main.py 임포트(= 서버 준비 완료)까지 걸리는 시간
+        - 가짜 API 키를 넣어 OpenAI/YouTube 클라이언트 생성 비용까지 포함합니다. (생성 시 네트워크 호출 없음)
+        """
+        env = dict(
+            os.environ,
+            LAZY_INIT="true" if lazy else "false",
+            WARMUP_ON_STARTUP="false",
+            OPENAI_API_KEY="sk-benchmark",
+            YOUTUBE_API_KEY="benchmark",
+        )
+        latencies = []
+        for _ in range(self.args.cold_start_runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "import main"], cwd=BACKEND_DIR, env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            latencies.append(time.perf_counter() - started)
+        return latencies, len(latencies)
+
+    def warm_up(self):
+        """사전/토크나이저/프롬프트 캐시 준비 (측정에서 제외)"""
+        sample = self.texts[:50]
+        self.first_filter.execute_batch(sample)
+        pipeline = self.pipeline()
+        try:
+            self.run(pipeline.run_batch_async(sample))
+        finally:
+            pipeline.executor.shutdown()
+
+
+# -------------------------------------------------
+# 결과 저장 / 비교
+# -------------------------------------------------
+
+def scaling_report(scenarios: dict, worker_memory: dict):
+    """scaling 결과에 워커별 메모리와 1프로세스 대비 처리량 배율을 붙이고 표로 출력"""
+    base = scenarios.get("scaling.p1")
+    print("[Benchmark] 1차 필터 프로세스 수별 처리량 / 워커 메모리 (MB)")
+    for name, result in scenarios.items():
+        if not name.startswith("scaling.p"):
+            continue
+        count = int(name[len("scaling.p"):])
+        workers = worker_memory.get(count, [])
+        result["workers"] = workers
+        if base and base["throughput_per_sec"]:
+            result["speedup_vs_1"] = round(result["throughput_per_sec"] / base["throughput_per_sec"], 2)
+
+        memory = [worker["memory"] for worker in workers if worker["memory"]]
+        mb = lambda key: round(sum(m[key] for m in memory) / len(memory) / (1024 * 1024), 1) if memory else "-"
+        print(f"  ㄴ {count}개: {result['throughput_per_sec']} items/s"
+              + (f" (x{result['speedup_vs_1']})" if "speedup_vs_1" in result else "")
+              + (f", 워커당 rss {mb('rss')} / pss {mb('pss')} / shared {mb('shared')}" if memory else ""))
+
+def _git(*cmd):
+    try:
+        out = subprocess.run(["git", *cmd], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def environment(args, config) -> dict:
+    status = _git("status", "--porcelain")
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(status) if status is not None else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {
+            "size": args.size,
+            "seed": args.seed,
+            "mix": args.mix,
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "llm_error_rate": args.llm_error_rate,
+            "yt_latency": args.yt_latency,
+            "yt_jitter": args.yt_jitter,
+            "single_size": args.single_size,
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "include_replies": args.include_replies,
+            "with_cache": args.with_cache,
+            "memory": args.memory,
+            "cold_start_runs": args.cold_start_runs,
+            "processes": args.processes,
+        },
+        "config": {
+            "TOKENIZER_BACKEND": config.TOKENIZER_BACKEND,
+            "DICTIONARY_ARTIFACT_PATH": config.DICTIONARY_ARTIFACT_PATH,
+            "USE_DETAIL_AI_MODEL": config.USE_DETAIL_AI_MODEL,
+            "LLM_BATCH_SIZE": config.LLM_BATCH_SIZE,
+            "LLM_BATCH_TOKEN_BUDGET": config.LLM_BATCH_TOKEN_BUDGET,
+            "LLM_MAX_CONCURRENCY": config.LLM_MAX_CONCURRENCY,
+            "LLM_INITIAL_CONCURRENCY": config.LLM_INITIAL_CONCURRENCY,
+            "LLM_MAX_RETRIES": config.LLM_MAX_RETRIES,
+            "PIPELINE_CPU_WORKERS": config.PIPELINE_CPU_WORKERS,
+            "EARLY_EXIT_ENABLED": config.EARLY_EXIT_ENABLED,
+            "NEAR_DUPLICATE_ENABLED": config.NEAR_DUPLICATE_ENABLED,
+            "YOUTUBE_PREFETCH_PAGES": config.YOUTUBE_PREFETCH_PAGES,
+            "YOUTUBE_REPLY_WORKERS": config.YOUTUBE_REPLY_WORKERS,
+            "SHARED_MATCHER_PATH": config.SHARED_MATCHER_PATH,
+            "FIRST_PASS_PROCESS_MIN_BATCH": config.FIRST_PASS_PROCESS_MIN_BATCH,
+        },
+    }
+
+
+def _lookup(result: dict, path):
+    for key in path:
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """
+    이전 결과와 시나리오별 주요 지표를 비교해 출력합니다.
+    - 반환: 허용 범위(tolerance 비율)를 넘어 나빠진 항목 [(시나리오, 지표, 이전 값, 현재 값), ...]
+    """
+    regressions = []
+    base_commit = (baseline.get("meta", {}).get("git_commit") or "unknown")[:10]
+    print(f"\n[Benchmark] 이전 결과와 비교 (기준 커밋: {base_commit}, 허용 범위 {tolerance:.0%})")
+    for section in ("params", "config"):
+        if current["meta"].get(section) != baseline.get("meta", {}).get(section):
+            print(f"  [Warning] 실행 조건({section})이 이전 결과와 다릅니다. 비교 결과를 그대로 믿기 어렵습니다.")
+
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for path, higher_is_better in COMPARE_METRICS:
+            now, before = _lookup(result, path), _lookup(base, path)
+            if now is None or not before:
+                continue
+            change = (now - before) / before
+            worse = -change if higher_is_better else change
+            label = ".".join(path)
+            flag = ""
+            if worse > tolerance:
+                flag = "  <-- REGRESSION"
+                regressions.append((name, label, before, now))
+            print(f"  ㄴ {name:<26} {label:<20} {before:>12} -> {now:>12} ({change:+.1%}){flag}")
+
+    if regressions:
+        print(f"  [Warning] 성능 저하 {len(regressions)}건")
+    else:
+        print("  ㄴ 허용 범위를 넘는 성능 저하 없음")
+    return regressions
+
+
+def default_output_path(meta: dict) -> str:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    commit = (meta.get("git_commit") or "nogit")[:10]
+    return os.path.join(RESULTS_DIR, f"{stamp}-{commit}.json")
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def parse_processes(value: str) -> list:
+    try:
+        counts = sorted({int(part) for part in value.split(',') if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError("프로세스 수는 쉼표로 구분한 정수여야 합니다.")
+    if not counts or counts[0] < 0:
+        raise argparse.ArgumentTypeError("프로세스 수는 0 이상이어야 합니다.")
+    return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="모더레이션 파이프라인 벤치마크 (오프라인)")
+    parser.add_argument("--size", type=int, default=2000, help="합성 댓글 수")
+    parser.add_argument("--seed", type=int, default=42, help="코퍼스/지연 난수 seed")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="댓글 종류 비율 (예: clean=0.6,profane=0.2,obfuscated=0.1,spam=0.1)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"실행할 시나리오 ({','.join(SCENARIOS)})")
+    parser.add_argument("--tokenizer", choices=("surface", "okt", "okt_pool"), help="TOKENIZER_BACKEND 덮어쓰기")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="GPT 대역 호출 지연 (초)")
+    parser.add_argument("--llm-jitter", type=float, default=0.05, help="GPT 대역 지연 편차 (초)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="GPT 대역 429 응답 비율 (0.0 ~ 1.0)")
+    parser.add_argument("--yt-latency", type=float, default=0.15, help="YouTube 대역 호출 지연 (초)")
+    parser.add_argument("--yt-jitter", type=float, default=0.03, help="YouTube 대역 지연 편차 (초)")
+    parser.add_argument("--single-size", type=int, default=300, help="single 시나리오 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="single 시나리오 동시 요청 수")
+    parser.add_argument("--batch-size", type=int, default=500, help="batch 시나리오 요청당 댓글 수")
+    parser.add_argument("--cold-start-runs", type=int, default=5, help="cold_start 시나리오 반복 횟수 (모드별)")
+    parser.add_argument("--processes", type=parse_processes, default=[0, 1, 2, 4],
+                        help="scaling 시나리오 1차 필터 프로세스 수 목록 (0: 이 프로세스에서만, 예: 0,1,2,4)")
+    parser.add_argument("--no-replies", dest="include_replies", action="store_false", help="youtube 시나리오에서 답글 제외")
+    parser.add_argument("--with-cache", action="store_true", help="판정 캐시(메모리) 사용")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="메모리 측정(추가 실행) 생략")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/<시각>-<커밋>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="성능 저하로 볼 변화 비율 (기본 0.1 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="성능 저하가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+    args.single_size = min(args.single_size, args.size)
+    return args
+
+
+def prepare_environment(args):
+    """config 임포트 전에 벤치마크용 환경 변수 설정 (실제 외부 API는 절대 호출하지 않음)"""
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ["OPENAI_API_KEY"] = ""
+    os.environ["YOUTUBE_API_KEY"] = ""
+    os.environ["YOUTUBE_COMMENT_CACHE_DIR"] = ""
+    os.environ["VERDICT_CACHE_DB_PATH"] = ""
+    if args.tokenizer:
+        os.environ["TOKENIZER_BACKEND"] = args.tokenizer
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    prepare_environment(args)
+
+    print("[Benchmark] 구성 요소 초기화 중...")
+    bench = Bench(args)
+    bench.warm_up()
+
+    scenarios = {}
+    if "stages" in args.scenarios:
+        scenarios.update(bench.stage_scenarios())
+    if "single" in args.scenarios:
+        scenarios["single"] = bench.single
+    if "batch" in args.scenarios:
+        scenarios["batch"] = bench.batch
+    if "youtube" in args.scenarios:
+        scenarios["youtube"] = bench.youtube
+    if "cold_start" in args.scenarios:
+        scenarios["cold_start.eager"] = lambda: bench.cold_start(lazy=False)
+        scenarios["cold_start.lazy"] = lambda: bench.cold_start(lazy=True)
+    if "scaling" in args.scenarios:
+        if not bench.first_filter.snapshot.shared_path:
+            print("[Benchmark] 공유 매칭 엔진을 쓰지 않아(SHARED_MATCHER_PATH 또는 FIRST_PASS_PROCESSES 지정 필요) scaling 시나리오를 건너뜁니다.")
+        else:
+            for count in args.processes:
+                scenarios[f"scaling.p{count}"] = lambda count=count: bench.scaling(count)
+
+    report = {"meta": environment(args, bench.config), "scenarios": {}}
+    for name, scenario in scenarios.items():
+        # 콜드 스타트는 별도 프로세스이므로 이 프로세스의 메모리 측정은 의미 없음
+        report["scenarios"][name] = measure(name, scenario, args.memory and not name.startswith("cold_start"))
+    report["meta"]["max_rss_mb"] = max_rss_mb()
+    if "scaling" in args.scenarios:
+        scaling_report(report["scenarios"], bench.worker_memory)
+
+    output = args.output or default_output_path(report["meta"])
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[Benchmark] 결과 저장: {output}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,14 +13,142 @@ load_dotenv()
 SECURITY_LEVEL = int(os.getenv("SECURITY_LEVEL", 3))
 
 # 2차 정밀 AI 모델(별도 학습 모델) 사용 여부
-USE_DETAIL_AI_MODEL = False  
+# 사용 시 로컬 CPU 모델이 먼저 판정하고, 확신도가 낮은 댓글만 GPT로 보냅니다.
+USE_DETAIL_AI_MODEL = os.getenv("USE_DETAIL_AI_MODEL", "false").lower() == "true"
 
 # 위험도 기준 점수 (0.0 ~ 1.0)
 # 이 점수 이상이면 규정 위반으로 간주
 RISK_THRESHOLD = 0.65
 
-# AI 모델 경로 (추후 사용)
-BASE_MODEL_PATH = "resources/models/AI_model.h5"
+# AI 모델 경로 (backend 기준, ONNX 형식 / onnxruntime 필요)
+BASE_MODEL_PATH = os.getenv("BASE_MODEL_PATH", "resources/models/AI_model.onnx")
+DETAIL_MODEL_LABELS = ['CLEAN', 'AGGRESSION', 'SEXUAL', 'POLITICAL', 'FAMILY', 'SPAM', 'PRIVACY']  # 모델 출력 순서
+DETAIL_MODEL_CONFIDENCE = 0.85  # 이 확률 이상이면 로컬 판정 확정 (정상/위반 모두), 미만이면 GPT로 보냄
+DETAIL_MODEL_BATCH_SIZE = 64    # 한 번에 추론할 댓글 수
+DETAIL_MODEL_THREADS = 2        # ONNX Runtime 연산 스레드 수
+
+# 1차 필터 형태소 분석기 백엔드
+# - 'surface'  : 형태소 분석 생략 (표면 문자열 매칭만, JVM 미사용)
+# - 'okt'      : 요청 스레드에서 직접 Okt 호출
+# - 'okt_pool' : 전용 워커 풀에서 Okt 호출 (대기열 제한)
+TOKENIZER_BACKEND = os.getenv("TOKENIZER_BACKEND", "okt_pool")
+TOKENIZER_POOL_SIZE = int(os.getenv("TOKENIZER_POOL_SIZE", 2))  # Okt 워커 스레드 수
+TOKENIZER_QUEUE_LIMIT = 64      # 워커 풀 대기열 상한 (초과 시 표면 매칭으로 대체)
+TOKENIZER_BATCH_WAIT = 2.0      # 묶음 분석이 대기열 자리를 기다리는 최대 시간 (초), 넘으면 묶음 전체를 표면 매칭으로 대체
+TOKENIZER_CACHE_SIZE = 10000    # pos() 결과 LRU 캐시 크기
+
+# 2차 필터 배치 분석 설정 (여러 댓글을 한 번의 GPT 호출로 묶음)
+LLM_BATCH_SIZE = 20             # 한 번의 호출에 넣을 최대 댓글 수
+LLM_BATCH_TOKEN_BUDGET = 3000   # 한 번의 호출에 넣을 댓글 텍스트의 추정 토큰 상한
+
+# 비동기 파이프라인 설정
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))  # 동시에 진행할 GPT 호출 수 (상한)
+PIPELINE_CPU_WORKERS = 4        # 1차 필터/점수 계산 등 CPU 단계를 실행할 스레드 수
+STREAM_CHUNK_SIZE = 10          # 스트리밍 분석 시 한 번에 처리해 내보낼 댓글 수
+BATCH_MAX_ITEMS = 5000          # 일괄 분석(/api/workflow/analyze-batch) 한 번에 받을 최대 텍스트 수
+REQUEST_TIMING_HEADER = True    # 응답에 단계별 소요 시간(Server-Timing 헤더) 포함 여부
+
+# GPT 호출 제어 (동시 호출 수 자동 조절 / 재시도 / 회로 차단)
+# - 동시 호출 수는 LLM_MIN_CONCURRENCY ~ LLM_MAX_CONCURRENCY 사이에서 429/시간 초과/응답 지연에 따라 조절 (AIMD)
+# - 재시도로도 응답을 받지 못하거나 회로가 열리면 1차 결과만으로 판정하고 status를 DEGRADED로 표시
+LLM_MIN_CONCURRENCY = 1
+LLM_INITIAL_CONCURRENCY = LLM_MAX_CONCURRENCY  # 시작 값 (이전 고정 상한과 같게 시작해 429/지연이 보이면 줄임)
+LLM_LATENCY_TARGET = 15.0       # 이보다 오래 걸린 응답은 과부하 신호로 보고 동시 호출 수를 줄임 (초)
+LLM_CALL_TIMEOUT = 30.0         # 호출 한 번의 시간 제한 (초)
+LLM_REQUEST_DEADLINE = float(os.getenv("LLM_REQUEST_DEADLINE", 60.0))  # 분석 요청 하나의 GPT 호출(재시도 포함) 마감 (초)
+LLM_MAX_RETRIES = 3             # 429/5xx/시간 초과/연결 오류 재시도 횟수
+LLM_RETRY_BASE_DELAY = 0.5      # 재시도 대기 시간 (지수 증가 + 지터, 초)
+LLM_RETRY_MAX_DELAY = 8.0
+LLM_BREAKER_FAILURES = 5        # 연속 실패가 이 횟수면 회로 차단
+LLM_BREAKER_RESET = 30.0        # 회로 차단 후 시험 호출까지 대기 시간 (초)
+
+# 판정 캐시 설정 (정규화 텍스트가 같은 댓글은 1차/2차 필터 결과를 재사용)
+VERDICT_CACHE_ENABLED = True
+VERDICT_CACHE_SIZE = 50000              # 메모리 LRU 최대 항목 수
+VERDICT_CACHE_TTL = 60 * 60 * 24        # 항목 유효 시간 (초)
+# 디스크 캐시(SQLite) 경로, 비워두면 메모리 캐시만 사용 (예: resources/cache/verdicts.sqlite3)
+VERDICT_CACHE_DB_PATH = os.getenv("VERDICT_CACHE_DB_PATH", "")
+VERDICT_CACHE_DB_MAX_ENTRIES = 500000   # 디스크 캐시 최대 항목 수
+DICTIONARY_CHECK_INTERVAL = 2.0         # 사전 파일 변경 확인 주기 (초)
+# 사전 파일 감시 스레드 사용 여부 (변경 시 백그라운드에서 새 매칭 엔진을 만든 뒤 교체)
+# 끄면 분석 요청 시점에 DICTIONARY_CHECK_INTERVAL 간격으로 확인합니다.
+DICTIONARY_WATCH_ENABLED = os.getenv("DICTIONARY_WATCH_ENABLED", "true").lower() == "true"
+
+# 근접 중복 묶음 분석 (YouTube 분석에서 링크/숫자/반복 글자만 다른 도배·스팸 댓글은 대표 1개만 2차 필터 실행)
+NEAR_DUPLICATE_ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+NEAR_DUPLICATE_THRESHOLD = 0.8          # 대표와의 유사도(자카드 추정치)가 이 값 이상이면 같은 군집
+NEAR_DUPLICATE_MIN_LENGTH = 10          # 서명용 텍스트가 이보다 짧은 댓글은 묶지 않음
+
+# 채널(테넌트)별 사전/정책 설정 경로 (backend 기준, <채널 ID>.json), 비워두면 비활성화
+# 공용 시스템 사전은 하나만 두고, 채널별 화이트/블랙리스트와 보안 레벨만 덧붙입니다.
+TENANT_DICTIONARY_DIR = os.getenv("TENANT_DICTIONARY_DIR", "resources/tenants")
+TENANT_CACHE_SIZE = 1000                    # 메모리에 유지할 최대 채널 수 (최근 사용 순으로 제거)
+TENANT_CACHE_MAX_BYTES = 32 * 1024 * 1024   # 채널 오버레이 전체 메모리 상한 (근사치)
+# 채널 사전 API(PUT /api/system/tenants/{id}) 제한
+# - 새 채널은 X-Tenant-Key를 함께 보내야 하며, 이후 수정은 같은 키로만 가능합니다. (키 해시만 파일에 저장)
+# - TENANT_ADMIN_KEY를 X-Admin-Key로 보내면 소유자 확인 없이 수정할 수 있습니다. (비워두면 관리자 키 없음)
+TENANT_MAX_TENANTS = int(os.getenv("TENANT_MAX_TENANTS", 10000))  # 저장할 수 있는 채널 사전 파일 수
+TENANT_MAX_WORDS = 500                      # 화이트/블랙리스트 각각의 최대 단어 수
+TENANT_MAX_WORD_LENGTH = 50                 # 단어 하나의 최대 길이
+TENANT_ADMIN_KEY = os.getenv("TENANT_ADMIN_KEY", "")
+
+# 영상별 분석 상태 저장소 (재분석 시 새 댓글/수정된 댓글만 분석), 비워두면 비활성화
+VIDEO_STATE_DB_PATH = os.getenv("VIDEO_STATE_DB_PATH", "resources/state/video_state.sqlite3")
+
+# 판정 기록 저장소 경로 (분석 결과를 영상/댓글/내용 해시 기준으로 보관, /api/results로 조회), 비워두면 비활성화
+RESULT_STORE_DB_PATH = os.getenv("RESULT_STORE_DB_PATH", "resources/state/results.sqlite3")
+RESULT_QUERY_MAX_LIMIT = 1000           # 판정 기록 조회 한 번에 반환할 최대 개수
+
+# 워크플로 응답 캐시 (analyze-youtube), 같은 영상/파라미터/판정 지문의 요청은 TTL 동안 분석 없이 응답
+# 응답에 ETag를 붙이고, If-None-Match가 같으면 본문 없이 304를 반환합니다. (refresh=true 또는 Cache-Control: no-cache로 우회)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 60.0))  # 응답 유효 시간 (초), 새 댓글이 반영되기까지의 최대 지연
+RESPONSE_CACHE_SIZE = 256               # 메모리에 유지할 최대 응답 수 (최근 사용 순으로 제거)
+
+# 백그라운드 작업 (대용량 영상 분석 /api/workflow/jobs), 저장소 경로를 비워두면 비활성화
+# 페이지 단위로 결과를 저장(체크포인트)하므로 서버가 재시작되어도 이어서 분석합니다.
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "resources/state/jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))  # 동시에 실행할 작업 수
+JOB_QUEUE_LIMIT = 100                   # 대기/실행 중인 작업 수 상한 (모든 서버 워커 합계, 초과 시 429)
+JOB_MAX_PAGES = 2000                    # 작업 하나가 수집할 최대 댓글 페이지 수 (페이지당 최대 100개 스레드)
+JOB_PAGE_CONCURRENCY = 4                # 작업 하나에서 동시에 분석할 페이지 수
+JOB_NEAR_DUPLICATE_WINDOW = 20          # 근접 중복 색인을 새로 만드는 페이지 간격 (메모리 상한)
+JOB_RETENTION = 7 * 24 * 3600           # 끝난 작업/결과 보관 기간 (초)
+JOB_LEASE = 60.0                        # 실행 중인 작업의 임대 시간 (초), 서버가 비정상 종료되면 이 시간이 지난 뒤 다른 워커가 이어받음
+
+# 회피 표기 탐지: 띄어 쓰기/자모 분리/닮은 문자/늘여 쓰기/야민정음을 표준형으로 바꿔 사전 표준형 색인과 매칭 (1차 필터)
+VARIANT_MATCHING_ENABLED = os.getenv("VARIANT_MATCHING_ENABLED", "true").lower() == "true"
+
+# 조기 종료 게이트 (1차 결과만으로 처분이 정해지면 2차 AI 호출 생략)
+EARLY_EXIT_ENABLED = True
+# 1차 적중·위험 신호가 없는 댓글 중 이 길이(공백/ㅋㅎㅠㅜ 제외) 이하는 2차 필터 없이 정상 판정
+# 짧은 욕설/비하(사전에 없는 신조어 등)도 통과시키므로 기본 0 (ㅋㅋ, 이모지처럼 글자가 없는 댓글만 정상 판정)
+EARLY_EXIT_CLEAN_MAX_LENGTH = int(os.getenv("EARLY_EXIT_CLEAN_MAX_LENGTH", 0))
+
+# 콜드 스타트 설정
+# LAZY_INIT=true이면 Okt(JVM)/OpenAI 클라이언트/로컬 모델/YouTube 서비스를 서버 시작 시 만들지 않고,
+# warm-up(시작 직후 백그라운드 또는 /api/system/warmup) 또는 첫 사용 시점에 준비합니다.
+LAZY_INIT = os.getenv("LAZY_INIT", "false").lower() == "true"
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"  # LAZY_INIT일 때 시작 직후 백그라운드 warm-up
+# 컴파일된 사전(매칭 엔진) 파일, 사전 버전이 같으면 JSON 파싱/컴파일을 생략 (비워두면 사용 안 함)
+# 미리 만들기: python -m filter_api.core.dictionary_artifact
+DICTIONARY_ARTIFACT_PATH = os.getenv("DICTIONARY_ARTIFACT_PATH", "resources/cache/dictionary_matcher.bin")
+
+# 여러 프로세스로 실행
+# 1차 필터 매칭(사전 매칭/마스킹/태그 탐지)을 나눠 실행할 프로세스 수 (0이면 사용 안 함)
+# 형태소 분석(Okt)은 서버 프로세스에서만 하므로 프로세스를 늘려도 JVM은 늘지 않음
+FIRST_PASS_PROCESSES = int(os.getenv("FIRST_PASS_PROCESSES", 0))
+FIRST_PASS_PROCESS_MIN_BATCH = 64       # 프로세스 하나에 넘길 최소 댓글 수 (작은 배치는 프로세스 간 전달 비용이 더 큼)
+# uvicorn 워커 프로세스 수 (python main.py로 실행할 때, 1보다 크면 자동 재시작(reload) 없이 실행)
+# 워커마다 Okt(JVM)를 따로 띄우므로, CPU를 더 쓰려면 FIRST_PASS_PROCESSES를 먼저 늘리는 쪽이 메모리에 유리합니다.
+# 백그라운드 작업은 작업 DB에서 먼저 가져간(claim) 워커 하나가 실행합니다. (JOB_LEASE)
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 1))
+# 공유 매칭 엔진 파일: 서버 워커/1차 필터 프로세스가 모두 메모리 맵(읽기 전용)으로 열어 사전 메모리를 공유 (비워두면 프로세스마다 따로 보유)
+# 메모리 맵 매칭은 일반 매칭 엔진보다 느리므로(최장 일치 탐색 약 1.75배), 지정하지 않으면 여러 프로세스로 실행할 때만 사용
+SHARED_MATCHER_PATH = os.getenv(
+    "SHARED_MATCHER_PATH",
+    "resources/cache/dictionary_matcher.mmap" if FIRST_PASS_PROCESSES > 0 or SERVER_WORKERS > 1 else ""
+)
 
 
 # ===========================================================
@@ -34,6 +162,19 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
+# ===========================================================
+# [YouTube 댓글 수집 설정]
+# ===========================================================
+
+YOUTUBE_PREFETCH_PAGES = 2      # 분석과 동시에 미리 받아둘 댓글 페이지 수
+YOUTUBE_REPLY_WORKERS = 4       # 답글 스레드를 동시에 수집할 워커 수
+
+# 영상별 댓글 캐시 경로 (backend 기준, 예: resources/cache/youtube), 비워두면 비활성화 (기본)
+# 캐시를 켜면 관련성순 대신 최신순으로 수집하며, 재분석 시 마지막 수집 이후의 새 댓글만 받아옵니다.
+YOUTUBE_COMMENT_CACHE_DIR = os.getenv("YOUTUBE_COMMENT_CACHE_DIR", "")
+YOUTUBE_COMMENT_CACHE_MAX = 20000   # 영상별 캐시 최대 댓글 수
+
+
 # ===========================================================
 # [AI 필터링 모듈 지침]
 # ===========================================================
@@ -50,6 +191,23 @@ SPECIAL_AI_MODULES = {
     'FAMILY': '가족(부모, 자녀 등)을 비하하거나 모욕하는 패륜적 발언'
 }
 
+# [사전 카테고리 -> 특수 AI 모듈 태그]
+# 1차 필터가 시스템 사전(word_dictionary.json) 카테고리 단어를 잡으면 해당 태그의 모듈을 활성화합니다.
+# 여기 없는 카테고리(일반 욕설 등)는 기본 AI 모듈만 적용합니다.
+DICTIONARY_CATEGORY_TAGS = {
+    'death': 'AGGRESSION',
+    'motherfucker': 'AGGRESSION',
+    'belitile': 'AGGRESSION',
+    'parential': 'FAMILY',
+    'political': 'POLITICAL',
+    'racial': 'POLITICAL',
+    'sexual_w': 'SEXUAL',
+    'sexual_m': 'SEXUAL',
+    'sex': 'SEXUAL',
+    'nuts': 'SEXUAL',
+    'inappropriate': 'SEXUAL'
+}
+
 # [기본 AI 모듈]
 # 특정 태그가 없을 때 적용할 범용 분석 지침
 BASIC_AI_MODULE = [
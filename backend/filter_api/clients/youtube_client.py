@@ -1,7 +1,15 @@
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
+import json
+import queue
+import tempfile
+import threading
+import contextvars
+
+from ..metrics import track, YOUTUBE_REQUESTS
 
 # config.py를 찾기 위한 경로 설정
 current_dir = os.path.dirname(__file__)
@@ -15,10 +23,101 @@ except ImportError:
     print(f"Current Path: {sys.path}", file=sys.stderr)
     sys.exit(1)
     
+class CommentNotModified(Exception):
+    """첫 페이지가 ETag 기준으로 변경되지 않았을 때 (HTTP 304)"""
+    pass
+
+
+class CommentCache:
+    """
+    영상별 댓글 캐시 (디스크, 영상 하나당 JSON 파일 하나)
+    - etag      : 마지막 수집 시 첫 페이지(최신순)의 ETag
+    - watermark : 캐시에 있는 최상위 댓글 중 가장 최근 publishedAt
+    - include_replies : 답글까지 수집한 캐시인지 여부
+    - complete  : comments가 영상의 가장 오래된 댓글까지 빠짐없이 이어지는지 여부
+    - comments  : 최신순 댓글 목록 (답글은 부모 댓글 바로 뒤), 항상 최신 댓글부터 중간에 빠진 구간 없이 이어짐
+    """
+
+    def __init__(self, cache_dir, max_comments=20000):
+        self.cache_dir = cache_dir
+        self.max_comments = max_comments
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, video_id):
+        safe_id = "".join(ch for ch in video_id if ch.isalnum() or ch in "-_")
+        return os.path.join(self.cache_dir, f"{safe_id}.json")
+
+    def load(self, video_id):
+        try:
+            with open(self._path(video_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, video_id, etag, comments, include_replies=False, complete=False):
+        if len(comments) > self.max_comments:
+            comments = comments[:self.max_comments]
+            complete = False
+        top_level = [c['published_at'] for c in comments if not c.get('parent_id')]
+        entry = {
+            "etag": etag,
+            "include_replies": include_replies,
+            "watermark": max(top_level) if top_level else None,
+            "complete": complete,
+            "comments": comments,
+        }
+        # 쓰는 도중 읽히지 않도록 임시 파일에 쓴 뒤 교체 (같은 영상을 동시에 저장해도 임시 파일이 겹치지 않게 요청마다 다른 이름)
+        path = self._path(video_id)
+        f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir, suffix='.tmp', delete=False)
+        try:
+            with f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(f.name, path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+
 class YouTubeClient:
     def __init__(self):
         print("[System] YouTube Client 초기화 중...")
-        self.youtube = self._build_service()
+        # 서비스 객체는 LAZY_INIT이면 warm_up() 또는 첫 사용 시점에 생성
+        self._youtube = None
+        self._youtube_ready = False
+        self._init_lock = threading.Lock()
+
+        # googleapiclient의 http 객체는 스레드 간에 공유할 수 없으므로 스레드별로 생성
+        self._local = threading.local()
+        self.prefetch_pages = config.YOUTUBE_PREFETCH_PAGES
+        self._reply_executor = ThreadPoolExecutor(max_workers=config.YOUTUBE_REPLY_WORKERS, thread_name_prefix="yt-replies")
+
+        self.cache = None
+        if config.YOUTUBE_COMMENT_CACHE_DIR:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            cache_dir = os.path.join(base_dir, config.YOUTUBE_COMMENT_CACHE_DIR)
+            self.cache = CommentCache(cache_dir, max_comments=config.YOUTUBE_COMMENT_CACHE_MAX)
+
+        if not config.LAZY_INIT:
+            self.warm_up()
+
+    def warm_up(self):
+        """YouTube API 서비스 객체 생성"""
+        with self._init_lock:
+            if not self._youtube_ready:
+                self._youtube = self._build_service()
+                self._youtube_ready = True
+
+    @property
+    def youtube(self):
+        """YouTube API 서비스 (API 키가 없거나 연결 실패 시 None)"""
+        if not self._youtube_ready:
+            self.warm_up()
+        return self._youtube
+
+    @youtube.setter
+    def youtube(self, service):
+        self._youtube = service
+        self._youtube_ready = True
 
     def _build_service(self):
         """(내부 메서드) YouTube API 서비스 연결"""
@@ -29,7 +128,9 @@ class YouTubeClient:
             return None
         
         try:
-            service = build('youtube', 'v3', developerKey=api_key)
+            from googleapiclient.discovery import build
+            # 패키지에 포함된 discovery 문서를 사용 (부팅 시 네트워크 요청/캐시 파일 조회 없음)
+            service = build('youtube', 'v3', developerKey=api_key, static_discovery=True, cache_discovery=False)
             print("[System] YouTube 서비스 연결 성공")
             return service
         except Exception as e:
@@ -46,7 +147,7 @@ class YouTubeClient:
                 part="snippet,topicDetails",
                 id=video_id
             )
-            response = request.execute()
+            response = self._execute(request)
 
             if not response.get('items'):
                 print(f"Error: 비디오 ID {video_id}를 찾을 수 없습니다.", file=sys.stderr)
@@ -75,47 +176,275 @@ class YouTubeClient:
             print(f"Unknown Error: {e}", file=sys.stderr)
             return None
 
-    def get_comments(self, video_id, max_pages=1):
-        """댓글 데이터 수집"""
-        if not self.youtube:
-            return []
+    def _execute(self, request):
+        """(내부 메서드) 현재 스레드 전용 http 객체로 요청 실행 (호출 수/소요 시간 기록)"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = build_http()
+            self._local.http = http
 
-        comments_list = []
+        method = getattr(request, 'methodId', None) or 'unknown'
+        status = "200"
         try:
-            request = self.youtube.commentThreads().list(
+            with track("youtube_api"):
+                return request.execute(http=http)
+        except HttpError as e:
+            status = str(getattr(e.resp, 'status', 'error'))
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            YOUTUBE_REQUESTS.inc(method=method, status=status)
+
+    def _parse_comment(self, item):
+        """(내부 메서드) commentThreads 항목 -> 댓글 dict"""
+        snippet = item['snippet']['topLevelComment']['snippet']
+        return {
+            "comment_id": item['id'],
+            "parent_id": None,
+            "text_original": snippet['textOriginal'],
+            "author_display_name": snippet.get('authorDisplayName'),
+            "published_at": snippet['publishedAt'],
+            "updated_at": snippet.get('updatedAt', snippet['publishedAt']),
+        }
+
+    def _parse_reply(self, item, parent_id):
+        """(내부 메서드) comments 항목(답글) -> 댓글 dict"""
+        snippet = item['snippet']
+        return {
+            "comment_id": item['id'],
+            "parent_id": parent_id,
+            "text_original": snippet['textOriginal'],
+            "author_display_name": snippet.get('authorDisplayName'),
+            "published_at": snippet['publishedAt'],
+            "updated_at": snippet.get('updatedAt', snippet['publishedAt']),
+        }
+
+    def _fetch_replies(self, parent_id):
+        """(내부 메서드) 한 댓글 스레드의 답글 전체 수집"""
+        replies = []
+        try:
+            request = self.youtube.comments().list(
                 part="snippet",
-                videoId=video_id,
+                parentId=parent_id,
                 maxResults=100,
-                order="relevance"
+                textFormat="plainText"
             )
-            
-            page_count = 0
-            while request and page_count < max_pages:
-                response = request.execute()
-                
-                for item in response['items']:
-                    snippet = item['snippet']['topLevelComment']['snippet']
-                    comments_list.append({
-                        "comment_id": item['id'],
-                        "text_original": snippet['textOriginal'],
-                        "author_display_name": snippet.get('authorDisplayName'),
-                        "published_at": snippet['publishedAt'],
-                    })
-                
-                if 'nextPageToken' in response:
-                    request = self.youtube.commentThreads().list_next(
-                        previous_request=request, 
-                        previous_response=response
-                    )
-                    page_count += 1
-                else:
+            while request:
+                response = self._execute(request)
+                replies.extend(self._parse_reply(item, parent_id) for item in response.get('items', []))
+                request = self.youtube.comments().list_next(request, response)
+        except HttpError as e:
+            print(f"YouTube API Error (replies): {e}", file=sys.stderr)
+        return replies
+
+    def _expand_replies(self, items):
+        """
+        (내부 메서드) 한 페이지의 스레드 항목 -> 댓글 리스트 (답글은 부모 바로 뒤)
+        - 응답에 포함된 답글(최대 5개)로 부족한 스레드만 답글 API를 추가 호출하며, 이 호출들은 동시에 진행합니다.
+        """
+        threads = []
+        for item in items:
+            inline = item.get('replies', {}).get('comments', [])
+            total = item['snippet'].get('totalReplyCount', 0)
+            if total > len(inline):
+                threads.append((item, self._reply_executor.submit(
+                    contextvars.copy_context().run, self._fetch_replies, item['id']
+                )))
+            else:
+                threads.append((item, [self._parse_reply(r, item['id']) for r in inline]))
+
+        comments = []
+        for item, replies in threads:
+            comments.append(self._parse_comment(item))
+            if not isinstance(replies, list):
+                replies = replies.result()
+            # 답글은 오래된 순으로 정렬
+            comments.extend(sorted(replies, key=lambda c: c['published_at']))
+        return comments
+
+    def _iter_thread_pages(self, video_id, max_pages, order, include_replies, etag=None):
+        """
+        (내부 메서드) commentThreads를 페이지 단위로 순차 수집
+        - etag가 주어지고 첫 페이지가 바뀌지 않았다면 CommentNotModified 발생
+        """
+        request = self.youtube.commentThreads().list(
+            part="snippet,replies" if include_replies else "snippet",
+            videoId=video_id,
+            maxResults=100,
+            order=order
+        )
+        if etag:
+            request.headers['If-None-Match'] = etag
+
+        page_count = 0
+        while request and page_count < max_pages:
+            try:
+                response = self._execute(request)
+            except HttpError as e:
+                if page_count == 0 and etag and e.resp.status == 304:
+                    raise CommentNotModified()
+                raise
+
+            items = response.get('items', [])
+            if include_replies:
+                page = self._expand_replies(items)
+            else:
+                page = [self._parse_comment(item) for item in items]
+            yield page, response
+
+            if 'nextPageToken' in response:
+                request = self.youtube.commentThreads().list_next(
+                    previous_request=request, 
+                    previous_response=response
+                )
+                page_count += 1
+            else:
+                break
+
+    def _iter_cached_pages(self, video_id, max_pages, include_replies):
+        """
+        (내부 메서드) 캐시를 이용한 증분 수집 (최신순)
+        - 첫 페이지 ETag가 같으면 API를 더 호출하지 않고 캐시를 그대로 사용합니다.
+        - 캐시의 watermark보다 새로운 댓글만 받아오고, 나머지는 캐시에서 채웁니다.
+        - 새 댓글이 max_pages 페이지를 넘게 쌓여 캐시까지 닿지 못하면, 받은 댓글과 캐시 사이가 비므로(gap)
+          이전 캐시는 버리고 받은 댓글만 저장합니다. (빈 구간을 캐시로 채워 영구히 빠뜨리지 않도록)
+        - 캐시가 요청한 수보다 적고 가장 오래된 댓글까지 닿지 않았으면(complete가 아니면) 처음부터 다시 수집합니다.
+        """
+        limit = max_pages * 100  # 반환할 최대 스레드(최상위 댓글) 수
+        entry = self.cache.load(video_id) or {}
+        if entry and entry.get('include_replies', False) != include_replies:
+            entry = {}  # 답글 포함 여부가 다르면 캐시를 새로 만듦
+        cached = entry.get('comments', [])
+        if entry and not entry.get('complete') and sum(1 for c in cached if not c['parent_id']) < limit:
+            entry, cached = {}, []  # 캐시만으로는 요청한 수를 채울 수 없음
+        watermark = entry.get('watermark')
+
+        fresh = []
+        etag = entry.get('etag')
+        first_page = True
+        reached_cache = False
+        more_pages = False  # 마지막으로 받은 페이지 뒤에 페이지가 더 있는지
+
+        try:
+            for page, response in self._iter_thread_pages(video_id, max_pages, "time", include_replies, etag=etag):
+                if first_page:
+                    etag = response.get('etag', etag)
+                    first_page = False
+                more_pages = 'nextPageToken' in response
+
+                new_items = []
+                for comment in page:
+                    top_level = comment if not comment['parent_id'] else None
+                    if top_level and watermark and comment['published_at'] <= watermark:
+                        reached_cache = True
+                        break
+                    new_items.append(comment)
+                fresh.extend(new_items)
+                if new_items:
+                    yield new_items
+                if reached_cache:
                     break
+        except CommentNotModified:
+            print(f"[System] 댓글 변경 없음 (ETag 일치): {video_id}")
+            reached_cache = True
 
-            return comments_list
+        complete = entry.get('complete', False)
+        if reached_cache:
+            # 새로 받은 댓글 + 캐시에 있던 이전 댓글 (중복 제거)
+            fresh_ids = {c['comment_id'] for c in fresh}
+            merged = fresh + [c for c in cached if c['comment_id'] not in fresh_ids]
+        else:
+            if cached and more_pages:
+                print(f"  [Warning] 새 댓글이 {max_pages}페이지를 넘어 이전 캐시와 이어지지 않아 캐시를 새로 만듭니다: {video_id}")
+            # 캐시까지 닿지 못함: 마지막 페이지까지 받았으면 전체, 아니면 받은 부분만 (이전 캐시와의 사이는 알 수 없음)
+            merged = fresh
+            complete = not more_pages
 
-        except HttpError as e:
-            print(f"YouTube API Error: {e}", file=sys.stderr)
-            return []
-        except Exception as e:
-            print(f"Unknown Error: {e}", file=sys.stderr)
-            return []
\ No newline at end of file
+        threads = sum(1 for c in fresh if not c['parent_id'])
+        page = []
+        for comment in merged[len(fresh):]:
+            if not comment['parent_id']:
+                if threads >= limit:
+                    break
+                threads += 1
+                if len(page) >= 100:
+                    yield page
+                    page = []
+            page.append(comment)
+        if page:
+            yield page
+
+        if fresh or not entry or etag != entry.get('etag') or complete != entry.get('complete', False):
+            self.cache.save(video_id, etag, merged, include_replies=include_replies, complete=complete)
+
+    def _prefetch(self, pages):
+        """
+        (내부 메서드) 페이지 제너레이터를 백그라운드 스레드에서 미리 수집
+        - 최대 prefetch_pages 페이지까지 앞서 받아두므로, 호출 측이 현재 페이지를 분석하는 동안 다음 페이지를 받아옵니다.
+        """
+        buffer = queue.Queue(maxsize=max(1, self.prefetch_pages))
+        done = object()
+        stop = threading.Event()
+
+        def worker():
+            try:
+                for page in pages:
+                    while not stop.is_set():
+                        try:
+                            buffer.put(page, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except HttpError as e:
+                print(f"YouTube API Error: {e}", file=sys.stderr)
+            except Exception as e:
+                print(f"Unknown Error: {e}", file=sys.stderr)
+            finally:
+                # 호출 측이 먼저 종료한 경우 대기열이 가득 차 있을 수 있으므로 막히지 않게 넣음
+                while not stop.is_set():
+                    try:
+                        buffer.put(done, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+        # 요청별 소요 시간 기록이 이어지도록 호출 측 컨텍스트에서 실행
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(worker,), name="yt-prefetch", daemon=True).start()
+        try:
+            while True:
+                page = buffer.get()
+                if page is done:
+                    break
+                yield page
+        finally:
+            stop.set()
+
+    def iter_comment_pages(self, video_id, max_pages=1, include_replies=False):
+        """
+        댓글을 페이지 단위로 수집하는 제너레이터
+        - 다음 페이지는 백그라운드에서 미리 받아옵니다.
+        - include_replies=True이면 답글도 부모 댓글 바로 뒤에 포함됩니다.
+        - 댓글 캐시가 켜져 있으면 최신순으로 새 댓글만 받아오고 나머지는 캐시에서 채웁니다.
+        - 오류가 나면 그때까지 받은 페이지만 반환하고 종료합니다.
+        """
+        if not self.youtube:
+            return
+
+        if self.cache is not None:
+            pages = self._iter_cached_pages(video_id, max_pages, include_replies)
+        else:
+            pages = (page for page, _ in self._iter_thread_pages(video_id, max_pages, "relevance", include_replies))
+
+        yield from self._prefetch(pages)
+
+    def get_comments(self, video_id, max_pages=1, include_replies=False):
+        """댓글 데이터 수집"""
+        comments_list = []
+        for page in self.iter_comment_pages(video_id, max_pages=max_pages, include_replies=include_replies):
+            comments_list.extend(page)
+        return comments_list
@@ -1,4 +1,5 @@
 from .first_pass_filter import FirstPassFilter
 from .risk_scorer import RiskScorer
 from .second_pass_filter import SecondPassFilter
-from .policy_manager import PolicyManager
\ No newline at end of file
+from .policy_manager import PolicyManager
+from .pipeline import ModerationPipeline
\ No newline at end of file
@@ -0,0 +1,118 @@
+import itertools
+from collections import deque
+
+
+class AhoCorasickMatcher:
+    """
+    다중 패턴 매칭 엔진 (Aho-Corasick 오토마톤)
+    - 사전 전체를 한 번만 컴파일해 두고, 텍스트는 한 번의 선형 스캔으로 모든 적중을 찾습니다.
+    - 각 패턴에는 (kind, priority) 형태의 payload를 붙여 화이트/블랙/시스템 사전을 구분합니다.
+    """
+
+    def __init__(self, patterns: dict):
+        # patterns: {패턴 문자열: (kind, priority)} / priority는 작을수록 우선
+        self._goto = [{}]       # 노드별 전이 테이블
+        self._fail = [0]        # 실패 링크
+        self._output = [None]   # 노드에서 끝나는 패턴 (length, payload)
+        self._dict_link = [0]   # 출력이 있는 가장 가까운 실패 노드 (출력 링크)
+
+        for pattern, payload in patterns.items():
+            if pattern:
+                self._insert(pattern, payload)
+        self._build_links()
+
+    def __len__(self):
+        return sum(1 for out in self._output if out is not None)
+
+    def to_state(self) -> tuple:
+        """컴파일된 오토마톤 (직렬화용, 리스트/딕셔너리/튜플만으로 구성)"""
+        return (self._goto, self._fail, self._output, self._dict_link)
+
+    @classmethod
+    def from_state(cls, state: tuple):
+        """to_state() 결과로 다시 컴파일하지 않고 매칭 엔진을 복원합니다."""
+        matcher = cls.__new__(cls)
+        matcher._goto, matcher._fail, matcher._output, matcher._dict_link = state
+        return matcher
+
+    def _insert(self, pattern, payload):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+            node = nxt
+
+        # 같은 패턴이 여러 사전에 있으면 우선순위가 높은 쪽을 유지
+        current = self._output[node]
+        if current is None or payload[1] < current[1][1]:
+            self._output[node] = (len(pattern), payload)
+
+    def _build_links(self):
+        """BFS로 실패 링크와 출력 링크를 계산합니다."""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+
+                link = self._fail[nxt]
+                self._dict_link[nxt] = link if self._output[link] is not None else self._dict_link[link]
+
+    def iter_matches(self, text: str):
+        """텍스트에서 모든 적중을 (start, end, payload) 형태로 반환합니다. (겹침 포함)"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        dict_link = self._dict_link
+
+        node = 0
+        for idx, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            out_node = node if output[node] is not None else dict_link[node]
+            while out_node:
+                length, payload = output[out_node]
+                yield idx + 1 - length, idx + 1, payload
+                out_node = dict_link[out_node]
+
+    def find_longest(self, text: str, accept=None, overlay=None) -> list:
+        """
+        겹치지 않는 적중만 골라 반환합니다.
+        - 왼쪽에서 먼저 시작하는 적중 우선, 같은 위치라면 더 긴 적중 우선 (Longest Match)
+        - 시작/길이가 같다면 payload의 priority가 높은 쪽 우선 (화이트리스트 > 블랙리스트 > 시스템)
+        - accept(start, end, payload)가 주어지면 통과한 적중만 후보로 사용합니다. (예: 형태소 경계 검사)
+        - overlay(다른 매칭 엔진)가 주어지면 두 엔진의 적중을 합쳐서 고릅니다. (예: 채널별 사전)
+        """
+        matches = self.iter_matches(text)
+        if overlay is not None:
+            matches = itertools.chain(matches, overlay.iter_matches(text))
+        if accept is not None:
+            matches = (m for m in matches if accept(*m))
+
+        candidates = sorted(matches, key=lambda m: (m[0], m[0] - m[1], m[2][1]))
+
+        selected = []
+        cursor = 0
+        for start, end, payload in candidates:
+            if start < cursor:
+                continue
+            selected.append((start, end, payload))
+            cursor = end
+        return selected
@@ -0,0 +1,81 @@
+"""
+1차 필터 사전 컴파일 결과(사전 데이터 + 매칭 엔진 오토마톤) 저장/로드
+- JSON 파싱과 오토마톤 빌드 없이 marshal 한 번으로 바로 복원합니다.
+- 사전 버전(사전 파일 내용 해시), 형식 버전, 파이썬 버전이 모두 같을 때만 사용하고 아니면 None을 반환합니다.
+- 미리 만들어 두기 (backend 디렉터리에서): python -m filter_api.core.dictionary_artifact
+"""
+import os
+import sys
+import marshal
+
+# 저장하는 state 구조나 매칭 payload 형식이 바뀌면 올려야 합니다.
+ARTIFACT_FORMAT = 2
+MAGIC = b"NERVDICT"
+
+
+def _python_tag() -> str:
+    # marshal 형식은 파이썬 버전마다 다를 수 있음
+    return f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-{marshal.version}"
+
+
+def load(path: str, dictionary_version: str):
+    """저장된 state (없거나 버전이 다르면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if not data.startswith(MAGIC):
+        return None
+    try:
+        entry = marshal.loads(data[len(MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    if (not isinstance(entry, dict)
+            or entry.get("format") != ARTIFACT_FORMAT
+            or entry.get("python") != _python_tag()
+            or entry.get("version") != dictionary_version):
+        return None
+    return entry.get("state")
+
+
+def save(path: str, dictionary_version: str, state: dict) -> bool:
+    """state 저장 (여러 워커가 동시에 써도 깨지지 않도록 임시 파일에 쓴 뒤 교체)"""
+    entry = {
+        "format": ARTIFACT_FORMAT,
+        "python": _python_tag(),
+        "version": dictionary_version,
+        "state": state,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(marshal.dumps(entry))
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"  [Warning] 컴파일된 사전 저장 실패: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+if __name__ == "__main__":
+    from .first_pass_filter import FirstPassFilter
+    from .tokenizer import SurfaceTokenizer
+
+    # 사전만 필요하므로 형태소 분석기(JVM)는 띄우지 않음
+    first_filter = FirstPassFilter(tokenizer=SurfaceTokenizer())
+    if not first_filter.artifact_path:
+        print("[System] DICTIONARY_ARTIFACT_PATH가 비어 있어 컴파일된 사전을 만들지 않습니다.")
+        sys.exit(1)
+    if load(first_filter.artifact_path, first_filter.dictionary_version) is None:
+        print("[System] 컴파일된 사전 생성 실패")
+        sys.exit(1)
+    print(f"[System] 컴파일된 사전 준비 완료: {first_filter.artifact_path} (버전 {first_filter.dictionary_version})")
@@ -0,0 +1,48 @@
+import re
+
+
+class EarlyExitGate:
+    """
+    조기 종료 게이트
+    - 1차 필터 결과만으로 최종 처분이 결정되는 댓글은 2차 필터(GPT)를 건너뛰게 합니다.
+    - 판정 경로(path)는 결과의 'pipeline_path'에 기록됩니다.
+        FULL             : 2차 필터까지 전체 실행
+        EARLY_EXIT_BLOCK : 1차 점수만으로 이미 임계값 이상 (처분 확정)
+        EARLY_EXIT_CLEAN : 1차 적중이 없고 위험 신호가 없는 짧은 댓글 (clean_max_length 이하, 기본 0은 글자가 없는 댓글만)
+    """
+
+    FULL = "FULL"
+    BLOCK = "EARLY_EXIT_BLOCK"
+    CLEAN = "EARLY_EXIT_CLEAN"
+
+    # 짧은 댓글이라도 2차 검사가 필요한 신호: 숫자(개인정보), 링크 흔적(스팸)
+    # 판정 캐시 키와 같은 기준을 쓰도록 원문이 아닌 정규화 텍스트에서 검사합니다.
+    RISK_SIGNAL = re.compile(r'[0-9]|http|www')
+    # 길이에서 빼는 감정 표현 자모 (ㅋㅋ, ㅎㅎ, ㅠㅠ, ㅜㅜ)
+    EXPRESSIVE_JAMO = re.compile(r'[ㅋㅎㅠㅜ\s]')
+
+    def __init__(self, risk_scorer, policy_manager, enabled: bool = True, clean_max_length: int = 0):
+        self.risk_scorer = risk_scorer
+        self.policy_manager = policy_manager
+        self.enabled = enabled
+        self.clean_max_length = clean_max_length
+
+    def decide(self, first_pass_result: dict, level: int = None) -> str:
+        """1차 필터 결과를 보고 판정 경로를 반환합니다. (level: 채널별 보안 레벨)"""
+        if not self.enabled:
+            return self.FULL
+
+        if first_pass_result.get('detected_words'):
+            # 1차 점수만으로 숨김/삭제가 결정되면 2차 적발이 추가되어도 처분은 같음
+            # (마스킹은 적발 단어 전체가 필요하므로 제외)
+            score = self.risk_scorer.execute(first_pass_result)
+            action = self.policy_manager.decide_action(score, first_pass_result, level)['action']
+            if action not in ("PASS", "MASKING"):
+                return self.BLOCK
+            return self.FULL
+
+        compact = self.EXPRESSIVE_JAMO.sub('', first_pass_result.get('text_for_filtering', ''))
+        if len(compact) <= self.clean_max_length and not self.RISK_SIGNAL.search(compact):
+            return self.CLEAN
+
+        return self.FULL
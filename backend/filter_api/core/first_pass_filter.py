@@ -1,91 +1,632 @@
 import os
+import sys
 import json
 import re
-from konlpy.tag import Okt
+import time
+import hashlib
+import tempfile
+import threading
+
+from . import spans as span_utils
+from . import dictionary_artifact
+from . import shared_matcher
+from . import variants
+from .aho_corasick import AhoCorasickMatcher
+from .tokenizer import create_tokenizer, TokenizerBusyError
+from ..metrics import timed
+
+# config.py를 찾기 위한 경로 설정
+current_dir = os.path.dirname(__file__)
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.append(backend_dir)
+
+try:
+    import config
+except ImportError:
+    print("Error: config.py를 찾을 수 없습니다.", file=sys.stderr)
+    print(f"Current Path: {sys.path}", file=sys.stderr)
+    sys.exit(1)
+
+class DictionarySnapshot:
+    """
+    한 시점의 사전 데이터 + 매칭 엔진 묶음 (만든 뒤에는 변경하지 않음)
+    - 분석 한 번(또는 배치 한 번)은 시작할 때 잡은 스냅샷 하나만 사용합니다.
+    - variant_matcher: 회피 표기 탐지용 사전 표준형 색인 (비활성화 시 None)
+    - shared_path: 매칭 엔진이 공유 파일(메모리 맵)에 있으면 그 경로 (1차 필터 프로세스가 같은 파일을 엶)
+    """
+    __slots__ = ('version', 'user_whitelist', 'user_blacklist', 'system_dictionary', 'system_whitelist',
+                 'matcher', 'white_matcher', 'variant_matcher', 'shared_path')
+
+    def __init__(self, version, user_whitelist, user_blacklist, system_dictionary, system_whitelist,
+                 matcher, white_matcher, variant_matcher=None, shared_path=None):
+        self.version = version
+        self.user_whitelist = user_whitelist
+        self.user_blacklist = user_blacklist
+        self.system_dictionary = system_dictionary
+        self.system_whitelist = system_whitelist
+        self.matcher = matcher
+        self.white_matcher = white_matcher
+        self.variant_matcher = variant_matcher
+        self.shared_path = shared_path
+
 
 class FirstPassFilter:
-    def __init__(self):
+    # 정규화 시 제거할 문자 (한글 음절/영문/숫자/공백 외)
+    NON_TEXT_PATTERN = span_utils.NON_TEXT_PATTERN
+
+    # 사전 적중 외에 원문에서 직접 찾는 2차 검사 태그 신호
+    # MODIFIED: 자음/모음 분리(ㅋ,ㅎ,ㅜ,ㅠ 등 일상적인 표현 제외) 또는 글자 사이 특수문자 삽입
+    TAG_SIGNALS = {
+        'MODIFIED': re.compile(r'[ㄱ-ㅊㅌㅍㅏ-ㅛ]|[가-힣][^가-힣a-zA-Z0-9\s]+[가-힣]'),
+        'PRIVACY': re.compile(r'[0-9][0-9\s-]{6,}[0-9]|[a-z0-9._-]+@[a-z0-9-]+\.'),
+        'SPAM': re.compile(r'https?://|www\.|\.(?:com|net|kr|ly)\b|open\.kakao'),
+    }
+    # 적중 단어에 한글 음절 외 문자가 섞여 있으면 변형 욕설 (예: 씨8, t발)
+    MODIFIED_WORD_PATTERN = re.compile(r'[^가-힣\s]')
+
+    def __init__(self, tokenizer=None):
         print("[System] 1차 필터 리소스 로딩 시작...")
         
-        # 1. 형태소 분석기 초기화 (메모리 로드)
-        self.okt = Okt()
+        # 1. 형태소 분석기 초기화 (백엔드는 config.TOKENIZER_BACKEND로 선택)
+        self.tokenizer = tokenizer or create_tokenizer(
+            config.TOKENIZER_BACKEND,
+            pool_size=config.TOKENIZER_POOL_SIZE,
+            queue_limit=config.TOKENIZER_QUEUE_LIMIT,
+            cache_size=config.TOKENIZER_CACHE_SIZE,
+            batch_wait=config.TOKENIZER_BATCH_WAIT,
+            lazy=config.LAZY_INIT
+        )
         
         # 2. 경로 설정
         self.base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.dict_dir = os.path.join(self.base_dir, 'resources', 'dictionaries')
         
-        # 3. 사전 데이터 로드 (메모리에 캐싱)
-        self.user_whitelist = set()
-        self.user_blacklist = set()
-        self.system_dictionary = set()
+        self.user_dict_path = os.path.join(self.dict_dir, 'user_dictionary.json')
+        self.system_dict_path = os.path.join(self.dict_dir, 'word_dictionary.json')
+
+        # 컴파일된 사전 파일 (사전 버전이 같으면 JSON 파싱/오토마톤 빌드 생략)
+        self.artifact_path = None
+        if config.DICTIONARY_ARTIFACT_PATH:
+            self.artifact_path = os.path.join(self.base_dir, config.DICTIONARY_ARTIFACT_PATH)
+
+        # 공유 매칭 엔진 파일 (여러 프로세스가 메모리 맵으로 함께 사용)
+        self.shared_matcher_path = None
+        if config.SHARED_MATCHER_PATH:
+            self.shared_matcher_path = os.path.join(self.base_dir, config.SHARED_MATCHER_PATH)
+        # 1차 필터 프로세스 풀 (FirstPassProcessPool, 서버에서 연결)
+        self.process_pool = None
         
-        self._load_user_dictionary(os.path.join(self.dict_dir, 'user_dictionary.json'))
-        self._load_system_dictionary(os.path.join(self.dict_dir, 'word_dictionary.json'))
+        # 3. 사전 데이터 로드 + 매칭 엔진 컴파일
+        # (다시 로드는 한 번에 하나만, 교체는 self.snapshot 참조를 바꾸는 것으로 끝남)
+        self._reload_lock = threading.Lock()
+        self.reload_info = {"reloads": 0, "last_reload_at": None, "last_duration_ms": None, "last_error": None}
+        self._dict_mtimes = self._dictionary_mtimes()
+        self.snapshot = self._load_snapshot(strict=False)
+        self._last_check = time.monotonic()
+
+        self._watch_stop = None
         
         print("[System] 1차 필터 준비 완료.")
 
+    @property
+    def dictionary_version(self) -> str:
+        """현재 스냅샷의 사전 버전 (두 사전 파일 내용의 해시)"""
+        return self.snapshot.version
+
+    # -------------------------------------------------
+    # 사전 스냅샷 생성 / 교체
+    # -------------------------------------------------
+
+    def _load_snapshot(self, strict: bool = True) -> DictionarySnapshot:
+        """
+        내부 메서드: 사전 파일로 새 스냅샷 생성 (현재 스냅샷은 건드리지 않음)
+        - 사전 버전이 같은 컴파일된 사전 파일이 있으면 그대로 복원합니다.
+        - strict=True이면 사전 파일을 읽지 못했을 때 빈 사전 대신 예외를 발생시킵니다. (다시 로드 시 기존 사전 유지)
+        """
+        version = self._dictionary_hash()
+
+        state = dictionary_artifact.load(self.artifact_path, version) if self.artifact_path else None
+        if state is not None:
+            snapshot = self._restore_state(version, state)
+            print(f"  ㄴ 컴파일된 사전 로드: {len(snapshot.system_dictionary)}개 단어, 매칭 엔진 {len(snapshot.matcher)}개 패턴")
+        else:
+            snapshot = self._compile_snapshot(version, strict)
+            if self.artifact_path:
+                dictionary_artifact.save(self.artifact_path, version, self._dump_state(snapshot))
+
+        print(f"  ㄴ 사전 버전: {version}")
+        return self._share_snapshot(snapshot)
+
+    def _share_snapshot(self, snapshot: DictionarySnapshot) -> DictionarySnapshot:
+        """
+        내부 메서드: 매칭 엔진을 공유 파일(메모리 맵) 버전으로 교체
+        - 같은 사전 버전 파일이 이미 있으면(다른 워커가 만든 경우 포함) 그대로 열고, 없으면 만든 뒤 엽니다.
+        - 파일을 쓰거나 열지 못하면 프로세스 안의 매칭 엔진을 그대로 사용합니다.
+        """
+        path = self.shared_matcher_path
+        if not path:
+            return snapshot
+        matchers = {"matcher": snapshot.matcher, "white_matcher": snapshot.white_matcher}
+        if snapshot.variant_matcher is not None:
+            matchers["variant_matcher"] = snapshot.variant_matcher
+        loaded = shared_matcher.load(path, snapshot.version)
+        if loaded is not None and set(loaded[1]) != set(matchers):
+            loaded = None  # 회피 표기 탐지 설정이 다른 서버가 만든 파일
+        if loaded is None:
+            if shared_matcher.save(path, snapshot.version, matchers):
+                loaded = shared_matcher.load(path, snapshot.version)
+        if loaded is None:
+            print("  [Warning] 공유 매칭 엔진을 열지 못해 프로세스 안의 매칭 엔진을 사용합니다.")
+            return snapshot
+
+        _, matchers = loaded
+        snapshot.matcher, snapshot.white_matcher = matchers["matcher"], matchers["white_matcher"]
+        snapshot.variant_matcher = matchers.get("variant_matcher")
+        snapshot.shared_path = path
+        print(f"  ㄴ 공유 매칭 엔진 연결: {path}")
+        return snapshot
+
+    def _compile_snapshot(self, version: str, strict: bool) -> DictionarySnapshot:
+        """내부 메서드: JSON 사전을 파싱하고 매칭 엔진을 컴파일"""
+        user = self._load_user_dictionary(self.user_dict_path)
+        system = self._load_system_dictionary(self.system_dict_path)
+        if strict and (user is None or system is None):
+            raise ValueError("사전 파일을 읽지 못했습니다.")
+
+        user_whitelist, user_blacklist = user or (set(), set())
+        system_dictionary, system_whitelist = system or ({}, {})
+
+        # 매칭 엔진 컴파일 (사전 전체를 하나의 오토마톤으로)
+        matcher = self._build_matcher(system_dictionary, user_blacklist, user_whitelist)
+        white_matcher = AhoCorasickMatcher({
+            phrase: ('SYSTEM_WHITELIST', 0, frozenset(categories))
+            for phrase, categories in system_whitelist.items()
+        })
+        return DictionarySnapshot(
+            version, user_whitelist, user_blacklist, system_dictionary, system_whitelist, matcher, white_matcher,
+            self._build_variant_matcher(system_dictionary, user_blacklist, user_whitelist)
+        )
+
+    def _dump_state(self, snapshot: DictionarySnapshot) -> dict:
+        """내부 메서드: 컴파일된 사전 파일로 저장할 state"""
+        return {
+            "user_whitelist": snapshot.user_whitelist,
+            "user_blacklist": snapshot.user_blacklist,
+            "system_dictionary": snapshot.system_dictionary,
+            "system_whitelist": snapshot.system_whitelist,
+            "matcher": snapshot.matcher.to_state(),
+            "white_matcher": snapshot.white_matcher.to_state(),
+            "variant_matcher": snapshot.variant_matcher.to_state() if snapshot.variant_matcher is not None else None,
+        }
+
+    def _restore_state(self, version: str, state: dict) -> DictionarySnapshot:
+        """내부 메서드: 컴파일된 사전 파일에서 사전 데이터와 매칭 엔진 복원"""
+        # 파일을 만들 때와 회피 표기 탐지 설정이 다르면 표준형 색인만 다시 만듦
+        variant_matcher = None
+        if config.VARIANT_MATCHING_ENABLED:
+            if state.get("variant_matcher") is not None:
+                variant_matcher = AhoCorasickMatcher.from_state(state["variant_matcher"])
+            else:
+                variant_matcher = self._build_variant_matcher(
+                    state["system_dictionary"], state["user_blacklist"], state["user_whitelist"]
+                )
+        return DictionarySnapshot(
+            version,
+            state["user_whitelist"],
+            state["user_blacklist"],
+            state["system_dictionary"],
+            state["system_whitelist"],
+            AhoCorasickMatcher.from_state(state["matcher"]),
+            AhoCorasickMatcher.from_state(state["white_matcher"]),
+            variant_matcher,
+        )
+
+    def _dictionary_mtimes(self):
+        mtimes = []
+        for path in (self.user_dict_path, self.system_dict_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return mtimes
+
+    def _dictionary_hash(self) -> str:
+        digest = hashlib.sha256()
+        for path in (self.user_dict_path, self.system_dict_path):
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b'')
+            digest.update(b'\x00')
+        return digest.hexdigest()[:16]
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        사전 파일을 다시 읽어 새 스냅샷을 만든 뒤 참조만 교체합니다. (copy-on-write)
+        - 진행 중인 요청은 시작할 때 잡은 이전 스냅샷을 끝까지 사용하고, 마지막 요청이 끝나면 이전 스냅샷은 해제됩니다.
+        - 새 스냅샷을 만드는 동안에도 요청은 이전 스냅샷으로 계속 처리됩니다.
+        - force=False이면 파일 수정 시각이 바뀐 경우에만 읽습니다.
+        - 사전 버전이 바뀌었으면 True를 반환합니다. (읽기 실패 시 기존 사전 유지)
+        """
+        with self._reload_lock:
+            mtimes = self._dictionary_mtimes()
+            if not force and mtimes == self._dict_mtimes:
+                return False
+
+            # 읽기에 실패해도 같은 파일을 반복해서 읽지 않도록 먼저 기록 (파일이 다시 수정되면 재시도)
+            self._dict_mtimes = mtimes
+            started = time.perf_counter()
+            try:
+                snapshot = self._load_snapshot(strict=True)
+            except Exception as e:
+                self.reload_info["last_error"] = str(e)
+                print(f"  [Error] 사전 다시 로드 실패 (기존 사전 유지): {e}")
+                return False
+
+            previous = self.snapshot.version
+            if snapshot.version == previous:
+                return False
+
+            self.snapshot = snapshot
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.reload_info.update({
+                "reloads": self.reload_info["reloads"] + 1,
+                "last_reload_at": time.time(),
+                "last_duration_ms": round(elapsed_ms, 1),
+                "last_error": None,
+            })
+            print(f"[System] 사전 교체 완료: {previous} -> {snapshot.version} ({elapsed_ms:.1f}ms)")
+            return True
+
+    def reload_if_changed(self, interval: float = 0.0) -> bool:
+        """
+        사전 파일이 수정되었으면 다시 로드합니다.
+        - interval 초 이내에 이미 확인했다면 파일 상태를 다시 보지 않습니다.
+        - 다시 로드했으면 True를 반환합니다.
+        """
+        now = time.monotonic()
+        if now - self._last_check < interval:
+            return False
+        self._last_check = now
+
+        if self._dictionary_mtimes() == self._dict_mtimes:
+            return False
+
+        print("[System] 사전 파일 변경 감지 -> 1차 필터 사전 다시 로드")
+        return self.reload()
+
+    def start_watcher(self, interval: float):
+        """사전 파일 감시 스레드 시작 (interval 초마다 수정 여부 확인, 변경 시 백그라운드에서 다시 로드)"""
+        if self._watch_stop is not None:
+            return
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+
+        def watch():
+            while not stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"  [Error] 사전 감시 중 오류: {e}")
+
+        threading.Thread(target=watch, name="dictionary-watcher", daemon=True).start()
+        print(f"[System] 사전 파일 감시 시작 (주기 {interval}초)")
+
+    def stop_watcher(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+            self._watch_stop = None
+
+    @property
+    def watching(self) -> bool:
+        return self._watch_stop is not None
+
+    def update_user_dictionary(self, whitelist: list, blacklist: list) -> bool:
+        """
+        사용자 사전 파일을 새 목록으로 바꾸고 바로 다시 로드합니다.
+        - 쓰는 도중 감시 스레드가 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+          (임시 파일은 요청마다 다른 이름이라 동시에 저장해도 서로 덮어쓰지 않고, 마지막으로 교체한 내용이 남음)
+        - 사전 버전이 바뀌었으면 True를 반환합니다.
+        """
+        def clean(words):
+            return sorted({w.strip() for w in words if w and w.strip()})
+
+        data = {"user_whitelist": clean(whitelist), "user_blacklist": clean(blacklist)}
+        directory = os.path.dirname(os.path.abspath(self.user_dict_path))
+        f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, suffix='.tmp', delete=False)
+        try:
+            with f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(f.name, self.user_dict_path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+        return self.reload(force=True)
+
     def _load_user_dictionary(self, filepath):
-        """내부 메서드: 사용자 사전 로드"""
+        """내부 메서드: 사용자 사전 로드 -> (화이트리스트, 블랙리스트), 실패 시 None"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                self.user_whitelist = set(w.strip().lower() for w in data.get("user_whitelist", []))
-                self.user_blacklist = set(w.strip().lower() for w in data.get("user_blacklist", []))
-            print(f"  ㄴ 사용자 사전 로드됨: 화이트({len(self.user_whitelist)}), 블랙({len(self.user_blacklist)})")
+            user_whitelist = set(w.strip().lower() for w in data.get("user_whitelist", []))
+            user_blacklist = set(w.strip().lower() for w in data.get("user_blacklist", []))
+            print(f"  ㄴ 사용자 사전 로드됨: 화이트({len(user_whitelist)}), 블랙({len(user_blacklist)})")
+            return user_whitelist, user_blacklist
         except Exception as e:
             print(f"  [Error] 사용자 사전 로드 실패: {e}")
+            return None
 
     def _load_system_dictionary(self, filepath):
-        """내부 메서드: 시스템 사전 로드"""
+        """내부 메서드: 시스템 사전 로드 -> ({단어: 카테고리}, {허용 구문: {카테고리, ...}}), 실패 시 None"""
         try:
+            system_dictionary = {}
+            system_whitelist = {}
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                for category, content in data.items():
-                    # 단어들을 시스템 사전에 추가
-                    for word in content.get("words", []):
-                        self.system_dictionary.add(word.strip().lower())
-                    # 시스템 사전 내의 'white' 리스트도 처리하려면 여기에 로직 추가 가능
-            print(f"  ㄴ 시스템 사전 로드됨: {len(self.system_dictionary)}개 단어")
+            for category, content in data.items():
+                # 단어들을 시스템 사전에 추가 (여러 카테고리에 있으면 먼저 나온 카테고리 유지)
+                for word in content.get("words", []):
+                    system_dictionary.setdefault(word.strip().lower(), category)
+                # 'white' 구문 안에 걸친 같은 카테고리 단어는 적발하지 않음 (예: 졸라서, 전염병)
+                for phrase in content.get("white", []):
+                    phrase = phrase.strip().lower()
+                    if phrase:
+                        system_whitelist.setdefault(phrase, set()).add(category)
+            print(f"  ㄴ 시스템 사전 로드됨: {len(system_dictionary)}개 단어, 허용 구문 {len(system_whitelist)}개")
+            return system_dictionary, system_whitelist
         except Exception as e:
             print(f"  [Error] 시스템 사전 로드 실패: {e}")
+            return None
+
+    def _build_matcher(self, system_dictionary, user_blacklist, user_whitelist) -> AhoCorasickMatcher:
+        """내부 메서드: 화이트/블랙/시스템 사전을 하나의 매칭 엔진으로 컴파일"""
+        patterns = {}
+        # 우선순위가 낮은 사전부터 넣고, 높은 사전이 같은 단어를 덮어쓰게 함
+        for word, category in system_dictionary.items():
+            patterns[word] = ('SYSTEM_KEYWORD', 2, category)
+        for word in user_blacklist:
+            patterns[word] = ('USER_BLACKLIST', 1)
+        for word in user_whitelist:
+            patterns[word] = ('USER_WHITELIST', 0)
+
+        matcher = AhoCorasickMatcher(patterns)
+        print(f"  ㄴ 매칭 엔진 컴파일 완료: {len(matcher)}개 패턴")
+        return matcher
+
+    def _build_variant_matcher(self, system_dictionary, user_blacklist, user_whitelist):
+        """내부 메서드: 화이트/블랙/시스템 사전의 표준형 색인 (회피 표기 탐지, 같은 표준형이면 우선순위가 높은 사전 유지)"""
+        if not config.VARIANT_MATCHING_ENABLED:
+            return None
+        patterns = {word: ('SYSTEM_KEYWORD', 2, category) for word, category in system_dictionary.items()}
+        patterns.update({word: ('USER_BLACKLIST', 1) for word in user_blacklist})
+        patterns.update({word: ('USER_WHITELIST', 0) for word in user_whitelist})
+        matcher = variants.build_matcher(patterns)
+        print(f"  ㄴ 회피 표기 색인 컴파일 완료: {len(matcher)}개 표준형")
+        return matcher
+
+    def _variant_matches(self, snapshot: DictionarySnapshot, normalized_text: str, matches: list, white_spans: dict) -> list:
+        """
+        내부 메서드: 회피 표기 적중 (정규화 텍스트 기준 (start, end, payload))
+        - 원래 매칭 엔진의 화이트리스트 적중과 겹치거나, 다른 적중에 걸쳐 있는 구간은 버립니다.
+          (원래 적중을 통째로 감싸는 구간은 받아들이고, 감싸인 적중은 호출한 쪽에서 대체합니다. 예: ㅂ[ㅕㅇ신] -> [ㅂㅕㅇ신])
+        - 적중 구간이 사전 단어 그대로의 표기이면 버립니다. (원래 매칭 엔진이 형태소 경계 등으로 거른 경우)
+        - 허용 구문도 표준형 텍스트에서 다시 찾아 함께 적용합니다. (예: '졸 라 서'는 표준형 '졸라서'가 허용 구문)
+        """
+        if not variants.has_variant(normalized_text):
+            return []
+        canonical, positions = variants.canonicalize(normalized_text)
+        if len(snapshot.white_matcher):
+            white_spans = {category: list(found) for category, found in white_spans.items()}
+            for category, found in self._white_spans(snapshot.white_matcher, canonical).items():
+                white_spans.setdefault(category, []).extend(
+                    (positions[start][0], positions[end - 1][1]) for start, end in found
+                )
+
+        def accept(start, end, payload):
+            span_start, span_end = positions[start][0], positions[end - 1][1]
+            for s, e, matched in matches:
+                if s < span_end and span_start < e and (
+                    matched[0] == 'USER_WHITELIST' or s < span_start or span_end < e
+                ):
+                    return False
+            if payload[0] == 'SYSTEM_KEYWORD':
+                for white_start, white_end in white_spans.get(payload[2], ()):
+                    if white_start <= span_start and span_end <= white_end:
+                        return False
+            word = normalized_text[span_start:span_end]
+            return not any(s == 0 and e == len(word) for s, e, _ in snapshot.matcher.iter_matches(word))
+
+        return [
+            (positions[start][0], positions[end - 1][1], payload)
+            for start, end, payload in snapshot.variant_matcher.find_longest(canonical, accept=accept)
+        ]
+
+    def _white_spans(self, white_matcher: AhoCorasickMatcher, text: str) -> dict:
+        """내부 메서드: 카테고리별 허용 구문 위치 {카테고리: [(start, end), ...]}"""
+        spans = {}
+        for start, end, (_, _, categories) in white_matcher.iter_matches(text):
+            for category in categories:
+                spans.setdefault(category, []).append((start, end))
+        return spans
+
+    def _detect_tags(self, original_text: str, detected_words: list) -> list:
+        """
+        내부 메서드: 2차 필터에서 활성화할 AI 모듈 태그 목록
+        - 적중 단어의 카테고리 (config.DICTIONARY_CATEGORY_TAGS로 변환)
+        - 원문의 변형/개인정보/스팸 신호
+        """
+        tags = set()
+        for item in detected_words:
+            tag = config.DICTIONARY_CATEGORY_TAGS.get(item.get('category'))
+            if tag:
+                tags.add(tag)
+            if self.MODIFIED_WORD_PATTERN.search(item['word']):
+                tags.add('MODIFIED')
+
+        tags.update(self.signal_tags(original_text))
+
+        # 출력 순서는 config.SPECIAL_AI_MODULES 순서를 따름
+        return [tag for tag in config.SPECIAL_AI_MODULES if tag in tags]
+
+    def signal_tags(self, original_text: str) -> tuple:
+        """
+        원문의 변형/개인정보/스팸 신호 태그 (TAG_SIGNALS 순서)
+        - 정규화하면 기호(@, ://, 특수문자 삽입 등)가 사라지므로 원문에서 찾습니다. (판정 캐시 키에도 들어감)
+        """
+        lowered = original_text.lower()
+        return tuple(tag for tag, pattern in self.TAG_SIGNALS.items() if pattern.search(lowered))
+
+    def _token_boundaries(self, text: str, tokens: list):
+        """내부 메서드: 형태소 토큰의 시작/끝 위치 집합 계산"""
+        starts, ends = set(), set()
+        cursor = 0
+        for word, pos in tokens:
+            idx = text.find(word, cursor)
+            if idx < 0:
+                continue
+            starts.add(idx)
+            ends.add(idx + len(word))
+            cursor = idx + len(word)
+        return starts, ends
 
     def normalize_text(self, text: str) -> str:
-        text = text.lower()
-        text = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', text)
-        return text
+        return span_utils.normalize(text)
 
-    def execute(self, original_text: str) -> dict:
-        """외부에서 호출하는 메인 메서드"""
-        status = "PASSED"
-        
+    @classmethod
+    def matching_only(cls):
+        """사전/형태소 분석기 없이 _filter()만 쓰는 인스턴스 (1차 필터 프로세스 풀 워커용, 스냅샷은 호출 때 전달)"""
+        return cls.__new__(cls)
+
+    def _morphology(self, tokened_text):
+        """내부 메서드: 형태소 경계 검사에 쓸 토큰 (표면 매칭 토크나이저면 None)"""
+        return tokened_text if self.tokenizer.uses_morphology else None
+
+    @timed("first_pass")
+    def execute(self, original_text: str, snapshot: DictionarySnapshot = None, overlay=None) -> dict:
+        """
+        외부에서 호출하는 메인 메서드
+        - snapshot을 주면 그 시점의 사전으로 매칭합니다. (없으면 현재 사전)
+        - overlay(채널별 TenantOverlay)를 주면 채널 화이트/블랙리스트를 함께 적용합니다.
+        """
+        snapshot = snapshot or self.snapshot
         # 1. 정규화
         normalized_text = self.normalize_text(original_text)
-        
-        # 2. 형태소 분석 (self.okt 사용)
-        tokened_text = self.okt.pos(normalized_text)
-        
-        text_for_filtering = normalized_text
-        detected_words = []
 
-        for word, pos in tokened_text:
-            word_lower = word.lower() # 혹시 몰라 한 번 더 소문자 처리
+        # 2. 형태소 분석 (self.tokenizer 사용)
+        try:
+            tokened_text = self._morphology(self.tokenizer.pos(normalized_text))
+        except TokenizerBusyError as e:
+            print(f"  [Warning] {e} 표면 매칭으로 대체합니다.")
+            tokened_text = None
 
-            # [A] 화이트리스트
-            if word_lower in self.user_whitelist:
-                text_for_filtering = text_for_filtering.replace(word, "__W__")
-                continue
+        return self._filter(snapshot, overlay, original_text, normalized_text, tokened_text)
 
-            # [B] 블랙리스트
-            if word_lower in self.user_blacklist:
-                detected_words.append({'word': word, 'type': 'USER_BLACKLIST'})
-                text_for_filtering = text_for_filtering.replace(word, "__B__")
-                continue
-            
-            # [C] 시스템 사전
-            if word_lower in self.system_dictionary:
-                detected_words.append({'word': word, 'type': 'SYSTEM_KEYWORD'})
-                text_for_filtering = text_for_filtering.replace(word, "__F__")
+    @timed("first_pass", batch=True)
+    def execute_batch(self, original_texts: list, snapshot: DictionarySnapshot = None, overlay=None) -> list:
+        """
+        여러 텍스트를 한 번에 처리 (입력 순서 유지)
+        - 정규화를 먼저 모두 끝낸 뒤, 형태소 분석을 묶어서 요청합니다. (워커 풀에서 동시에 처리)
+        - 배치 전체가 같은 사전 스냅샷을 사용합니다.
+        - 프로세스 풀이 연결되어 있고 공유 매칭 엔진을 쓰는 스냅샷이면, 사전 매칭은 프로세스 풀에서 나눠 실행합니다.
+          (채널 오버레이는 공유 파일에 없으므로 이 프로세스에서 실행)
+        """
+        snapshot = snapshot or self.snapshot
+        normalized_texts = [self.normalize_text(text) for text in original_texts]
+
+        try:
+            tokened_texts = [self._morphology(tokens) for tokens in self.tokenizer.pos_batch(normalized_texts)]
+        except TokenizerBusyError as e:
+            print(f"  [Warning] {e} 표면 매칭으로 대체합니다.")
+            tokened_texts = [None] * len(normalized_texts)
+
+        if self.process_pool is not None and overlay is None and snapshot.shared_path:
+            results = self.process_pool.filter_batch(
+                snapshot, list(zip(original_texts, normalized_texts, tokened_texts))
+            )
+            if results is not None:
+                return results
+
+        return [
+            self._filter(snapshot, overlay, original, normalized, tokens)
+            for original, normalized, tokens in zip(original_texts, normalized_texts, tokened_texts)
+        ]
+
+    @timed("first_pass")
+    async def execute_async(self, original_text: str, snapshot: DictionarySnapshot = None, overlay=None) -> dict:
+        """이벤트 루프를 막지 않는 비동기 버전 (형태소 분석은 워커 풀에서 수행)"""
+        snapshot = snapshot or self.snapshot
+        normalized_text = self.normalize_text(original_text)
+
+        try:
+            tokened_text = self._morphology(await self.tokenizer.pos_async(normalized_text))
+        except TokenizerBusyError as e:
+            print(f"  [Warning] {e} 표면 매칭으로 대체합니다.")
+            tokened_text = None
+
+        return self._filter(snapshot, overlay, original_text, normalized_text, tokened_text)
+
+    def _filter(self, snapshot: DictionarySnapshot, overlay, original_text: str, normalized_text: str, tokened_text) -> dict:
+        """내부 메서드: 사전 매칭 및 마스킹"""
+        status = "PASSED"
+
+        # 3. 사전 매칭 (한 번의 선형 스캔)
+        # - 형태소 분석을 한 경우에만 형태소 경계에 맞는 적중을 인정 (표면 매칭이면 tokened_text는 None)
+        # - 같은 카테고리의 허용 구문 안에 있는 시스템 사전 적중은 제외
+        starts = ends = None
+        if tokened_text is not None:
+            starts, ends = self._token_boundaries(normalized_text, tokened_text)
+        white_matcher = snapshot.white_matcher
+        white_spans = self._white_spans(white_matcher, normalized_text) if len(white_matcher) else {}
+
+        def accept(start, end, payload):
+            if starts is not None and (start not in starts or end not in ends):
+                return False
+            if payload[0] == 'SYSTEM_KEYWORD':
+                for white_start, white_end in white_spans.get(payload[2], ()):
+                    if white_start <= start and end <= white_end:
+                        return False
+            return True
+
+        # 채널 오버레이는 공용 매칭 엔진에 합치지 않고 적중만 더해서 고름 (공용 엔진은 채널마다 복제하지 않음)
+        matches = snapshot.matcher.find_longest(
+            normalized_text,
+            accept=accept if starts is not None or white_spans else None,
+            overlay=overlay.matcher if overlay is not None else None
+        )
+        # 3-1. 회피 표기 (띄어 쓰기/자모 분리/닮은 문자/늘여 쓰기/야민정음) 적중 추가
+        variant_hits = []
+        if snapshot.variant_matcher is not None:
+            variant_hits = self._variant_matches(snapshot, normalized_text, matches, white_spans)
+            if variant_hits:
+                matches = [
+                    m for m in matches
+                    if not any(start <= m[0] and m[1] <= end for start, end, _ in variant_hits)
+                ]
+                matches = sorted(matches + variant_hits, key=lambda m: m[0])
+
+        # 4. 적중 구간(span) 기록 후 자리표시자 텍스트를 한 번에 생성
+        detected_words = []
+        spans = []
+        variant_starts = {start for start, _, _ in variant_hits}
+        for start, end, payload in matches:
+            kind = payload[0]
+            word = normalized_text[start:end]
+
+            if kind == 'USER_WHITELIST':   # [A] 화이트리스트
+                spans.append((start, end, kind, None))
                 continue
+            if kind == 'USER_BLACKLIST':   # [B] 블랙리스트
+                detected = {'word': word, 'type': 'USER_BLACKLIST'}
+                spans.append((start, end, kind, None))
+            else:                          # [C] 시스템 사전
+                detected = {'word': word, 'type': 'SYSTEM_KEYWORD', 'category': payload[2]}
+                spans.append((start, end, kind, payload[2]))
+            if start in variant_starts:    # 회피 표기로 적중
+                detected['variant'] = True
+            detected_words.append(detected)
+
+        text_for_filtering = span_utils.render(normalized_text, spans)
 
         if detected_words:
             status = 'FILTERED_BY_FIRST_PASS'
@@ -94,7 +635,11 @@ class FirstPassFilter:
             'original_text': original_text,
             'status': status,
             'detected_words': detected_words,
-            'text_for_filtering': text_for_filtering
+            'text_for_filtering': text_for_filtering,
+            'tags': self._detect_tags(original_text, detected_words),
+            'normalized_text': normalized_text,
+            'spans': spans,
+            'dictionary_version': snapshot.version if overlay is None else f"{snapshot.version}+{overlay.fingerprint}"
         }
 
 if __name__ == "__main__":
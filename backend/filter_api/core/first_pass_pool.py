@@ -0,0 +1,130 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from . import shared_matcher
+from .first_pass_filter import FirstPassFilter, DictionarySnapshot
+
+# -------------------------------------------------
+# 워커 프로세스 쪽 (모듈 전역 상태는 워커마다 따로)
+# -------------------------------------------------
+
+_worker_filter = None
+_worker_snapshots = {}  # 공유 파일 경로 -> (파일 식별값, 스냅샷)
+
+
+def _worker_snapshot(path: str):
+    """공유 파일이 바뀌었으면(사전 다시 로드) 새로 열고, 아니면 열어 둔 스냅샷을 그대로 사용"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _worker_snapshots.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    loaded = shared_matcher.load(path)
+    if loaded is None:
+        return None
+    version, matchers = loaded
+    snapshot = DictionarySnapshot(
+        version, None, None, None, None, matchers["matcher"], matchers["white_matcher"],
+        matchers.get("variant_matcher"), shared_path=path
+    )
+    _worker_snapshots[path] = (key, snapshot)
+    return snapshot
+
+
+def _filter_chunk(path: str, version: str, items: list):
+    """[(원문, 정규화 텍스트, 토큰 또는 None), ...] -> 1차 필터 결과 목록 (사전 버전이 다르면 None)"""
+    global _worker_filter
+    snapshot = _worker_snapshot(path)
+    if snapshot is None or snapshot.version != version:
+        return None
+    if _worker_filter is None:
+        _worker_filter = FirstPassFilter.matching_only()
+    return [_worker_filter._filter(snapshot, None, original, normalized, tokens) for original, normalized, tokens in items]
+
+
+def _worker_ready(path: str):
+    _worker_snapshot(path)
+
+
+# -------------------------------------------------
+# 서버 프로세스 쪽
+# -------------------------------------------------
+
+def process_memory(pid: int):
+    """프로세스 메모리 {rss, pss, shared} (bytes, Linux /proc 기준, 읽을 수 없으면 None)"""
+    fields = {"Rss:": "rss", "Pss:": "pss", "Shared_Clean:": "shared", "Shared_Dirty:": "shared"}
+    memory = {"rss": 0, "pss": 0, "shared": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+            for line in f:
+                parts = line.split()
+                if parts and parts[0] in fields:
+                    memory[fields[parts[0]]] += int(parts[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return memory
+
+
+class FirstPassProcessPool:
+    """
+    1차 필터 사전 매칭을 여러 프로세스에 나눠 실행하는 풀
+    - 정규화/형태소 분석은 서버 프로세스에서 하고, 매칭/마스킹/태그 탐지만 워커 프로세스로 넘깁니다.
+      (워커는 Okt/JVM 없이 공유 매칭 엔진 파일만 메모리 맵으로 열어서 사용)
+    - 워커는 호출마다 파일이 바뀌었는지 확인하므로 사전을 다시 로드해도 풀을 다시 만들 필요가 없습니다.
+      요청한 사전 버전과 파일 버전이 다르면(교체 중) None을 반환하고, 호출한 쪽이 직접 처리합니다.
+    - fork를 쓸 수 있으면 fork로 워커를 만듭니다. (spawn은 실행 스크립트(main.py)를 워커에서 다시 임포트함)
+      형태소 분석기(JVM)나 서버 스레드가 생기기 전에 만들고 start()로 워커를 모두 띄워 두어야 합니다.
+    """
+
+    def __init__(self, processes: int, min_batch: int = 64):
+        self.processes = processes
+        self.min_batch = min_batch
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self._executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method))
+        self.pids = []
+        self.batches = 0
+        self.fallbacks = 0
+
+    def start(self, path: str):
+        """워커를 모두 띄우고 공유 파일을 미리 열어 둠"""
+        for future in [self._executor.submit(_worker_ready, path) for _ in range(self.processes)]:
+            future.result()
+        # 작업 하나를 한 워커가 연달아 받을 수 있으므로 PID는 실행기가 띄운 프로세스 목록에서 가져옴
+        self.pids = sorted(self._executor._processes)
+        print(f"  ㄴ 1차 필터 프로세스 {self.processes}개 준비 완료")
+
+    def filter_batch(self, snapshot: DictionarySnapshot, items: list):
+        """
+        items를 워커 수(최소 min_batch개씩)만큼 연속 구간으로 나눠 실행 (순서 유지)
+        - min_batch보다 작은 배치나 버전이 맞지 않는 경우는 None (호출한 쪽에서 직접 처리)
+        """
+        if len(items) < self.min_batch:
+            return None
+        size = max(self.min_batch, -(-len(items) // self.processes))
+        futures = [
+            self._executor.submit(_filter_chunk, snapshot.shared_path, snapshot.version, items[i:i + size])
+            for i in range(0, len(items), size)
+        ]
+        parts = [future.result() for future in futures]
+        if any(part is None for part in parts):
+            self.fallbacks += 1
+            return None
+        self.batches += 1
+        return [res for part in parts for res in part]
+
+    def stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "min_batch": self.min_batch,
+            "batches": self.batches,
+            "fallbacks": self.fallbacks,
+            "workers": [{"pid": pid, "memory": process_memory(pid)} for pid in self.pids],
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
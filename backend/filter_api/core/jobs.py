@@ -0,0 +1,443 @@
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업 수가 상한에 도달함"""
+
+
+class JobStore:
+    """
+    백그라운드 작업 저장소 (SQLite)
+    - 작업 상태/진행률/누적 통계와 작업이 만든 결과(댓글별 요약)를 저장합니다.
+    - 결과는 페이지 단위로 진행률과 함께 한 트랜잭션으로 기록하므로(체크포인트), 서버가 재시작되어도
+      저장된 결과까지는 그대로 남고 이어서 실행할 수 있습니다.
+    - 여러 서버 워커가 같은 파일을 쓰므로, 작업은 owner(실행기 ID) + lease_until(임대 만료 시각)을 한 문장으로
+      기록한 실행기 하나만 실행합니다. 실행기가 비정상 종료되면 임대가 끝난 뒤 다른 실행기가 이어받습니다.
+    """
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+    ACTIVE = (QUEUED, RUNNING)
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " dedupe_key TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " progress TEXT NOT NULL,"
+            " stats TEXT NOT NULL,"
+            " info TEXT,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " owner TEXT,"
+            " lease_until REAL)"
+        )
+        # 실행기 ID/임대 열이 없던 이전 파일
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS job_results ("
+            " job_id TEXT NOT NULL,"
+            " seq INTEGER NOT NULL,"
+            " item_id TEXT,"
+            " summary TEXT NOT NULL,"
+            " PRIMARY KEY (job_id, seq))"
+        )
+        self._db.commit()
+        print(f"  ㄴ 작업 저장소 연결: {db_path}")
+
+    @staticmethod
+    def _row(row) -> dict:
+        job_id, kind, dedupe_key, params, status, progress, stats, info, error, created_at, updated_at = row
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "dedupe_key": dedupe_key,
+            "params": json.loads(params),
+            "status": status,
+            "progress": json.loads(progress),
+            "stats": json.loads(stats),
+            "info": json.loads(info) if info else None,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def _select(self, where: str, args=(), suffix: str = ""):
+        return self._db.execute(
+            "SELECT job_id, kind, dedupe_key, params, status, progress, stats, info, error, created_at, updated_at"
+            f" FROM jobs WHERE {where} {suffix}", args
+        ).fetchall()
+
+    def create_or_get(self, kind: str, dedupe_key: str, params: dict, limit: int = None):
+        """
+        같은 dedupe_key로 대기/실행 중인 작업이 있으면 그 작업을, 없으면 새 작업을 반환합니다.
+        - limit: 대기/실행 중인 작업(모든 서버 워커 합계)이 이 개수 이상이면 새로 만들지 않고 JobQueueFull
+        - 반환: (작업, 새로 만들었는지 여부)
+        """
+        with self._lock:
+            # 여러 서버 워커가 동시에 등록해도 확인 ~ 추가가 한 번에 이루어지도록 처음부터 쓰기 잠금
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._select("dedupe_key = ? AND status IN (?, ?)", (dedupe_key, *self.ACTIVE), "LIMIT 1")
+                if rows:
+                    self._db.rollback()
+                    return self._row(rows[0]), False
+                if limit is not None:
+                    active = self._db.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", self.ACTIVE).fetchone()[0]
+                    if active >= limit:
+                        raise JobQueueFull(f"대기/실행 중인 작업이 너무 많습니다. (최대 {limit}개)")
+
+                now = time.time()
+                job_id = uuid.uuid4().hex
+                self._db.execute(
+                    "INSERT INTO jobs (job_id, kind, dedupe_key, params, status, progress, stats, info, error, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?, ?)",
+                    (job_id, kind, dedupe_key, json.dumps(params, ensure_ascii=False), self.QUEUED, "{}", "{}", now, now)
+                )
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            return self._row(self._select("job_id = ?", (job_id,))[0]), True
+
+    def get(self, job_id: str):
+        with self._lock:
+            rows = self._select("job_id = ?", (job_id,))
+        return self._row(rows[0]) if rows else None
+
+    def list(self, limit: int = 50) -> list:
+        with self._lock:
+            rows = self._select("1 = 1", (limit,), "ORDER BY created_at DESC LIMIT ?")
+        return [self._row(row) for row in rows]
+
+    def claimable(self) -> list:
+        """실행기가 가져갈 수 있는 작업: 대기/실행 중이면서 실행기가 없거나 임대가 끝난 작업 (만든 순서)"""
+        with self._lock:
+            rows = self._select(
+                "status IN (?, ?) AND (owner IS NULL OR lease_until < ?)", (*self.ACTIVE, time.time()),
+                "ORDER BY created_at"
+            )
+        return [self._row(row) for row in rows]
+
+    def claim(self, job_id: str, owner: str, lease: float) -> bool:
+        """
+        작업을 owner가 실행하도록 가져가고 RUNNING으로 변경 -> 가져갔는지 여부
+        (여러 워커가 같은 작업을 동시에 가져가려 해도 조건부 UPDATE 한 문장이라 하나만 성공)
+        """
+        now = time.time()
+        with self._lock:
+            changed = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ?"
+                " WHERE job_id = ? AND status IN (?, ?) AND (owner IS NULL OR lease_until < ?)",
+                (self.RUNNING, owner, now + lease, now, job_id, *self.ACTIVE, now)
+            ).rowcount
+            self._db.commit()
+        return changed == 1
+
+    def renew(self, owner: str, lease: float) -> set:
+        """owner가 실행 중인 작업의 임대 연장 -> 아직 owner가 실행 중인 작업 ID (취소/이어받기된 작업은 빠짐)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = ?",
+                (time.time() + lease, owner, self.RUNNING)
+            )
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT job_id FROM jobs WHERE owner = ? AND status = ?", (owner, self.RUNNING)
+            ).fetchall()
+        return {job_id for job_id, in rows}
+
+    def release(self, owner: str):
+        """서버 종료: owner가 실행하던 작업을 내려놓음 (다음 시작 때 임대 만료를 기다리지 않고 이어서 실행)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET owner = NULL, lease_until = NULL WHERE owner = ? AND status IN (?, ?)",
+                (owner, *self.ACTIVE)
+            )
+            self._db.commit()
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def transition(self, job_id: str, status: str, from_statuses: tuple, error: str = None, owner: str = None) -> bool:
+        """
+        현재 상태가 from_statuses 중 하나일 때만 상태 변경 -> 바꿨는지 여부
+        (취소가 먼저 기록된 작업을 실행 완료로 덮어쓰지 않도록 조건과 변경을 한 문장으로 처리)
+        - owner: 지정하면 그 실행기가 실행 중인 작업일 때만 변경 (다른 워커가 이어받은 작업은 그대로 둠)
+        """
+        marks = ", ".join("?" * len(from_statuses))
+        where = f"job_id = ? AND status IN ({marks})" + (" AND owner = ?" if owner is not None else "")
+        args = (job_id, *from_statuses) + ((owner,) if owner is not None else ())
+        with self._lock:
+            changed = self._db.execute(
+                f"UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE {where}",
+                (status, error, time.time(), *args)
+            ).rowcount
+            self._db.commit()
+        return changed == 1
+
+    def set_info(self, job_id: str, info: dict):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET info = ?, updated_at = ? WHERE job_id = ?",
+                (json.dumps(info, ensure_ascii=False), time.time(), job_id)
+            )
+            self._db.commit()
+
+    def checkpoint(self, job_id: str, items: list, progress: dict, stats: dict):
+        """
+        결과 추가 + 진행률/누적 통계 갱신 (한 트랜잭션)
+        - items: [(item_id, summary), ...] / seq는 progress["results"]부터 이어서 붙입니다.
+        """
+        start = progress.get("results", 0) - len(items)
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO job_results (job_id, seq, item_id, summary) VALUES (?, ?, ?, ?)",
+                [
+                    (job_id, start + offset, item_id, json.dumps(summary, ensure_ascii=False))
+                    for offset, (item_id, summary) in enumerate(items)
+                ]
+            )
+            self._db.execute(
+                "UPDATE jobs SET progress = ?, stats = ?, updated_at = ? WHERE job_id = ?",
+                (json.dumps(progress), json.dumps(stats), time.time(), job_id)
+            )
+            self._db.commit()
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 500) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT summary FROM job_results WHERE job_id = ? AND seq >= ? ORDER BY seq LIMIT ?",
+                (job_id, offset, limit)
+            ).fetchall()
+        return [json.loads(summary) for summary, in rows]
+
+    def result_ids(self, job_id: str) -> set:
+        """이미 결과가 저장된 항목 ID (재시작 후 이어서 실행할 때 건너뜀)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT item_id FROM job_results WHERE job_id = ? AND item_id IS NOT NULL", (job_id,)
+            ).fetchall()
+        return {item_id for item_id, in rows}
+
+    def purge(self, max_age: float) -> int:
+        """끝난 지 max_age 초가 지난 작업과 결과 삭제"""
+        cutoff = time.time() - max_age
+        with self._lock:
+            job_ids = [job_id for job_id, in self._db.execute(
+                "SELECT job_id FROM jobs WHERE status NOT IN (?, ?) AND updated_at < ?", (*self.ACTIVE, cutoff)
+            ).fetchall()]
+            for job_id in job_ids:
+                self._db.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+                self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            self._db.commit()
+        return len(job_ids)
+
+
+class Job:
+    """
+    실행 중인 작업 (핸들러가 진행 상황을 기록하는 통로)
+    - params/progress/stats/info는 저장소의 값으로 시작하므로, 재시작 후에도 누적값이 이어집니다.
+    """
+
+    def __init__(self, store: JobStore, row: dict):
+        self.store = store
+        self.job_id = row["job_id"]
+        self.kind = row["kind"]
+        self.params = row["params"]
+        self.progress = dict(row["progress"])
+        self.stats = dict(row["stats"])
+        self.info = row["info"]
+        self.resumed = bool(self.progress)
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def done_ids(self) -> set:
+        return await self._run(self.store.result_ids, self.job_id) if self.resumed else set()
+
+    async def set_info(self, info: dict):
+        self.info = info
+        await self._run(self.store.set_info, self.job_id, info)
+
+    async def checkpoint(self, items: list, stats: dict, **progress):
+        """
+        결과 저장 + 누적 통계/진행률 갱신
+        - stats: 이번 결과분의 통계 (키별로 더함) / progress: 키별로 더할 진행 값 (예: pages=1)
+        """
+        for key, value in stats.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+        for key, value in progress.items():
+            self.progress[key] = self.progress.get(key, 0) + value
+        self.progress["results"] = self.progress.get("results", 0) + len(items)
+        await self._run(self.store.checkpoint, self.job_id, items, dict(self.progress), dict(self.stats))
+
+
+class JobManager:
+    """
+    백그라운드 작업 실행기 (asyncio 워커 workers개)
+    - submit(): 같은 dedupe_key로 대기/실행 중인 작업이 있으면 새로 만들지 않고 그 작업 ID를 돌려줍니다.
+    - 대기/실행 중인 작업이 (모든 서버 워커 합계) queue_limit개 이상이면 JobQueueFull
+    - 작업 종류(kind)별 핸들러 handlers[kind](job)를 실행하고, 예외가 나면 FAILED로 기록합니다.
+    - start() 시 대기/실행 중이던 작업(이전 서버가 끝내지 못한 작업)을 다시 대기열에 넣습니다.
+      stop()으로 멈춘 실행 중 작업은 RUNNING으로 남아 다음 시작 때 이어서 실행됩니다.
+    - 서버 워커가 여러 개이면 워커마다 실행기가 있고, 작업은 store.claim()에 성공한 실행기 하나만 실행합니다.
+      lease / 3초마다 실행 중인 작업의 임대를 연장하고, 다른 워커에서 취소된 작업을 멈추고,
+      가져갈 수 있는 작업(다른 워커에 등록되었거나 임대가 끝난 작업)을 대기열에 넣습니다.
+    """
+
+    def __init__(self, store: JobStore, handlers: dict, workers: int = 2, queue_limit: int = 100,
+                 retention: float = 7 * 24 * 3600, lease: float = 60.0):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.retention = retention
+        self.lease = lease
+        self.owner = uuid.uuid4().hex  # 이 실행기 ID
+
+        self._queue = None
+        self._tasks = []
+        self._queued = set()     # 대기열에 넣은 작업 ID (같은 작업을 두 번 넣지 않도록)
+        self._running = {}       # job_id -> 핸들러 Task
+        self._cancelled = set()  # 취소 요청을 받은 작업 ID
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        purged = await self._run(self.store.purge, self.retention)
+        unfinished = await self._enqueue_claimable()
+        if unfinished or purged:
+            print(f"[System] 작업 대기열 복구: 이어서 실행 {unfinished}개, 오래된 작업 삭제 {purged}개")
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._maintain()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._run(self.store.release, self.owner)
+
+    def _enqueue(self, job_id: str):
+        if job_id not in self._queued and job_id not in self._running:
+            self._queued.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    async def _enqueue_claimable(self) -> int:
+        rows = await self._run(self.store.claimable)
+        for row in rows:
+            self._enqueue(row["job_id"])
+        return len(rows)
+
+    async def _maintain(self):
+        """임대 연장 + 다른 워커에서 취소/이어받은 작업 중단 + 가져갈 수 있는 작업 확인"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                owned = await self._run(self.store.renew, self.owner, self.lease)
+                for job_id, task in list(self._running.items()):
+                    if job_id not in owned:
+                        self._cancelled.add(job_id)
+                        task.cancel()
+                await self._enqueue_claimable()
+            except Exception as e:
+                print(f"  [Warning] 작업 임대 갱신 실패: {e}")
+
+    async def submit(self, kind: str, dedupe_key: str, params: dict):
+        """작업 등록 -> (작업, 기존 작업과 합쳐졌는지 여부)"""
+        if kind not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+        if self._queue is None:
+            raise RuntimeError("작업 실행기가 시작되지 않았습니다.")
+
+        row, created = await self._run(self.store.create_or_get, kind, dedupe_key, params, self.queue_limit)
+        if created:
+            self._enqueue(row["job_id"])
+        return row, not created
+
+    async def cancel(self, job_id: str):
+        """작업 취소 (대기 중이면 실행하지 않고, 실행 중이면 중단) -> 취소 후 작업, 없으면 None"""
+        row = await self._run(self.store.get, job_id)
+        if row is None or row["status"] not in JobStore.ACTIVE:
+            return row
+        self._cancelled.add(job_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            # 아직 실행 전 (워커가 꺼냈더라도 RUNNING 전환이 조건부라 실행되지 않고, 실행 중이어도 완료로 덮어쓰지 않음)
+            await self._run(self.store.transition, job_id, JobStore.CANCELLED, JobStore.ACTIVE)
+        return await self._run(self.store.get, job_id)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "queue_limit": self.queue_limit,
+        }
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            row = await self._run(self.store.get, job_id)
+            if row is None or row["status"] not in JobStore.ACTIVE or job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+
+            # 다른 워커가 이미 가져갔거나(임대 중) 그 사이 취소되었으면 실행하지 않음
+            if not await self._run(self.store.claim, job_id, self.owner, self.lease):
+                self._cancelled.discard(job_id)
+                continue
+            if job_id in self._cancelled:
+                # RUNNING 전환 직후 이 워커에서 취소됨
+                await self._run(self.store.transition, job_id, JobStore.CANCELLED, JobStore.ACTIVE, None, self.owner)
+                self._cancelled.discard(job_id)
+                continue
+
+            task = asyncio.ensure_future(self.handlers[row["kind"]](Job(self.store, row)))
+            self._running[job_id] = task
+            try:
+                await task
+                # 실행 중 다른 경로로 취소/종료가 기록되었으면 그대로 둠
+                await self._run(self.store.transition, job_id, JobStore.COMPLETED, (JobStore.RUNNING,), None, self.owner)
+            except asyncio.CancelledError:
+                if job_id not in self._cancelled:
+                    raise  # 서버 종료: RUNNING으로 남겨 다음 시작 때 이어서 실행
+                await self._run(self.store.transition, job_id, JobStore.CANCELLED, JobStore.ACTIVE, None, self.owner)
+            except Exception as e:
+                print(f"  [Error] 작업 실패 ({row['kind']} {job_id}): {e}")
+                await self._run(
+                    self.store.transition, job_id, JobStore.FAILED, (JobStore.RUNNING,), str(e), self.owner
+                )
+            finally:
+                self._running.pop(job_id, None)
+                self._cancelled.discard(job_id)
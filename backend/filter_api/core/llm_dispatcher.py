@@ -0,0 +1,331 @@
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+from ..metrics import track, LLM_REQUESTS
+
+# 이 컨텍스트(요청) 안의 GPT 호출이 재시도를 포함해 끝나야 하는 시각 (time.monotonic 기준)
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """
+    블록 안의 GPT 호출이 공유할 마감 시각을 정합니다.
+    - 바깥에서 이미 정해져 있으면 그대로 사용합니다. (배치 호출과 누락 항목 단건 호출이 같은 마감을 공유)
+    """
+    if _deadline.get() is not None or not seconds:
+        yield
+        return
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class LLMUnavailableError(Exception):
+    """재시도/마감/회로 차단으로 GPT 응답을 받지 못함 (reason: 마지막 실패 종류)"""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 방식 동시 호출 수 제한 (asyncio 경로 전용, 이벤트 루프 스레드에서만 사용)
+    - 응답 시간이 latency_target 이하로 성공하면 동시 호출 수를 천천히 늘리고 (limit당 +1)
+    - 429/시간 초과/응답 지연이면 backoff_ratio배로 줄입니다.
+    - 같은 혼잡으로 동시에 실패한 호출들이 여러 번 줄이지 않도록, 마지막 감소 이전에 시작한 호출의 실패는 무시합니다.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 8, latency_target: float = 10.0,
+                 backoff_ratio: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self._in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+        self.counters = {"increases": 0, "decreases": 0}
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            # release()가 자리를 넘겨주면서 _in_flight를 대신 올림
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+
+    def on_success(self, started: float, latency: float):
+        if latency > self.latency_target:
+            self.on_overload(started)
+            return
+        if self._limit < self.maximum:
+            self._limit = min(float(self.maximum), self._limit + 1.0 / self._limit)
+            self.counters["increases"] += 1
+
+    def on_overload(self, started: float):
+        if started < self._last_decrease:
+            return
+        self._last_decrease = time.monotonic()
+        if self._limit > self.minimum:
+            self._limit = max(float(self.minimum), self._limit * self.backoff_ratio)
+            self.counters["decreases"] += 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "min": self.minimum,
+            "max": self.maximum,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            **self.counters,
+        }
+
+
+class CircuitBreaker:
+    """
+    회로 차단기 (동기/비동기 경로 공용, 스레드 안전)
+    - CLOSED    : 정상. 연속 실패가 failure_threshold번이면 OPEN
+    - OPEN      : reset_timeout 초 동안 호출하지 않고 바로 실패 처리
+    - HALF_OPEN : 시험 호출 하나만 허용, 성공하면 CLOSED / 실패하면 다시 OPEN
+                  (시험 호출이 reset_timeout 안에 끝나지 않으면 다음 호출을 시험 호출로 허용)
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self.counters = {"opens": 0}
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_started = now
+                return True
+            if self.state == self.HALF_OPEN and now - self._probe_started >= self.reset_timeout:
+                self._probe_started = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self.state != self.CLOSED:
+                print("[System] GPT 호출 회로 차단 해제")
+                self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                print(f"  [Warning] GPT 호출 연속 실패 {self._failures}회 - {self.reset_timeout:.0f}초 동안 2차 필터를 생략합니다.")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.counters["opens"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)) if self.state == self.OPEN else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "retry_in": round(retry_in, 1),
+                **self.counters,
+            }
+
+
+class LLMDispatcher:
+    """
+    GPT 호출 계층 (동시 호출 수 조절 + 재시도 + 회로 차단)
+    - 실패 종류별로 재시도 여부를 정하고, 재시도 간격은 지수 증가 + 전체 지터 (Retry-After가 있으면 그 이상)
+    - 재시도는 마감 시각(deadline_scope 또는 request_deadline) 안에서만 하며, 넘기면 LLMUnavailableError
+      (asyncio 경로에서 동시 호출 자리를 기다린 시간은 마감에서 제외합니다. 대기열이 길어도 호출 전에 DEGRADED가 되지 않도록)
+    - 동시 호출 수 조절(AIMD)은 asyncio 경로에만 적용합니다. 동기 경로는 재시도/회로 차단만 적용합니다.
+    - 회로가 HALF_OPEN이면 다른 호출은 바로 실패하지 않고 시험 호출 결과를 기다립니다. (복구 직후 요청 전체가 DEGRADED가 되지 않도록)
+    - SDK 자체 재시도와 겹치지 않도록 클라이언트는 max_retries=0으로 만들어야 합니다.
+    """
+
+    PROBE_WAIT = 0.05  # 시험 호출 결과를 기다리는 동안 다시 확인하는 간격 (초)
+
+    RETRYABLE = frozenset({"rate_limited", "timeout", "server_error", "connection"})
+    # 댓글 하나의 요청 문제(잘못된 요청 등)는 서비스 장애가 아니므로 회로 차단 집계에서 제외
+    NOT_COUNTED = frozenset({"bad_request"})
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter, breaker: CircuitBreaker, max_retries: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 8.0, call_timeout: float = 30.0,
+                 request_deadline: float = 60.0):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.call_timeout = call_timeout
+        self.request_deadline = request_deadline
+
+    @staticmethod
+    def classify(error: Exception) -> str:
+        """예외 -> 실패 종류 (openai 예외 클래스를 직접 임포트하지 않고 이름/상태 코드로 판단)"""
+        name = type(error).__name__
+        if isinstance(error, TimeoutError) or "Timeout" in name:
+            return "timeout"
+        status = getattr(error, 'status_code', None)
+        if status == 429 or name == "RateLimitError":
+            return "rate_limited"
+        if status is not None:
+            if status >= 500 or status in (408, 409):
+                return "server_error"
+            if status in (401, 403):
+                return "auth"
+            return "bad_request"
+        if "Connection" in name:
+            return "connection"
+        return "error"
+
+    def _retry_after(self, error: Exception) -> float:
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        try:
+            return float(headers.get('retry-after')) if headers is not None and headers.get('retry-after') else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _deadline(self) -> float:
+        return _deadline.get() or time.monotonic() + self.request_deadline
+
+    def _admit(self, deadline: float):
+        """호출 직전 확인 -> 이번 시도의 시간 제한 (None이면 시험 호출 결과를 기다린 뒤 다시 확인)"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            LLM_REQUESTS.inc(result="deadline")
+            raise LLMUnavailableError("deadline")
+        if self.breaker.allow():
+            return min(self.call_timeout, remaining)
+        if self.breaker.state == CircuitBreaker.HALF_OPEN:
+            return None
+        LLM_REQUESTS.inc(result="rejected")
+        raise LLMUnavailableError("circuit_open")
+
+    def _on_failure(self, error: Exception, attempt: int, deadline: float) -> float:
+        """실패 기록 -> 재시도 전 대기 시간 (재시도하지 않으면 LLMUnavailableError)"""
+        kind = self.classify(error)
+        LLM_REQUESTS.inc(result=kind)
+        if kind not in self.NOT_COUNTED:
+            self.breaker.record_failure()
+
+        if kind not in self.RETRYABLE or attempt >= self.max_retries:
+            print(f"  [Error] OpenAI API 호출 실패 ({kind}, 시도 {attempt + 1}회): {error}")
+            raise LLMUnavailableError(kind, str(error)) from error
+
+        delay = max(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)), self._retry_after(error))
+        if time.monotonic() + delay >= deadline:
+            LLM_REQUESTS.inc(result="deadline")
+            raise LLMUnavailableError("deadline", str(error)) from error
+        LLM_REQUESTS.inc(result="retry")
+        return delay
+
+    def call(self, create, **kwargs):
+        """동기 호출 (create: client.chat.completions.create)"""
+        deadline = self._deadline()
+        attempt = 0
+        while True:
+            timeout = self._admit(deadline)
+            if timeout is None:
+                time.sleep(self.PROBE_WAIT)
+                continue
+            try:
+                with track("llm"):
+                    response = create(timeout=timeout, **kwargs)
+            except Exception as e:
+                time.sleep(self._on_failure(e, attempt, deadline))
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return response
+
+    async def call_async(self, create, **kwargs):
+        """비동기 호출 (create: async_client.chat.completions.create), 동시 호출 수는 limiter가 조절"""
+        deadline = self._deadline()
+        attempt = 0
+        while True:
+            if self._admit(deadline) is None:
+                await asyncio.sleep(self.PROBE_WAIT)
+                continue
+            queued = time.monotonic()
+            await self.limiter.acquire()
+            started = time.monotonic()
+            # 동시 호출 수 제한으로 기다린 시간은 마감에 넣지 않음 (마감은 GPT 호출과 재시도 대기에만 적용)
+            deadline += started - queued
+
+            try:
+                timeout = min(self.call_timeout, deadline - started)
+                with track("llm"):
+                    response = await asyncio.wait_for(create(**kwargs), timeout)
+            except Exception as e:
+                if self.classify(e) in ("rate_limited", "timeout"):
+                    self.limiter.on_overload(started)
+                self.limiter.release()
+                await asyncio.sleep(self._on_failure(e, attempt, deadline))
+                attempt += 1
+                continue
+            except BaseException:
+                self.limiter.release()
+                raise
+
+            self.limiter.on_success(started, time.monotonic() - started)
+            self.limiter.release()
+            self.breaker.record_success()
+            return response
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.limiter.stats(),
+            "breaker": self.breaker.stats(),
+            "max_retries": self.max_retries,
+            "request_deadline": self.request_deadline,
+        }
@@ -0,0 +1,81 @@
+import os
+import threading
+
+from ..metrics import timed
+
+
+class LocalClassifier:
+    """
+    [로컬 CPU 분류 모델] ONNX Runtime으로 댓글의 위반 카테고리를 분류합니다.
+    - 모델 입력: 문자열 텐서 [N, 1] (예: skl2onnx로 변환한 문자 n-gram TF-IDF + 선형 분류기)
+    - 모델 출력: 라벨별 확률 [N, len(labels)] (skl2onnx 변환 시 zipmap=False)
+    - onnxruntime이 없거나 모델 파일이 없으면 비활성화됩니다. (available == False)
+    """
+
+    def __init__(self, model_path: str, labels: list, clean_label: str = 'CLEAN',
+                 batch_size: int = 64, num_threads: int = 2):
+        self.model_path = model_path
+        self.labels = list(labels)
+        self.clean_index = self.labels.index(clean_label)
+        self.batch_size = batch_size
+        self.available = False
+
+        self.counters = {"predicted": 0, "batches": 0}
+        self._lock = threading.Lock()
+
+        try:
+            import numpy as np
+            import onnxruntime as ort  # 선택 의존성이므로 사용 시점에만 임포트
+        except ImportError:
+            print("  [Warning] onnxruntime이 설치되지 않아 로컬 분류 모델을 사용하지 않습니다.")
+            return
+
+        if not os.path.exists(model_path):
+            print(f"  [Warning] 로컬 분류 모델 파일이 없습니다: {model_path}")
+            return
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        try:
+            self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        except Exception as e:
+            print(f"  [Error] 로컬 분류 모델 로드 실패: {e}")
+            return
+
+        self._np = np
+        self.input_name = self.session.get_inputs()[0].name
+        self.available = True
+        print(f"  ㄴ 로컬 분류 모델 로드: {model_path} (라벨 {len(self.labels)}개)")
+
+    def _probabilities(self, outputs):
+        """모델 출력 중 [N, 라벨 수] 모양의 확률 배열을 찾습니다."""
+        for output in outputs:
+            if getattr(output, 'ndim', 0) == 2 and output.shape[1] == len(self.labels) and output.dtype.kind == 'f':
+                return output
+        raise ValueError("로컬 분류 모델 출력에서 라벨별 확률을 찾을 수 없습니다.")
+
+    @timed("local_model", batch=True)
+    def predict(self, texts: list) -> list:
+        """
+        텍스트별 (라벨, 확률) 리스트를 반환합니다.
+        - 반환: [(best_label, best_prob, clean_prob), ...] (입력 순서 유지)
+        - batch_size 단위로 묶어 한 번에 추론합니다.
+        """
+        np = self._np
+        predictions = []
+
+        for i in range(0, len(texts), self.batch_size):
+            chunk = texts[i:i + self.batch_size]
+            inputs = np.array(chunk, dtype=object).reshape(-1, 1)
+            probs = self._probabilities(self.session.run(None, {self.input_name: inputs}))
+
+            for row in probs:
+                violation = row.copy()
+                violation[self.clean_index] = -1.0
+                best = int(violation.argmax())
+                predictions.append((self.labels[best], float(row[best]), float(row[self.clean_index])))
+
+        with self._lock:
+            self.counters["predicted"] += len(texts)
+            self.counters["batches"] += -(-len(texts) // self.batch_size)
+        return predictions
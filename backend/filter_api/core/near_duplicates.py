@@ -0,0 +1,167 @@
+import re
+import hashlib
+
+from . import spans as span_utils
+
+
+class NearDuplicateCluster:
+    """근접 중복 군집 (대표 댓글 1개 + 구성원)"""
+    __slots__ = ('cluster_id', 'representative', 'signature', 'members', 'result', 'action')
+
+    def __init__(self, cluster_id: int, representative, signature: tuple):
+        self.cluster_id = cluster_id
+        self.representative = representative
+        self.signature = signature
+        self.members = []   # [(label, similarity), ...]
+        self.result = None  # 대표 댓글 분석 결과 (asyncio.Future, 파이프라인이 채움)
+        self.action = None
+
+
+class NearDuplicateIndex:
+    """
+    근접 중복 댓글 색인 (요청 하나 동안 사용)
+    - 링크/숫자/이모지/반복 글자를 걷어낸 정규화 텍스트의 글자 n-gram으로 MinHash 서명을 만듭니다.
+      (해시 한 번으로 num_perm개 구간의 최솟값을 채우는 one-permutation 방식, 빈 구간은 오른쪽 구간 값으로 채움)
+    - LSH 밴드로 후보 군집을 찾고, 서명 일치율(자카드 유사도 추정치)이 threshold 이상인 대표가 있으면 그 군집에 넣습니다.
+    - 대표와 1차 필터 적중(단어/카테고리) 또는 링크/숫자 포함 여부가 다르면 묶지 않습니다. (판정이 달라질 수 있는 차이)
+    - min_length보다 짧은 댓글은 서명이 불안정하므로 묶지 않습니다.
+    """
+
+    PATH = "NEAR_DUPLICATE"
+
+    LINK_PATTERN = re.compile(r'(https?://\S+|www\.\S+|open\.kakao\.com/\S+|\S+\.(?:com|net|org|kr|ly|io|me)\S*|@\w+)', re.I)
+    DIGIT_PATTERN = re.compile(r'[0-9]')
+    REPEAT_PATTERN = re.compile(r'(.)\1{2,}')
+    SPACE_PATTERN = re.compile(r'\s+')
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, shingle_size: int = 3,
+                 min_length: int = 10):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_length = min_length
+
+        self.clusters = []
+        self._buckets = {}  # (밴드 번호, 가드, 밴드 값) -> [군집, ...]
+
+    # -------------------------------------------------
+    # 서명 (스레드 풀에서 실행 가능, 색인 상태를 바꾸지 않음)
+    # -------------------------------------------------
+
+    def shingle_text(self, original_text: str) -> str:
+        """서명용 텍스트 (링크/숫자/이모지/공백 제거, 3번 이상 반복되는 글자는 2번으로)"""
+        text = span_utils.normalize(self.LINK_PATTERN.sub(' ', original_text))
+        text = self.DIGIT_PATTERN.sub('', text)
+        text = self.REPEAT_PATTERN.sub(r'\1\1', text)
+        return self.SPACE_PATTERN.sub('', text)
+
+    def _guard(self, original_text: str, first_pass_result: dict) -> tuple:
+        """같은 군집이 되려면 일치해야 하는 값 (링크/숫자 포함 여부, 1차 적중 목록)"""
+        hits = tuple(sorted(
+            (item.get('type', ''), item.get('category') or '', item.get('word', ''))
+            for item in first_pass_result.get('detected_words', [])
+        ))
+        return (
+            bool(self.LINK_PATTERN.search(original_text)),
+            bool(self.DIGIT_PATTERN.search(original_text)),
+            hits,
+        )
+
+    def signature(self, original_text: str, first_pass_result: dict):
+        """(MinHash 서명, 가드), 너무 짧으면 None"""
+        text = self.shingle_text(original_text)
+        if len(text) < self.min_length:
+            return None
+
+        size = self.shingle_size
+        num_perm = self.num_perm
+        bins = [None] * num_perm
+        for shingle in {text[i:i + size] for i in range(len(text) - size + 1)}:
+            h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            slot, value = h % num_perm, h // num_perm
+            if bins[slot] is None or value < bins[slot]:
+                bins[slot] = value
+        return self._densify(bins), self._guard(original_text, first_pass_result)
+
+    @staticmethod
+    def _densify(bins: list) -> tuple:
+        """빈 구간은 오른쪽으로 가장 가까운 구간 값 + 거리로 채움 (두 텍스트에서 같은 규칙이므로 비교 가능)"""
+        size = len(bins)
+        filled = list(bins)
+        for slot in range(size):
+            if filled[slot] is None:
+                for distance in range(1, size):
+                    value = bins[(slot + distance) % size]
+                    if value is not None:
+                        filled[slot] = (value, distance)
+                        break
+        return tuple(filled)
+
+    def signatures(self, original_texts: list, first_pass_results: list) -> list:
+        return [self.signature(text, res) for text, res in zip(original_texts, first_pass_results)]
+
+    # -------------------------------------------------
+    # 군집 배정 (이벤트 루프/단일 스레드에서 호출)
+    # -------------------------------------------------
+
+    def similarity(self, left: tuple, right: tuple) -> float:
+        return sum(1 for a, b in zip(left, right) if a == b) / self.num_perm
+
+    def _bucket_keys(self, minhash: tuple, guard: tuple):
+        rows = self.rows
+        return [(band, guard, minhash[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def assign(self, label, signature):
+        """
+        서명을 군집에 배정합니다.
+        - 반환: (군집, 유사도) / 새 대표가 되면 (군집, None) / 서명이 없으면 (None, None)
+        """
+        if signature is None:
+            return None, None
+        minhash, guard = signature
+        keys = self._bucket_keys(minhash, guard)
+
+        best, best_similarity = None, 0.0
+        seen = set()
+        for key in keys:
+            for cluster in self._buckets.get(key, ()):
+                if cluster.cluster_id in seen:
+                    continue
+                seen.add(cluster.cluster_id)
+                similarity = self.similarity(minhash, cluster.signature)
+                if similarity > best_similarity:
+                    best, best_similarity = cluster, similarity
+
+        if best is not None and best_similarity >= self.threshold:
+            best.members.append((label, round(best_similarity, 3)))
+            return best, best_similarity
+
+        cluster = NearDuplicateCluster(len(self.clusters), label, minhash)
+        self.clusters.append(cluster)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(cluster)
+        return cluster, None
+
+    def audit(self) -> list:
+        """구성원이 있는 군집별 기록 (대표, 대표 판정, 구성원과 유사도)"""
+        return [
+            {
+                "cluster_id": cluster.cluster_id,
+                "representative": cluster.representative,
+                "action": cluster.action,
+                "size": 1 + len(cluster.members),
+                "members": [{"label": label, "similarity": similarity} for label, similarity in cluster.members],
+            }
+            for cluster in self.clusters if cluster.members
+        ]
+
+    def stats(self) -> dict:
+        clustered = sum(len(cluster.members) for cluster in self.clusters)
+        return {
+            "clusters": sum(1 for cluster in self.clusters if cluster.members),
+            "near_duplicate_comments": clustered,
+        }
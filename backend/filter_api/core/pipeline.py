@@ -0,0 +1,393 @@
+import os
+import sys
+import copy
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from .verdict_cache import VerdictCache
+from .early_exit_gate import EarlyExitGate
+from .tenants import TenantRegistry
+from .near_duplicates import NearDuplicateIndex
+from ..metrics import PIPELINE_PATHS
+
+# config.py를 찾기 위한 경로 설정
+current_dir = os.path.dirname(__file__)
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
+sys.path.append(backend_dir)
+
+try:
+    import config
+except ImportError:
+    print("Error: config.py를 찾을 수 없습니다.", file=sys.stderr)
+    print(f"Current Path: {sys.path}", file=sys.stderr)
+    sys.exit(1)
+
+
+class ModerationPipeline:
+    """
+    1차 필터 -> 2차 필터 -> 위험도 -> 정책 4단계를 묶어 실행하는 파이프라인
+    - 동기 경로(run, run_batch)와 asyncio 경로(run_async, run_batch_async)를 함께 제공합니다.
+    - asyncio 경로는 CPU 단계를 전용 스레드 풀로 넘기고, GPT 호출은 AsyncOpenAI로 동시에 수행합니다.
+    - verdict_cache가 주어지면 정규화 텍스트가 같은 댓글은 1차/2차 필터를 다시 실행하지 않습니다.
+    - early_exit_gate가 주어지면 1차 결과만으로 처분이 정해지는 댓글은 2차 필터를 건너뜁니다.
+    - tenant_registry가 주어지면 tenant_id(채널 ID)별 화이트/블랙리스트와 보안 레벨을 공용 사전 위에 적용합니다.
+    """
+
+    def __init__(self, first_filter, second_filter, risk_scorer, policy_manager, cpu_workers: int = 4,
+                 verdict_cache: VerdictCache = None, early_exit_gate: EarlyExitGate = None,
+                 tenant_registry: TenantRegistry = None):
+        self.first_filter = first_filter
+        self.second_filter = second_filter
+        self.risk_scorer = risk_scorer
+        self.policy_manager = policy_manager
+        self.verdict_cache = verdict_cache
+        self.early_exit_gate = early_exit_gate
+        self.tenant_registry = tenant_registry
+        self.cpu_workers = cpu_workers
+        self.executor = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="pipeline")
+
+    def fingerprint(self, tenant_id: str = None) -> str:
+        """판정 결과를 좌우하는 사전 버전 + config 값 (+ 채널 오버레이)의 지문"""
+        fingerprint = f"{self.first_filter.dictionary_version}:{VerdictCache.config_fingerprint(config)}"
+        overlay = self._tenant(tenant_id)
+        return fingerprint if overlay is None else f"{fingerprint}:{overlay.fingerprint}"
+
+    def _tenant(self, tenant_id):
+        """채널 오버레이 (채널 지정이 없거나 채널 사전 파일이 없으면 None)"""
+        if tenant_id is None:
+            return None
+        if self.tenant_registry is None:
+            raise ValueError("채널별 사전이 비활성화되어 있습니다. (config.TENANT_DICTIONARY_DIR)")
+        return self.tenant_registry.get(tenant_id)
+
+    # -------------------------------------------------
+    # 판정 캐시
+    # -------------------------------------------------
+
+    def _resolve(self, tenant_id):
+        """
+        이번 분석에 사용할 (사전 스냅샷, 채널 오버레이)
+        - 사전 감시 스레드가 없으면 여기서 사전 변경 여부를 확인합니다.
+        - 분석 도중 사전이 교체되어도 이 스냅샷으로 끝까지 처리합니다.
+        """
+        if not self.first_filter.watching:
+            self.first_filter.reload_if_changed(config.DICTIONARY_CHECK_INTERVAL)
+        return self.first_filter.snapshot, self._tenant(tenant_id)
+
+    def _cache_keys(self, texts, snapshot, overlay):
+        """
+        각 텍스트의 캐시 키를 계산합니다. (키에는 스냅샷의 사전 버전이 들어감)
+        - 정규화 텍스트 + 원문 신호 태그(2차 필터 특수 모듈을 정하므로 정규화 텍스트만으로는 부족)
+        (캐시를 사용하지 않으면 None 리스트)
+        """
+        if self.verdict_cache is None:
+            return [None] * len(texts)
+
+        # 이전 버전 항목 정리는 현재 사전 버전 기준 (교체 직전에 시작한 분석이 되돌리지 않도록)
+        self.verdict_cache.sync_version(self.first_filter.dictionary_version)
+
+        fingerprint = VerdictCache.config_fingerprint(config)
+        if overlay is not None:
+            fingerprint = f"{fingerprint}:{overlay.fingerprint}"
+        return [
+            self.verdict_cache.make_key(
+                self.first_filter.normalize_text(text), snapshot.version, fingerprint, self.first_filter.signal_tags(text)
+            )
+            for text in texts
+        ]
+
+    def _split_cached(self, texts, snapshot, overlay):
+        """
+        캐시 적중 결과와 새로 분석할 텍스트를 나눕니다.
+        - 반환: (적중 결과 리스트[없으면 None], {키: [인덱스, ...]}, 분석할 대표 텍스트 리스트)
+        - 같은 배치 안의 중복 텍스트도 대표 한 건만 분석합니다.
+        """
+        keys = self._cache_keys(texts, snapshot, overlay)
+        cached = [None] * len(texts)
+        pending = {}
+        pending_texts = []
+
+        for idx, (text, key) in enumerate(zip(texts, keys)):
+            if key is None:
+                pending[idx] = [idx]
+                pending_texts.append(text)
+                continue
+
+            if key not in pending:
+                hit = self.verdict_cache.get(key)
+                if hit is not None:
+                    cached[idx] = self._restore(text, hit)
+                    continue
+                pending[key] = []
+                pending_texts.append(text)
+            pending[key].append(idx)
+
+        return cached, pending, pending_texts
+
+    def _merge_cached(self, texts, cached, pending, analyzed):
+        """새로 분석한 결과를 캐시에 저장하고, 입력 순서대로 결과를 합칩니다."""
+        for key, res in zip(pending.keys(), analyzed):
+            indices = pending[key]
+            # GPT 응답 없이 판정한 결과(DEGRADED)는 저장하지 않음 (복구 후 다시 분석)
+            if (self.verdict_cache is not None and isinstance(key, str)
+                    and res.get('status') != self.second_filter.DEGRADED):
+                self.verdict_cache.put(key, self._strip(res))
+            cached[indices[0]] = res
+            for idx in indices[1:]:
+                cached[idx] = self._restore(texts[idx], res)
+        return cached
+
+    def _strip(self, res):
+        """캐시에 저장할 부분만 추출 (원문은 댓글마다 다르므로 제외)"""
+        return copy.deepcopy({k: v for k, v in res.items() if k != 'original_text'})
+
+    def _restore(self, text, cached_res):
+        restored = copy.deepcopy({k: v for k, v in cached_res.items() if k != 'original_text'})
+        restored['original_text'] = text
+        return restored
+
+    # -------------------------------------------------
+    # 조기 종료 게이트
+    # -------------------------------------------------
+
+    def _gate(self, first_results, level):
+        """각 1차 결과의 판정 경로를 정하고, 2차 필터로 보낼 결과만 골라냅니다."""
+        if self.early_exit_gate is None:
+            paths = [EarlyExitGate.FULL] * len(first_results)
+        else:
+            paths = [self.early_exit_gate.decide(res, level) for res in first_results]
+
+        to_second = [res for res, path in zip(first_results, paths) if path == EarlyExitGate.FULL]
+        return paths, to_second
+
+    def _merge_gated(self, first_results, paths, second_results):
+        """2차 필터 결과를 원래 위치에 되돌리고 판정 경로를 기록합니다."""
+        second_iter = iter(second_results)
+        merged = []
+        for res, path in zip(first_results, paths):
+            if path == EarlyExitGate.FULL:
+                res = next(second_iter)
+            res['pipeline_path'] = path
+            merged.append(res)
+        return merged
+
+    def _first_pass_many(self, texts, snapshot, overlay):
+        return self.first_filter.execute_batch(texts, snapshot=snapshot, overlay=overlay)
+
+    def _finalize_many(self, results, level):
+        """위험도 계산 및 최종 처분을 묶음 단위로 실행 (Step 3, 4)"""
+        scores = self.risk_scorer.execute_batch(results)
+        decisions = self.policy_manager.decide_actions(scores, results, level)
+        for res in results:
+            PIPELINE_PATHS.inc(path=res.get('pipeline_path', EarlyExitGate.FULL))
+
+        return [
+            {
+                "original_text": res['original_text'],
+                "processed_text": decision['processed_text'],
+                "action": decision['action'],
+                "score": score,
+                "pipeline_path": res.get('pipeline_path', EarlyExitGate.FULL),
+                "dictionary_version": res.get('dictionary_version'),
+                "degraded": res.get('status') == self.second_filter.DEGRADED,
+                "details": res
+            }
+            for res, score, decision in zip(results, scores, decisions)
+        ]
+
+    def _chunk(self, items):
+        """스레드 풀 워커 수만큼 연속 구간으로 나눔 (순서 유지)"""
+        size = max(1, -(-len(items) // self.cpu_workers))
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    # -------------------------------------------------
+    # 동기 경로
+    # -------------------------------------------------
+
+    def run(self, text: str, tenant_id: str = None) -> dict:
+        return self.run_batch([text], tenant_id)[0]
+
+    def run_batch(self, texts: list, tenant_id: str = None) -> list:
+        """여러 텍스트를 분석 (2차 필터는 배치 호출로 묶어서 수행, 입력 순서 유지)"""
+        snapshot, overlay = self._resolve(tenant_id)
+        level = overlay.security_level if overlay is not None else None
+        cached, pending, pending_texts = self._split_cached(texts, snapshot, overlay)
+
+        first_results = self._first_pass_many(pending_texts, snapshot, overlay)
+        paths, to_second = self._gate(first_results, level)
+        second_results = self.second_filter.execute_batch(to_second)
+        analyzed = self._merge_gated(first_results, paths, second_results)
+
+        filtered = self._merge_cached(texts, cached, pending, analyzed)
+        return self._finalize_many(filtered, level)
+
+    # -------------------------------------------------
+    # asyncio 경로
+    # -------------------------------------------------
+
+    async def _offload(self, func, *args):
+        """CPU 단계를 전용 스레드 풀에서 실행 (이벤트 루프 보호, 요청 컨텍스트 유지)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, contextvars.copy_context().run, func, *args)
+
+    async def run_async(self, text: str, tenant_id: str = None) -> dict:
+        results = await self.run_batch_async([text], tenant_id)
+        return results[0]
+
+    async def run_batch_async(self, texts: list, tenant_id: str = None) -> list:
+        """
+        여러 텍스트를 비동기로 분석합니다. 결과는 입력 순서를 그대로 유지합니다.
+        - 1차 필터: 워커 수만큼 나눠 스레드 풀에서 동시에 실행
+        - 조기 종료: 1차 결과만으로 처분이 정해지면 2차 필터 생략
+        - 2차 필터: 배치 호출을 동시에 진행 (동시 호출 수는 LLM_MAX_CONCURRENCY로 제한)
+        - 위험도/정책: 스레드 풀에서 묶음 단위로 실행
+        """
+        if not texts:
+            return []
+
+        snapshot, overlay = await self._offload(self._resolve, tenant_id)
+        return await self._analyze_async(texts, snapshot, overlay)
+
+    async def _analyze_async(self, texts, snapshot, overlay, first_results=None):
+        """
+        run_batch_async 본체 (스냅샷/오버레이를 정한 뒤)
+        - first_results: 이미 실행한 texts의 1차 필터 결과 (주어지면 1차 필터를 다시 실행하지 않음)
+          2차 필터가 결과를 제자리에서 갱신하므로, 한 번 넘긴 결과는 다시 넘기면 안 됩니다.
+        """
+        level = overlay.security_level if overlay is not None else None
+        cached, pending, pending_texts = await self._offload(self._split_cached, texts, snapshot, overlay)
+
+        if first_results is None:
+            parts = await asyncio.gather(*(
+                self._offload(self._first_pass_many, chunk, snapshot, overlay) for chunk in self._chunk(pending_texts)
+            ))
+            first_results = [res for part in parts for res in part]
+        else:
+            first_results = [first_results[indices[0]] for indices in pending.values()]
+
+        paths, to_second = await self._offload(self._gate, first_results, level)
+        second_results = await self.second_filter.execute_batch_async(to_second)
+        analyzed = self._merge_gated(first_results, paths, second_results)
+
+        filtered = await self._offload(self._merge_cached, texts, cached, pending, analyzed)
+        return await self._offload(self._finalize_many, filtered, level)
+
+    # -------------------------------------------------
+    # 근접 중복 묶음 분석 (asyncio 경로)
+    # -------------------------------------------------
+
+    def _propagate_many(self, first_results, clusters, similarities, level):
+        """대표 판정을 구성원에 전파 (2차 적발 항목 재배치 -> 위험도/정책은 구성원 텍스트로 다시 계산)"""
+        propagated = []
+        for res, cluster in zip(first_results, clusters):
+            res = self.second_filter.propagate(res, cluster.result.result()['details'])
+            res['pipeline_path'] = NearDuplicateIndex.PATH
+            propagated.append(res)
+
+        results = self._finalize_many(propagated, level)
+        for result, cluster, similarity in zip(results, clusters, similarities):
+            result['cluster'] = {
+                "id": cluster.cluster_id,
+                "representative": cluster.representative,
+                "similarity": round(similarity, 3),
+            }
+        return results
+
+    async def run_clustered_async(self, texts: list, index: NearDuplicateIndex, tenant_id: str = None,
+                                  labels: list = None) -> list:
+        """
+        근접 중복을 묶어 분석합니다. 결과는 입력 순서를 그대로 유지합니다.
+        - 1차 필터는 모든 댓글에 실행하고, 그 결과로 군집을 나눕니다. (index는 여러 호출에 걸쳐 공유 가능)
+        - 군집 대표(와 묶이지 않은 댓글)만 나머지 파이프라인을 실행하고 (1차 결과는 다시 계산하지 않음),
+          구성원은 대표의 2차 판정을 전파받아 위험도/정책만 다시 계산합니다.
+        - 대표 분석이 실패하면 그 군집의 구성원만 (다른 묶음의 구성원 포함) 대표 판정 대신 자신의 분석 결과를 사용합니다.
+        - 구성원 결과에는 cluster {id, representative, similarity}가 붙고, 군집 기록은 index.audit()로 조회합니다.
+        """
+        if not texts:
+            return []
+        labels = labels if labels is not None else list(range(len(texts)))
+
+        snapshot, overlay = await self._offload(self._resolve, tenant_id)
+        level = overlay.security_level if overlay is not None else None
+
+        parts = await asyncio.gather(*(
+            self._offload(self._first_pass_many, chunk, snapshot, overlay) for chunk in self._chunk(texts)
+        ))
+        first_results = [res for part in parts for res in part]
+        signatures = await self._offload(index.signatures, texts, first_results)
+
+        # 군집 배정은 이벤트 루프에서 한 번에 (동시에 진행 중인 다른 묶음과 같은 색인을 공유)
+        loop = asyncio.get_running_loop()
+        full, members = [], []
+        for idx, (label, signature) in enumerate(zip(labels, signatures)):
+            cluster, similarity = index.assign(label, signature)
+            if similarity is None:
+                if cluster is not None:
+                    cluster.result = loop.create_future()
+                full.append((idx, cluster))
+            else:
+                members.append((idx, cluster, similarity))
+
+        results = [None] * len(texts)
+        try:
+            analyzed = await self._analyze_async(
+                [texts[idx] for idx, _ in full], snapshot, overlay, [first_results[idx] for idx, _ in full]
+            )
+        except Exception as e:
+            # 대표 하나의 오류가 다른 군집까지 실패시키지 않도록 대표별로 다시 분석
+            # (실패한 묶음이 1차 결과를 이미 갱신했을 수 있으므로 1차 필터부터 다시 실행)
+            print(f"  [Warning] 군집 대표 묶음 분석 실패, 대표별로 다시 분석합니다: {e}")
+            retried = await asyncio.gather(*(
+                self._analyze_async([texts[idx]], snapshot, overlay) for idx, _ in full
+            ), return_exceptions=True)
+            analyzed = [res if isinstance(res, BaseException) else res[0] for res in retried]
+        except BaseException:
+            # 취소되면 이 대표를 기다리는 다른 묶음은 구성원 자신의 분석으로 대체
+            for _, cluster in full:
+                if cluster is not None and not cluster.result.done():
+                    cluster.result.cancel()
+            raise
+
+        error = None
+        for (idx, cluster), res in zip(full, analyzed):
+            if isinstance(res, BaseException):
+                error = error or res
+                if cluster is not None:
+                    cluster.result.set_exception(res)
+                    cluster.result.exception()  # 기다리는 구성원이 없어도 경고가 나지 않게 처리 표시
+                continue
+            results[idx] = res
+            if cluster is not None:
+                cluster.action = res['action']
+                cluster.result.set_result(res)
+        if error is not None:
+            raise error
+
+        if members:
+            # 다른 묶음에서 분석 중인 대표는 끝날 때까지 기다림
+            await asyncio.gather(*{cluster.result for _, cluster, _ in members}, return_exceptions=True)
+            # 대표 분석이 실패/취소된 군집의 구성원은 대표 판정 대신 자신의 분석 결과를 사용
+            failed = [
+                (idx, cluster, similarity) for idx, cluster, similarity in members
+                if cluster.result.cancelled() or cluster.result.exception() is not None
+            ]
+            members = [member for member in members if member not in failed]
+            if failed:
+                own = await self._analyze_async(
+                    [texts[idx] for idx, _, _ in failed], snapshot, overlay, [first_results[idx] for idx, _, _ in failed]
+                )
+                for (idx, _, _), res in zip(failed, own):
+                    results[idx] = res
+
+        if members:
+            propagated = await self._offload(
+                self._propagate_many,
+                [first_results[idx] for idx, _, _ in members],
+                [cluster for _, cluster, _ in members],
+                [similarity for _, _, similarity in members],
+                level
+            )
+            for (idx, _, _), res in zip(members, propagated):
+                results[idx] = res
+        return results
@@ -1,6 +1,9 @@
 import sys
 import os
 
+from . import spans as span_utils
+from ..metrics import timed
+
 # config.py를 찾기 위한 경로 설정
 current_dir = os.path.dirname(__file__)
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
@@ -17,7 +20,19 @@ class PolicyManager:
     def __init__(self):
         print(f"[System] Policy Manager 로드 (Level: {config.SECURITY_LEVEL})")
 
-    def decide_action(self, risk_score: float, filter_result: dict) -> dict:
+    @timed("policy", batch=True)
+    def decide_actions(self, risk_scores: list, filter_results: list, level: int = None) -> list:
+        """여러 결과의 처분 결정 (입력 순서 유지, 항목별 규칙 계산, level이 없으면 config.SECURITY_LEVEL)"""
+        return [
+            self._decide(risk_score, filter_result, level)
+            for risk_score, filter_result in zip(risk_scores, filter_results)
+        ]
+
+    @timed("policy")
+    def decide_action(self, risk_score: float, filter_result: dict, level: int = None) -> dict:
+        return self._decide(risk_score, filter_result, level)
+
+    def _decide(self, risk_score: float, filter_result: dict, level: int = None) -> dict:
         
         # 1. 원문 추출 (없으면 빈 문자열)
         # 1차 필터링 결과 dict 안에 'original_text' 키가 있다고 가정
@@ -31,15 +46,15 @@ class PolicyManager:
                 "score": risk_score
             }
 
-        # 3. 점수 초과 시 레벨별 처분
-        level = config.SECURITY_LEVEL
+        # 3. 점수 초과 시 레벨별 처분 (채널별 레벨이 있으면 우선)
+        level = level or config.SECURITY_LEVEL
         final_action = "PASS"
         processed_text = original_text
         
         # 문자열 오타만 조심하면 이 방식이 제일 빠르고 편함
         if level == 1:   # 관찰
             final_action = "MASKING"
-            processed_text = self._mask_text(original_text, filter_result.get('detected_words', []))
+            processed_text = self._mask_text(original_text, filter_result)
             
         elif level == 2: # 관대함
             final_action = "REVIEW_HUMAN"
@@ -63,10 +78,17 @@ class PolicyManager:
             "score": risk_score
         }
 
-    def _mask_text(self, text, detected_words):
-        """마스킹 처리"""
+    def _mask_text(self, text, filter_result):
+        """마스킹 처리 (적발 구간 정보가 있으면 원문 위에 한 번에 적용)"""
+        spans = filter_result.get('spans')
+        normalized_text = filter_result.get('normalized_text')
+        if spans is not None and normalized_text is not None:
+            masked_text = span_utils.mask(text, normalized_text, spans)
+            if masked_text is not None:
+                return masked_text
+
         masked_text = text
-        for item in detected_words:
+        for item in filter_result.get('detected_words', []):
             word = item.get('word', '')
             if word:
                 masked_text = masked_text.replace(word, "*" * len(word))
@@ -0,0 +1,164 @@
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더(여러 값, 약한 비교 W/ 포함)에 etag가 있는지"""
+    if not if_none_match or not etag:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in (tag[2:] if tag.startswith('W/') else tag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    워크플로 응답 캐시 (메모리, 서버 프로세스별)
+    - 키: 요청 파라미터(영상 ID, max_pages 등) + 판정 지문(사전 버전/config/채널 오버레이)
+      사전/설정이 바뀌면 지문이 달라지므로 이전 응답은 다시 쓰이지 않고 LRU/TTL로 자연히 빠집니다.
+    - TTL 동안은 분석 없이 저장된 응답을 돌려줍니다. (여러 관리자가 같은 영상을 열어 두어도 분석은 한 번)
+    - 같은 키의 요청이 동시에 들어오면 한 번만 분석하고 나머지는 그 결과를 기다립니다.
+    - ETag는 응답 내용의 해시라서, TTL이 지나 다시 분석해도 결과가 같으면 같은 ETag가 나옵니다. (If-None-Match -> 304)
+    - cacheable(body)가 False인 응답(예: GPT 응답 없이 판정한 댓글이 있는 응답)은 돌려주기만 하고 저장하지 않습니다.
+    """
+
+    HIT, MISS, COALESCED, REFRESH = "HIT", "MISS", "COALESCED", "REFRESH"
+
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, video_id, etag, body)
+        self._inflight = {}             # key -> asyncio.Future (분석 중인 요청)
+        self._generation = 0            # invalidate() 때마다 증가
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "not_modified": 0,
+            "uncacheable": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    # -------------------------------------------------
+    # 키 / ETag
+    # -------------------------------------------------
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        raw = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_etag(body: dict, volatile: tuple = (), volatile_stats: tuple = ()) -> str:
+        """
+        응답 내용의 ETag
+        - volatile / volatile_stats: 판정 내용이 같아도 분석할 때마다 달라지는 항목과 stats 항목 (해시에서 제외)
+        """
+        content = {k: v for k, v in body.items() if k not in volatile}
+        if 'stats' in content:
+            content['stats'] = {k: v for k, v in content['stats'].items() if k not in volatile_stats}
+        raw = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return '"' + hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32] + '"'
+
+    def not_modified(self, if_none_match: str, etag: str) -> bool:
+        """요청한 쪽이 이미 같은 응답을 가지고 있는지 (304 응답 수 집계)"""
+        matched = etag_matches(if_none_match, etag)
+        if matched:
+            self.counters["not_modified"] += 1
+        return matched
+
+    # -------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------
+
+    def peek(self, key: str):
+        """저장된 (etag, body) (없거나 만료되면 None), 조회 통계에는 넣지 않음"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[2], entry[3]
+
+    def _put(self, key: str, video_id: str, etag: str, body: dict):
+        self._entries[key] = (time.time() + self.ttl, video_id, etag, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def get_or_compute(self, key: str, video_id: str, compute, refresh: bool = False, cacheable=None):
+        """
+        캐시된 응답 또는 compute()의 결과 -> (etag, body, 상태)
+        - compute: (etag, body)를 반환하는 코루틴 함수, 실패하면 예외가 같은 키를 기다리던 요청에도 전달됩니다.
+        - 분석 도중 invalidate()가 불리거나 cacheable(body)가 False이면 결과를 돌려주기만 하고 저장하지 않습니다.
+          (이미 기다리던 요청은 이 결과를 함께 받음)
+        - refresh=True이면 저장된 응답을 쓰지 않고 다시 분석합니다. (이미 분석 중이면 그 결과를 기다림)
+        """
+        if not refresh:
+            cached = self.peek(key)
+            if cached is not None:
+                self.counters["hits"] += 1
+                return (*cached, self.HIT)
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                etag, body = await asyncio.shield(inflight)
+                self.counters["coalesced"] += 1
+                return etag, body, self.COALESCED
+            except asyncio.CancelledError:
+                # 먼저 분석하던 요청이 취소된 경우에만 직접 분석 (이 요청이 취소된 것이면 그대로 전달)
+                if not inflight.cancelled():
+                    raise
+                inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.counters["refreshes" if refresh else "misses"] += 1
+        generation = self._generation
+        try:
+            etag, body = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 요청이 없어도 경고가 나지 않게 처리 표시
+            raise
+        else:
+            if cacheable is not None and not cacheable(body):
+                self.counters["uncacheable"] += 1
+            elif generation == self._generation:
+                self._put(key, video_id, etag, body)
+            future.set_result((etag, body))
+        finally:
+            self._inflight.pop(key, None)
+        return etag, body, self.REFRESH if refresh else self.MISS
+
+    def invalidate(self, video_id: str = None) -> int:
+        """영상 하나(video_id) 또는 전체 응답 삭제 -> 삭제한 개수"""
+        if video_id is None:
+            keys = list(self._entries)
+        else:
+            keys = [key for key, entry in self._entries.items() if entry[1] == video_id]
+        for key in keys:
+            del self._entries[key]
+        self._generation += 1
+        self.counters["invalidations"] += len(keys)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["coalesced"] + self.counters["misses"]
+        stats = dict(self.counters)
+        stats["entries"] = len(self._entries)
+        stats["in_flight"] = len(self._inflight)
+        stats["ttl"] = self.ttl
+        stats["hit_rate"] = round((self.counters["hits"] + self.counters["coalesced"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,294 @@
+import json
+import time
+import sqlite3
+import threading
+
+
+class ResultStore:
+    """
+    판정 기록 저장소 (SQLite)
+    - 분석한 댓글/텍스트의 처분, 점수, 적발 구간(spans), 태그를 (채널, video_id, comment_id) 기준으로 보관합니다.
+      같은 댓글을 다시 분석하면 최신 판정으로 덮어씁니다. (단일 텍스트 분석은 video_id '', comment_id = 내용 해시)
+      채널(tenant_id)마다 사전/보안 레벨이 다르므로 같은 영상이라도 채널별로 따로 보관합니다. (채널 지정 없음은 '')
+    - position은 마지막 수집 때의 댓글 순서입니다. (영상 기록 조회를 analyze-youtube 응답과 같은 순서로)
+    - 대시보드 조회(처분/태그/점수 범위/시간 필터 + 페이지)는 파이프라인을 다시 실행하지 않고 색인으로 처리합니다.
+    - 영상 분석 상태(VideoStateStore)와 달리 사전/설정이 바뀐 뒤에도 이전 판정을 그대로 조회할 수 있습니다. (다시 분석하면 덮어씀)
+    """
+
+    ORDERS = {
+        "collected": "r.position IS NULL, r.position, r.analyzed_at DESC, r.comment_id",
+        "recent": "r.analyzed_at DESC, r.comment_id",
+        "score": "r.score DESC, r.comment_id",
+        "published": "r.published_at DESC, r.comment_id",
+    }
+    # 스키마가 바뀌면 올리고 _migrate에 이전 스키마 변환을 추가합니다.
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        legacy = version < self.SCHEMA_VERSION and self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'results'"
+        ).fetchone() is not None
+        if legacy:
+            self._db.executescript(
+                "ALTER TABLE results RENAME TO results_v1;"
+                "ALTER TABLE result_tags RENAME TO result_tags_v1;"
+                "ALTER TABLE videos RENAME TO videos_v1;"
+            )
+            for index in ("results_video_time", "results_video_action", "results_video_score", "results_video_published",
+                          "results_action_time", "results_time", "results_hash", "result_tags_comment"):
+                self._db.execute(f"DROP INDEX IF EXISTS {index}")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " tenant_id TEXT NOT NULL DEFAULT '',"
+            " video_id TEXT NOT NULL,"
+            " comment_id TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " parent_id TEXT,"
+            " author TEXT,"
+            " published_at TEXT,"
+            " position INTEGER,"
+            " original TEXT NOT NULL,"
+            " processed TEXT NOT NULL,"
+            " action TEXT NOT NULL,"
+            " score REAL NOT NULL,"
+            " pipeline_path TEXT,"
+            " degraded INTEGER NOT NULL DEFAULT 0,"
+            " tags TEXT NOT NULL,"
+            " spans TEXT,"
+            " analyzed_at REAL NOT NULL,"
+            " PRIMARY KEY (tenant_id, video_id, comment_id));"
+            "CREATE INDEX IF NOT EXISTS results_video_time ON results (video_id, analyzed_at);"
+            "CREATE INDEX IF NOT EXISTS results_video_position ON results (video_id, tenant_id, position);"
+            "CREATE INDEX IF NOT EXISTS results_video_action ON results (video_id, action, analyzed_at);"
+            "CREATE INDEX IF NOT EXISTS results_video_score ON results (video_id, score);"
+            "CREATE INDEX IF NOT EXISTS results_video_published ON results (video_id, published_at);"
+            "CREATE INDEX IF NOT EXISTS results_action_time ON results (action, analyzed_at);"
+            "CREATE INDEX IF NOT EXISTS results_time ON results (analyzed_at);"
+            "CREATE INDEX IF NOT EXISTS results_hash ON results (content_hash);"
+            "CREATE TABLE IF NOT EXISTS result_tags ("
+            " tag TEXT NOT NULL,"
+            " tenant_id TEXT NOT NULL DEFAULT '',"
+            " video_id TEXT NOT NULL,"
+            " comment_id TEXT NOT NULL,"
+            " PRIMARY KEY (tag, tenant_id, video_id, comment_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS result_tags_comment ON result_tags (tenant_id, video_id, comment_id);"
+            "CREATE TABLE IF NOT EXISTS videos ("
+            " tenant_id TEXT NOT NULL DEFAULT '',"
+            " video_id TEXT NOT NULL,"
+            " title TEXT,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (tenant_id, video_id));"
+        )
+        if legacy:
+            self._migrate_v1()
+        self._db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._db.commit()
+        print(f"  ㄴ 판정 기록 저장소 연결: {db_path}")
+
+    def _migrate_v1(self):
+        """v1 (채널이 키에 없던 스키마) -> 현재 스키마, 같은 댓글이 겹치면 나중에 분석한 기록을 남김"""
+        self._db.executescript(
+            "INSERT OR REPLACE INTO results (tenant_id, video_id, comment_id, content_hash, parent_id, author, published_at,"
+            " original, processed, action, score, pipeline_path, degraded, tags, spans, analyzed_at)"
+            " SELECT COALESCE(tenant_id, ''), video_id, comment_id, content_hash, parent_id, author, published_at,"
+            " original, processed, action, score, pipeline_path, degraded, tags, spans, analyzed_at"
+            " FROM results_v1 ORDER BY analyzed_at;"
+            "INSERT OR IGNORE INTO result_tags (tag, tenant_id, video_id, comment_id)"
+            " SELECT t.tag, COALESCE(r.tenant_id, ''), t.video_id, t.comment_id FROM result_tags_v1 t"
+            " JOIN results_v1 r ON r.video_id = t.video_id AND r.comment_id = t.comment_id;"
+            "INSERT OR REPLACE INTO videos (tenant_id, video_id, title, updated_at)"
+            " SELECT '', video_id, title, updated_at FROM videos_v1;"
+            "DROP TABLE results_v1;"
+            "DROP TABLE result_tags_v1;"
+            "DROP TABLE videos_v1;"
+        )
+        print("  ㄴ 판정 기록 저장소 스키마 변환 완료 (채널별 기록)")
+
+    # -------------------------------------------------
+    # 기록
+    # -------------------------------------------------
+
+    def save(self, video_id: str, items: list, tenant_id: str = None, reused: bool = False):
+        """
+        판정 기록 추가/갱신
+        - items: [(comment_id, content_hash, summary, spans, position), ...]
+          summary는 YoutubeCommentSummary 형식, spans는 [[start, end, source, category], ...] 또는 None,
+          position은 수집 순서 (텍스트 분석은 None)
+        - reused=True: 다시 분석하지 않고 재사용한 판정, 이미 기록이 있으면 수집 순서만 갱신하고
+          없으면(같은 판정 지문의 다른 채널 등) 새로 기록합니다.
+        """
+        if not items:
+            return
+        tenant_id = tenant_id or ''
+        now = time.time()
+        rows, keys, tag_rows = [], [], []
+        for comment_id, content_hash, summary, spans, position in items:
+            tags = sorted(set(summary.get('violation_tags', [])))
+            rows.append((
+                tenant_id, video_id, comment_id, content_hash, summary.get('parent_id'), summary.get('author'),
+                summary.get('published_at'), position, summary['original'], summary['processed'], summary['action'],
+                summary['risk_score'], summary.get('pipeline_path'), int(bool(summary.get('degraded'))),
+                json.dumps(tags, ensure_ascii=False),
+                json.dumps(spans, ensure_ascii=False) if spans is not None else None, now
+            ))
+            keys.append((tenant_id, video_id, comment_id))
+            tag_rows.extend((tag, tenant_id, video_id, comment_id) for tag in tags)
+
+        with self._lock:
+            if reused:
+                self._db.executemany(
+                    "INSERT INTO results (tenant_id, video_id, comment_id, content_hash, parent_id, author,"
+                    " published_at, position, original, processed, action, score, pipeline_path, degraded, tags, spans,"
+                    " analyzed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (tenant_id, video_id, comment_id) DO UPDATE SET position = excluded.position", rows
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO result_tags (tag, tenant_id, video_id, comment_id) VALUES (?, ?, ?, ?)",
+                    tag_rows
+                )
+                self._db.commit()
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results (tenant_id, video_id, comment_id, content_hash, parent_id, author,"
+                " published_at, position, original, processed, action, score, pipeline_path, degraded, tags, spans,"
+                " analyzed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.executemany(
+                "DELETE FROM result_tags WHERE tenant_id = ? AND video_id = ? AND comment_id = ?", keys
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO result_tags (tag, tenant_id, video_id, comment_id) VALUES (?, ?, ?, ?)", tag_rows
+            )
+            self._db.commit()
+
+    def save_video(self, video_id: str, title: str, tenant_id: str = None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO videos (tenant_id, video_id, title, updated_at) VALUES (?, ?, ?, ?)",
+                (tenant_id or '', video_id, title, time.time())
+            )
+            self._db.commit()
+
+    # -------------------------------------------------
+    # 조회
+    # -------------------------------------------------
+
+    @staticmethod
+    def _where(video_id=None, action=None, tag=None, min_score=None, max_score=None, since=None, until=None,
+               tenant_id=None):
+        clauses, args = [], []
+        if video_id is not None:
+            clauses.append("r.video_id = ?")
+            args.append(video_id)
+        if action is not None:
+            clauses.append("r.action = ?")
+            args.append(action)
+        if tag is not None:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM result_tags t WHERE t.tag = ? AND t.tenant_id = r.tenant_id"
+                " AND t.video_id = r.video_id AND t.comment_id = r.comment_id)"
+            )
+            args.append(tag)
+        if min_score is not None:
+            clauses.append("r.score >= ?")
+            args.append(min_score)
+        if max_score is not None:
+            clauses.append("r.score <= ?")
+            args.append(max_score)
+        if since is not None:
+            clauses.append("r.analyzed_at >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("r.analyzed_at < ?")
+            args.append(until)
+        if tenant_id is not None:  # '' = 채널 지정 없이 분석한 기록
+            clauses.append("r.tenant_id = ?")
+            args.append(tenant_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    @staticmethod
+    def _record(row) -> dict:
+        (tenant_id, video_id, comment_id, content_hash, parent_id, author, published_at, original, processed,
+         action, score, pipeline_path, degraded, tags, spans, analyzed_at) = row
+        return {
+            "video_id": video_id,
+            "comment_id": comment_id,
+            "content_hash": content_hash,
+            "tenant_id": tenant_id or None,
+            "parent_id": parent_id,
+            "author": author or "",
+            "published_at": published_at or "",
+            "original": original,
+            "processed": processed,
+            "action": action,
+            "risk_score": score,
+            "violation_tags": json.loads(tags),
+            "pipeline_path": pipeline_path or "FULL",
+            "degraded": bool(degraded),
+            "spans": json.loads(spans) if spans else None,
+            "analyzed_at": analyzed_at,
+        }
+
+    def query(self, order: str = "recent", offset: int = 0, limit: int = 100, **filters):
+        """
+        조건에 맞는 판정 기록 -> (전체 개수, 기록 리스트)
+        - filters: video_id, action, tag, min_score, max_score, since, until(analyzed_at, epoch 초),
+          tenant_id (None이면 모든 채널, ''이면 채널 지정 없이 분석한 기록)
+        """
+        if order not in self.ORDERS:
+            raise ValueError(f"order는 {', '.join(self.ORDERS)} 중 하나여야 합니다.")
+        where, args = self._where(**filters)
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM results r{where}", args).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT r.tenant_id, r.video_id, r.comment_id, r.content_hash, r.parent_id, r.author, r.published_at,"
+                " r.original, r.processed, r.action, r.score, r.pipeline_path, r.degraded, r.tags, r.spans, r.analyzed_at"
+                f" FROM results r{where} ORDER BY {self.ORDERS[order]} LIMIT ? OFFSET ?",
+                (*args, limit, offset)
+            ).fetchall()
+        return total, [self._record(row) for row in rows]
+
+    def video_summary(self, video_id: str, tenant_id: str = None):
+        """채널/영상별 집계 (analyze-youtube의 stats와 같은 항목), 기록이 없으면 None"""
+        tenant_id = tenant_id or ''
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*),"
+                " COALESCE(SUM(action != 'PASS'), 0),"
+                " COALESCE(SUM(pipeline_path LIKE 'EARLY_EXIT%'), 0),"
+                " COALESCE(SUM(pipeline_path = 'NEAR_DUPLICATE'), 0),"
+                " COALESCE(SUM(degraded), 0),"
+                " MAX(analyzed_at)"
+                " FROM results WHERE tenant_id = ? AND video_id = ?", (tenant_id, video_id)
+            ).fetchone()
+            title = self._db.execute(
+                "SELECT title FROM videos WHERE tenant_id = ? AND video_id = ?", (tenant_id, video_id)
+            ).fetchone()
+        total, blocked, early_exit, near_duplicate, degraded, analyzed_at = row
+        if not total:
+            return None
+        return {
+            "video_info": {"title": title[0] if title and title[0] else "Unknown", "id": video_id},
+            "stats": {
+                "total_comments": total,
+                "blocked_comments": blocked,
+                "clean_comments": total - blocked,
+                "early_exit_comments": early_exit,
+                "near_duplicate_comments": near_duplicate,
+                "degraded_comments": degraded,
+                "analyzed_comments": 0,  # 저장된 기록만 조회 (새로 분석하지 않음)
+            },
+            "analyzed_at": analyzed_at,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            videos = self._db.execute("SELECT COUNT(DISTINCT video_id) FROM results WHERE video_id != ''").fetchone()[0]
+        return {"entries": entries, "videos": videos}
@@ -1,6 +1,16 @@
 import re
 
+from .spans import DICTIONARY_SOURCES
+from ..metrics import timed
+
 class RiskScorer:
+    # 연속 욕설 토큰 탐색용 정규식 (span 정보가 없는 입력용, 매 호출마다 컴파일하지 않도록 미리 준비)
+    SEQUENCE_PATTERN = re.compile(r'(?:__[BF]__\s*){2,}')
+    TOKEN_PATTERN = re.compile(r'__[BF]__')
+    # 두 적발 구간 사이에 공백 외 글자가 있는지 확인
+    GAP_PATTERN = re.compile(r'\S')
+    PLACEHOLDER_LEN = len("__F__")
+
     def __init__(self):
         self.weights = {
             'BASE_SYSTEM': 0.4,      # 기본 점수
@@ -17,16 +27,26 @@ class RiskScorer:
         }
         print("[System] Risk Scorer(위험도 분석기) 로드 완료")
 
+    @timed("risk_score")
     def execute(self, filter_result: dict) -> float:
         """
         1차 필터링 결과를 바탕으로 위험도 점수(0.0 ~ 1.0)를 계산합니다.
         """
+        return self._score(filter_result)
+
+    def _score(self, filter_result: dict) -> float:
         # 1. 데이터 추출
         detected_words = filter_result.get('detected_words', [])
-        text_for_filtering = filter_result.get('text_for_filtering', "")
         
         if not detected_words:
             return 0.0
+
+        spans = filter_result.get('spans')
+        normalized_text = filter_result.get('normalized_text')
+        if spans is not None and normalized_text is not None:
+            density, sequence_lengths = self._span_features(normalized_text, spans, detected_words)
+        else:
+            density, sequence_lengths = self._text_features(filter_result.get('text_for_filtering', ""), detected_words)
         
         # 2. 기본 점수 (Base Score)
         has_blacklist = any(item['type'] == 'USER_BLACKLIST' for item in detected_words)
@@ -42,21 +62,13 @@ class RiskScorer:
         total_score += min((count - 1) * self.weights['COUNT_BONUS'], self.weights['COUNT_MAX'])
         
         # (B) 밀도 (Density)
-        text_len = len(text_for_filtering.replace(" ", ""))
-        if text_len > 0:
-            detected_words_len = sum(len(item['word']) for item in detected_words)
-            density = detected_words_len / text_len
-            if density > 0.4:
-                total_score += self.weights['DENSITY_BONUS']
+        if density > 0.4:
+            total_score += self.weights['DENSITY_BONUS']
 
         # (C) 연속성 (Consecutive Degree)
-        # "__B__" 또는 "__F__" 토큰이 2개 이상 연속으로 나오는 시퀀스 탐색
-        sequences = re.findall(r'(?:__[BF]__\s*){2,}', text_for_filtering)
-        
+        # 사전 적발 구간(블랙리스트/시스템)이 공백만 사이에 두고 2개 이상 이어지는 시퀀스
         consecutive_score = 0.0
-        for seq in sequences:
-            # 발견된 시퀀스 안에서 토큰(__F__, __B__) 수 계산
-            seq_len = len(re.findall(r'__[BF]__', seq))
+        for seq_len in sequence_lengths:
             if seq_len >= 2:
                 consecutive_score += min(self.weights['CONSECUTIVE_BONUS'] * (seq_len - 1), self.weights['CONSECUTIVE_LEN_MAX'])
         
@@ -64,6 +76,56 @@ class RiskScorer:
 
         # 4. 최종 마무리
         return min(round(total_score, 2), 1.0)
+
+    def _span_features(self, normalized_text: str, spans: list, detected_words: list):
+        """
+        적발 구간(span)에서 밀도와 연속 시퀀스 길이를 바로 계산합니다. (자리표시자 텍스트를 만들지 않음)
+        - 밀도의 분모는 기존 점수 체계와 같도록 '구간을 자리표시자(5글자)로 바꾼 텍스트'의 길이로 계산합니다.
+        """
+        text_len = len(normalized_text) - normalized_text.count(" ")
+        sequence_lengths = []
+        run = 0
+        prev_end = None
+
+        for start, end, source, _ in sorted(spans, key=lambda span: span[0]):
+            # 공백은 이미 길이에서 뺐으므로 구간의 공백 외 글자 수만큼만 자리표시자로 바꿈 (예: '씨 발')
+            text_len += self.PLACEHOLDER_LEN - (end - start - normalized_text.count(" ", start, end))
+            if source not in DICTIONARY_SOURCES:
+                continue
+
+            if prev_end is not None and not self.GAP_PATTERN.search(normalized_text, prev_end, start):
+                run += 1
+            else:
+                if run:
+                    sequence_lengths.append(run)
+                run = 1
+            prev_end = end
+
+        if run:
+            sequence_lengths.append(run)
+
+        density = 0.0
+        if text_len > 0:
+            density = sum(len(item['word']) for item in detected_words) / text_len
+        return density, sequence_lengths
+
+    def _text_features(self, text_for_filtering: str, detected_words: list):
+        """span 정보가 없는 입력(단위 API 등)은 자리표시자 텍스트에서 계산합니다."""
+        text_len = len(text_for_filtering.replace(" ", ""))
+        density = 0.0
+        if text_len > 0:
+            density = sum(len(item['word']) for item in detected_words) / text_len
+
+        # "__B__" 또는 "__F__" 토큰이 2개 이상 연속으로 나오는 시퀀스 탐색
+        sequence_lengths = [
+            len(self.TOKEN_PATTERN.findall(seq)) for seq in self.SEQUENCE_PATTERN.findall(text_for_filtering)
+        ]
+        return density, sequence_lengths
+
+    @timed("risk_score", batch=True)
+    def execute_batch(self, filter_results: list) -> list:
+        """여러 필터링 결과의 위험도 점수 (입력 순서 유지, 항목별 규칙 계산이며 단계 지표는 묶음당 한 번 기록)"""
+        return [self._score(filter_result) for filter_result in filter_results]
     
 if __name__ == "__main__":
     print("==========================================")
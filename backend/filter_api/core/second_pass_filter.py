@@ -1,8 +1,18 @@
+import re
 import json
-import openai
+import asyncio
+import threading
+import contextvars
 import sys
 import os
 
+from . import spans as span_utils
+from .local_classifier import LocalClassifier
+from .llm_dispatcher import (
+    LLMDispatcher, AdaptiveConcurrencyLimiter, CircuitBreaker, LLMUnavailableError, deadline_scope
+)
+from ..metrics import LLM_REQUESTS, LLM_TOKENS, DEGRADED_RESULTS
+
 # config.py를 찾기 위한 경로 설정
 current_dir = os.path.dirname(__file__)
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
@@ -16,31 +26,158 @@ except ImportError:
     sys.exit(1)
 
 class SecondPassFilter:
+    # GPT 응답을 받지 못해 1차 결과만으로 판정한 결과의 status (사유는 degraded_reason)
+    DEGRADED = "DEGRADED"
+    # 적발 구문 없이 댓글 전체에 대해 내린 판정 (로컬 문장 분류 모델)의 scope
+    COMMENT_SCOPE = "comment"
+
     def __init__(self, api_key=None):
-        api_key = config.OPENAI_API_KEY
-        
-        if api_key:
-            # 키가 있으면 정상적으로 클라이언트 생성
-            self.client = openai.OpenAI(api_key=api_key)
-        else:
-            # 키가 없으면 클라이언트를 None으로 설정하고 경고 출력
-            self.client = None
+        self._api_key = config.OPENAI_API_KEY
+        self._client = None
+        self._async_client = None
+        self._init_lock = threading.Lock()
+
+        if not self._api_key:
+            # 키가 없으면 클라이언트는 계속 None이며 경고만 출력
             print("[WARNING] OPENAI_API_KEY가 설정되지 않았습니다. 2차 필터링(AI)이 비활성화됩니다.")    
         
         self.special_ai_modules = config.SPECIAL_AI_MODULES
         self.basic_ai_module = config.BASIC_AI_MODULE
 
-    def _construct_prompt(self, text):
+        self.batch_size = config.LLM_BATCH_SIZE
+        self.batch_token_budget = config.LLM_BATCH_TOKEN_BUDGET
+
+        # GPT 호출 계층 (동시 호출 수 자동 조절 / 재시도 / 회로 차단)
+        self.dispatcher = LLMDispatcher(
+            AdaptiveConcurrencyLimiter(
+                config.LLM_INITIAL_CONCURRENCY,
+                minimum=config.LLM_MIN_CONCURRENCY,
+                maximum=config.LLM_MAX_CONCURRENCY,
+                latency_target=config.LLM_LATENCY_TARGET
+            ),
+            CircuitBreaker(failure_threshold=config.LLM_BREAKER_FAILURES, reset_timeout=config.LLM_BREAKER_RESET),
+            max_retries=config.LLM_MAX_RETRIES,
+            base_delay=config.LLM_RETRY_BASE_DELAY,
+            max_delay=config.LLM_RETRY_MAX_DELAY,
+            call_timeout=config.LLM_CALL_TIMEOUT,
+            request_deadline=config.LLM_REQUEST_DEADLINE
+        )
+
+        # 로컬 CPU 분류 모델 (USE_DETAIL_AI_MODEL) - 확신도가 높은 댓글은 GPT 호출 없이 판정
+        self._local_model = None
+        self._local_model_loaded = not config.USE_DETAIL_AI_MODEL
+        self.local_confidence = config.DETAIL_MODEL_CONFIDENCE
+        self.routing_counters = {"local": 0, "escalated": 0}
+        self._routing_lock = threading.Lock()  # 파이프라인 스레드 풀에서 동시에 갱신
+
+        # 태그 조합별 판단 기준 블록 캐시 (기본 모듈만 / 모듈 1개짜리 조합은 미리 생성)
+        self._criteria_cache = {}
+        self._construct_criteria(())
+        for category in self.special_ai_modules:
+            self._construct_criteria((category,))
+
+        # LAZY_INIT이면 OpenAI 클라이언트/로컬 모델은 warm_up() 또는 첫 사용 시점에 준비
+        if not config.LAZY_INIT:
+            self.warm_up()
+
+    # -------------------------------------------------
+    # 지연 초기화 (OpenAI 클라이언트 / 로컬 모델)
+    # -------------------------------------------------
+
+    def warm_up(self):
+        """OpenAI 클라이언트 생성 + 로컬 분류 모델 로드"""
+        if self._api_key:
+            self._create_clients()
+        self._load_local_model()
+
+    def _create_clients(self):
+        with self._init_lock:
+            if self._client is None:
+                import openai  # 임포트 비용이 커서(수백 ms) 클라이언트가 필요한 시점에만 임포트
+                # 재시도는 dispatcher가 담당 (SDK 자체 재시도와 겹치지 않도록 끔)
+                self._client = openai.OpenAI(api_key=self._api_key, max_retries=0)
+                self._async_client = openai.AsyncOpenAI(api_key=self._api_key, max_retries=0)
+
+    @property
+    def client(self):
+        """동기 OpenAI 클라이언트 (API 키가 없으면 None)"""
+        if self._client is None and self._api_key:
+            self._create_clients()
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def async_client(self):
+        """비동기 OpenAI 클라이언트 (API 키가 없으면 None)"""
+        if self._async_client is None and self._api_key:
+            self._create_clients()
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, value):
+        self._async_client = value
+
+    def _load_local_model(self):
+        with self._init_lock:
+            if not self._local_model_loaded:
+                model = LocalClassifier(
+                    os.path.join(backend_dir, config.BASE_MODEL_PATH),
+                    config.DETAIL_MODEL_LABELS,
+                    batch_size=config.DETAIL_MODEL_BATCH_SIZE,
+                    num_threads=config.DETAIL_MODEL_THREADS
+                )
+                self._local_model = model if model.available else None
+                self._local_model_loaded = True
+
+    @property
+    def local_model(self):
+        """로컬 분류 모델 (비활성화/로드 실패 시 None)"""
+        if not self._local_model_loaded:
+            self._load_local_model()
+        return self._local_model
+
+    @local_model.setter
+    def local_model(self, value):
+        self._local_model = value
+        self._local_model_loaded = True
+
+    def _tags_of(self, first_pass_result):
         """
-        [프롬프트 생성 담당] 질문 텍스트를 만듭니다.
+        1차 필터가 붙인 태그 중 활성화할 특수 모듈 (config 순서로 정렬된 튜플)
+        - 태그 정보가 없는 입력은 모든 특수 모듈을 적용합니다.
         """
+        tags = first_pass_result.get('tags')
+        if tags is None:
+            return tuple(self.special_ai_modules)
+        return tuple(category for category in self.special_ai_modules if category in tags)
+
+    def _construct_criteria(self, tags=()):
+        """
+        [판단 기준 생성] 기본 모듈 + 태그로 활성화된 특수 모듈 지침을 하나의 블록으로 만듭니다.
+        - 태그 조합별로 한 번만 만들고 캐싱합니다.
+        """
+        criteria = self._criteria_cache.get(tags)
+        if criteria is not None:
+            return criteria
+
         check_list = []
         for rule in self.basic_ai_module:
             check_list.append(f"- [기본검사] {rule}")
-        for category, rule in self.special_ai_modules.items():
-            check_list.append(f"- [{category}] {rule}")
+        for category in tags:
+            check_list.append(f"- [{category}] {self.special_ai_modules[category]}")
 
         criteria = "\n".join(check_list)
+        self._criteria_cache[tags] = criteria
+        return criteria
+
+    def _construct_prompt(self, text, tags=()):
+        """
+        [프롬프트 생성 담당] 질문 텍스트를 만듭니다.
+        """
+        criteria = self._construct_criteria(tags)
 
         return f"""
         분석할 댓글: "{text}"
@@ -64,68 +201,439 @@ class SecondPassFilter:
         }}
         """
 
+    def _construct_batch_prompt(self, items, tags=()):
+        """
+        [배치 프롬프트 생성 담당] 여러 댓글을 하나의 질문으로 묶습니다.
+        - items: [(id, text), ...] / 판단 기준 블록은 한 번만 포함됩니다.
+        - tags: 배치 안 댓글들이 공유하는 특수 모듈 태그
+        """
+        criteria = self._construct_criteria(tags)
+        comments = "\n".join(
+            f"{item_id}: {json.dumps(text, ensure_ascii=False)}" for item_id, text in items
+        )
+
+        return f"""
+        분석할 댓글 목록 (형식: id: "댓글"):
+        {comments}
+        
+        [판단 기준]
+        다음의 모든 기준을 적용하여 각 댓글을 독립적으로 엄격하게 검사하세요:
+        {criteria}
+        
+        각 댓글에서 위반되는 '구체적인 부분(단어, 구문)'을 모두 찾아내어 아래 JSON 형식으로 응답하세요.
+        모든 댓글 id에 대해 결과를 하나씩 반환해야 하며, 위반이 없으면 detected_items를 빈 배열로 두세요.
+        
+        {{
+            "results": [
+                {{
+                    "id": integer (댓글 id),
+                    "detected_items": [
+                        {{
+                            "keyword": "문제된 단어/구문",
+                            "category": "위반 모듈명 (예: PRIVACY, SEXUAL)"
+                        }}
+                    ],
+                    "reason": "판단 사유",
+                    "severity": integer (1~5)
+                }}
+            ]
+        }}
+        """
+
+    def _estimate_tokens(self, text):
+        """대략적인 토큰 수 추정 (한글은 글자당 약 1토큰으로 보수적으로 계산)"""
+        return len(text) + 8
+
+    def _split_batches(self, indexed_texts):
+        """
+        배치 크기(LLM_BATCH_SIZE)와 토큰 예산(LLM_BATCH_TOKEN_BUDGET)을 넘지 않도록
+        [(id, text), ...]를 묶음 리스트로 나눕니다.
+        """
+        batches = []
+        current = []
+        current_tokens = 0
+
+        for idx, text in indexed_texts:
+            tokens = self._estimate_tokens(text)
+            if current and (len(current) >= self.batch_size or current_tokens + tokens > self.batch_token_budget):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((idx, text))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _plan_batches(self, first_pass_results):
+        """
+        태그 조합이 같은 댓글끼리 모아 배치로 나눕니다.
+        - 반환: [(tags, [(id, text), ...]), ...] / 배치마다 필요한 모듈 지침만 프롬프트에 넣기 위함
+        """
+        groups = {}
+        for idx, res in enumerate(first_pass_results):
+            groups.setdefault(self._tags_of(res), []).append((idx, res.get('text_for_filtering', '')))
+
+        return [
+            (tags, batch)
+            for tags, indexed_texts in groups.items()
+            for batch in self._split_batches(indexed_texts)
+        ]
+
+    def _request_args(self, prompt):
+        return dict(
+            model="gpt-4o-mini", # 또는 "gpt-3.5-turbo" (가성비 모델)
+            messages=[
+                {"role": "system", "content": "You are a strict content moderator. Output in JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"}, # JSON 모드 강제 (중요)
+            temperature=0.0 # 일관된 분석을 위해 0으로 설정
+        )
+
     def _call_openai_api(self, prompt):
         """
         [API 통신 담당] 실제 GPT에게 질문을 던지고 JSON 결과를 받아옵니다.
+        - 재시도/회로 차단은 dispatcher가 담당하며, 끝내 응답을 받지 못하면 LLMUnavailableError를 던집니다.
         """
         if self.client is None:
             # 빈 응답을 반환하여 2차 필터링 로직이 정상적으로 통과되게 함
             return {"detected_items": [], "reason": "API Key Missing", "severity": 0}
 
+        response = self.dispatcher.call(self.client.chat.completions.create, **self._request_args(prompt))
+        return self._parse_response(response)
+
+    async def _call_openai_api_async(self, prompt):
+        """
+        [API 통신 담당 - 비동기] AsyncOpenAI로 호출하며, 동시 호출 수는 dispatcher가 조절합니다.
+        """
+        if self.async_client is None:
+            return {"detected_items": [], "reason": "API Key Missing", "severity": 0}
+
+        response = await self.dispatcher.call_async(self.async_client.chat.completions.create, **self._request_args(prompt))
+        return self._parse_response(response)
+
+    def _parse_response(self, response):
+        """응답 본문(JSON) 추출 + 사용 토큰 수 기록"""
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            LLM_TOKENS.inc(getattr(usage, 'prompt_tokens', 0) or 0, kind="prompt")
+            LLM_TOKENS.inc(getattr(usage, 'completion_tokens', 0) or 0, kind="completion")
+
+        content = response.choices[0].message.content
+        if not content:
+            LLM_REQUESTS.inc(result="empty")
+            return {}
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini", # 또는 "gpt-3.5-turbo" (가성비 모델)
-                messages=[
-                    {"role": "system", "content": "You are a strict content moderator. Output in JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"}, # JSON 모드 강제 (중요)
-                temperature=0.0 # 일관된 분석을 위해 0으로 설정
-            )
-            content = response.choices[0].message.content
-            if not content:
-                return {}
-            return json.loads(content)
-            
+            parsed = json.loads(content)
+        except ValueError:
+            LLM_REQUESTS.inc(result="invalid_json")
+            return {}
+        LLM_REQUESTS.inc(result="ok")
+        return parsed if isinstance(parsed, dict) else {}
+
+    def _index_batch_response(self, gpt_response):
+        """배치 응답의 results 배열을 {id: item} 형태로 변환"""
+        answered = {}
+        for item in gpt_response.get('results', []) or []:
+            try:
+                answered[int(item.get('id'))] = item
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return answered
+
+    def _apply_ai_items(self, second_pass_result, ai_detected_items):
+        """
+        [결과 처리 담당] AI 적발 항목을 결과에 누적합니다.
+        - 적발 위치는 span으로 기록하고, text_for_filtering은 마지막에 한 번만 다시 만듭니다.
+        """
+        if ai_detected_items:
+            second_pass_result['status'] = "FILTERED_BY_SECOND_PASS"
+
+            normalized_text = second_pass_result.get('normalized_text')
+            spans = second_pass_result.get('spans')
+            words = []
+
+            for item in ai_detected_items:
+                word = item.get('keyword', '')
+                category = item.get('category', 'DETECTED')
+
+                if item.get('scope') == self.COMMENT_SCOPE:
+                    # 댓글 전체에 대한 판정 (적발 구문 없음): 적발 항목만 기록하고 구간/마스킹은 만들지 않음
+                    second_pass_result['detected_words'].append({
+                        "word": "",
+                        "type": f"AI_{category.upper()}",
+                        "scope": self.COMMENT_SCOPE
+                    })
+                elif word:
+                    # 리스트에 추가
+                    second_pass_result['detected_words'].append({
+                        "word": word,
+                        "type": f"AI_{category.upper()}"
+                    })
+                    words.append(word)
+
+                    if spans is not None and normalized_text is not None:
+                        for start, end in span_utils.locate(normalized_text, word, spans):
+                            spans.append((start, end, 'AI', category.upper()))
+
+            # 텍스트 수정
+            if spans is not None and normalized_text is not None:
+                spans.sort(key=lambda span: span[0])
+                second_pass_result['text_for_filtering'] = span_utils.render(normalized_text, spans)
+            elif words:
+                # span 정보가 없는 입력(단위 API 등)은 적발 단어를 한 번의 정규식 치환으로 처리
+                pattern = "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+                second_pass_result['text_for_filtering'] = re.sub(pattern, "__S__", second_pass_result['text_for_filtering'])
+
+        return second_pass_result
+
+    def _apply_response(self, second_pass_result, gpt_response):
+        """단건 응답 적용 (detected_items가 없는 빈/깨진 응답은 '적발 없음'이 아니라 DEGRADED)"""
+        ai_detected_items = gpt_response.get('detected_items')
+        if not isinstance(ai_detected_items, list):
+            return self._degrade(second_pass_result, "invalid_response")
+        return self._apply_ai_items(second_pass_result, ai_detected_items)
+
+    def _degrade(self, second_pass_result, reason):
+        """
+        GPT 응답을 받지 못한 댓글 표시
+        - 1차 적발 항목은 그대로 두므로 위험도/정책은 1차 결과만으로 계산됩니다.
+        - 파이프라인은 DEGRADED 결과를 판정 캐시에 저장하지 않습니다. (다음 요청에서 다시 분석)
+        """
+        second_pass_result['status'] = self.DEGRADED
+        second_pass_result['degraded_reason'] = reason
+        DEGRADED_RESULTS.inc(reason=reason)
+        return second_pass_result
+
+    def _local_items(self, label):
+        """
+        로컬 모델의 위반 판정 -> detected_items
+        - 문장 단위 분류라 어느 구문 때문인지 알 수 없으므로, 적발 구문 없이 댓글 전체 판정으로 기록합니다.
+          (임의의 구간을 적발 구문으로 표시/마스킹하지 않음)
+        """
+        return [{"keyword": "", "category": label, "scope": self.COMMENT_SCOPE}]
+
+    def _run_local_model(self, results, can_escalate):
+        """
+        로컬 모델로 먼저 판정합니다. (results를 제자리에서 갱신)
+        - 정상/위반 확률이 DETAIL_MODEL_CONFIDENCE 이상이면 로컬 판정을 확정합니다.
+        - 나머지는 GPT로 보낼 인덱스로 반환합니다. GPT를 쓸 수 없으면 로컬 판정을 그대로 사용합니다.
+        """
+        if self.local_model is None or not results:
+            return list(range(len(results)))
+
+        try:
+            predictions = self.local_model.predict([res.get('text_for_filtering', '') for res in results])
         except Exception as e:
-            print(f"OpenAI API 호출 실패: {e}")
-            return {} # 실패 시 빈 객체 반환하여 로직이 안 터지게 함
+            print(f"  [Error] 로컬 분류 모델 추론 실패: {e}")
+            return list(range(len(results)))
+
+        escalate = []
+        for idx, (label, prob, clean_prob) in enumerate(predictions):
+            if clean_prob >= self.local_confidence:
+                continue
+            if prob >= self.local_confidence or not can_escalate:
+                if prob > clean_prob:
+                    results[idx] = self._apply_ai_items(results[idx], self._local_items(label))
+                continue
+            escalate.append(idx)
+
+        with self._routing_lock:
+            self.routing_counters["local"] += len(results) - len(escalate)
+            self.routing_counters["escalated"] += len(escalate)
+        return escalate
+
+    def propagate(self, first_pass_result, source_result):
+        """
+        다른 댓글(근접 중복 대표)의 2차 적발 항목을 이 댓글의 1차 결과에 적용합니다. (AI 호출 없음)
+        - 적발 구문은 이 댓글의 정규화 텍스트에서 다시 찾아 span을 만듭니다.
+        - 대표가 DEGRADED이면 이 댓글도 DEGRADED로 표시합니다.
+        """
+        if source_result.get('status') == self.DEGRADED:
+            return self._degrade(first_pass_result, source_result.get('degraded_reason', "unknown"))
+        items = [
+            {"keyword": item['word'], "category": item['type'][len("AI_"):], "scope": item.get('scope')}
+            for item in source_result.get('detected_words', [])
+            if item.get('type', '').startswith("AI_")
+        ]
+        return self._apply_ai_items(first_pass_result, items)
 
     def execute(self, first_pass_result):
         """
         메인 실행 함수
         """
+        if self.local_model is not None and not self._run_local_model([first_pass_result], self.client is not None):
+            return first_pass_result
+        with deadline_scope(self.dispatcher.request_deadline):
+            return self._execute_gpt(first_pass_result)
+
+    def _execute_gpt(self, first_pass_result):
+        """GPT 단건 분석"""
         second_pass_result = first_pass_result
 
         try:
-            # 1. 프롬프트 생성
-            prompt_text = self._construct_prompt(second_pass_result.get('text_for_filtering', ''))
+            # 1. 프롬프트 생성 (1차 필터 태그에 해당하는 모듈만 포함)
+            prompt_text = self._construct_prompt(
+                second_pass_result.get('text_for_filtering', ''), self._tags_of(second_pass_result)
+            )
             
-            # 2. API 호출
-            gpt_response = self._call_openai_api(prompt_text)
+            # 2. API 호출 (응답을 받지 못하면 1차 결과만으로 판정)
+            try:
+                gpt_response = self._call_openai_api(prompt_text)
+            except LLMUnavailableError as e:
+                return self._degrade(second_pass_result, e.reason)
 
             # 3. 결과 처리
-            ai_detected_items = gpt_response.get('detected_items', [])
-            
-            if ai_detected_items:
-                second_pass_result['status'] = "FILTERED_BY_SECOND_PASS"
-
-                for item in ai_detected_items:
-                    word = item.get('keyword', '')
-                    category = item.get('category', 'DETECTED')
-                    
-                    if word:
-                        # 리스트에 추가
-                        second_pass_result['detected_words'].append({
-                            "word": word,
-                            "type": f"AI_{category.upper()}"
-                        })
-                        
-                        # 텍스트 수정
-                        second_pass_result['text_for_filtering'] = second_pass_result['text_for_filtering'].replace(word, "__S__")
-
-            return second_pass_result
+            return self._apply_response(second_pass_result, gpt_response)
 
         except Exception as e:
-            print(f"2차 필터 에러: {e}")
-            return first_pass_result
\ No newline at end of file
+            # 예상하지 못한 오류(응답 형식 등)도 '적발 없음'으로 넘기지 않고 DEGRADED로 표시 (판정 캐시에 저장하지 않음)
+            print(f"  [Error] 2차 필터 에러: {e}")
+            return self._degrade(first_pass_result, "error")
+
+    def execute_batch(self, first_pass_results):
+        """
+        배치 실행 함수
+        - 로컬 모델을 사용하면 먼저 일괄 추론하고, 확신도가 낮은 댓글만 GPT로 보냅니다.
+        - 여러 댓글을 한 번의 API 호출로 묶어 분석합니다.
+        - 배치 응답에서 누락된 댓글은 단건 호출로 다시 분석합니다.
+        - 재시도/마감/회로 차단으로 응답을 받지 못한 댓글은 status가 DEGRADED가 됩니다.
+        - 반환 리스트의 순서는 입력 순서와 같습니다.
+        """
+        results = list(first_pass_results)
+        pending = self._run_local_model(results, self.client is not None)
+        if self.client is None or not pending:
+            # 키가 없으면 단건 경로와 동일하게 2차 필터링을 통과시킴
+            return results
+
+        with deadline_scope(self.dispatcher.request_deadline):
+            gpt_results = self._execute_gpt_batch([results[idx] for idx in pending])
+        for idx, res in zip(pending, gpt_results):
+            results[idx] = res
+        return results
+
+    def _execute_gpt_batch(self, first_pass_results):
+        """GPT 배치 분석 (입력 순서 유지)"""
+        results = list(first_pass_results)
+
+        for tags, batch in self._plan_batches(results):
+            if len(batch) == 1:
+                idx = batch[0][0]
+                results[idx] = self._execute_gpt(results[idx])
+                continue
+
+            try:
+                gpt_response = self._call_openai_api(self._construct_batch_prompt(batch, tags))
+            except LLMUnavailableError as e:
+                # 배치 전체가 실패하면 단건으로 다시 나누지 않음 (장애 중 호출 수만 늘어남)
+                for idx, _ in batch:
+                    results[idx] = self._degrade(results[idx], e.reason)
+                continue
+            answered = self._index_batch_response(gpt_response)
+
+            for idx, _ in batch:
+                item = answered.get(idx)
+                if item is None or not isinstance(item.get('detected_items', []), list):
+                    # 배치 응답에 없는 항목은 단건 호출로 대체
+                    results[idx] = self._execute_gpt(results[idx])
+                    continue
+                try:
+                    results[idx] = self._apply_ai_items(results[idx], item.get('detected_items', []))
+                except Exception as e:
+                    print(f"  [Error] 2차 필터 에러: {e}")
+                    results[idx] = self._degrade(results[idx], "error")
+
+        return results
+
+    async def _run_local_model_async(self, results, can_escalate):
+        """로컬 모델 추론은 CPU 작업이므로 스레드에서 실행 (이벤트 루프 보호)"""
+        if self.local_model is None:
+            return list(range(len(results)))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, contextvars.copy_context().run, self._run_local_model, results, can_escalate)
+
+    async def execute_async(self, first_pass_result):
+        """
+        메인 실행 함수 (비동기)
+        """
+        if self.local_model is not None and not await self._run_local_model_async([first_pass_result], self.async_client is not None):
+            return first_pass_result
+        with deadline_scope(self.dispatcher.request_deadline):
+            return await self._execute_gpt_async(first_pass_result)
+
+    async def _execute_gpt_async(self, first_pass_result):
+        """GPT 단건 분석 (비동기)"""
+        second_pass_result = first_pass_result
+
+        try:
+            prompt_text = self._construct_prompt(
+                second_pass_result.get('text_for_filtering', ''), self._tags_of(second_pass_result)
+            )
+            try:
+                gpt_response = await self._call_openai_api_async(prompt_text)
+            except LLMUnavailableError as e:
+                return self._degrade(second_pass_result, e.reason)
+            return self._apply_response(second_pass_result, gpt_response)
+
+        except Exception as e:
+            # 예상하지 못한 오류(응답 형식 등)도 '적발 없음'으로 넘기지 않고 DEGRADED로 표시 (판정 캐시에 저장하지 않음)
+            print(f"  [Error] 2차 필터 에러: {e}")
+            return self._degrade(first_pass_result, "error")
+
+    async def execute_batch_async(self, first_pass_results):
+        """
+        배치 실행 함수 (비동기)
+        - 로컬 모델을 사용하면 먼저 일괄 추론하고, 확신도가 낮은 댓글만 GPT로 보냅니다.
+        - 배치들을 동시에 호출하되, 동시 호출 수는 dispatcher가 429/응답 시간을 보고 조절합니다.
+        - 반환 리스트의 순서는 입력 순서와 같습니다.
+        """
+        results = list(first_pass_results)
+        pending = await self._run_local_model_async(results, self.async_client is not None)
+        if self.async_client is None or not pending:
+            return results
+
+        with deadline_scope(self.dispatcher.request_deadline):
+            gpt_results = await self._execute_gpt_batch_async([results[idx] for idx in pending])
+        for idx, res in zip(pending, gpt_results):
+            results[idx] = res
+        return results
+
+    async def _execute_gpt_batch_async(self, first_pass_results):
+        """GPT 배치 분석 (비동기, 입력 순서 유지)"""
+        results = list(first_pass_results)
+
+        async def run_batch(tags, batch):
+            if len(batch) == 1:
+                idx = batch[0][0]
+                results[idx] = await self._execute_gpt_async(results[idx])
+                return
+
+            try:
+                gpt_response = await self._call_openai_api_async(self._construct_batch_prompt(batch, tags))
+            except LLMUnavailableError as e:
+                for idx, _ in batch:
+                    results[idx] = self._degrade(results[idx], e.reason)
+                return
+            answered = self._index_batch_response(gpt_response)
+
+            fallbacks = []
+            for idx, _ in batch:
+                item = answered.get(idx)
+                if item is None or not isinstance(item.get('detected_items', []), list):
+                    fallbacks.append(idx)
+                    continue
+                try:
+                    results[idx] = self._apply_ai_items(results[idx], item.get('detected_items', []))
+                except Exception as e:
+                    print(f"  [Error] 2차 필터 에러: {e}")
+                    results[idx] = self._degrade(results[idx], "error")
+
+            # 배치 응답에 없는 항목은 단건 호출로 대체
+            fallback_results = await asyncio.gather(*(self._execute_gpt_async(results[idx]) for idx in fallbacks))
+            for idx, res in zip(fallbacks, fallback_results):
+                results[idx] = res
+
+        await asyncio.gather(*(run_batch(tags, batch) for tags, batch in self._plan_batches(results)))
+        return results
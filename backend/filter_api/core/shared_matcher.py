@@ -0,0 +1,191 @@
+"""
+여러 프로세스가 함께 쓰는 매칭 엔진 파일 (메모리 맵, 읽기 전용)
+- Aho-Corasick 오토마톤을 노드/전이 정수 배열로 펼쳐 파일 하나에 저장하고, 각 프로세스는 mmap으로 엽니다.
+  (배열은 운영체제 페이지 캐시를 공유하므로 워커 수가 늘어도 사전 메모리가 워커마다 복제되지 않음)
+- 전이는 노드별로 글자 코드 순으로 정렬해 두고 이진 탐색합니다. 루트 전이만 프로세스별 딕셔너리로 둡니다.
+- 사전 버전, 형식 버전, 파이썬 버전/바이트 순서가 모두 같을 때만 사용하고 아니면 None을 반환합니다.
+"""
+import os
+import sys
+import mmap
+import array
+import marshal
+import struct
+from bisect import bisect_left
+
+from .aho_corasick import AhoCorasickMatcher
+
+# 파일 배치나 payload 형식이 바뀌면 올려야 합니다.
+SHARED_FORMAT = 2
+MAGIC = b"NERVMMAP"
+HEADER = struct.Struct("<I")
+ALIGN = 8
+
+
+def _python_tag() -> str:
+    # 헤더(marshal)와 배열(기계 정수)의 형식이 파이썬 버전/플랫폼마다 다를 수 있음
+    return (f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-{marshal.version}"
+            f"-{sys.byteorder}-{array.array('i').itemsize}")
+
+
+class MappedMatcher(AhoCorasickMatcher):
+    """
+    메모리 맵 파일 위의 매칭 엔진 (AhoCorasickMatcher와 같은 적중 결과)
+    - 배열은 파일을 직접 가리키므로 만들 때 복사가 없고, 변경할 수 없습니다.
+    """
+
+    def __init__(self, view: memoryview, entry: dict):
+        nodes, edges = entry["nodes"], entry["edges"]
+        offset = entry["offset"]
+
+        def take(count):
+            nonlocal offset
+            part = view[offset:offset + count * 4].cast('i')
+            offset += count * 4
+            return part
+
+        self._edge_start = take(nodes + 1)
+        self._edge_chars = take(edges)
+        self._edge_targets = take(edges)
+        self._fail = take(nodes)
+        self._dict_link = take(nodes)
+        self._out = take(nodes)
+        self._outputs = entry["outputs"]
+
+        # 루트 전이는 거의 모든 글자에서 조회하므로 딕셔너리로 (노드 하나분이라 작음)
+        start, end = self._edge_start[0], self._edge_start[1]
+        self._root = {chr(self._edge_chars[i]): self._edge_targets[i] for i in range(start, end)}
+
+    def __len__(self):
+        return len(self._outputs)
+
+    def to_state(self) -> tuple:
+        raise TypeError("메모리 맵 매칭 엔진은 직렬화하지 않습니다. (파일 자체를 공유)")
+
+    def iter_matches(self, text: str):
+        """텍스트에서 모든 적중을 (start, end, payload) 형태로 반환합니다. (겹침 포함)"""
+        edge_start = self._edge_start
+        edge_chars = self._edge_chars
+        edge_targets = self._edge_targets
+        fail = self._fail
+        dict_link = self._dict_link
+        out = self._out
+        outputs = self._outputs
+        root = self._root
+
+        node = 0
+        for idx, ch in enumerate(text):
+            code = ord(ch)
+            while node:
+                lo, hi = edge_start[node], edge_start[node + 1]
+                # 루트가 아닌 노드는 대부분 전이가 한두 개뿐이라 바로 비교
+                pos = lo if hi - lo == 1 else bisect_left(edge_chars, code, lo, hi)
+                if pos < hi and edge_chars[pos] == code:
+                    node = edge_targets[pos]
+                    break
+                node = fail[node]
+            else:
+                node = root.get(ch, 0)
+
+            out_node = node if out[node] >= 0 else dict_link[node]
+            while out_node:
+                length, payload = outputs[out[out_node]]
+                yield idx + 1 - length, idx + 1, payload
+                out_node = dict_link[out_node]
+
+
+def _flatten(matcher: AhoCorasickMatcher):
+    """오토마톤 -> (노드 수, 전이 수, 정수 배열 목록, 출력 목록)"""
+    goto, fail, output, dict_link = matcher.to_state()
+    edge_start, edge_chars, edge_targets = array.array('i', [0]), array.array('i'), array.array('i')
+    out, outputs = array.array('i'), []
+    for node, transitions in enumerate(goto):
+        for ch in sorted(transitions, key=ord):
+            edge_chars.append(ord(ch))
+            edge_targets.append(transitions[ch])
+        edge_start.append(len(edge_chars))
+        if output[node] is None:
+            out.append(-1)
+        else:
+            out.append(len(outputs))
+            outputs.append(output[node])
+    arrays = [edge_start, edge_chars, edge_targets, array.array('i', fail), array.array('i', dict_link), out]
+    return len(goto), len(edge_chars), arrays, outputs
+
+
+def save(path: str, dictionary_version: str, matchers: dict) -> bool:
+    """
+    매칭 엔진 저장 (matchers: {이름: AhoCorasickMatcher})
+    - 임시 파일에 쓴 뒤 교체하므로, 이미 열어 둔 프로세스는 이전 파일을 그대로 계속 사용합니다.
+    """
+    entries, blobs, offset = {}, [], 0
+    for name, matcher in matchers.items():
+        nodes, edges, arrays, outputs = _flatten(matcher)
+        entries[name] = {"nodes": nodes, "edges": edges, "offset": offset, "outputs": outputs}
+        for part in arrays:
+            blob = part.tobytes()
+            blobs.append(blob)
+            offset += len(blob)
+
+    header = marshal.dumps({
+        "format": SHARED_FORMAT,
+        "python": _python_tag(),
+        "version": dictionary_version,
+        "matchers": entries,
+    })
+    padding = -(len(MAGIC) + HEADER.size + len(header)) % ALIGN
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(len(header)))
+            f.write(header)
+            f.write(b"\0" * padding)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"  [Warning] 공유 매칭 엔진 저장 실패: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load(path: str, dictionary_version: str = None):
+    """
+    저장된 매칭 엔진 -> (사전 버전, {이름: MappedMatcher}) (없거나 형식/버전이 다르면 None)
+    - dictionary_version을 주지 않으면 파일에 있는 버전을 그대로 사용합니다. (프로세스 풀 워커)
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    try:
+        if view[:len(MAGIC)] != MAGIC:
+            return None
+        start = len(MAGIC) + HEADER.size
+        (size,) = HEADER.unpack(view[len(MAGIC):start])
+        entry = marshal.loads(view[start:start + size])
+    except (struct.error, EOFError, ValueError, TypeError):
+        return None
+
+    if (not isinstance(entry, dict)
+            or entry.get("format") != SHARED_FORMAT
+            or entry.get("python") != _python_tag()
+            or (dictionary_version is not None and entry.get("version") != dictionary_version)):
+        return None
+
+    data = view[start + size + (-(start + size) % ALIGN):]
+    try:
+        matchers = {name: MappedMatcher(data, spec) for name, spec in entry["matchers"].items()}
+    except (KeyError, TypeError, ValueError):
+        return None
+    return entry["version"], matchers
@@ -0,0 +1,104 @@
+"""
+적발 구간(span) 처리 함수 모음
+- span: (start, end, source, category) 형태이며 위치는 정규화 텍스트 기준입니다.
+  (판정 캐시 키가 정규화 텍스트이므로, 같은 키를 공유하는 댓글끼리 span도 그대로 재사용 가능)
+- 각 단계는 문자열을 치환하지 않고 span만 추가하며, 치환 결과는 필요한 시점에 한 번만 만듭니다.
+"""
+import re
+
+# 정규화 시 제거할 문자 (한글 음절/낱자 자모/영문/숫자/공백 외)
+# 낱자 자모(ㅅㅂ, ㅈㄴ 등)는 사전 단어이자 회피 표기이므로 남겨 둡니다.
+NON_TEXT_PATTERN = re.compile(r'[^가-힣ㄱ-ㅣa-zA-Z0-9\s]')
+# 정규화 규칙이 바뀌면 올려야 합니다. (판정 캐시/영상 분석 상태 지문에 포함)
+NORMALIZATION_VERSION = 2
+
+# 2차 필터(GPT)에 넘기는 텍스트의 자리표시자
+PLACEHOLDERS = {
+    'USER_WHITELIST': "__W__",
+    'USER_BLACKLIST': "__B__",
+    'SYSTEM_KEYWORD': "__F__",
+    'AI': "__S__",
+}
+PLACEHOLDER_PATTERN = re.compile(r'__[WBFS]__')
+
+# 사전 적발 span (연속성 점수 계산 대상)
+DICTIONARY_SOURCES = ('USER_BLACKLIST', 'SYSTEM_KEYWORD')
+
+
+def _span_start(span):
+    return span[0]
+
+
+def normalize(text: str) -> str:
+    return NON_TEXT_PATTERN.sub('', text.lower())
+
+
+def render(normalized_text: str, spans: list) -> str:
+    """정규화 텍스트의 span 구간을 자리표시자로 바꾼 문자열 (한 번의 join)"""
+    if not spans:
+        return normalized_text
+
+    pieces = []
+    cursor = 0
+    for start, end, source, _ in sorted(spans, key=_span_start):
+        if start < cursor:
+            continue
+        pieces.append(normalized_text[cursor:start])
+        pieces.append(PLACEHOLDERS.get(source, "__S__"))
+        cursor = end
+    pieces.append(normalized_text[cursor:])
+    return "".join(pieces)
+
+
+def locate(normalized_text: str, keyword: str, spans: list) -> list:
+    """
+    키워드가 나오는 위치 중 기존 span과 겹치지 않는 구간 [(start, end), ...]
+    - GPT가 자리표시자를 포함해 답하는 경우가 있어 자리표시자를 떼고 정규화한 뒤 찾습니다.
+    """
+    needle = normalize(PLACEHOLDER_PATTERN.sub(' ', keyword)).strip()
+    if not needle:
+        return []
+
+    found = []
+    idx = normalized_text.find(needle)
+    while idx >= 0:
+        end = idx + len(needle)
+        if not any(start < end and idx < stop for start, stop, _, _ in spans):
+            found.append((idx, end))
+        idx = normalized_text.find(needle, end)
+    return found
+
+
+def original_offsets(original_text: str) -> list:
+    """정규화 텍스트의 각 글자가 원문의 몇 번째 글자에서 왔는지 (normalize와 같은 규칙)"""
+    offsets = []
+    for idx, ch in enumerate(original_text):
+        for lowered in ch.lower():
+            if not NON_TEXT_PATTERN.match(lowered):
+                offsets.append(idx)
+    return offsets
+
+
+def mask(original_text: str, normalized_text: str, spans: list):
+    """
+    원문에서 적발 span에 해당하는 구간을 '*'로 가린 문자열
+    - 정규화 과정에서 빠진 특수문자도 구간 안에 있으면 함께 가립니다. (예: 씨#발 -> ***)
+    - 원문과 정규화 텍스트가 맞지 않으면 None을 반환합니다.
+    """
+    offsets = original_offsets(original_text)
+    if len(offsets) != len(normalized_text):
+        return None
+
+    pieces = []
+    cursor = 0
+    for start, end, source, _ in sorted(spans, key=_span_start):
+        if source == 'USER_WHITELIST' or end <= start:
+            continue
+        orig_start, orig_end = offsets[start], offsets[end - 1] + 1
+        if orig_start < cursor:
+            continue
+        pieces.append(original_text[cursor:orig_start])
+        pieces.append("*" * (orig_end - orig_start))
+        cursor = orig_end
+    pieces.append(original_text[cursor:])
+    return "".join(pieces)
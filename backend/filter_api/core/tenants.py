@@ -0,0 +1,270 @@
+import os
+import re
+import json
+import time
+import hmac
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .aho_corasick import AhoCorasickMatcher
+
+
+class TenantAccessDenied(Exception):
+    """채널 사전을 수정할 권한이 없음 (소유자 키 불일치)"""
+
+
+class TenantLimitExceeded(Exception):
+    """채널 사전 수/단어 수 상한 초과"""
+
+
+class TenantOverlay:
+    """
+    채널(테넌트)별 사전/정책 오버레이 (만든 뒤에는 변경하지 않음)
+    - 공용 시스템 사전 매칭 엔진 위에 채널 화이트/블랙리스트만 담은 작은 매칭 엔진을 덧붙입니다.
+    - 같은 단어가 공용 사전과 겹치면 채널 목록이 우선합니다. (화이트 > 블랙 > 공용 사용자 사전 > 시스템)
+    - security_level이 None이면 config.SECURITY_LEVEL을 따릅니다.
+    """
+    __slots__ = ('tenant_id', 'version', 'whitelist', 'blacklist', 'security_level', 'matcher', 'size')
+
+    WHITELIST_PRIORITY = -2
+    BLACKLIST_PRIORITY = -1
+    NODE_BYTES = 400  # 오토마톤 노드 하나의 대략적인 메모리 (dict + 리스트 항목)
+
+    def __init__(self, tenant_id: str, version: str, whitelist: frozenset, blacklist: frozenset, security_level=None):
+        self.tenant_id = tenant_id
+        self.version = version
+        self.whitelist = whitelist
+        self.blacklist = blacklist
+        self.security_level = security_level
+
+        patterns = {word: ('USER_BLACKLIST', self.BLACKLIST_PRIORITY) for word in blacklist}
+        patterns.update({word: ('USER_WHITELIST', self.WHITELIST_PRIORITY) for word in whitelist})
+        self.matcher = AhoCorasickMatcher(patterns) if patterns else None
+
+        # 메모리 상한 계산용 근사치 (노드 수는 단어 글자 수 합을 넘지 않음)
+        chars = sum(len(word) for word in patterns)
+        self.size = self.NODE_BYTES * (1 + chars) + 100 * len(patterns)
+
+    @property
+    def fingerprint(self) -> str:
+        """판정 캐시 키/영상 분석 상태에 넣을 오버레이 지문"""
+        return f"{self.tenant_id}:{self.version}"
+
+
+class TenantRegistry:
+    """
+    채널별 오버레이 저장소
+    - 파일: <directory>/<tenant_id>.json  {"user_whitelist": [...], "user_blacklist": [...], "security_level": 3}
+    - 처음 요청될 때 읽고(지연 로드), 최근 사용 순(LRU)으로 항목 수/메모리 상한을 넘으면 제거합니다.
+    - check_interval 초가 지난 항목은 파일 수정 시각을 다시 확인해 바뀌었으면 새로 읽습니다.
+    - 파일이 없는 채널은 None (공용 사전/기본 정책만 사용)
+    - 파일을 만든 쪽의 소유자 키 해시(owner_key_sha256)를 함께 저장하고, 수정은 같은 키로만 허용합니다.
+      (소유자 키 없이 만든 파일(직접 배치 등)은 관리자만 수정 가능)
+    """
+
+    TENANT_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+    OWNER_FIELD = "owner_key_sha256"
+
+    def __init__(self, directory: str, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024,
+                 check_interval: float = 2.0, max_tenants: int = 10000, max_words: int = 500,
+                 max_word_length: int = 50):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self.max_tenants = max_tenants
+        self.max_words = max_words
+        self.max_word_length = max_word_length
+
+        self._entries = OrderedDict()  # tenant_id -> (overlay 또는 None, mtime_ns, checked_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # 소유자 확인 ~ 파일 교체 (이 프로세스 안에서)
+
+        self.counters = {"hits": 0, "loads": 0, "evictions": 0, "errors": 0}
+
+    @classmethod
+    def validate_id(cls, tenant_id: str) -> str:
+        """채널 ID 검사 (파일 경로로 쓰이므로 영문/숫자/_/-만 허용)"""
+        if not isinstance(tenant_id, str) or not cls.TENANT_ID_PATTERN.match(tenant_id):
+            raise ValueError(f"잘못된 채널 ID입니다: {tenant_id!r}")
+        return tenant_id
+
+    def _path(self, tenant_id: str) -> str:
+        return os.path.join(self.directory, f"{tenant_id}.json")
+
+    def _mtime(self, tenant_id: str):
+        try:
+            return os.stat(self._path(tenant_id)).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, tenant_id: str):
+        """채널 오버레이 (파일이 없으면 None)"""
+        self.validate_id(tenant_id)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(tenant_id)
+            if entry is not None and now - entry[2] < self.check_interval:
+                self._entries.move_to_end(tenant_id)
+                self.counters["hits"] += 1
+                return entry[0]
+
+        # 파일 확인/파싱은 잠금 밖에서 (다른 채널 요청을 막지 않음)
+        mtime = self._mtime(tenant_id)
+        reused = entry is not None and entry[1] == mtime
+        if reused:
+            overlay = entry[0]
+        else:
+            overlay = self._load(tenant_id) if mtime is not None else None
+
+        with self._lock:
+            if reused:
+                self.counters["hits"] += 1
+            elif mtime is not None:
+                self.counters["loads" if overlay is not None else "errors"] += 1
+            self._store(tenant_id, overlay, mtime, now)
+        return overlay
+
+    def _load(self, tenant_id: str):
+        """내부 메서드: 채널 사전 파일 파싱 (실패 시 오버레이 없이 진행)"""
+        try:
+            with open(self._path(tenant_id), 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw.decode('utf-8'))
+            overlay = TenantOverlay(
+                tenant_id,
+                hashlib.sha256(raw).hexdigest()[:16],
+                frozenset(w.strip().lower() for w in data.get("user_whitelist", []) if w.strip()),
+                frozenset(w.strip().lower() for w in data.get("user_blacklist", []) if w.strip()),
+                self._check_level(data.get("security_level")),
+            )
+            return overlay
+        except Exception as e:
+            print(f"  [Error] 채널 사전 로드 실패 ({tenant_id}): {e}")
+            return None
+
+    @staticmethod
+    def _check_level(level):
+        if level is None:
+            return None
+        if not isinstance(level, int) or not 1 <= level <= 5:
+            raise ValueError(f"security_level은 1~5 사이여야 합니다: {level!r}")
+        return level
+
+    def update(self, tenant_id: str, whitelist: list, blacklist: list, security_level=None,
+               owner_key: str = None, admin: bool = False):
+        """
+        채널 사전 파일을 새 내용으로 바꾸고 (새 오버레이, 변경 여부)를 반환합니다.
+        - 새 채널은 owner_key가 있어야 만들 수 있고, 이후 수정은 같은 키(또는 admin)로만 가능합니다.
+        - 내용이 같으면 파일을 다시 쓰지 않습니다. (버전이 그대로이므로 판정 캐시/분석 상태도 그대로)
+        - 새 채널인데 목록이 비어 있고 보안 레벨도 없으면 파일을 만들지 않습니다. (None 반환)
+        """
+        self.validate_id(tenant_id)
+        self._check_level(security_level)
+
+        def clean(words):
+            cleaned = sorted({w.strip() for w in words if w and w.strip()})
+            if len(cleaned) > self.max_words:
+                raise TenantLimitExceeded(f"화이트/블랙리스트는 각각 최대 {self.max_words}개까지 저장할 수 있습니다.")
+            if any(len(w) > self.max_word_length for w in cleaned):
+                raise TenantLimitExceeded(f"단어는 최대 {self.max_word_length}자까지 저장할 수 있습니다.")
+            return cleaned
+
+        data = {"user_whitelist": clean(whitelist), "user_blacklist": clean(blacklist)}
+        if security_level is not None:
+            data["security_level"] = security_level
+        path = self._path(tenant_id)
+
+        with self._write_lock:
+            current = self._read(path)
+            if current is None:
+                if not admin and not owner_key:
+                    raise TenantAccessDenied("새 채널 사전을 만들려면 소유자 키(X-Tenant-Key)가 필요합니다.")
+                if not data["user_whitelist"] and not data["user_blacklist"] and security_level is None:
+                    return None, False
+                if self._count() >= self.max_tenants:
+                    raise TenantLimitExceeded(f"채널 사전은 최대 {self.max_tenants}개까지 저장할 수 있습니다.")
+                owner = self._hash_key(owner_key) if owner_key else None
+            else:
+                owner = current.get(self.OWNER_FIELD)
+                if not admin and (owner is None or not owner_key or not hmac.compare_digest(owner, self._hash_key(owner_key))):
+                    raise TenantAccessDenied("이 채널 사전을 수정할 권한이 없습니다.")
+            if owner is not None:
+                data[self.OWNER_FIELD] = owner
+
+            if data == current:
+                return self.get(tenant_id), False
+
+            os.makedirs(self.directory, exist_ok=True)
+            # 요청마다 다른 임시 파일에 쓴 뒤 교체 (같은 채널을 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음)
+            f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.directory, suffix='.tmp', delete=False)
+            try:
+                with f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(f.name, path)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+
+        self.invalidate(tenant_id)
+        return self.get(tenant_id), True
+
+    @staticmethod
+    def _hash_key(owner_key: str) -> str:
+        return hashlib.sha256(owner_key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read(path: str):
+        """저장된 채널 사전 파일 내용 (없으면 None)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _count(self) -> int:
+        try:
+            return sum(1 for name in os.listdir(self.directory) if name.endswith('.json'))
+        except FileNotFoundError:
+            return 0
+
+    def invalidate(self, tenant_id: str):
+        with self._lock:
+            entry = self._entries.pop(tenant_id, None)
+            if entry is not None:
+                self._bytes -= self._entry_size(entry[0])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self.counters,
+            }
+
+    # -------------------------------------------------
+    # 내부 메서드 (호출 측에서 self._lock 보유)
+    # -------------------------------------------------
+
+    @staticmethod
+    def _entry_size(overlay) -> int:
+        return overlay.size if overlay is not None else 0
+
+    def _store(self, tenant_id, overlay, mtime, now):
+        previous = self._entries.pop(tenant_id, None)
+        if previous is not None:
+            self._bytes -= self._entry_size(previous[0])
+
+        self._entries[tenant_id] = (overlay, mtime, now)
+        self._bytes += self._entry_size(overlay)
+
+        while len(self._entries) > self.max_entries or (self._bytes > self.max_bytes and len(self._entries) > 1):
+            _, (evicted, _, _) = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(evicted)
+            self.counters["evictions"] += 1
@@ -0,0 +1,194 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenizerBusyError(Exception):
+    """형태소 분석 워커 풀의 대기열이 가득 찼을 때 발생"""
+    pass
+
+
+class SurfaceTokenizer:
+    """
+    [순수 Python 경로] 형태소 분석을 생략합니다.
+    - 표면 문자열 매칭만 필요한 경우 사용 (JVM 미기동)
+    """
+    uses_morphology = False
+
+    def pos(self, text: str) -> list:
+        return []
+
+    def pos_batch(self, texts: list) -> list:
+        return [[] for _ in texts]
+
+    async def pos_async(self, text: str) -> list:
+        return []
+
+    def warm_up(self):
+        pass
+
+
+class OktTokenizer:
+    """
+    [프로세스 내 Okt] 호출한 스레드에서 바로 형태소 분석을 수행합니다.
+    - 정규화된 텍스트를 키로 pos() 결과를 LRU 캐싱합니다.
+    """
+    uses_morphology = True
+
+    def __init__(self, cache_size: int = 10000, lazy: bool = False):
+        self._okt_class = None
+        self._local = threading.local()
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+
+        if not lazy:
+            self.warm_up()  # 생성 시점에 JVM을 미리 띄워 첫 요청 지연을 없앰
+
+    def warm_up(self):
+        """JVM 기동 + 현재 스레드의 Okt 인스턴스 준비 (lazy 모드에서는 warm-up 훅 또는 첫 요청 시 호출됨)"""
+        self._get_okt()
+
+    def _get_okt(self):
+        """스레드별 Okt 인스턴스 (JPype 객체를 스레드 간에 공유하지 않음)"""
+        okt = getattr(self._local, 'okt', None)
+        if okt is None:
+            if self._okt_class is None:
+                with self._init_lock:
+                    if self._okt_class is None:
+                        from konlpy.tag import Okt  # JVM 기동 비용이 크므로 사용 시점에만 임포트
+                        self._okt_class = Okt
+            okt = self._okt_class()
+            self._local.okt = okt
+        return okt
+
+    def _cache_get(self, text):
+        with self._cache_lock:
+            tokens = self._cache.get(text)
+            if tokens is not None:
+                self._cache.move_to_end(text)
+            return tokens
+
+    def _cache_put(self, text, tokens):
+        if self._cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[text] = tokens
+            self._cache.move_to_end(text)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _analyze(self, text: str) -> list:
+        tokens = self._get_okt().pos(text)
+        self._cache_put(text, tokens)
+        return tokens
+
+    def pos(self, text: str) -> list:
+        tokens = self._cache_get(text)
+        if tokens is None:
+            tokens = self._analyze(text)
+        return tokens
+
+    def pos_batch(self, texts: list) -> list:
+        return [self.pos(text) for text in texts]
+
+    async def pos_async(self, text: str) -> list:
+        return self.pos(text)
+
+
+class PooledOktTokenizer(OktTokenizer):
+    """
+    [전용 워커 풀] Okt 호출을 별도 스레드 풀에서 수행합니다.
+    - 이벤트 루프/요청 스레드가 형태소 분석에 묶이지 않게 합니다.
+    - 실행 중 + 대기 중인 작업 수를 queue_limit으로 제한하고, 초과 시 TokenizerBusyError를 발생시킵니다.
+      (묶음 분석은 batch_wait초까지 자리를 기다린 뒤 발생)
+    """
+
+    def __init__(self, pool_size: int = 2, queue_limit: int = 64, cache_size: int = 10000, lazy: bool = False,
+                 batch_wait: float = 2.0):
+        super().__init__(cache_size=cache_size, lazy=lazy)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="okt")
+        self._slots = threading.BoundedSemaphore(pool_size + queue_limit)
+        self.batch_wait = batch_wait
+
+    def _submit(self, text, timeout: float = 0):
+        """워커 풀에 작업 추가 (timeout초 안에 대기열 자리가 나지 않으면 TokenizerBusyError)"""
+        acquired = self._slots.acquire(timeout=timeout) if timeout > 0 else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise TokenizerBusyError("형태소 분석 대기열이 가득 찼습니다.")
+        try:
+            future = self._executor.submit(self._analyze, text)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def pos(self, text: str) -> list:
+        tokens = self._cache_get(text)
+        if tokens is None:
+            tokens = self._submit(text).result()
+        return tokens
+
+    def pos_batch(self, texts: list) -> list:
+        """
+        여러 텍스트를 워커 풀에 한꺼번에 넣어 동시에 분석합니다. (입력 순서 유지)
+        - 대기열이 가득 차면 자리가 날 때까지 기다렸다가 이어서 넣습니다.
+        - 묶음 전체에서 batch_wait초가 지나도 자리가 나지 않으면(워커 풀 과부하) 아직 시작하지 않은 작업을 취소하고
+          TokenizerBusyError를 발생시킵니다. (호출 측은 표면 매칭으로 대체)
+        """
+        results = [None] * len(texts)
+        outstanding = []   # (index, future)
+        submitted = {}     # 같은 배치 안의 중복 텍스트는 한 번만 분석
+        deadline = time.monotonic() + self.batch_wait
+
+        for idx, text in enumerate(texts):
+            tokens = self._cache_get(text)
+            if tokens is not None:
+                results[idx] = tokens
+                continue
+            if text in submitted:
+                outstanding.append((idx, submitted[text]))
+                continue
+
+            try:
+                future = self._submit(text, timeout=max(0.0, deadline - time.monotonic()))
+            except TokenizerBusyError:
+                for future in submitted.values():
+                    future.cancel()
+                raise
+            submitted[text] = future
+            outstanding.append((idx, future))
+
+        for idx, future in outstanding:
+            results[idx] = future.result()
+        return results
+
+    async def pos_async(self, text: str) -> list:
+        tokens = self._cache_get(text)
+        if tokens is None:
+            tokens = await asyncio.wrap_future(self._submit(text))
+        return tokens
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def create_tokenizer(backend: str, pool_size: int = 2, queue_limit: int = 64, cache_size: int = 10000, lazy: bool = False,
+                     batch_wait: float = 2.0):
+    """
+    설정값(backend)에 맞는 형태소 분석기 생성
+    - lazy=True이면 JVM을 바로 띄우지 않고 warm_up() 또는 첫 분석 요청 때 띄웁니다.
+    """
+    if backend == 'surface':
+        return SurfaceTokenizer()
+    if backend == 'okt':
+        return OktTokenizer(cache_size=cache_size, lazy=lazy)
+    if backend == 'okt_pool':
+        return PooledOktTokenizer(
+            pool_size=pool_size, queue_limit=queue_limit, cache_size=cache_size, lazy=lazy, batch_wait=batch_wait
+        )
+    raise ValueError(f"알 수 없는 형태소 분석기 백엔드: {backend}")
@@ -0,0 +1,197 @@
+"""
+필터링 회피 표기(변형) 정규화
+- 정규화 텍스트를 "표준형"으로 한 번 더 바꿔, 사전 단어의 표준형 색인(매칭 엔진)과 비교합니다.
+  표준형의 각 글자는 정규화 텍스트의 어느 구간에서 왔는지 기억하므로 적중 위치를 그대로 span으로 쓸 수 있습니다.
+- 표준형 변환 규칙 (사전 단어에도 똑같이 적용)
+    1. 띄어 쓴 한 글자끼리는 붙임 (씨 발 -> 씨발 / 시 발표는 그대로)
+    2. 한글 옆의 닮은 문자를 자모로 (ㅅ1발 -> ㅅㅣ발, 0 -> ㅇ)
+    3. 한글을 자모로 분해한 뒤 다시 조합 (ㅆㅣ발 -> 씨발, 씨바ㄹ -> 씨발, ㅂㅕㅇ신 -> 병신)
+    4. 늘여 쓰기/한글 반복 줄이기 (씨이이발 -> 씨발, ㅋㅋㅋ -> ㅋ)
+    5. 야민정음 글자를 대표 글자로 (띵 -> 명, 댕 -> 멍)
+- 한 번의 선형 스캔(O(n))으로 변환하고, 매칭도 Aho-Corasick 한 번으로 끝납니다.
+  규칙이 적용될 곳이 없는 텍스트는 정규식 검사 한 번으로 건너뜁니다. (has_variant)
+"""
+import re
+
+from . import spans as span_utils
+from .aho_corasick import AhoCorasickMatcher
+
+SYLLABLE_BASE, SYLLABLE_LAST = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"  # 0번은 받침 없음
+
+CHO_INDEX = {ch: idx for idx, ch in enumerate(CHOSEONG)}
+JUNG_INDEX = {ch: idx for idx, ch in enumerate(JUNGSEONG)}
+JONG_INDEX = {ch: idx for idx, ch in enumerate(JONGSEONG) if idx}
+NO_JONG = 0
+IEUNG = CHO_INDEX['ㅇ']
+
+# 겹모음 조합 (ㅗ + ㅏ -> ㅘ)
+COMPOUND_VOWELS = {
+    ('ㅗ', 'ㅏ'): 'ㅘ', ('ㅗ', 'ㅐ'): 'ㅙ', ('ㅗ', 'ㅣ'): 'ㅚ',
+    ('ㅜ', 'ㅓ'): 'ㅝ', ('ㅜ', 'ㅔ'): 'ㅞ', ('ㅜ', 'ㅣ'): 'ㅟ', ('ㅡ', 'ㅣ'): 'ㅢ',
+}
+
+# 한글 옆에 홀로 있을 때만 자모로 보는 닮은 문자 (정규화 후 남는 영문 소문자/숫자, 20초 같은 숫자열은 제외)
+CONFUSABLES = {
+    '1': 'ㅣ', 'l': 'ㅣ', 'i': 'ㅣ',
+    '0': 'ㅇ', 'o': 'ㅇ',
+    '7': 'ㄱ', '2': 'ㄹ',
+}
+
+# 야민정음 (모양이 닮은 글자 바꿔 쓰기) -> 대표 글자
+# 일상 글자(대, 네, 귀 등)와 겹치는 짝은 오탐이 많아 넣지 않습니다.
+YAMINJEONGEUM = {'댕': '멍', '띵': '명', '띠': '며', '윾': '유'}
+
+SPACE_RUN = re.compile(r'\S+')
+
+# 변환 규칙이 하나라도 적용될 수 있는 텍스트인지 미리 확인 (대부분의 댓글은 표준형이 원래 텍스트와 같음)
+VARIANT_TRIGGER = re.compile(
+    r'[ㄱ-ㅊㅌㅍㅏ-ㅛㅝ-ㅟㅡ-ㅣ]'                       # 낱자 자모 (웃음/울음 표현 ㅋㅎㅠㅜ만 있으면 제외)
+    r'|(?<!\S)\S\s+\S(?!\S)'                          # 띄어 쓴 한 글자끼리
+    r'|(?<![0-9a-z])[01ilo72](?=[가-힣])'              # 한글 옆 닮은 문자
+    r'|(?<=[가-힣])[01ilo72](?![0-9a-z])'
+    r'|([가-힣])\1'                                   # 같은 글자 반복
+    rf'|[{"".join(YAMINJEONGEUM)}]'                  # 야민정음
+)
+# 늘여 쓰기 후보 (음절 + 받침 없는 'ㅇ' 음절, 모음이 같은지는 코드로 확인)
+IEUNG_SYLLABLES = "".join(chr(SYLLABLE_BASE + (IEUNG * 21 + jung) * 28) for jung in range(len(JUNGSEONG)))
+ELONGATION_CANDIDATE = re.compile(f'[가-힣](?=[{IEUNG_SYLLABLES}])')
+
+
+def has_variant(text: str) -> bool:
+    """표준형이 텍스트와 다를 수 있으면 True (False이면 원래 매칭 엔진의 결과와 같으므로 표준형 매칭 생략)"""
+    if VARIANT_TRIGGER.search(text) is not None:
+        return True
+    for match in ELONGATION_CANDIDATE.finditer(text):
+        code = ord(text[match.start()]) - SYLLABLE_BASE
+        if code % 28 == NO_JONG and (code % 588) // 28 == (ord(text[match.end()]) - SYLLABLE_BASE) % 588 // 28:
+            return True
+    return False
+
+
+def _is_hangul(ch: str) -> bool:
+    return bool(ch) and (SYLLABLE_BASE <= ord(ch) <= SYLLABLE_LAST or ch in CHO_INDEX or ch in JUNG_INDEX or ch in JONG_INDEX)
+
+
+def _is_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _compose(cho: int, jung: int, jong: int = NO_JONG) -> str:
+    return chr(SYLLABLE_BASE + (cho * 21 + jung) * 28 + jong)
+
+
+def _decompose(ch: str):
+    """완성형 음절 -> (초성, 중성, 종성) 번호, 음절이 아니면 None"""
+    code = ord(ch) - SYLLABLE_BASE
+    if not 0 <= code <= SYLLABLE_LAST - SYLLABLE_BASE:
+        return None
+    return code // 588, (code % 588) // 28, code % 28
+
+
+def _units(text: str) -> list:
+    """규칙 1, 2: [(글자, 시작, 끝), ...] (띄어 쓴 한 글자끼리 붙이고, 한글 옆 닮은 문자를 자모로)"""
+    units = []
+    tokens = [(m.start(), m.end()) for m in SPACE_RUN.finditer(text)]
+    for idx, (start, end) in enumerate(tokens):
+        if idx and not (end - start == 1 and tokens[idx - 1][1] - tokens[idx - 1][0] == 1):
+            units.append((' ', tokens[idx - 1][1], start))
+        for pos in range(start, end):
+            units.append((text[pos], pos, pos + 1))
+
+    for idx, (ch, start, end) in enumerate(units):
+        mapped = CONFUSABLES.get(ch)
+        if mapped is None:
+            continue
+        prev_ch = units[idx - 1][0] if idx else ''
+        next_ch = units[idx + 1][0] if idx + 1 < len(units) else ''
+        if _is_alnum(prev_ch) or _is_alnum(next_ch):
+            continue
+        if _is_hangul(prev_ch) or _is_hangul(next_ch):
+            units[idx] = (mapped, start, end)
+    return units
+
+
+def canonicalize(text: str):
+    """
+    정규화 텍스트 -> (표준형 문자열, 표준형 글자별 (시작, 끝) 목록)
+    - 위치는 입력 텍스트 기준이며 끝은 포함하지 않습니다.
+    """
+    units = _units(text)
+    out = []  # [글자, 시작, 끝, (초성, 중성, 종성) 또는 None]
+    count = len(units)
+    idx = 0
+    while idx < count:
+        ch, start, end = units[idx]
+        next_ch = units[idx + 1][0] if idx + 1 < count else ''
+
+        # 규칙 3: 낱자 자음 + 낱자 모음 (+ 뒤에 모음이 없는 낱자 받침) -> 음절
+        if ch in CHO_INDEX and next_ch in JUNG_INDEX:
+            jung_ch = next_ch
+            end = units[idx + 1][2]
+            idx += 2
+            if idx < count and (jung_ch, units[idx][0]) in COMPOUND_VOWELS:
+                jung_ch = COMPOUND_VOWELS[(jung_ch, units[idx][0])]
+                end = units[idx][2]
+                idx += 1
+            jong = NO_JONG
+            if idx < count and units[idx][0] in JONG_INDEX and (idx + 1 >= count or units[idx + 1][0] not in JUNG_INDEX):
+                jong = JONG_INDEX[units[idx][0]]
+                end = units[idx][2]
+                idx += 1
+            parts = (CHO_INDEX[ch], JUNG_INDEX[jung_ch], jong)
+            out.append([_compose(*parts), start, end, parts])
+            continue
+
+        prev = out[-1] if out else None
+        # 받침 없는 음절 뒤 낱자 자음 (뒤에 모음이 없으면) -> 받침 (씨바ㄹ -> 씨발)
+        if (ch in JONG_INDEX and prev is not None and prev[3] is not None and prev[3][2] == NO_JONG
+                and next_ch not in JUNG_INDEX):
+            parts = (prev[3][0], prev[3][1], JONG_INDEX[ch])
+            prev[0], prev[2], prev[3] = _compose(*parts), end, parts
+            idx += 1
+            continue
+
+        parts = _decompose(ch)
+        out.append([ch, start, end, parts])
+        idx += 1
+
+    # 규칙 4, 5: 늘여 쓰기/반복 줄이기, 야민정음
+    chars, positions = [], []
+    last = None
+    for ch, start, end, parts in out:
+        if last is not None:
+            last_parts = last[3]
+            elongation = (
+                last_parts is not None and last_parts[2] == NO_JONG and (
+                    (parts is not None and parts[0] == IEUNG and parts[2] == NO_JONG and parts[1] == last_parts[1])
+                    or (ch in JUNG_INDEX and JUNG_INDEX[ch] == last_parts[1])
+                )
+            )
+            if elongation or (ch == last[0] and _is_hangul(ch)):
+                positions[-1] = (positions[-1][0], end)
+                continue
+        last = (ch, start, end, parts)
+        chars.append(YAMINJEONGEUM.get(ch, ch))
+        positions.append((start, end))
+    return "".join(chars), positions
+
+
+def build_matcher(patterns: dict) -> AhoCorasickMatcher:
+    """
+    사전 단어 표준형 색인 (patterns: {사전 단어: payload})
+    - 사전 단어도 정규화 -> 표준형으로 바꿔서 넣습니다. (같은 표준형이면 priority가 높은 payload 유지)
+    - 표준형이 한 글자뿐인 단어(예: ㅗ, 지ㄹ -> 질)는 일반 단어 안에서 오탐이 많아 넣지 않습니다.
+      (원래 매칭 엔진이 형태소 경계 검사와 함께 그대로 처리)
+    """
+    variants = {}
+    for word, payload in patterns.items():
+        canonical, _ = canonicalize(span_utils.normalize(word).strip())
+        if len(canonical) < 2:
+            continue
+        current = variants.get(canonical)
+        if current is None or payload[1] < current[1]:
+            variants[canonical] = payload
+    return AhoCorasickMatcher(variants)
@@ -0,0 +1,210 @@
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from . import spans as span_utils
+
+
+class VerdictCache:
+    """
+    파이프라인 판정 결과 캐시 (내용 주소 기반)
+    - 키: 정규화 텍스트 + 사전 버전 + 판정에 영향을 주는 config 값의 해시
+    - 1단계: 메모리 LRU (TTL 적용)
+    - 2단계: SQLite 디스크 캐시 (선택, TTL + 개수 상한 초과 시 오래된 항목부터 삭제)
+    - 사전 버전이 바뀌면 이전 버전의 항목은 자동으로 무효화됩니다.
+    """
+
+    def __init__(self, max_entries: int = 50000, ttl: float = 86400, db_path: str = None, db_max_entries: int = 500000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+
+        self._memory = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._version = None
+
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+        self._db = None
+        self._db_puts = 0
+        if db_path:
+            self._open_db(db_path)
+
+    # -------------------------------------------------
+    # 키 생성
+    # -------------------------------------------------
+
+    @staticmethod
+    def config_fingerprint(config) -> str:
+        """판정 결과에 영향을 주는 config 값들의 지문"""
+        values = {
+            "security_level": config.SECURITY_LEVEL,
+            "risk_threshold": config.RISK_THRESHOLD,
+            "use_detail_ai_model": config.USE_DETAIL_AI_MODEL,
+            "detail_model": [config.BASE_MODEL_PATH, config.DETAIL_MODEL_LABELS, config.DETAIL_MODEL_CONFIDENCE],
+            "special_ai_modules": config.SPECIAL_AI_MODULES,
+            "basic_ai_module": config.BASIC_AI_MODULE,
+            "dictionary_category_tags": config.DICTIONARY_CATEGORY_TAGS,
+            "normalization": span_utils.NORMALIZATION_VERSION,
+            "variant_matching": config.VARIANT_MATCHING_ENABLED,
+        }
+        return hashlib.sha256(json.dumps(values, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    def make_key(self, normalized_text: str, dictionary_version: str, config_fingerprint: str,
+                 signal_tags: tuple = ()) -> str:
+        """캐시 키 (signal_tags: 원문 신호 태그, 정규화 텍스트가 같아도 2차 필터 특수 모듈이 달라질 수 있음)"""
+        raw = "\x1f".join([dictionary_version or "", config_fingerprint, ",".join(signal_tags), normalized_text])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    # -------------------------------------------------
+    # 무효화
+    # -------------------------------------------------
+
+    def sync_version(self, dictionary_version: str):
+        """사전 버전이 바뀌었으면 이전 버전 항목을 모두 제거"""
+        if dictionary_version == self._version:
+            return
+
+        with self._lock:
+            if dictionary_version == self._version:
+                return
+            had_version = self._version is not None
+            self._version = dictionary_version
+            self._memory.clear()
+            if had_version:
+                self.counters["invalidations"] += 1
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM verdicts WHERE version != ?", (dictionary_version,))
+                self._db.commit()
+
+        if had_version:
+            print(f"[System] 사전 변경 감지 -> 판정 캐시 무효화 (version: {dictionary_version})")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM verdicts")
+                self._db.commit()
+
+    # -------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.counters["hits"] += 1
+                    self.counters["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+            if self._db is not None:
+                value = self._db_get(key, now)
+                if value is not None:
+                    self._memory_put(key, value, now)
+                    self.counters["hits"] += 1
+                    self.counters["disk_hits"] += 1
+                    return value
+
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: dict):
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, value, now)
+            if self._db is not None:
+                self._db_put(key, value, now)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            stats = dict(self.counters)
+            stats["memory_entries"] = len(self._memory)
+            stats["hit_rate"] = round(self.counters["hits"] / lookups, 4) if lookups else 0.0
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+            return stats
+
+    # -------------------------------------------------
+    # 내부 메서드 (호출 측에서 self._lock 보유)
+    # -------------------------------------------------
+
+    def _memory_put(self, key, value, now):
+        self._memory[key] = (now + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _open_db(self, db_path):
+        try:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                " key TEXT PRIMARY KEY,"
+                " version TEXT,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_accessed ON verdicts (accessed_at)")
+            self._db.execute("DELETE FROM verdicts WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+            print(f"  ㄴ 판정 캐시 디스크 저장소 연결: {db_path}")
+        except sqlite3.Error as e:
+            print(f"  [Error] 판정 캐시 디스크 저장소 연결 실패: {e}")
+            self._db = None
+
+    def _db_get(self, key, now):
+        row = self._db.execute("SELECT value, expires_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self._db.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return json.loads(row[0])
+
+    def _db_put(self, key, value, now):
+        self._db.execute(
+            "INSERT OR REPLACE INTO verdicts (key, version, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, self._version, json.dumps(value, ensure_ascii=False), now + self.ttl, now)
+        )
+        self._db_puts += 1
+        # 개수 확인은 비용이 있으므로 일정 횟수마다만 수행
+        if self._db_puts % 256 == 0:
+            self._db_trim(now)
+        self._db.commit()
+
+    def _db_trim(self, now):
+        """만료 항목 삭제 후, 개수 상한을 넘으면 가장 오래 조회되지 않은 항목부터 삭제"""
+        self._db.execute("DELETE FROM verdicts WHERE expires_at <= ?", (now,))
+        overflow = self._db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0] - self.db_max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+            self.counters["evictions"] += overflow
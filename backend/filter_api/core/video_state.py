@@ -0,0 +1,93 @@
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+
+class VideoStateStore:
+    """
+    영상별 분석 상태 저장소 (SQLite)
+    - (채널, 영상)마다 댓글별 판정 결과와 그 판정을 낼 때의 지문(사전 버전 + config + 채널 오버레이)을 저장합니다.
+    - 재분석 시 새 댓글이나 내용이 바뀐 댓글만 파이프라인에 넣고, 나머지는 저장된 판정을 그대로 사용합니다.
+    - 지문이 다른 판정은 재사용하지 않고, 다시 분석하면 덮어씁니다. (지문이 바뀌어도 지우지 않으므로
+      서로 다른 지문으로 동시에 분석하는 요청이 상대의 상태를 지우거나 다른 지문의 판정을 읽지 않음)
+    - 채널마다 사전이 다르므로 같은 영상이라도 채널별로 따로 보관합니다. (채널 지정 없음은 '')
+    """
+
+    # 스키마가 바뀌면 올립니다. (분석 상태는 다시 분석하면 복구되므로 이전 스키마는 변환하지 않고 버림)
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            self._db.executescript(
+                "DROP TABLE IF EXISTS video_state;"
+                "DROP TABLE IF EXISTS comment_verdicts;"
+            )
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS video_state ("
+            " tenant_id TEXT NOT NULL,"
+            " video_id TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " analyzed_at REAL NOT NULL,"
+            " PRIMARY KEY (tenant_id, video_id));"
+            "CREATE TABLE IF NOT EXISTS comment_verdicts ("
+            " tenant_id TEXT NOT NULL,"
+            " video_id TEXT NOT NULL,"
+            " comment_id TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " summary TEXT NOT NULL,"
+            " PRIMARY KEY (tenant_id, video_id, comment_id));"
+        )
+        self._db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._db.commit()
+        print(f"  ㄴ 영상 분석 상태 저장소 연결: {db_path}")
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+    def load(self, video_id: str, fingerprint: str, tenant_id: str = None) -> dict:
+        """
+        저장된 판정 결과 중 지문이 같은 것만 {comment_id: (text_hash, summary)} 형태로 반환합니다.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT comment_id, text_hash, summary FROM comment_verdicts"
+                " WHERE tenant_id = ? AND video_id = ? AND fingerprint = ?",
+                (tenant_id or '', video_id, fingerprint)
+            ).fetchall()
+        return {comment_id: (text_hash, json.loads(summary)) for comment_id, text_hash, summary in rows}
+
+    def save(self, video_id: str, fingerprint: str, items: list, tenant_id: str = None):
+        """
+        새로 분석한 판정 결과를 저장합니다.
+        - items: [(comment_id, text_hash, summary), ...] (변경분만)
+        """
+        tenant_id = tenant_id or ''
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO video_state (tenant_id, video_id, fingerprint, analyzed_at) VALUES (?, ?, ?, ?)",
+                (tenant_id, video_id, fingerprint, time.time())
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO comment_verdicts (tenant_id, video_id, comment_id, fingerprint, text_hash, summary)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (tenant_id, video_id, comment_id, fingerprint, text_hash, json.dumps(summary, ensure_ascii=False))
+                    for comment_id, text_hash, summary in items
+                ]
+            )
+            self._db.commit()
+
+    def clear(self, video_id: str, tenant_id: str = None):
+        with self._lock:
+            self._db.execute("DELETE FROM comment_verdicts WHERE tenant_id = ? AND video_id = ?", (tenant_id or '', video_id))
+            self._db.execute("DELETE FROM video_state WHERE tenant_id = ? AND video_id = ?", (tenant_id or '', video_id))
+            self._db.commit()
@@ -0,0 +1,288 @@
+import time
+import asyncio
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+
+def _escape(value) -> str:
+    """레이블 값 이스케이프 (Prometheus 텍스트 형식)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Metric:
+    """레이블 조합별 값을 보관하는 기본 지표"""
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(key), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in self._values.items():
+                labels = dict(key)
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    result.append((f"{self.name}_bucket", {**labels, "le": repr(float(bound))}, bucket_count))
+                result.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+                result.append((f"{self.name}_sum", labels, total))
+                result.append((f"{self.name}_count", labels, count))
+        return result
+
+
+class MetricsRegistry:
+    """
+    프로세스 내 지표 저장소 (Prometheus 텍스트 형식으로 출력)
+    - 외부 의존성 없이 카운터/게이지/히스토그램을 제공합니다.
+    - collector: 캐시 통계처럼 다른 객체가 이미 들고 있는 값을 조회 시점에 읽어오는 함수
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text):
+        return self._register(Gauge(name, help_text))
+
+    def histogram(self, name, help_text, buckets=Histogram.DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def register_collector(self, collector):
+        """collector() -> [(name, kind, help, [(labels, value), ...]), ...]"""
+        self._collectors.append(collector)
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"  [Error] 지표 수집 실패: {e}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# --- 단계별 지표 ---
+STAGE_SECONDS = metrics.histogram("nerv_stage_seconds", "단계별 호출 소요 시간 (초)")
+STAGE_ITEMS = metrics.counter("nerv_stage_items_total", "단계별 처리 항목 수")
+STAGE_IN_FLIGHT = metrics.gauge("nerv_stage_in_flight", "단계별 진행 중인 호출 수")
+STAGE_ERRORS = metrics.counter("nerv_stage_errors_total", "단계별 오류 수")
+
+# --- 2차 필터(GPT) 지표 ---
+LLM_REQUESTS = metrics.counter("nerv_llm_requests_total", "GPT 호출 수 (결과별)")
+LLM_TOKENS = metrics.counter("nerv_llm_tokens_total", "GPT 사용 토큰 수")
+DEGRADED_RESULTS = metrics.counter("nerv_degraded_results_total", "GPT 응답 없이 1차 결과만으로 판정한 댓글 수 (사유별)")
+
+# --- 파이프라인 / YouTube / HTTP 지표 ---
+PIPELINE_PATHS = metrics.counter("nerv_pipeline_path_total", "판정 경로별 댓글 수 (조기 종료 포함)")
+YOUTUBE_REQUESTS = metrics.counter("nerv_youtube_requests_total", "YouTube API 호출 수")
+HTTP_SECONDS = metrics.histogram("nerv_http_request_seconds", "HTTP 요청 처리 시간 (초)")
+HTTP_REQUESTS = metrics.counter("nerv_http_requests_total", "HTTP 요청 수")
+HTTP_IN_FLIGHT = metrics.gauge("nerv_http_in_flight", "처리 중인 HTTP 요청 수")
+# 응답 캐시를 거치지 않는 조회 API의 304 (분석 응답의 304는 응답 캐시 통계 nerv_response_not_modified_total)
+HTTP_NOT_MODIFIED = metrics.counter("nerv_http_not_modified_total", "If-None-Match가 같아 304로 응답한 수 (조회 API별)")
+
+# --- 서버 시작 지표 ---
+STARTUP_SECONDS = metrics.gauge("nerv_startup_seconds", "서버 시작/warm-up 단계별 소요 시간 (초)")
+
+
+# -------------------------------------------------
+# 요청별 소요 시간 (Server-Timing)
+# -------------------------------------------------
+
+class RequestTiming:
+    """한 요청 안에서 단계별 누적 소요 시간 (여러 스레드에서 동시에 기록될 수 있음)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def header(self) -> str:
+        """Server-Timing 헤더 값 (ms 단위)"""
+        with self._lock:
+            parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.durations.items()]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_request_timing = contextvars.ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> RequestTiming:
+    timing = RequestTiming()
+    _request_timing.set(timing)
+    return timing
+
+
+@contextmanager
+def track(stage: str, items: int = 1):
+    """단계 하나의 소요 시간/처리 수/진행 중 호출 수/오류를 기록"""
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_IN_FLIGHT.dec(stage=stage)
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        STAGE_ITEMS.inc(items, stage=stage)
+        timing = _request_timing.get()
+        if timing is not None:
+            timing.add(stage, elapsed)
+
+
+def timed(stage: str, batch: bool = False):
+    """
+    메서드 단위 계측 데코레이터 (동기/비동기 모두 지원)
+    - batch=True이면 첫 번째 인자(리스트)의 길이를 처리 항목 수로 기록합니다.
+    """
+    def decorator(func):
+        def count(args):
+            return len(args[1]) if batch and len(args) > 1 else 1
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track(stage, count(args)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(stage, count(args)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 지표 + 요청별 단계 소요 시간(Server-Timing 헤더) 기록용 ASGI 미들웨어
+    - 스트리밍 응답은 헤더가 먼저 나가므로, 첫 응답 전까지 기록된 단계만 헤더에 포함됩니다.
+    """
+
+    def __init__(self, app, server_timing: bool = True, skip_paths=("/metrics",)):
+        self.app = app
+        self.server_timing = server_timing
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        timing = start_request_timing()
+        status = {"code": 500}
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.header().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            HTTP_SECONDS.observe(time.perf_counter() - timing.started, route=path)
+            HTTP_REQUESTS.inc(method=scope.get("method", ""), route=path, status=str(status["code"]))
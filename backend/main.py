@@ -1,10 +1,22 @@
+import time
+_BOOT_STARTED = time.perf_counter()  # 콜드 스타트 측정 시작 (모듈 임포트 시간 포함)
+
 import sys
 import os
-from typing import List, Optional, Dict, Any
+import json
+import asyncio
+import threading
+import hmac
+import functools
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import List, Optional, Dict, Any, Tuple
 
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Header, Request
 from pydantic import BaseModel, Field
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse, JSONResponse, PlainTextResponse
 
 try:
     import config
@@ -12,15 +24,48 @@ try:
     from filter_api.core.second_pass_filter import SecondPassFilter
     from filter_api.core.risk_scorer import RiskScorer
     from filter_api.core.policy_manager import PolicyManager
+    from filter_api.core.pipeline import ModerationPipeline
+    from filter_api.core.verdict_cache import VerdictCache
+    from filter_api.core.early_exit_gate import EarlyExitGate
+    from filter_api.core.video_state import VideoStateStore
+    from filter_api.core.tenants import TenantRegistry, TenantAccessDenied, TenantLimitExceeded
+    from filter_api.core.near_duplicates import NearDuplicateIndex
+    from filter_api.core.jobs import JobStore, JobManager, JobQueueFull
+    from filter_api.core.result_store import ResultStore
+    from filter_api.core.response_cache import ResponseCache, etag_matches
+    from filter_api.core.first_pass_pool import FirstPassProcessPool, process_memory
     from filter_api.clients.youtube_client import YouTubeClient
+    from filter_api.metrics import metrics, MetricsMiddleware, STARTUP_SECONDS, HTTP_NOT_MODIFIED
 except ImportError as e:
     print(f"[System] 필수 모듈 임포트 실패: {e}")
     sys.exit(1)
 
+# 서버 시작 단계별 소요 시간 (초)
+startup_timings = {"imports": time.perf_counter() - _BOOT_STARTED}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 지연 초기화 모드에서는 요청을 받기 시작한 뒤 백그라운드로 리소스를 준비
+    if config.LAZY_INIT and config.WARMUP_ON_STARTUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+    # 사전 파일이 바뀌면 백그라운드에서 다시 컴파일한 뒤 교체 (요청 처리는 멈추지 않음)
+    if config.DICTIONARY_WATCH_ENABLED:
+        first_filter.start_watcher(config.DICTIONARY_CHECK_INTERVAL)
+    # 이전 서버가 끝내지 못한 작업은 이어서 실행
+    if job_manager is not None:
+        await job_manager.start()
+    yield
+    if job_manager is not None:
+        await job_manager.stop()
+    first_filter.stop_watcher()
+    if first_pass_pool is not None:
+        first_pass_pool.shutdown()
+
 app = FastAPI(
     title="YouTube Comment Filtering System API",
     description="1차/2차/위험도/정책 모델을 엄격하게 분리하여 단계별 데이터 변화를 명확히 보여주는 API",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -29,20 +74,162 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "X-Response-Cache"],
 )
+app.add_middleware(MetricsMiddleware, server_timing=config.REQUEST_TIMING_HEADER)
+
+def _resolve_path(path: str) -> str:
+    """backend 디렉터리 기준 상대 경로를 절대 경로로 변환"""
+    if not path or os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+def _create_first_pass_pool() -> Optional[FirstPassProcessPool]:
+    # 워커는 fork로 만들므로 형태소 분석기(JVM)/스레드를 만들기 전에 띄움 (공유 매칭 엔진 파일은 워커가 작업 때 엶)
+    if config.FIRST_PASS_PROCESSES <= 0:
+        return None
+    if not config.SHARED_MATCHER_PATH:
+        print("  [Warning] SHARED_MATCHER_PATH가 비어 있어 1차 필터 프로세스를 사용하지 않습니다.")
+        return None
+    pool = FirstPassProcessPool(config.FIRST_PASS_PROCESSES, min_batch=config.FIRST_PASS_PROCESS_MIN_BATCH)
+    pool.start(_resolve_path(config.SHARED_MATCHER_PATH))
+    return pool
+
+def _create_video_state() -> Optional[VideoStateStore]:
+    db_path = _resolve_path(config.VIDEO_STATE_DB_PATH)
+    if not db_path:
+        return None
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return VideoStateStore(db_path)
+
+def _create_result_store() -> Optional[ResultStore]:
+    db_path = _resolve_path(config.RESULT_STORE_DB_PATH)
+    if not db_path:
+        return None
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return ResultStore(db_path)
+
+def _create_verdict_cache() -> VerdictCache:
+    db_path = _resolve_path(config.VERDICT_CACHE_DB_PATH)
+    if db_path:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return VerdictCache(
+        max_entries=config.VERDICT_CACHE_SIZE,
+        ttl=config.VERDICT_CACHE_TTL,
+        db_path=db_path or None,
+        db_max_entries=config.VERDICT_CACHE_DB_MAX_ENTRIES
+    )
+
+def _create_tenant_registry() -> Optional[TenantRegistry]:
+    directory = _resolve_path(config.TENANT_DICTIONARY_DIR)
+    if not directory:
+        return None
+    return TenantRegistry(
+        directory,
+        max_entries=config.TENANT_CACHE_SIZE,
+        max_bytes=config.TENANT_CACHE_MAX_BYTES,
+        check_interval=config.DICTIONARY_CHECK_INTERVAL,
+        max_tenants=config.TENANT_MAX_TENANTS,
+        max_words=config.TENANT_MAX_WORDS,
+        max_word_length=config.TENANT_MAX_WORD_LENGTH
+    )
+
+def _create_job_manager() -> Optional[JobManager]:
+    db_path = _resolve_path(config.JOB_DB_PATH)
+    if not db_path:
+        return None
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return JobManager(
+        JobStore(db_path),
+        {"youtube": lambda job: _run_youtube_job(job)},  # 핸들러는 아래(Job APIs)에 정의
+        workers=config.JOB_WORKERS,
+        queue_limit=config.JOB_QUEUE_LIMIT,
+        retention=config.JOB_RETENTION,
+        lease=config.JOB_LEASE
+    )
 
-print("[System] 모듈 초기화 중...")
+def _timed_init(phase: str, factory):
+    """구성 요소 생성 + 소요 시간 기록"""
+    started = time.perf_counter()
+    component = factory()
+    startup_timings[phase] = time.perf_counter() - started
+    return component
+
+def _format_timings(timings: dict) -> str:
+    return ", ".join(f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in timings.items())
+
+print(f"[System] 모듈 초기화 중... (지연 초기화: {'ON' if config.LAZY_INIT else 'OFF'})")
 try:
-    first_filter = FirstPassFilter()
-    second_filter = SecondPassFilter()
+    first_pass_pool = _timed_init("first_pass_pool", _create_first_pass_pool)
+    first_filter = _timed_init("first_filter", FirstPassFilter)
+    first_filter.process_pool = first_pass_pool
+    second_filter = _timed_init("second_filter", SecondPassFilter)
     risk_scorer = RiskScorer()
     policy_manager = PolicyManager()
-    yt_client = YouTubeClient()
-    print("[System] 서버 준비 완료.")
+    yt_client = _timed_init("youtube_client", YouTubeClient)
+    video_state = _timed_init("video_state", _create_video_state)
+    result_store = _timed_init("result_store", _create_result_store)
+    verdict_cache = _timed_init("verdict_cache", _create_verdict_cache) if config.VERDICT_CACHE_ENABLED else None
+    response_cache = (
+        ResponseCache(max_entries=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL)
+        if config.RESPONSE_CACHE_ENABLED else None
+    )
+    tenant_registry = _create_tenant_registry()
+    job_manager = _timed_init("jobs", _create_job_manager)
+    pipeline = ModerationPipeline(
+        first_filter, second_filter, risk_scorer, policy_manager,
+        cpu_workers=config.PIPELINE_CPU_WORKERS,
+        verdict_cache=verdict_cache,
+        early_exit_gate=EarlyExitGate(
+            risk_scorer, policy_manager,
+            enabled=config.EARLY_EXIT_ENABLED,
+            clean_max_length=config.EARLY_EXIT_CLEAN_MAX_LENGTH
+        ),
+        tenant_registry=tenant_registry
+    )
+    metrics.register_collector(lambda: _component_metrics())
+
+    startup_timings["total"] = time.perf_counter() - _BOOT_STARTED
+    for phase, seconds in startup_timings.items():
+        STARTUP_SECONDS.set(seconds, phase=phase)
+    print(f"[System] 서버 준비 완료. (콜드 스타트 {startup_timings['total'] * 1000:.1f}ms)")
+    print(f"  ㄴ {_format_timings(startup_timings)}")
 except Exception as e:
     print(f"[System] 초기화 중 오류 발생: {e}")
     sys.exit(1)
 
+# warm-up 상태 (지연 초기화를 쓰지 않으면 이미 모두 준비된 상태)
+warmup_state = {"done": not config.LAZY_INIT, "timings": {}}
+_warmup_lock = threading.Lock()
+
+def warm_up() -> dict:
+    """
+    지연 초기화된 리소스를 미리 준비합니다. (여러 번 호출해도 한 번만 실행)
+    - 형태소 분석기(JVM), OpenAI 클라이언트 + 로컬 분류 모델, YouTube 서비스
+    """
+    with _warmup_lock:
+        if warmup_state["done"]:
+            return warmup_state
+
+        print("[System] warm-up 시작...")
+        for phase, func in (
+            ("warmup_tokenizer", first_filter.tokenizer.warm_up),
+            ("warmup_second_filter", second_filter.warm_up),
+            ("warmup_youtube_client", yt_client.warm_up),
+        ):
+            started = time.perf_counter()
+            try:
+                func()
+            except Exception as e:
+                print(f"  [Error] warm-up 실패 ({phase}): {e}")
+            elapsed = time.perf_counter() - started
+            warmup_state["timings"][phase] = elapsed
+            STARTUP_SECONDS.set(elapsed, phase=phase)
+
+        warmup_state["done"] = True
+        print(f"[System] warm-up 완료. ({_format_timings(warmup_state['timings'])})")
+    return warmup_state
+
 
 # =========================================================
 # [Pydantic 모델 정의] - 단계별 엄격한 분리 (Strict Mode)
@@ -53,28 +240,38 @@ class TextInput(BaseModel):
     text: str = Field(..., json_schema_extra={
         "example": "야이 개새끼야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라"
     })
+    tenant_id: Optional[str] = Field(None, description="채널 ID (채널별 화이트/블랙리스트, 보안 레벨 적용)")
 
 # --- [Step 1 전용 모델] ---
 
 class FirstPassDetectedWord(BaseModel):
     word: str = Field(..., description="1차 필터가 잡아낸 단어", json_schema_extra={"example": "개새끼"})
     type: str = Field(..., description="감지 유형 (시스템/사용자 사전)", json_schema_extra={"example": "SYSTEM_KEYWORD"})
+    category: Optional[str] = Field(None, description="시스템 사전 카테고리", json_schema_extra={"example": "bitch"})
+    variant: bool = Field(False, description="회피 표기(띄어 쓰기/자모 분리/닮은 문자 등)로 적중했는지 여부")
 
 class FirstPassResponse(BaseModel):
     original_text: str = Field(..., json_schema_extra={"example": "야이 개새끼야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라"})
     status: str = Field(..., description="1차 필터링 상태", json_schema_extra={"example": "FILTERED_BY_FIRST_PASS"})
     detected_words: List[FirstPassDetectedWord] = Field(..., json_schema_extra={
-        "example": [{"word": "개새끼", "type": "SYSTEM_KEYWORD"}]
+        "example": [{"word": "개새끼", "type": "SYSTEM_KEYWORD", "category": "bitch"}]
     })
     text_for_filtering: str = Field(..., description="1차 마스킹 완료된 텍스트", json_schema_extra={
         "example": "야이 __F__야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라"
     })
+    tags: Optional[List[str]] = Field(None, description="2차 필터에서 활성화할 AI 모듈 태그 (없으면 모든 모듈 적용)", json_schema_extra={
+        "example": ["PRIVACY"]
+    })
+    normalized_text: Optional[str] = Field(None, description="정규화 텍스트 (spans 위치 기준)")
+    spans: Optional[List[Tuple[int, int, str, Optional[str]]]] = Field(None, description="적발 구간 [start, end, source, category]")
+    dictionary_version: Optional[str] = Field(None, description="매칭에 사용한 사전 버전")
 
 # --- [Step 2 전용 모델] ---
 
 class SecondPassDetectedWord(BaseModel):
     word: str = Field(..., description="1차 혹은 2차 필터가 잡아낸 단어", json_schema_extra={"example": "010-1234-5678"})
     type: str = Field(..., description="감지 유형 (AI 카테고리 포함)", json_schema_extra={"example": "AI_PRIVACY"})
+    category: Optional[str] = Field(None, description="시스템 사전 카테고리 (1차 적발 항목)")
 
 class SecondPassResponse(BaseModel):
     original_text: str = Field(..., json_schema_extra={"example": "야이 개새끼야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라"})
@@ -89,6 +286,11 @@ class SecondPassResponse(BaseModel):
     text_for_filtering: str = Field(..., description="2차 마스킹 완료된 텍스트", json_schema_extra={
         "example": "야이 __F__야 ㅋㅋ __S__ __S__ __S__"
     })
+    tags: Optional[List[str]] = Field(None, description="1차 필터가 붙인 AI 모듈 태그")
+    normalized_text: Optional[str] = Field(None, description="정규화 텍스트 (spans 위치 기준)")
+    spans: Optional[List[Tuple[int, int, str, Optional[str]]]] = Field(None, description="1차+2차 누적 적발 구간 [start, end, source, category]")
+    dictionary_version: Optional[str] = Field(None, description="1차 매칭에 사용한 사전 버전")
+    degraded_reason: Optional[str] = Field(None, description="status가 DEGRADED일 때 GPT 응답을 받지 못한 사유 (rate_limited, timeout, circuit_open 등)")
 
 # --- [Step 3 & 4 전용 모델] ---
 
@@ -99,6 +301,7 @@ class PolicyInput(BaseModel):
     risk_score: float = Field(..., json_schema_extra={"example": 0.98})
     # 정책 결정에는 최종 결과(2차 결과)가 들어가는 것이 맞음
     filter_result: SecondPassResponse 
+    security_level: Optional[int] = Field(None, ge=1, le=5, description="보안 레벨 (없으면 서버 기본값)")
 
 class PolicyResponse(BaseModel):
     action: str = Field(..., description="최종 처분 결과", json_schema_extra={"example": "AUTO_HIDE"})
@@ -112,11 +315,35 @@ class AnalysisResult(BaseModel):
     processed_text: str
     action: str
     score: float
+    pipeline_path: str = Field("FULL", description="판정 경로 (FULL / EARLY_EXIT_BLOCK / EARLY_EXIT_CLEAN)")
+    dictionary_version: Optional[str] = Field(None, description="판정에 사용한 사전 버전")
+    degraded: bool = Field(False, description="GPT 응답 없이 1차 결과만으로 판정했는지 여부")
     details: SecondPassResponse # 디테일은 최종 필터링 결과 구조를 따름
 
+# --- [일괄 분석 모델] ---
+
+class UserDictionaryInput(BaseModel):
+    user_whitelist: List[str] = Field(default_factory=list, json_schema_extra={"example": ["천사"]})
+    user_blacklist: List[str] = Field(default_factory=list, json_schema_extra={"example": ["개새끼"]})
+
+class TenantDictionaryInput(UserDictionaryInput):
+    security_level: Optional[int] = Field(None, ge=1, le=5, description="채널 보안 레벨 (없으면 서버 기본값)")
+
+class BatchTextInput(BaseModel):
+    texts: List[str] = Field(..., json_schema_extra={"example": ["야이 개새끼야 ㅋㅋ", "좋은 영상 감사합니다"]})
+
+class BatchAnalysisItem(AnalysisResult):
+    index: int = Field(..., description="입력 순서 (0부터)")
+
+class BatchAnalysisResponse(BaseModel):
+    count: int
+    results: List[BatchAnalysisItem]
+
 # --- [유튜브 리포트 모델] ---
 
 class YoutubeCommentSummary(BaseModel):
+    comment_id: Optional[str] = None
+    parent_id: Optional[str] = None  # 답글이면 부모 댓글 ID
     author: str
     published_at: str
     original: str
@@ -124,11 +351,68 @@ class YoutubeCommentSummary(BaseModel):
     action: str
     risk_score: float
     violation_tags: List[str]
+    pipeline_path: str = "FULL"
+    cluster_id: Optional[int] = None  # 근접 중복 군집 구성원이면 군집 번호
+    degraded: bool = False  # GPT 응답 없이 1차 결과만으로 판정 (다음 분석 때 다시 분석)
+
+class NearDuplicateMember(BaseModel):
+    label: Any = Field(..., description="댓글 ID (없으면 수집 순서)")
+    similarity: float
+
+class NearDuplicateAudit(BaseModel):
+    cluster_id: int
+    representative: Any = Field(..., description="대표 댓글 ID (없으면 수집 순서)")
+    action: Optional[str] = Field(None, description="대표 판정 (구성원에 전파됨)")
+    size: int
+    members: List[NearDuplicateMember]
 
 class YoutubeAnalysisResponse(BaseModel):
     video_info: Dict[str, str]
     stats: Dict[str, int]
     results: List[YoutubeCommentSummary]
+    clusters: List[NearDuplicateAudit] = Field(default_factory=list, description="근접 중복 군집 기록")
+
+# --- [판정 기록 모델] ---
+
+class StoredResult(YoutubeCommentSummary):
+    video_id: str = Field(..., description="영상 ID (단일/일괄 텍스트 분석은 빈 문자열)")
+    content_hash: str = Field(..., description="원문 내용 해시")
+    tenant_id: Optional[str] = None
+    spans: Optional[List[Tuple[int, int, str, Optional[str]]]] = Field(None, description="적발 구간 (정규화 텍스트 기준)")
+    analyzed_at: float = Field(..., description="분석 시각 (epoch 초)")
+
+class StoredResultsResponse(BaseModel):
+    total: int = Field(..., description="조건에 맞는 전체 기록 수")
+    offset: int
+    next_offset: Optional[int] = Field(None, description="다음 조회 시작 위치 (더 없으면 null)")
+    results: List[StoredResult]
+
+class StoredVideoResponse(YoutubeAnalysisResponse):
+    results: List[StoredResult]
+    analyzed_at: float = Field(..., description="마지막 분석 시각 (epoch 초)")
+    next_offset: Optional[int] = Field(None, description="다음 페이지 시작 위치 (/api/results?video_id=..., 더 없으면 null)")
+
+# --- [백그라운드 작업 모델] ---
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str = Field(..., description="QUEUED / RUNNING / COMPLETED / FAILED / CANCELLED")
+    coalesced: bool = Field(False, description="같은 영상/옵션으로 진행 중이던 작업에 합쳐졌는지 여부 (등록 응답)")
+    params: Dict[str, Any]
+    progress: Dict[str, int] = Field(..., description="pages: 처리한 페이지 수, results: 저장된 결과 수")
+    stats: Dict[str, int] = Field(..., description="지금까지의 누적 통계 (analyze-youtube의 stats와 같은 항목)")
+    video_info: Optional[Dict[str, str]] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+class JobResultsResponse(BaseModel):
+    job_id: str
+    status: str
+    offset: int
+    next_offset: Optional[int] = Field(None, description="다음 조회 시작 위치 (작업이 끝났고 더 없으면 null)")
+    results: List[YoutubeCommentSummary]
 
 
 # =========================================================
@@ -141,8 +425,9 @@ async def run_first_pass(input_data: TextInput):
     KoNLPy 및 사전을 이용한 1차 필터링을 수행합니다.
     반환값은 FirstPassResponse 모델을 따릅니다.
     """
+    overlay = await _tenant_overlay(input_data.tenant_id)
     try:
-        result = first_filter.execute(input_data.text)
+        result = await first_filter.execute_async(input_data.text, overlay=overlay)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -156,8 +441,9 @@ async def run_second_pass(
             "example": {
                 "original_text": "야이 개새끼야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라",
                 "status": "FILTERED_BY_FIRST_PASS",
-                "detected_words": [{"word": "개새끼", "type": "SYSTEM_KEYWORD"}],
-                "text_for_filtering": "야이 __F__야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라"
+                "detected_words": [{"word": "개새끼", "type": "SYSTEM_KEYWORD", "category": "bitch"}],
+                "text_for_filtering": "야이 __F__야 ㅋㅋ 니네 집 주소 다 털었다 010-1234-5678 밤길 조심해라",
+                "tags": ["PRIVACY"]
             }
         }
     )
@@ -169,7 +455,7 @@ async def run_second_pass(
     try:
         # Pydantic 모델 -> dict 변환
         input_dict = first_pass_result.dict()
-        result = second_filter.execute(input_dict)
+        result = await second_filter.execute_async(input_dict)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -225,7 +511,7 @@ async def decide_policy(
     try:
         score = data.risk_score
         f_res = data.filter_result.dict()
-        decision = policy_manager.decide_action(score, f_res)
+        decision = policy_manager.decide_action(score, f_res, data.security_level)
         return decision
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -236,33 +522,19 @@ async def decide_policy(
 async def get_youtube_video_info(video_id: str):
     if not yt_client.youtube:
         raise HTTPException(status_code=500, detail="YouTube API 클라이언트가 초기화되지 않았습니다.")
-    return yt_client.get_video_details(video_id)
+    return await run_in_threadpool(yt_client.get_video_details, video_id)
 
 @app.get("/api/modules/youtube/comments", summary="유튜브 댓글 수집 (원문)")
-async def get_youtube_comments_raw(video_id: str, max_pages: int = 1):
+async def get_youtube_comments_raw(video_id: str, max_pages: int = 1, include_replies: bool = False):
     if not yt_client.youtube:
         raise HTTPException(status_code=500, detail="YouTube API 클라이언트가 초기화되지 않았습니다.")
-    comments = yt_client.get_comments(video_id, max_pages=max_pages)
+    comments = await run_in_threadpool(yt_client.get_comments, video_id, max_pages=max_pages, include_replies=include_replies)
     return {"video_id": video_id, "total_count": len(comments), "comments": comments}
 
 # =========================================================
 # [API 2] 전체 통합 워크플로우 (Workflow APIs)
 # =========================================================
 
-def _run_pipeline(text: str) -> dict:
-    res = first_filter.execute(text)
-    res = second_filter.execute(res)
-    score = risk_scorer.execute(res)
-    final_decision = policy_manager.decide_action(score, res)
-    
-    return {
-        "original_text": res['original_text'],
-        "processed_text": final_decision['processed_text'],
-        "action": final_decision['action'],
-        "score": score,
-        "details": res
-    }
-
 @app.post("/api/workflow/analyze-text", response_model=AnalysisResult, summary="단일 텍스트 전체 분석")
 async def analyze_single_text(
     input_data: TextInput = Body(
@@ -272,47 +544,882 @@ async def analyze_single_text(
         }
     )
 ):
+    await _tenant_overlay(input_data.tenant_id)
     try:
-        result = _run_pipeline(input_data.text)
-        return result
+        result = await pipeline.run_async(input_data.text, input_data.tenant_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    await _record_texts([input_data.text], [result], input_data.tenant_id)
+    return result
 
-@app.post("/api/workflow/analyze-youtube", response_model=YoutubeAnalysisResponse, summary="유튜브 영상 댓글 분석")
-async def analyze_youtube_video(video_id: str, max_pages: int = 1):
-    if not yt_client.youtube:
-        raise HTTPException(status_code=500, detail="YouTube API 연결 실패 (API Key 확인 필요)")
-    
-    video_info = yt_client.get_video_details(video_id)
-    comments = yt_client.get_comments(video_id, max_pages=max_pages)
-    
-    analyzed_results = []
-    blocked_count = 0
-    
-    for comm in comments:
-        text = comm['text_original']
-        analysis = _run_pipeline(text)
-        
+def _parse_batch_body(body: bytes, content_type: str) -> List[str]:
+    """
+    일괄 분석 요청 본문 -> 텍스트 리스트
+    - application/json     : {"texts": [...]} 또는 [...]
+    - application/x-ndjson : 한 줄에 하나씩 "문자열" 또는 {"text": "..."}
+    """
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            items = [json.loads(line) for line in body.decode('utf-8').splitlines() if line.strip()]
+        else:
+            data = json.loads(body or b"null")
+            items = data.get("texts") if isinstance(data, dict) else data
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"요청 본문을 해석할 수 없습니다: {e}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="texts 리스트가 필요합니다.")
+
+    texts = []
+    for idx, item in enumerate(items):
+        text = item.get("text") if isinstance(item, dict) else item
+        if not isinstance(text, str):
+            raise HTTPException(status_code=400, detail=f"{idx}번째 항목에 텍스트가 없습니다.")
+        texts.append(text)
+    return texts
+
+@app.post(
+    "/api/workflow/analyze-batch",
+    summary="여러 텍스트 일괄 분석",
+    responses={200: {"model": BatchAnalysisResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": BatchTextInput.model_json_schema()},
+                "application/x-ndjson": {"schema": {"type": "string", "example": "\"야이 개새끼야 ㅋㅋ\"\n{\"text\": \"좋은 영상 감사합니다\"}"}}
+            }
+        }
+    }
+)
+async def analyze_batch(request: Request, tenant_id: Optional[str] = None):
+    """
+    여러 텍스트를 한 번의 요청으로 분석합니다.
+    - 각 단계를 묶음 단위로 호출합니다. (정규화 후 형태소 분석을 워커 풀에 한꺼번에 요청, GPT 배치 호출, 점수/정책은 항목별 계산)
+    - 결과의 index는 입력 순서와 같습니다.
+    - 항목마다 응답 모델 검증을 거치지 않도록 JSON을 바로 반환합니다.
+    - tenant_id(쿼리)를 주면 해당 채널의 사전/보안 레벨을 적용합니다.
+    """
+    await _tenant_overlay(tenant_id)
+    body = await request.body()
+    texts = await run_in_threadpool(_parse_batch_body, body, request.headers.get("content-type", ""))
+    if len(texts) > config.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {config.BATCH_MAX_ITEMS}개까지 분석할 수 있습니다.")
+
+    try:
+        analyses = await pipeline.run_batch_async(texts, tenant_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    await _record_texts(texts, analyses, tenant_id)
+
+    return JSONResponse({
+        "count": len(analyses),
+        "results": [{"index": idx, **analysis} for idx, analysis in enumerate(analyses)]
+    })
+
+def _video_summary(video_id: str, video_info: Optional[dict]) -> dict:
+    return {"title": (video_info or {}).get('snippet', {}).get('title', 'Unknown'), "id": video_id}
+
+def _summarize(comm: dict, analysis: dict) -> dict:
+    """파이프라인 결과 -> YoutubeCommentSummary"""
+    return {
+        "comment_id": comm.get('comment_id'),
+        "parent_id": comm.get('parent_id'),
+        "author": comm['author_display_name'],
+        "published_at": comm['published_at'],
+        "original": comm['text_original'],
+        "processed": analysis['processed_text'],
+        "action": analysis['action'],
+        "risk_score": analysis['score'],
+        "violation_tags": [item['type'] for item in analysis['details']['detected_words']],
+        "pipeline_path": analysis['pipeline_path'],
+        "cluster_id": analysis.get('cluster', {}).get('id'),
+        "degraded": analysis.get('degraded', False)
+    }
+
+def _spans_of(analysis: dict):
+    spans = analysis['details'].get('spans')
+    return [list(span) for span in spans] if spans is not None else None
+
+async def _record_texts(texts: List[str], analyses: List[dict], tenant_id: Optional[str] = None):
+    """단일/일괄 텍스트 분석 결과를 판정 기록에 저장 (video_id '', comment_id = 내용 해시)"""
+    if result_store is None:
+        return
+    items = {}
+    for text, analysis in zip(texts, analyses):
+        if analysis.get('degraded'):  # GPT 응답 없이 낸 판정은 기록하지 않음
+            continue
+        text_hash = VideoStateStore.text_hash(text)
         summary = {
-            "author": comm['author_display_name'],
-            "published_at": comm['published_at'],
             "original": text,
             "processed": analysis['processed_text'],
             "action": analysis['action'],
             "risk_score": analysis['score'],
-            "violation_tags": [item['type'] for item in analysis['details']['detected_words']]
+            "violation_tags": [item['type'] for item in analysis['details']['detected_words']],
+            "pipeline_path": analysis['pipeline_path'],
+            "degraded": analysis.get('degraded', False),
         }
-        analyzed_results.append(summary)
-        
-        if analysis['action'] != "PASS":
-            blocked_count += 1
+        items[text_hash] = (text_hash, text_hash, summary, _spans_of(analysis), None)
+    if items:
+        await run_in_threadpool(result_store.save, "", list(items.values()), tenant_id)
+
+async def _record_video(video_id: str, video_summary: dict, tenant_id: Optional[str] = None):
+    if result_store is not None:
+        await run_in_threadpool(result_store.save_video, video_id, video_summary.get('title'), tenant_id)
 
+def _build_stats(summaries: List[dict], analyzed_count: int) -> Dict[str, int]:
+    blocked_count = sum(1 for s in summaries if s['action'] != "PASS")
+    early_exit_count = sum(1 for s in summaries if s['pipeline_path'].startswith("EARLY_EXIT"))
+    near_duplicate_count = sum(1 for s in summaries if s['pipeline_path'] == NearDuplicateIndex.PATH)
+    degraded_count = sum(1 for s in summaries if s.get('degraded'))
     return {
-        "video_info": {"title": video_info.get('snippet', {}).get('title', 'Unknown'), "id": video_id},
-        "stats": {"total_comments": len(comments), "blocked_comments": blocked_count, "clean_comments": len(comments) - blocked_count},
-        "results": analyzed_results
+        "total_comments": len(summaries),
+        "blocked_comments": blocked_count,
+        "clean_comments": len(summaries) - blocked_count,
+        "early_exit_comments": early_exit_count,
+        "near_duplicate_comments": near_duplicate_count,  # 대표 댓글의 판정을 전파받은 댓글 수 (2차 필터 생략)
+        "degraded_comments": degraded_count,  # GPT 응답 없이 1차 결과만으로 판정한 댓글 수
+        "analyzed_comments": analyzed_count  # 이번 요청에서 새로 분석한 댓글 수 (나머지는 저장된 결과 재사용)
     }
 
+async def _load_video_state(video_id: str, incremental: bool, tenant_id: Optional[str] = None):
+    """증분 분석용 (지문, 저장된 판정) 로드. 비활성화 시 (None, {})"""
+    if video_state is None or not incremental:
+        return None, {}
+    fingerprint = await run_in_threadpool(pipeline.fingerprint, tenant_id)
+    stored = await run_in_threadpool(video_state.load, video_id, fingerprint, tenant_id)
+    return fingerprint, stored
+
+def _near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """요청 하나(영상 하나) 동안 공유할 근접 중복 색인 (비활성화 시 None)"""
+    if not config.NEAR_DUPLICATE_ENABLED:
+        return None
+    return NearDuplicateIndex(threshold=config.NEAR_DUPLICATE_THRESHOLD, min_length=config.NEAR_DUPLICATE_MIN_LENGTH)
+
+async def _analyze_comments(video_id: str, comments: List[dict], fingerprint: Optional[str], stored: dict,
+                            tenant_id: Optional[str] = None, near_duplicates: Optional[NearDuplicateIndex] = None,
+                            positions: Optional[List[int]] = None):
+    """
+    댓글 목록 분석 (입력 순서 유지)
+    - 저장된 판정이 있고 내용이 같은 댓글은 재사용하고, 새 댓글/수정된 댓글만 파이프라인에 넣습니다.
+    - near_duplicates가 주어지면 근접 중복 댓글은 군집 대표의 판정을 전파받습니다.
+    - positions: 댓글별 수집 순서 (판정 기록을 수집 순서로 조회하기 위해 저장)
+    - 반환: (요약 리스트, 새로 분석한 댓글 수)
+    """
+    if positions is None:
+        positions = [None] * len(comments)
+    summaries = [None] * len(comments)
+    todo = []
+    reused = []
+    for idx, comm in enumerate(comments):
+        text_hash = VideoStateStore.text_hash(comm['text_original'])
+        prev = stored.get(comm.get('comment_id'))
+        if prev is not None and prev[0] == text_hash:
+            summaries[idx] = prev[1]
+            if comm.get('comment_id'):
+                reused.append((comm['comment_id'], text_hash, prev[1], None, positions[idx]))
+        else:
+            todo.append((idx, text_hash))
+
+    texts = [comments[idx]['text_original'] for idx, _ in todo]
+    if near_duplicates is not None:
+        labels = [comments[idx].get('comment_id') or idx for idx, _ in todo]
+        analyses = await pipeline.run_clustered_async(texts, near_duplicates, tenant_id, labels)
+    else:
+        analyses = await pipeline.run_batch_async(texts, tenant_id)
+
+    fresh = []
+    records = []
+    for (idx, text_hash), analysis in zip(todo, analyses):
+        summaries[idx] = _summarize(comments[idx], analysis)
+        # DEGRADED 판정은 분석 상태/판정 기록 모두에 저장하지 않음 (다음 분석 때 다시 분석)
+        if not comments[idx].get('comment_id') or analysis.get('degraded'):
+            continue
+        records.append((comments[idx]['comment_id'], text_hash, summaries[idx], _spans_of(analysis), positions[idx]))
+        fresh.append((comments[idx]['comment_id'], text_hash, summaries[idx]))
+
+    if fingerprint is not None and fresh:
+        await run_in_threadpool(video_state.save, video_id, fingerprint, fresh, tenant_id)
+    if result_store is not None and records:
+        await run_in_threadpool(result_store.save, video_id, records, tenant_id)
+    if result_store is not None and reused:
+        await run_in_threadpool(functools.partial(result_store.save, video_id, reused, tenant_id, reused=True))
+    return summaries, len(todo)
+
+def _conditional_response(request: Request, etag: str, body: dict, cache_status: Optional[str] = None) -> Response:
+    """ETag를 붙인 JSON 응답 (If-None-Match가 같으면 본문 없이 304)"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if cache_status is not None:
+        headers["X-Response-Cache"] = cache_status
+    if_none_match = request.headers.get("if-none-match")
+    if cache_status is not None:
+        # 응답 캐시를 거친 분석 응답만 응답 캐시 통계에 집계
+        matched = response_cache.not_modified(if_none_match, etag)
+    else:
+        matched = etag_matches(if_none_match, etag)
+        if matched:
+            HTTP_NOT_MODIFIED.inc(route=getattr(request.scope.get("route"), "path", "unmatched"))
+    if matched:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(body, headers=headers)
+
+@app.post("/api/workflow/analyze-youtube", response_model=YoutubeAnalysisResponse, summary="유튜브 영상 댓글 분석")
+async def analyze_youtube_video(request: Request, video_id: str, max_pages: int = 1, include_replies: bool = False,
+                                incremental: bool = True, tenant_id: Optional[str] = None, refresh: bool = False):
+    """
+    영상 댓글을 수집해 분석합니다.
+    - incremental=True이면 이전 분석 결과를 재사용하고 새 댓글/수정된 댓글만 분석합니다.
+    - tenant_id를 주면 해당 채널의 사전/보안 레벨을 적용합니다.
+    - 같은 영상/파라미터/판정 지문의 응답은 RESPONSE_CACHE_TTL 동안 분석 없이 재사용합니다. (X-Response-Cache: HIT)
+      응답의 ETag를 If-None-Match로 보내면 바뀌지 않았을 때 304를 반환합니다.
+    - refresh=true, Cache-Control: no-cache, incremental=false이면 저장된 응답을 쓰지 않고 다시 분석합니다.
+    """
+    if not yt_client.youtube:
+        raise HTTPException(status_code=500, detail="YouTube API 연결 실패 (API Key 확인 필요)")
+    await _tenant_overlay(tenant_id)
+    if response_cache is None:
+        return await _analyze_youtube(video_id, max_pages, include_replies, incremental, tenant_id)
+
+    fingerprint = await run_in_threadpool(pipeline.fingerprint, tenant_id)
+    key = ResponseCache.make_key("analyze-youtube", video_id, max_pages, include_replies, tenant_id, fingerprint)
+    refresh = refresh or not incremental or "no-cache" in request.headers.get("cache-control", "").lower()
+
+    async def compute():
+        result = await _analyze_youtube(video_id, max_pages, include_replies, incremental, tenant_id)
+        body = YoutubeAnalysisResponse.model_validate(result).model_dump(mode="json")
+        # 근접 중복 감사(clusters)와 analyzed_comments는 이번 분석에서 새로 처리한 댓글 기준이라 ETag에서 제외
+        return ResponseCache.make_etag(body, volatile=("clusters",), volatile_stats=("analyzed_comments",)), body
+
+    # GPT 응답 없이 판정한 댓글이 있는 응답은 저장하지 않음 (다음 요청에서 다시 분석)
+    etag, body, cache_status = await response_cache.get_or_compute(
+        key, video_id, compute, refresh, cacheable=lambda body: not body["stats"].get("degraded_comments")
+    )
+    if cache_status in (ResponseCache.HIT, ResponseCache.COALESCED):
+        # 이 요청에서 새로 분석한 댓글은 없음
+        body = {**body, "stats": {**body["stats"], "analyzed_comments": 0}}
+    return _conditional_response(request, etag, body, cache_status)
+
+async def _analyze_youtube(video_id: str, max_pages: int, include_replies: bool, incremental: bool,
+                           tenant_id: Optional[str]) -> dict:
+    """영상 댓글 수집 + 분석 (analyze-youtube 응답 형태)"""
+    fingerprint, stored = await _load_video_state(video_id, incremental, tenant_id)
+    near_duplicates = _near_duplicate_index()
+
+    # YouTube 클라이언트는 블로킹 호출이므로 스레드 풀에서 실행
+    video_task = asyncio.ensure_future(run_in_threadpool(yt_client.get_video_details, video_id))
+    pages = yt_client.iter_comment_pages(video_id, max_pages=max_pages, include_replies=include_replies)
+
+    # 다음 페이지를 받는 동안 이미 받은 페이지의 분석을 진행
+    comments = []
+    page_tasks = []
+    while True:
+        page = await run_in_threadpool(next, pages, None)
+        if page is None:
+            break
+        positions = list(range(len(comments), len(comments) + len(page)))
+        comments.extend(page)
+        page_tasks.append(asyncio.ensure_future(
+            _analyze_comments(video_id, page, fingerprint, stored, tenant_id, near_duplicates, positions)
+        ))
+
+    # 댓글 순서는 그대로 유지됨
+    parts = await asyncio.gather(*page_tasks)
+    analyzed_results = [summary for summaries, _ in parts for summary in summaries]
+    analyzed_count = sum(count for _, count in parts)
+    video_info = _video_summary(video_id, await video_task)
+    await _record_video(video_id, video_info, tenant_id)
+
+    return {
+        "video_info": video_info,
+        "stats": _build_stats(analyzed_results, analyzed_count),
+        "results": analyzed_results,
+        "clusters": near_duplicates.audit() if near_duplicates is not None else []
+    }
+
+def _encode_frame(frame: dict, fmt: str) -> str:
+    """스트리밍 프레임 직렬화 (NDJSON 한 줄 또는 SSE 이벤트)"""
+    data = json.dumps(frame, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {frame['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+async def _stream_youtube_frames(video_id: str, max_pages: int, include_replies: bool = False, incremental: bool = True,
+                                 tenant_id: Optional[str] = None):
+    """
+    스트리밍 프레임 생성기
+    - video_info 프레임 1개 -> comment 프레임 (분석되는 즉시, index는 수집 순서) -> stats 프레임 1개 (근접 중복 군집 기록 clusters 포함)
+    - 현재 페이지를 분석하는 동안 다음 페이지를 미리 받아옵니다.
+    """
+    video_info = _video_summary(video_id, await run_in_threadpool(yt_client.get_video_details, video_id))
+    await _record_video(video_id, video_info, tenant_id)
+    yield {"type": "video_info", "video_info": video_info}
+
+    fingerprint, stored = await _load_video_state(video_id, incremental, tenant_id)
+    near_duplicates = _near_duplicate_index()
+
+    pages = yt_client.iter_comment_pages(video_id, max_pages=max_pages, include_replies=include_replies)
+    next_page = asyncio.ensure_future(run_in_threadpool(next, pages, None))
+    pending = []
+    summaries = []
+    analyzed_count = 0
+    offset = 0
+
+    async def analyze_chunk(start: int, chunk: List[dict]):
+        chunk_summaries, count = await _analyze_comments(
+            video_id, chunk, fingerprint, stored, tenant_id, near_duplicates, list(range(start, start + len(chunk)))
+        )
+        return [(start + i, summary) for i, summary in enumerate(chunk_summaries)], count
+
+    try:
+        while True:
+            page = await next_page
+            if page is None:
+                break
+            next_page = asyncio.ensure_future(run_in_threadpool(next, pages, None))
+
+            # 페이지를 작은 묶음으로 나눠 동시에 분석하고, 끝나는 묶음부터 바로 내보냄
+            size = config.STREAM_CHUNK_SIZE
+            pending = [
+                asyncio.ensure_future(analyze_chunk(offset + i, page[i:i + size]))
+                for i in range(0, len(page), size)
+            ]
+            for fut in asyncio.as_completed(pending):
+                indexed, count = await fut
+                analyzed_count += count
+                for index, summary in indexed:
+                    summaries.append(summary)
+                    yield {"type": "comment", "index": index, "result": summary}
+            offset += len(page)
+
+        yield {
+            "type": "stats",
+            "stats": _build_stats(summaries, analyzed_count),
+            "clusters": near_duplicates.audit() if near_duplicates is not None else []
+        }
+    finally:
+        # 클라이언트 연결이 끊긴 경우 남은 작업 정리
+        next_page.cancel()
+        for fut in pending:
+            fut.cancel()
+
+@app.post("/api/workflow/analyze-youtube/stream", summary="유튜브 영상 댓글 분석 (스트리밍)")
+async def analyze_youtube_video_stream(video_id: str, max_pages: int = 1, include_replies: bool = False, incremental: bool = True, format: str = "ndjson",
+                                       tenant_id: Optional[str] = None):
+    """
+    댓글 분석 결과를 분석되는 즉시 스트리밍합니다.
+    - format=ndjson : 한 줄에 JSON 프레임 하나 (application/x-ndjson)
+    - format=sse    : Server-Sent Events (text/event-stream)
+    """
+    if not yt_client.youtube:
+        raise HTTPException(status_code=500, detail="YouTube API 연결 실패 (API Key 확인 필요)")
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format은 ndjson 또는 sse만 가능합니다.")
+    await _tenant_overlay(tenant_id)
+
+    async def body():
+        async for frame in _stream_youtube_frames(video_id, max_pages, include_replies, incremental, tenant_id):
+            yield _encode_frame(frame, format)
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+# =========================================================
+# [API 2-1] 백그라운드 작업 (Job APIs)
+# =========================================================
+
+def _add_stats(total: Dict[str, int], stats: Dict[str, int]):
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+
+async def _run_youtube_job(job):
+    """
+    영상 댓글 분석 작업 (JobManager 핸들러)
+    - analyze-youtube와 같은 수집/분석 경로를 쓰되, 페이지마다 결과를 작업 저장소에 기록합니다.
+    - 최대 JOB_PAGE_CONCURRENCY 페이지를 동시에 분석하고, 체크포인트는 수집 순서대로 남깁니다.
+    - 재시작 후 이어서 실행하면 이미 결과가 저장된 댓글은 건너뜁니다.
+      (댓글 캐시/영상 분석 상태가 켜져 있으면 다시 수집·분석하는 비용도 거의 없음)
+    """
+    params = job.params
+    video_id, tenant_id = params["video_id"], params.get("tenant_id")
+    if not yt_client.youtube:
+        raise RuntimeError("YouTube API 연결 실패 (API Key 확인 필요)")
+
+    if job.info is None:
+        video_info = _video_summary(video_id, await run_in_threadpool(yt_client.get_video_details, video_id))
+        await job.set_info(video_info)
+        await _record_video(video_id, video_info, tenant_id)
+    fingerprint, stored = await _load_video_state(video_id, params["incremental"], tenant_id)
+    done = await job.done_ids()
+    if done:
+        print(f"[System] 작업 이어서 실행: {job.job_id} (저장된 결과 {len(done)}개 건너뜀)")
+
+    near_duplicates = _near_duplicate_index()
+    pages = yt_client.iter_comment_pages(video_id, max_pages=params["max_pages"], include_replies=params["include_replies"])
+    in_flight = deque()  # (분석 Task 또는 None, 댓글 목록, 새로 처리한 페이지 수)
+
+    async def checkpoint_oldest():
+        task, todo, new_pages = in_flight.popleft()
+        if task is None:
+            if new_pages:
+                await job.checkpoint([], {}, pages=new_pages)
+            return
+        summaries, analyzed_count = await task
+        stats = _build_stats(summaries, analyzed_count)
+        await job.checkpoint(
+            [(comm.get('comment_id'), summary) for comm, summary in zip(todo, summaries)], stats, pages=new_pages
+        )
+
+    try:
+        page_count = 0
+        collected = 0
+        while True:
+            page = await run_in_threadpool(next, pages, None)
+            if page is None:
+                break
+            page_count += 1
+
+            # 이전 실행에서 체크포인트까지 끝낸 페이지는 진행률에도 이미 포함되어 있음
+            indexed = [(collected + i, comm) for i, comm in enumerate(page) if comm.get('comment_id') not in done]
+            collected += len(page)
+            todo = [comm for _, comm in indexed]
+            task = asyncio.ensure_future(
+                _analyze_comments(video_id, todo, fingerprint, stored, tenant_id, near_duplicates,
+                                  [position for position, _ in indexed])
+            ) if todo else None
+            in_flight.append((task, todo, 1 if todo or not page else 0))
+            if len(in_flight) >= config.JOB_PAGE_CONCURRENCY:
+                await checkpoint_oldest()
+
+            # 색인이 계속 커지지 않도록 일정 페이지마다 새로 만듦 (도배는 대부분 가까운 페이지에 몰려 있음)
+            if near_duplicates is not None and page_count % config.JOB_NEAR_DUPLICATE_WINDOW == 0:
+                near_duplicates = _near_duplicate_index()
+
+        while in_flight:
+            await checkpoint_oldest()
+    finally:
+        for task, _, _ in in_flight:
+            if task is not None:
+                task.cancel()
+        try:
+            pages.close()  # 미리 받기 스레드 종료
+        except ValueError:
+            pass  # 다음 페이지를 받는 중에 취소됨 (생성기가 정리될 때 미리 받기 스레드도 멈춤)
+
+def _job_status(row: dict, coalesced: bool = False) -> dict:
+    return {
+        "job_id": row["job_id"],
+        "kind": row["kind"],
+        "status": row["status"],
+        "coalesced": coalesced,
+        "params": row["params"],
+        "progress": row["progress"],
+        "stats": row["stats"],
+        "video_info": row["info"],
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+def _require_jobs() -> JobManager:
+    if job_manager is None:
+        raise HTTPException(status_code=400, detail="백그라운드 작업이 비활성화되어 있습니다. (JOB_DB_PATH)")
+    return job_manager
+
+@app.post("/api/workflow/jobs/analyze-youtube", response_model=JobStatusResponse, status_code=202,
+          summary="유튜브 영상 댓글 분석 작업 등록 (대용량)")
+async def submit_youtube_job(video_id: str, max_pages: int = 100, include_replies: bool = False, incremental: bool = True,
+                             tenant_id: Optional[str] = None):
+    """
+    댓글 수가 많은 영상을 백그라운드에서 분석합니다. 바로 작업 ID를 반환합니다.
+    - 같은 영상/옵션으로 대기·실행 중인 작업이 있으면 새로 만들지 않고 그 작업을 반환합니다. (coalesced=true)
+    - 진행 상황: GET /api/workflow/jobs/{job_id}, 결과(진행 중에도 조회 가능): GET /api/workflow/jobs/{job_id}/results
+    """
+    manager = _require_jobs()
+    if not yt_client.youtube:
+        raise HTTPException(status_code=500, detail="YouTube API 연결 실패 (API Key 확인 필요)")
+    if not 1 <= max_pages <= config.JOB_MAX_PAGES:
+        raise HTTPException(status_code=400, detail=f"max_pages는 1~{config.JOB_MAX_PAGES} 사이여야 합니다.")
+    await _tenant_overlay(tenant_id)
+
+    params = {
+        "video_id": video_id,
+        "max_pages": max_pages,
+        "include_replies": include_replies,
+        "incremental": incremental,
+        "tenant_id": tenant_id,
+    }
+    dedupe_key = json.dumps(["youtube", video_id, max_pages, include_replies, incremental, tenant_id])
+    try:
+        row, coalesced = await manager.submit("youtube", dedupe_key, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return _job_status(row, coalesced)
+
+@app.get("/api/workflow/jobs/{job_id}", response_model=JobStatusResponse, summary="작업 진행 상황 조회")
+async def get_job(job_id: str):
+    row = await run_in_threadpool(_require_jobs().store.get, job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _job_status(row)
+
+@app.get("/api/workflow/jobs/{job_id}/results", response_model=JobResultsResponse, summary="작업 결과 조회 (부분 결과 포함)")
+async def get_job_results(job_id: str, offset: int = 0, limit: int = 500):
+    """저장된 순서(수집 순서)대로 offset부터 최대 limit(1~1000)개를 반환합니다. 진행 중인 작업은 지금까지의 결과를 반환합니다."""
+    store = _require_jobs().store
+    if offset < 0 or not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="offset은 0 이상, limit은 1~1000 사이여야 합니다.")
+    row = await run_in_threadpool(store.get, job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    results = await run_in_threadpool(store.results, job_id, offset, limit)
+
+    next_offset = offset + len(results)
+    if len(results) < limit and row["status"] not in JobStore.ACTIVE:
+        next_offset = None
+    return {"job_id": job_id, "status": row["status"], "offset": offset, "next_offset": next_offset, "results": results}
+
+@app.delete("/api/workflow/jobs/{job_id}", response_model=JobStatusResponse, summary="작업 취소")
+async def cancel_job(job_id: str):
+    """대기 중인 작업은 실행하지 않고, 실행 중인 작업은 중단합니다. (중단이 끝나면 CANCELLED, 이미 저장된 결과는 남음)"""
+    row = await _require_jobs().cancel(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _job_status(row)
+
+# =========================================================
+# [API 2-2] 판정 기록 조회 (Result APIs)
+# =========================================================
+
+def _require_results() -> ResultStore:
+    if result_store is None:
+        raise HTTPException(status_code=503, detail="판정 기록 저장소가 비활성화되어 있습니다. (RESULT_STORE_DB_PATH)")
+    return result_store
+
+def _check_page(offset: int, limit: int):
+    if offset < 0 or not 1 <= limit <= config.RESULT_QUERY_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400, detail=f"offset은 0 이상, limit은 1~{config.RESULT_QUERY_MAX_LIMIT} 사이여야 합니다."
+        )
+
+@app.get("/api/results", response_model=StoredResultsResponse, summary="판정 기록 조회 (필터 + 페이지)")
+async def query_results(video_id: Optional[str] = None, action: Optional[str] = None, tag: Optional[str] = None,
+                        min_score: Optional[float] = None, max_score: Optional[float] = None,
+                        since: Optional[float] = None, until: Optional[float] = None, tenant_id: Optional[str] = None,
+                        order: str = "recent", offset: int = 0, limit: int = 100):
+    """
+    저장된 판정 기록을 파이프라인 재실행 없이 조회합니다.
+    - video_id: 영상 ID (빈 문자열이면 단일/일괄 텍스트 분석 기록)
+    - action / tag / min_score~max_score / since~until(분석 시각, epoch 초) / tenant_id로 거를 수 있습니다.
+    - tenant_id를 주지 않으면 모든 채널의 기록, 빈 문자열이면 채널 지정 없이 분석한 기록만 조회합니다.
+    - order: collected(마지막 수집 순서) / recent(최근 분석순) / score(점수 높은 순) / published(작성 최신순)
+    """
+    store = _require_results()
+    _check_page(offset, limit)
+    if order not in ResultStore.ORDERS:
+        raise HTTPException(status_code=400, detail=f"order는 {', '.join(ResultStore.ORDERS)} 중 하나여야 합니다.")
+    total, results = await run_in_threadpool(
+        functools.partial(
+            store.query, order, offset, limit, video_id=video_id, action=action, tag=tag, min_score=min_score,
+            max_score=max_score, since=since, until=until, tenant_id=tenant_id
+        )
+    )
+    next_offset = offset + len(results) if offset + len(results) < total else None
+    return {"total": total, "offset": offset, "next_offset": next_offset, "results": results}
+
+@app.get("/api/results/videos/{video_id}", response_model=StoredVideoResponse, summary="영상 분석 기록 조회 (재분석 없음)")
+async def get_video_results(request: Request, video_id: str, limit: int = 500, tenant_id: Optional[str] = None):
+    """
+    analyze-youtube 응답과 같은 형태(같은 댓글 순서)로 저장된 기록을 반환합니다. (집계 + 수집 순서 첫 페이지)
+    나머지는 next_offset부터 /api/results?video_id=...&order=collected로 이어서 조회합니다. 기록이 없으면 404.
+    - tenant_id: 해당 채널로 분석한 기록 (주지 않으면 채널 지정 없이 분석한 기록)
+    기록이 바뀌지 않았으면(If-None-Match가 ETag와 같으면) 304를 반환합니다.
+    """
+    store = _require_results()
+    _check_page(0, limit)
+    summary = await run_in_threadpool(store.video_summary, video_id, tenant_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="저장된 분석 기록이 없습니다.")
+    total, results = await run_in_threadpool(
+        functools.partial(store.query, "collected", 0, limit, video_id=video_id, tenant_id=tenant_id or "")
+    )
+    body = StoredVideoResponse.model_validate({
+        **summary,
+        "results": results,
+        "clusters": [],
+        "next_offset": len(results) if len(results) < total else None,
+    }).model_dump(mode="json")
+    return _conditional_response(request, ResponseCache.make_etag(body), body)
+
+# =========================================================
+# [API 3] 시스템 상태 (System APIs)
+# =========================================================
+
+@app.get("/api/system/cache", summary="판정 캐시 상태 조회")
+async def get_cache_stats():
+    if verdict_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "dictionary_version": first_filter.dictionary_version, **verdict_cache.stats()}
+
+@app.delete("/api/system/cache", summary="판정 캐시 비우기")
+async def clear_cache():
+    if verdict_cache is not None:
+        verdict_cache.clear()
+    return {"cleared": verdict_cache is not None}
+
+@app.get("/api/system/response-cache", summary="워크플로 응답 캐시 상태 조회")
+async def get_response_cache_stats():
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+@app.delete("/api/system/response-cache", summary="워크플로 응답 캐시 비우기 (영상 하나 또는 전체)")
+async def clear_response_cache(video_id: Optional[str] = None):
+    if response_cache is None:
+        return {"cleared": 0}
+    return {"cleared": response_cache.invalidate(video_id)}
+
+def _dictionary_status() -> dict:
+    snapshot = first_filter.snapshot
+    return {
+        "version": snapshot.version,
+        "watching": first_filter.watching,
+        "user_whitelist": sorted(snapshot.user_whitelist),
+        "user_blacklist": sorted(snapshot.user_blacklist),
+        "system_words": len(snapshot.system_dictionary),
+        "patterns": len(snapshot.matcher),
+        **first_filter.reload_info,
+    }
+
+@app.get("/api/system/dictionaries", summary="사전 버전/상태 조회")
+async def get_dictionary_status():
+    return _dictionary_status()
+
+@app.post("/api/system/dictionaries/reload", summary="사전 다시 로드")
+async def reload_dictionaries():
+    """사전 파일을 다시 읽어 새 매칭 엔진으로 교체합니다. (진행 중인 분석은 이전 사전으로 끝까지 처리)"""
+    changed = await run_in_threadpool(first_filter.reload, True)
+    return {"changed": changed, **_dictionary_status()}
+
+@app.put("/api/system/dictionaries/user", summary="사용자 화이트/블랙리스트 교체")
+async def update_user_dictionary(input_data: UserDictionaryInput):
+    """사용자 사전(user_dictionary.json)을 주어진 목록으로 바꾸고 바로 적용합니다."""
+    try:
+        changed = await run_in_threadpool(
+            first_filter.update_user_dictionary, input_data.user_whitelist, input_data.user_blacklist
+        )
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"사용자 사전 저장 실패: {e}")
+    return {"changed": changed, **_dictionary_status()}
+
+@app.get("/api/system/llm", summary="GPT 호출 상태 조회 (동시 호출 수 / 회로 차단)")
+async def get_llm_status():
+    return {"enabled": bool(config.OPENAI_API_KEY), **second_filter.dispatcher.stats()}
+
+@app.get("/api/system/workers", summary="프로세스 구성/메모리 조회 (서버 워커 + 1차 필터 프로세스)")
+async def get_worker_status():
+    """
+    이 서버 워커 프로세스와 1차 필터 프로세스의 메모리 (rss / pss / shared, bytes)
+    - 공유 매칭 엔진은 파일 페이지를 함께 쓰므로 shared에 잡히고, pss에는 프로세스 수로 나눈 만큼만 잡힙니다.
+    - SERVER_WORKERS > 1이면 요청을 받은 워커 하나의 값입니다. (pid로 구분)
+    """
+    snapshot = first_filter.snapshot
+    return {
+        "pid": os.getpid(),
+        "server_workers": config.SERVER_WORKERS,
+        "memory": await run_in_threadpool(process_memory, os.getpid()),
+        "shared_matcher": {
+            "enabled": snapshot.shared_path is not None,
+            "path": snapshot.shared_path,
+            "dictionary_version": snapshot.version,
+        },
+        "first_pass_pool": (
+            await run_in_threadpool(first_pass_pool.stats) if first_pass_pool is not None else {"enabled": False}
+        ),
+    }
+
+@app.get("/api/system/results", summary="판정 기록 저장소 상태 조회")
+async def get_result_store_stats():
+    if result_store is None:
+        return {"enabled": False}
+    return {"enabled": True, "path": result_store.db_path, **(await run_in_threadpool(result_store.stats))}
+
+@app.get("/api/system/jobs", summary="백그라운드 작업 상태 조회")
+async def get_job_stats(limit: int = 20):
+    """작업 실행기 상태 + 상태별 작업 수 + 최근 작업 목록"""
+    if job_manager is None:
+        return {"enabled": False}
+    counts = await run_in_threadpool(job_manager.store.counts)
+    recent = await run_in_threadpool(job_manager.store.list, max(1, min(limit, 200)))
+    return {"enabled": True, **job_manager.stats(), "jobs": counts, "recent": [_job_status(row) for row in recent]}
+
+async def _tenant_overlay(tenant_id: Optional[str]):
+    """채널 ID 확인 후 채널 오버레이 반환 (지정이 없거나 채널 사전이 없으면 None)"""
+    if tenant_id is None:
+        return None
+    if tenant_registry is None:
+        raise HTTPException(status_code=400, detail="채널별 사전이 비활성화되어 있습니다.")
+    try:
+        return await run_in_threadpool(tenant_registry.get, tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _tenant_status(tenant_id: str, overlay) -> dict:
+    if overlay is None:
+        return {"tenant_id": tenant_id, "configured": False, "security_level": config.SECURITY_LEVEL}
+    return {
+        "tenant_id": tenant_id,
+        "configured": True,
+        "version": overlay.version,
+        "user_whitelist": sorted(overlay.whitelist),
+        "user_blacklist": sorted(overlay.blacklist),
+        "security_level": overlay.security_level or config.SECURITY_LEVEL,
+    }
+
+@app.get("/api/system/tenants", summary="채널별 사전 캐시 상태 조회")
+async def get_tenant_stats():
+    if tenant_registry is None:
+        return {"enabled": False}
+    return {"enabled": True, **tenant_registry.stats()}
+
+@app.get("/api/system/tenants/{tenant_id}", summary="채널별 사전/보안 레벨 조회")
+async def get_tenant(tenant_id: str):
+    return _tenant_status(tenant_id, await _tenant_overlay(tenant_id))
+
+@app.put("/api/system/tenants/{tenant_id}", summary="채널별 사전/보안 레벨 교체")
+async def update_tenant(tenant_id: str, input_data: TenantDictionaryInput,
+                        x_tenant_key: Optional[str] = Header(None), x_admin_key: Optional[str] = Header(None)):
+    """
+    채널 화이트/블랙리스트와 보안 레벨을 저장하고 바로 적용합니다. (공용 사전은 그대로)
+    - 새 채널은 X-Tenant-Key(소유자 키)와 함께 만들고, 이후 수정은 같은 키로만 가능합니다. (X-Admin-Key는 예외)
+    - 채널 수/단어 수 상한을 넘으면 413, 내용이 같으면 파일을 다시 쓰지 않습니다.
+    """
+    await _tenant_overlay(tenant_id)
+    admin = bool(config.TENANT_ADMIN_KEY) and x_admin_key is not None and hmac.compare_digest(x_admin_key, config.TENANT_ADMIN_KEY)
+    try:
+        overlay, changed = await run_in_threadpool(functools.partial(
+            tenant_registry.update, tenant_id,
+            input_data.user_whitelist, input_data.user_blacklist, input_data.security_level,
+            owner_key=x_tenant_key, admin=admin
+        ))
+    except TenantAccessDenied as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except TenantLimitExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"채널 사전 저장 실패: {e}")
+    return {**_tenant_status(tenant_id, overlay), "changed": changed}
+
+def _startup_status(state: dict) -> dict:
+    return {
+        "lazy_init": config.LAZY_INIT,
+        "warmed_up": state["done"],
+        "dictionary_artifact": first_filter.artifact_path is not None,
+        "startup_ms": {phase: round(seconds * 1000, 1) for phase, seconds in startup_timings.items()},
+        "warmup_ms": {phase: round(seconds * 1000, 1) for phase, seconds in state["timings"].items()},
+    }
+
+@app.get("/api/system/startup", summary="서버 시작/warm-up 소요 시간 조회")
+async def get_startup_status():
+    return _startup_status(warmup_state)
+
+@app.post("/api/system/warmup", summary="지연 초기화 리소스 준비 (warm-up)")
+async def run_warmup():
+    """LAZY_INIT 모드에서 JVM/OpenAI/YouTube 클라이언트를 미리 준비합니다. (이미 준비되었으면 바로 반환)"""
+    state = await run_in_threadpool(warm_up)
+    return _startup_status(state)
+
+def _component_metrics():
+    """각 모듈이 들고 있는 통계를 /metrics 조회 시점에 지표로 변환"""
+    families = [(
+        "nerv_second_pass_routed_total", "counter", "2차 필터 판정 경로 (로컬 모델 확정 / GPT 호출)",
+        [({"route": route}, count) for route, count in second_filter.routing_counters.items()]
+    ), (
+        "nerv_dictionary_reloads_total", "counter", "사전 교체 횟수",
+        [({}, first_filter.reload_info["reloads"])]
+    )]
+    processes = [("server", os.getpid())]
+    if first_pass_pool is not None:
+        processes += [("first_pass", pid) for pid in first_pass_pool.pids]
+    samples = []
+    for role, pid in processes:
+        memory = process_memory(pid)
+        if memory is not None:
+            samples += [({"role": role, "pid": str(pid), "kind": kind}, value) for kind, value in memory.items()]
+    if samples:
+        families.append((
+            "nerv_process_memory_bytes", "gauge", "프로세스 메모리 (rss / pss: 공유 페이지를 나눠 계산 / shared: 공유 페이지)",
+            samples
+        ))
+    if job_manager is not None:
+        job_stats = job_manager.stats()
+        families.append((
+            "nerv_jobs", "gauge", "백그라운드 작업 수 (queued: 대기 중 / running: 실행 중)",
+            [({"state": state}, job_stats[state]) for state in ("queued", "running")]
+        ))
+    dispatcher_stats = second_filter.dispatcher.stats()
+    families.append((
+        "nerv_llm_concurrency", "gauge", "GPT 동시 호출 수 (limit: 현재 상한 / in_flight: 진행 중 / waiting: 대기 중)",
+        [({"kind": kind}, dispatcher_stats["concurrency"][kind]) for kind in ("limit", "in_flight", "waiting")]
+    ))
+    families.append((
+        "nerv_llm_circuit_open", "gauge", "GPT 호출 회로 상태 (0: CLOSED, 1: OPEN, 0.5: HALF_OPEN)",
+        [({}, {"CLOSED": 0, "OPEN": 1}.get(dispatcher_stats["breaker"]["state"], 0.5))]
+    ))
+    families.append((
+        "nerv_llm_circuit_opens_total", "counter", "GPT 호출 회로 차단 횟수",
+        [({}, dispatcher_stats["breaker"]["opens"])]
+    ))
+    if verdict_cache is not None:
+        stats = verdict_cache.stats()
+        families.append((
+            "nerv_verdict_cache_lookups_total", "counter", "판정 캐시 조회 수",
+            [({"result": "hit", "tier": "memory"}, stats["memory_hits"]),
+             ({"result": "hit", "tier": "disk"}, stats["disk_hits"]),
+             ({"result": "miss"}, stats["misses"])]
+        ))
+        families.append((
+            "nerv_verdict_cache_evictions_total", "counter", "판정 캐시 제거 수",
+            [({}, stats["evictions"])]
+        ))
+        families.append((
+            "nerv_verdict_cache_entries", "gauge", "판정 캐시 항목 수",
+            [({"tier": "memory"}, stats["memory_entries"])]
+            + ([({"tier": "disk"}, stats["disk_entries"])] if "disk_entries" in stats else [])
+        ))
+    if response_cache is not None:
+        stats = response_cache.stats()
+        families.append((
+            "nerv_response_cache_requests_total", "counter",
+            "워크플로 응답 캐시 요청 수 (hit: 저장된 응답 / coalesced: 진행 중인 분석 대기 / miss, refresh: 새로 분석)",
+            [({"result": "hit"}, stats["hits"]), ({"result": "coalesced"}, stats["coalesced"]),
+             ({"result": "miss"}, stats["misses"]), ({"result": "refresh"}, stats["refreshes"])]
+        ))
+        families.append((
+            "nerv_response_not_modified_total", "counter", "If-None-Match가 같아 304로 응답한 수",
+            [({}, stats["not_modified"])]
+        ))
+    if tenant_registry is not None:
+        tenant_stats = tenant_registry.stats()
+        families.append((
+            "nerv_tenant_overlays", "gauge", "메모리에 있는 채널 오버레이 수 / 메모리 (근사치, bytes)",
+            [({"unit": "entries"}, tenant_stats["entries"]), ({"unit": "bytes"}, tenant_stats["bytes"])]
+        ))
+        families.append((
+            "nerv_tenant_overlay_evictions_total", "counter", "채널 오버레이 제거 수",
+            [({}, tenant_stats["evictions"])]
+        ))
+    return families
+
+@app.get("/metrics", summary="Prometheus 지표", response_class=PlainTextResponse)
+async def get_metrics():
+    """단계별 소요 시간 히스토그램, 캐시/GPT 토큰/조기 종료/오류 카운터, 진행 중 호출 게이지 (Prometheus 텍스트 형식)"""
+    body = await run_in_threadpool(metrics.render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # 워커를 여러 개 띄우면 자동 재시작(reload)은 쓸 수 없음 (워커마다 공유 매칭 엔진 파일을 함께 사용)
+    if config.SERVER_WORKERS > 1:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=config.SERVER_WORKERS)
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
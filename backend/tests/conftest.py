@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# backend 디렉터리를 임포트 경로에 추가 (filter_api, config 등을 그대로 임포트)
+sys.path.insert(0, BACKEND_DIR)
+
+# config를 임포트하기 전에 외부 서비스/JVM/디스크 상태를 쓰지 않도록 설정 (.env보다 우선)
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["YOUTUBE_API_KEY"] = ""
+os.environ["TOKENIZER_BACKEND"] = "surface"
+os.environ["DICTIONARY_WATCH_ENABLED"] = "false"
+os.environ["DICTIONARY_ARTIFACT_PATH"] = ""
+os.environ["YOUTUBE_COMMENT_CACHE_DIR"] = ""
+os.environ["VERDICT_CACHE_DB_PATH"] = ""
+os.environ["VIDEO_STATE_DB_PATH"] = ""
+os.environ["RESULT_STORE_DB_PATH"] = ""
+os.environ["JOB_DB_PATH"] = ""
+
+
+@pytest.fixture(scope="session")
+def first_filter():
+    """공용 사전을 읽은 1차 필터 (형태소 분석 없이 표면 매칭)"""
+    from filter_api.core.first_pass_filter import FirstPassFilter
+    return FirstPassFilter()
+
+
+@pytest.fixture
+def make_pipeline(first_filter):
+    """
+    가짜 GPT 클라이언트(benchmarks.fakes)를 쓰는 파이프라인 생성 함수
+    - 판정 캐시/조기 종료/채널 사전은 테스트마다 지정 (기본: 캐시 없음, 조기 종료 켬)
+    """
+    from benchmarks.fakes import FakeOpenAI, FakeAsyncOpenAI
+    from filter_api.core.early_exit_gate import EarlyExitGate
+    from filter_api.core.pipeline import ModerationPipeline
+    from filter_api.core.policy_manager import PolicyManager
+    from filter_api.core.risk_scorer import RiskScorer
+    from filter_api.core.second_pass_filter import SecondPassFilter
+
+    created = []
+
+    def make(verdict_cache=None, early_exit=True, clean_max_length=0, tenant_registry=None, latency=0.0):
+        second_filter = SecondPassFilter()
+        second_filter.client = FakeOpenAI(latency)
+        second_filter.async_client = FakeAsyncOpenAI(latency)
+        risk_scorer, policy_manager = RiskScorer(), PolicyManager()
+        pipeline = ModerationPipeline(
+            first_filter, second_filter, risk_scorer, policy_manager,
+            cpu_workers=2,
+            verdict_cache=verdict_cache,
+            early_exit_gate=EarlyExitGate(risk_scorer, policy_manager, enabled=early_exit, clean_max_length=clean_max_length),
+            tenant_registry=tenant_registry
+        )
+        created.append(pipeline)
+        return pipeline
+
+    yield make
+    for pipeline in created:
+        pipeline.executor.shutdown(wait=False)
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """
+    가짜 GPT 클라이언트를 쓰는 API 서버 (main 모듈, TestClient)
+    - 판정/응답 캐시와 댓글 캐시는 끄고, 분석 상태 저장소는 테스트마다 tmp_path에 새로 만듭니다.
+    - YouTube 서비스는 테스트에서 main.yt_client.youtube에 지정합니다.
+    """
+    import main
+    from fastapi.testclient import TestClient
+    from benchmarks.fakes import FakeOpenAI, FakeAsyncOpenAI
+    from filter_api.core.video_state import VideoStateStore
+
+    monkeypatch.setattr(main.second_filter, "client", FakeOpenAI(0.0))
+    monkeypatch.setattr(main.second_filter, "async_client", FakeAsyncOpenAI(0.0))
+    monkeypatch.setattr(main.pipeline, "verdict_cache", None)
+    monkeypatch.setattr(main, "response_cache", None)
+    monkeypatch.setattr(main, "video_state", VideoStateStore(str(tmp_path / "video_state.sqlite3")))
+    monkeypatch.setattr(main.yt_client, "cache", None)
+    monkeypatch.setattr(main.yt_client, "youtube", None)
+    with TestClient(main.app) as client:
+        yield main, client
@@ -0,0 +1,43 @@
+from filter_api.core.aho_corasick import AhoCorasickMatcher
+
+WHITE = ('USER_WHITELIST', 0)
+BLACK = ('USER_BLACKLIST', 1)
+SYSTEM = ('SYSTEM_KEYWORD', 2)
+
+
+def test_iter_matches_includes_overlaps():
+    matcher = AhoCorasickMatcher({'시발': SYSTEM, '발놈': BLACK, '시발놈': SYSTEM})
+    found = sorted(matcher.iter_matches('이 시발놈아'))
+    assert found == [(2, 4, SYSTEM), (2, 5, SYSTEM), (3, 5, BLACK)]
+
+
+def test_find_longest_prefers_leftmost_then_longest():
+    matcher = AhoCorasickMatcher({'시발': SYSTEM, '발놈': BLACK, '시발놈': SYSTEM, '놈아': SYSTEM})
+    assert matcher.find_longest('이 시발놈아') == [(2, 5, SYSTEM)]
+
+
+def test_find_longest_prefers_priority_on_same_span():
+    matcher = AhoCorasickMatcher({'병신': SYSTEM})
+    overlay = AhoCorasickMatcher({'병신': WHITE})
+    assert matcher.find_longest('병신', overlay=overlay) == [(0, 2, WHITE)]
+
+
+def test_find_longest_accept_filters_candidates():
+    matcher = AhoCorasickMatcher({'시발': SYSTEM, '시발놈': SYSTEM})
+    found = matcher.find_longest('시발놈', accept=lambda start, end, payload: end - start == 2)
+    assert found == [(0, 2, SYSTEM)]
+
+
+def test_state_round_trip():
+    matcher = AhoCorasickMatcher({'시발': SYSTEM, '개새끼': BLACK, '새끼': SYSTEM})
+    restored = AhoCorasickMatcher.from_state(matcher.to_state())
+    text = '개새끼 시발'
+    assert len(restored) == len(matcher) == 3
+    assert sorted(restored.iter_matches(text)) == sorted(matcher.iter_matches(text))
+    assert restored.find_longest(text) == matcher.find_longest(text)
+
+
+def test_no_match():
+    matcher = AhoCorasickMatcher({'시발': SYSTEM})
+    assert matcher.find_longest('안녕하세요') == []
+    assert AhoCorasickMatcher({}).find_longest('시발') == []
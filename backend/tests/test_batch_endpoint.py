@@ -0,0 +1,48 @@
+import json
+
+TEXTS = ["좋은 영상이네요", "씨발 좆같네 개새끼", "연락주세요 010-1234-5678"]
+
+
+def test_json_body_keeps_input_order(api):
+    _, client = api
+    response = client.post("/api/workflow/analyze-batch", json={"texts": TEXTS})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['count'] == len(TEXTS)
+    assert [(res['index'], res['original_text']) for res in body['results']] == list(enumerate(TEXTS))
+
+
+def test_ndjson_body_matches_json_body(api):
+    _, client = api
+    lines = [json.dumps(TEXTS[0], ensure_ascii=False)] + [
+        json.dumps({"text": text}, ensure_ascii=False) for text in TEXTS[1:]
+    ]
+    ndjson = client.post(
+        "/api/workflow/analyze-batch", content="\n".join(lines).encode('utf-8'),
+        headers={"Content-Type": "application/x-ndjson"}
+    ).json()
+    plain = client.post("/api/workflow/analyze-batch", json=TEXTS).json()
+
+    assert [(res['original_text'], res['action']) for res in ndjson['results']] == \
+           [(res['original_text'], res['action']) for res in plain['results']]
+
+
+def test_matches_single_text_endpoint(api):
+    _, client = api
+    batch = client.post("/api/workflow/analyze-batch", json={"texts": TEXTS}).json()['results']
+    single = [client.post("/api/workflow/analyze-text", json={"text": text}).json() for text in TEXTS]
+
+    assert [(res['action'], res['score']) for res in batch] == [(res['action'], res['score']) for res in single]
+
+
+def test_rejects_invalid_and_oversized_bodies(api, monkeypatch):
+    main, client = api
+    assert client.post("/api/workflow/analyze-batch", json={"texts": "하나"}).status_code == 400
+    assert client.post("/api/workflow/analyze-batch", json={"texts": ["하나", 2]}).status_code == 400
+    assert client.post(
+        "/api/workflow/analyze-batch", content=b"{", headers={"Content-Type": "application/json"}
+    ).status_code == 400
+
+    monkeypatch.setattr(main.config, "BATCH_MAX_ITEMS", 2)
+    assert client.post("/api/workflow/analyze-batch", json={"texts": TEXTS}).status_code == 413
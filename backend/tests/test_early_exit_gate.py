@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.early_exit_gate import EarlyExitGate
+from filter_api.core.policy_manager import PolicyManager
+from filter_api.core.risk_scorer import RiskScorer
+
+BLOCKED = "씨발 좆같네 개새끼"
+
+
+@pytest.fixture(scope="module")
+def scoring():
+    return RiskScorer(), PolicyManager()
+
+
+def _gate(scoring, **kwargs):
+    return EarlyExitGate(*scoring, **kwargs)
+
+
+@pytest.mark.parametrize("text", ["", "ㅋㅋㅋ", "ㅠㅠ ㅎㅎ"])
+def test_default_only_skips_comments_without_letters(first_filter, scoring, text):
+    assert _gate(scoring).decide(first_filter.execute(text)) == EarlyExitGate.CLEAN
+
+
+def test_default_sends_short_text_to_second_pass(first_filter, scoring):
+    assert _gate(scoring).decide(first_filter.execute("좋아요")) == EarlyExitGate.FULL
+
+
+def test_clean_max_length_keeps_risk_signals(first_filter, scoring):
+    gate = _gate(scoring, clean_max_length=10)
+    assert gate.decide(first_filter.execute("좋아요")) == EarlyExitGate.CLEAN
+    assert gate.decide(first_filter.execute("0101234")) == EarlyExitGate.FULL
+    assert gate.decide(first_filter.execute("www.a.kr")) == EarlyExitGate.FULL
+
+
+def test_block_only_when_first_pass_decides_the_action(first_filter, scoring):
+    gate = _gate(scoring)
+    assert gate.decide(first_filter.execute(BLOCKED)) == EarlyExitGate.BLOCK
+    # 적발은 있지만 처분이 PASS/MASKING이면 2차 필터 결과가 필요
+    assert gate.decide(first_filter.execute("시발 진짜")) == EarlyExitGate.FULL
+
+
+def test_disabled_gate_always_runs_full(first_filter, scoring):
+    gate = _gate(scoring, enabled=False)
+    assert gate.decide(first_filter.execute(BLOCKED)) == EarlyExitGate.FULL
+    assert gate.decide(first_filter.execute("")) == EarlyExitGate.FULL
+
+
+def test_pipeline_skips_llm_for_early_exits(make_pipeline):
+    pipeline = make_pipeline()
+    results = asyncio.run(pipeline.run_batch_async([BLOCKED, "ㅋㅋㅋ"]))
+
+    assert [res['pipeline_path'] for res in results] == [EarlyExitGate.BLOCK, EarlyExitGate.CLEAN]
+    assert results[0]['action'] not in ("PASS", "MASKING")
+    assert pipeline.second_filter.async_client.chat.completions.calls == 0
@@ -0,0 +1,50 @@
+from benchmarks.fakes import FakeYouTubeService
+
+TEXTS = ["좋은 영상이네요", "씨발 좆같네 개새끼", "연락주세요 010-1234-5678", "ㅋㅋㅋ"]
+
+
+def _analyze(client, **params):
+    response = client.post("/api/workflow/analyze-youtube", params={"video_id": "v1", **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _actions(body):
+    return [(res['original'], res['action']) for res in body['results']]
+
+
+def test_second_run_reuses_stored_verdicts(api, monkeypatch):
+    main, client = api
+    service = FakeYouTubeService(TEXTS, latency=0.0, reply_every=0)
+    monkeypatch.setattr(main.yt_client, "youtube", service)
+
+    first = _analyze(client)
+    calls = main.second_filter.async_client.chat.completions.calls
+    second = _analyze(client)
+
+    assert first['stats']['analyzed_comments'] == len(TEXTS)
+    assert second['stats']['analyzed_comments'] == 0
+    assert main.second_filter.async_client.chat.completions.calls == calls
+    assert _actions(second) == _actions(first)
+
+
+def test_only_edited_and_new_comments_are_analyzed(api, monkeypatch):
+    main, client = api
+    service = FakeYouTubeService(TEXTS, latency=0.0, reply_every=0)
+    monkeypatch.setattr(main.yt_client, "youtube", service)
+    _analyze(client)
+
+    service.threads[0]["text"] = "수정된 댓글입니다"
+    service.threads.append({"id": "thread-new", "text": "새 댓글", "published": "2025-01-02T00:00:00Z"})
+    body = _analyze(client)
+
+    assert body['stats']['analyzed_comments'] == 2
+    assert [res['original'] for res in body['results']] == ["수정된 댓글입니다", *TEXTS[1:], "새 댓글"]
+
+
+def test_incremental_false_reanalyzes_everything(api, monkeypatch):
+    main, client = api
+    monkeypatch.setattr(main.yt_client, "youtube", FakeYouTubeService(TEXTS, latency=0.0, reply_every=0))
+    _analyze(client)
+
+    assert _analyze(client, incremental="false")['stats']['analyzed_comments'] == len(TEXTS)
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.jobs import JobManager, JobQueueFull, JobStore
+
+
+async def _idle(job):
+    await asyncio.sleep(3600)
+
+
+def test_queue_limit_counts_jobs_of_every_server_worker(tmp_path):
+    # 서버 워커 두 개가 같은 파일을 씀: 합계가 한도에 닿으면 어느 쪽에서도 새 작업을 받지 않음
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def scenario():
+        managers = [JobManager(JobStore(db_path), {"idle": _idle}, workers=1, queue_limit=3) for _ in range(2)]
+        for manager in managers:
+            await manager.start()
+        try:
+            await managers[0].submit("idle", "a", {})
+            await managers[1].submit("idle", "b", {})
+            await managers[0].submit("idle", "c", {})
+            with pytest.raises(JobQueueFull):
+                await managers[1].submit("idle", "d", {})
+
+            # 이미 있는 작업은 한도와 관계없이 그 작업을 돌려줌
+            row, existing = await managers[1].submit("idle", "a", {})
+            assert existing and row["status"] in JobStore.ACTIVE
+        finally:
+            for manager in managers:
+                await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_free_the_queue_limit(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    row, created = store.create_or_get("idle", "a", {}, limit=1)
+    assert created
+    with pytest.raises(JobQueueFull):
+        store.create_or_get("idle", "b", {}, limit=1)
+
+    store.transition(row["job_id"], JobStore.COMPLETED, JobStore.ACTIVE)
+    _, created = store.create_or_get("idle", "b", {}, limit=1)
+    assert created
+
+
+async def _wait_for(store, job_id, statuses, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        row = store.get(job_id)
+        if row["status"] in statuses or loop.time() > deadline:
+            return row
+        await asyncio.sleep(0.01)
+
+
+def _paged_handler(block_after_first_page: asyncio.Event = None):
+    """3페이지 x 2개 결과를 기록 (이미 저장된 항목은 건너뜀)"""
+    async def handler(job):
+        done = await job.done_ids()
+        for page in range(3):
+            items = [(f"p{page}-{n}", {"page": page, "n": n}) for n in range(2)]
+            items = [item for item in items if item[0] not in done]
+            if items:
+                await job.checkpoint(items, {"comments": len(items)}, pages=1)
+            if page == 0 and block_after_first_page is not None:
+                await block_after_first_page.wait()
+    return handler
+
+
+def test_lease_allows_single_owner_until_expiry(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    row, _ = store.create_or_get("idle", "a", {})
+
+    assert store.claim(row["job_id"], "worker-a", lease=60)
+    assert not store.claim(row["job_id"], "worker-b", lease=60)
+    assert store.claimable() == []
+    assert store.renew("worker-a", lease=60) == {row["job_id"]}
+
+    # 임대가 끝나면 다른 실행기가 이어받고, 이전 실행기의 임대 연장에서는 빠짐
+    store.renew("worker-a", lease=-1)
+    assert store.claim(row["job_id"], "worker-b", lease=60)
+    assert store.renew("worker-a", lease=60) == set()
+    assert not store.transition(row["job_id"], JobStore.COMPLETED, (JobStore.RUNNING,), owner="worker-a")
+
+
+def test_release_makes_job_claimable_immediately(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    row, _ = store.create_or_get("idle", "a", {})
+    store.claim(row["job_id"], "worker-a", lease=60)
+
+    store.release("worker-a")
+    assert [job["job_id"] for job in store.claimable()] == [row["job_id"]]
+
+
+def test_stopped_job_resumes_from_checkpoint(tmp_path):
+    db_path = str(tmp_path / "jobs.sqlite3")
+
+    async def scenario():
+        first = JobManager(JobStore(db_path), {"pages": _paged_handler(asyncio.Event())}, workers=1)
+        await first.start()
+        row, _ = await first.submit("pages", "video-1", {"video_id": "video-1"})
+        deadline = asyncio.get_running_loop().time() + 5
+        while first.store.get(row["job_id"])["progress"].get("results", 0) < 2:
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.01)
+        await first.stop()
+        assert first.store.get(row["job_id"])["status"] == JobStore.RUNNING
+
+        # 서버 재시작: 저장된 첫 페이지는 건너뛰고 이어서 실행
+        second = JobManager(JobStore(db_path), {"pages": _paged_handler()}, workers=1)
+        await second.start()
+        try:
+            return await _wait_for(second.store, row["job_id"], (JobStore.COMPLETED, JobStore.FAILED)), second.store
+        finally:
+            await second.stop()
+
+    row, store = asyncio.run(scenario())
+    assert row["status"] == JobStore.COMPLETED
+    assert row["progress"] == {"pages": 3, "results": 6}
+    assert row["stats"] == {"comments": 6}
+    assert [(item["page"], item["n"]) for item in store.results(row["job_id"])] == \
+           [(page, n) for page in range(3) for n in range(2)]
+
+
+def test_duplicate_submit_returns_existing_job(tmp_path):
+    async def scenario():
+        manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), {"idle": _idle}, workers=1)
+        await manager.start()
+        try:
+            first, coalesced_first = await manager.submit("idle", "a", {})
+            second, coalesced_second = await manager.submit("idle", "a", {})
+            return first, coalesced_first, second, coalesced_second
+        finally:
+            await manager.stop()
+
+    first, coalesced_first, second, coalesced_second = asyncio.run(scenario())
+    assert not coalesced_first and coalesced_second
+    assert second["job_id"] == first["job_id"]
+
+
+def test_cancel_and_failure_are_recorded(tmp_path):
+    async def failing(job):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3")), {"idle": _idle, "fail": failing}, workers=1)
+        await manager.start()
+        try:
+            running, _ = await manager.submit("idle", "a", {})
+            await _wait_for(manager.store, running["job_id"], (JobStore.RUNNING,))
+            queued, _ = await manager.submit("idle", "b", {})  # 워커 하나가 a를 실행 중이라 대기
+            cancelled_queued = await manager.cancel(queued["job_id"])
+            await manager.cancel(running["job_id"])
+            cancelled_running = await _wait_for(manager.store, running["job_id"], (JobStore.CANCELLED,))
+
+            failed, _ = await manager.submit("fail", "c", {})
+            failed = await _wait_for(manager.store, failed["job_id"], (JobStore.FAILED,))
+            return cancelled_queued, cancelled_running, failed
+        finally:
+            await manager.stop()
+
+    cancelled_queued, cancelled_running, failed = asyncio.run(scenario())
+    assert cancelled_queued["status"] == JobStore.CANCELLED
+    assert cancelled_running["status"] == JobStore.CANCELLED
+    assert failed["status"] == JobStore.FAILED and failed["error"] == "boom"
@@ -0,0 +1,175 @@
+import time
+import asyncio
+
+import pytest
+
+from filter_api.core.llm_dispatcher import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    LLMDispatcher,
+    LLMUnavailableError,
+    deadline_scope,
+)
+
+
+class ServerError(Exception):
+    status_code = 500
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+def _dispatcher(limit=2, **kwargs):
+    options = {"base_delay": 0.01, "max_delay": 0.02, "call_timeout": 1.0, "request_deadline": 2.0}
+    options.update(kwargs)
+    breaker = options.pop("breaker", None) or CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+    return LLMDispatcher(AdaptiveConcurrencyLimiter(limit, minimum=1, maximum=limit), breaker, **options)
+
+
+def _failing(errors, result="ok"):
+    """앞의 errors를 차례로 던진 뒤 result를 반환하는 동기 create"""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return create, calls
+
+
+def test_classify():
+    assert LLMDispatcher.classify(TimeoutError()) == "timeout"
+    assert LLMDispatcher.classify(ServerError()) == "server_error"
+    assert LLMDispatcher.classify(BadRequestError()) == "bad_request"
+    assert LLMDispatcher.classify(type("RateLimitError", (Exception,), {})()) == "rate_limited"
+    assert LLMDispatcher.classify(type("APIConnectionError", (Exception,), {})()) == "connection"
+
+
+def test_retry_then_success():
+    create, calls = _failing([ServerError(), ServerError()])
+    assert _dispatcher().call(create, model="m") == "ok"
+    assert len(calls) == 3
+    assert all(call["model"] == "m" and 0 < call["timeout"] <= 1.0 for call in calls)
+
+
+def test_non_retryable_error_is_not_retried_or_counted():
+    dispatcher = _dispatcher()
+    create, calls = _failing([BadRequestError()])
+    with pytest.raises(LLMUnavailableError) as exc:
+        dispatcher.call(create)
+    assert exc.value.reason == "bad_request"
+    assert len(calls) == 1
+    assert dispatcher.breaker.stats()["consecutive_failures"] == 0
+
+
+def test_retries_exhausted():
+    create, calls = _failing([ServerError()] * 10)
+    with pytest.raises(LLMUnavailableError) as exc:
+        _dispatcher(max_retries=2).call(create)
+    assert exc.value.reason == "server_error"
+    assert len(calls) == 3
+
+
+def test_deadline_scope_stops_retries():
+    dispatcher = _dispatcher(base_delay=0.2, max_delay=0.2, max_retries=10)
+    dispatcher._retry_after = lambda error: 0.2
+    create, calls = _failing([ServerError()] * 10)
+    with deadline_scope(0.1):
+        with pytest.raises(LLMUnavailableError) as exc:
+            dispatcher.call(create)
+    assert exc.value.reason == "deadline"
+    assert len(calls) == 1
+
+
+def test_deadline_scope_is_shared_by_nested_scopes():
+    with deadline_scope(0.05):
+        with deadline_scope(10.0):
+            time.sleep(0.06)
+            with pytest.raises(LLMUnavailableError) as exc:
+                _dispatcher().call(lambda **kwargs: "ok")
+    assert exc.value.reason == "deadline"
+    assert _dispatcher().call(lambda **kwargs: "ok") == "ok"
+
+
+def test_breaker_transitions():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    # reset_timeout이 지나면 시험 호출 하나만 허용
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # 시험 호출이 실패하면 바로 다시 OPEN
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.counters["opens"] == 2
+
+
+def test_open_breaker_rejects_without_calling():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    create, calls = _failing([])
+    with pytest.raises(LLMUnavailableError) as exc:
+        _dispatcher(breaker=breaker).call(create)
+    assert exc.value.reason == "circuit_open"
+    assert calls == []
+
+
+def test_async_retry_then_success():
+    dispatcher = _dispatcher()
+    attempts = []
+
+    async def create(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise ServerError()
+        return "ok"
+
+    assert asyncio.run(dispatcher.call_async(create, model="m")) == "ok"
+    assert len(attempts) == 2
+    assert dispatcher.limiter.stats()["in_flight"] == 0
+
+
+def test_async_queue_wait_excluded_from_deadline():
+    # 동시 호출 1개, 호출 하나에 0.3초 -> 4번째 호출은 0.9초를 기다리지만 마감(0.5초)에는 넣지 않음
+    dispatcher = _dispatcher(limit=1)
+
+    async def create(**kwargs):
+        await asyncio.sleep(0.3)
+        return "ok"
+
+    async def run():
+        async def one():
+            with deadline_scope(0.5):
+                return await dispatcher.call_async(create)
+        return await asyncio.gather(*(one() for _ in range(4)))
+
+    assert asyncio.run(run()) == ["ok"] * 4
+
+
+def test_async_call_timeout_counts_as_overload():
+    dispatcher = _dispatcher(limit=4, call_timeout=0.05, max_retries=0)
+
+    async def create(**kwargs):
+        await asyncio.sleep(1.0)
+
+    with pytest.raises(LLMUnavailableError) as exc:
+        asyncio.run(dispatcher.call_async(create))
+    assert exc.value.reason == "timeout"
+    assert dispatcher.limiter.limit == 2
+    assert dispatcher.limiter.stats()["in_flight"] == 0
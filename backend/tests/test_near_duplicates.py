@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.near_duplicates import NearDuplicateIndex
+
+SPAM = "구독하고 이벤트 참여하세요 선물 드립니다"
+SPAM_COPY = "구독하고 이벤트 참여하세요 선물 드립니다!!!!"
+OTHER = "오늘 영상 편집 정말 깔끔하네요 잘 봤습니다"
+
+
+def _count_first_pass(pipeline, monkeypatch):
+    """1차 필터에 들어간 텍스트 목록"""
+    seen = []
+    original = pipeline.first_filter.execute_batch
+
+    def execute_batch(texts, **kwargs):
+        seen.extend(texts)
+        return original(texts, **kwargs)
+
+    monkeypatch.setattr(pipeline.first_filter, "execute_batch", execute_batch)
+    return seen
+
+
+def test_members_receive_representative_verdict(make_pipeline):
+    pipeline = make_pipeline()
+    index = NearDuplicateIndex()
+    results = asyncio.run(pipeline.run_clustered_async([SPAM, OTHER, SPAM_COPY], index))
+
+    assert [res['original_text'] for res in results] == [SPAM, OTHER, SPAM_COPY]
+    assert results[2]['pipeline_path'] == NearDuplicateIndex.PATH
+    assert results[2]['cluster']['representative'] == 0
+    assert results[2]['action'] == results[0]['action']
+    assert 'cluster' not in results[0] and 'cluster' not in results[1]
+
+
+def test_first_pass_runs_once_per_text(make_pipeline, monkeypatch):
+    pipeline = make_pipeline()
+    seen = _count_first_pass(pipeline, monkeypatch)
+    asyncio.run(pipeline.run_clustered_async([SPAM, OTHER, SPAM_COPY], NearDuplicateIndex()))
+    assert sorted(seen) == sorted([SPAM, OTHER, SPAM_COPY])
+
+
+def test_representative_failure_only_affects_its_cluster(make_pipeline, monkeypatch):
+    pipeline = make_pipeline()
+    original = pipeline.second_filter.execute_batch_async
+
+    async def execute_batch_async(results):
+        if any(res['original_text'] == SPAM for res in results):
+            raise RuntimeError("representative failed")
+        return await original(results)
+
+    monkeypatch.setattr(pipeline.second_filter, "execute_batch_async", execute_batch_async)
+    index = NearDuplicateIndex()
+
+    async def run():
+        # 첫 페이지의 대표(SPAM)가 실패해도 같은 페이지의 다른 대표는 분석되고,
+        # 다음 페이지의 구성원은 실패한 대표 판정 대신 자신의 분석 결과를 받음
+        with pytest.raises(RuntimeError):
+            await pipeline.run_clustered_async([SPAM, OTHER], index, labels=["a", "b"])
+        return await pipeline.run_clustered_async([SPAM_COPY], index, labels=["c"])
+
+    second = asyncio.run(run())
+    assert second[0]['original_text'] == SPAM_COPY
+    assert second[0]['pipeline_path'] != NearDuplicateIndex.PATH
+    assert 'cluster' not in second[0]
+    other_cluster = next(cluster for cluster in index.clusters if cluster.representative == "b")
+    assert other_cluster.result.result()['original_text'] == OTHER
+
+
+def _assign(index, texts, first_filter):
+    return [index.assign(label, index.signature(text, first_filter.execute(text)))
+            for label, text in enumerate(texts)]
+
+
+def test_index_groups_copies_and_keeps_distinct_texts_apart(first_filter):
+    index = NearDuplicateIndex()
+    assigned = _assign(index, [SPAM, OTHER, SPAM_COPY, "구독하고 이벤트 참여하세요 선물 드립니다 https://spam.kr"], first_filter)
+
+    assert assigned[1][1] is None
+    assert assigned[2][0] is assigned[0][0] and assigned[2][1] >= index.threshold
+    # 링크가 붙은 사본은 판정이 달라질 수 있어 묶지 않음
+    assert assigned[3][1] is None
+    assert index.audit() == [{
+        "cluster_id": 0, "representative": 0, "action": None, "size": 2,
+        "members": [{"label": 2, "similarity": round(assigned[2][1], 3)}],
+    }]
+    assert index.stats() == {"clusters": 1, "near_duplicate_comments": 1}
+
+
+def test_short_texts_and_different_hits_are_not_clustered(first_filter):
+    index = NearDuplicateIndex()
+    assert index.signature("ㅋㅋㅋㅋㅋ", first_filter.execute("ㅋㅋㅋㅋㅋ")) is None
+
+    assigned = _assign(index, ["이 영상 진짜 시발 재밌네요 최고입니다", "이 영상 진짜 존나 재밌네요 최고입니다"], first_filter)
+    assert assigned[1][1] is None
@@ -0,0 +1,47 @@
+import asyncio
+
+TEXTS = [
+    "시발 진짜",
+    "좋은 영상이네요",
+    "연락주세요 010-1234-5678",
+    "",
+    "좋은 영상이네요",
+    "씨발 좆같네 개새끼",
+    "ㅋㅋㅋ",
+]
+
+
+def _summary(results):
+    return [(res['original_text'], res['action'], res['score'], res['pipeline_path']) for res in results]
+
+
+def test_async_batch_keeps_input_order_and_matches_sync(make_pipeline):
+    pipeline = make_pipeline()
+    async_results = asyncio.run(pipeline.run_batch_async(TEXTS))
+    sync_results = pipeline.run_batch(TEXTS)
+
+    assert [res['original_text'] for res in async_results] == TEXTS
+    assert _summary(async_results) == _summary(sync_results)
+
+
+def test_second_pass_detection_reaches_final_result(make_pipeline):
+    pipeline = make_pipeline()
+    result = asyncio.run(pipeline.run_async("연락주세요 010-1234-5678"))
+
+    assert result['details']['status'] == "FILTERED_BY_SECOND_PASS"
+    assert result['score'] > 0
+    assert not result['degraded']
+
+
+def test_concurrent_requests_get_their_own_results(make_pipeline):
+    pipeline = make_pipeline(latency=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(pipeline.run_batch_async([text, f"{text} 2"]) for text in TEXTS))
+
+    for text, results in zip(TEXTS, asyncio.run(scenario())):
+        assert [res['original_text'] for res in results] == [text, f"{text} 2"]
+
+
+def test_empty_batch(make_pipeline):
+    assert asyncio.run(make_pipeline().run_batch_async([])) == []
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.response_cache import ResponseCache, etag_matches
+
+
+def _compute(body, calls, delay=0.0):
+    async def compute():
+        calls.append(body)
+        if delay:
+            await asyncio.sleep(delay)
+        return ResponseCache.make_etag(body), body
+    return compute
+
+
+def test_miss_then_hit():
+    cache = ResponseCache(ttl=60.0)
+    calls = []
+
+    async def run():
+        first = await cache.get_or_compute("k", "v1", _compute({"n": 1}, calls))
+        second = await cache.get_or_compute("k", "v1", _compute({"n": 2}, calls))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first[2] == ResponseCache.MISS and second[2] == ResponseCache.HIT
+    assert first[:2] == second[:2]
+    assert calls == [{"n": 1}]
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(
+            cache.get_or_compute("k", "v1", _compute({"n": 1}, calls, delay=0.05)) for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sorted(status for _, _, status in results) == [ResponseCache.COALESCED] * 4 + [ResponseCache.MISS]
+    assert len({etag for etag, _, _ in results}) == 1
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_error_reaches_waiting_requests_and_is_not_cached():
+    cache = ResponseCache()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            cache.get_or_compute("k", "v1", failing),
+            cache.get_or_compute("k", "v1", failing),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.peek("k") is None
+
+
+def test_invalidate_during_compute_is_not_stored():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        task = asyncio.create_task(cache.get_or_compute("k", "v1", _compute({"n": 1}, calls, delay=0.05)))
+        await asyncio.sleep(0.01)
+        cache.invalidate("v1")
+        return await task
+
+    _, body, status = asyncio.run(run())
+    assert body == {"n": 1} and status == ResponseCache.MISS
+    assert cache.peek("k") is None
+
+
+def test_invalidate_by_video():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        await cache.get_or_compute("a", "v1", _compute({"n": 1}, calls))
+        await cache.get_or_compute("b", "v1", _compute({"n": 2}, calls))
+        await cache.get_or_compute("c", "v2", _compute({"n": 3}, calls))
+
+    asyncio.run(run())
+    assert cache.invalidate("v1") == 2
+    assert cache.peek("a") is None and cache.peek("b") is None
+    assert cache.peek("c") is not None
+    assert cache.invalidate() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_refresh_recomputes_and_replaces():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        await cache.get_or_compute("k", "v1", _compute({"n": 1}, calls))
+        return await cache.get_or_compute("k", "v1", _compute({"n": 2}, calls), refresh=True)
+
+    _, body, status = asyncio.run(run())
+    assert status == ResponseCache.REFRESH and body == {"n": 2}
+    assert cache.peek("k")[1] == {"n": 2}
+
+
+def test_uncacheable_body_is_returned_but_not_stored():
+    cache = ResponseCache()
+    calls = []
+
+    async def run():
+        return await cache.get_or_compute(
+            "k", "v1", _compute({"degraded": 1}, calls), cacheable=lambda body: not body["degraded"]
+        )
+
+    _, body, status = asyncio.run(run())
+    assert body == {"degraded": 1} and status == ResponseCache.MISS
+    assert cache.peek("k") is None
+    assert cache.counters["uncacheable"] == 1
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache(max_entries=2, ttl=60.0)
+    calls = []
+
+    async def run():
+        for key in ("a", "b", "c"):
+            await cache.get_or_compute(key, "v1", _compute({"key": key}, calls))
+
+    asyncio.run(run())
+    assert cache.peek("a") is None and cache.peek("c") is not None
+    assert cache.counters["evictions"] == 1
+
+    expired = ResponseCache(ttl=0.0)
+    asyncio.run(expired.get_or_compute("k", "v1", _compute({"n": 1}, calls)))
+    assert expired.peek("k") is None
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('*', True),
+    ('"x"', False),
+    ('', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_etag_ignores_volatile_fields():
+    first = {"items": [1], "elapsed": 1.0, "stats": {"total": 1, "took": 0.1}}
+    second = {"items": [1], "elapsed": 2.0, "stats": {"total": 1, "took": 0.2}}
+    make = ResponseCache.make_etag
+    assert make(first, ("elapsed",), ("took",)) == make(second, ("elapsed",), ("took",))
+    assert make(first) != make(second)
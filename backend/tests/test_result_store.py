@@ -0,0 +1,80 @@
+import pytest
+
+from filter_api.core.result_store import ResultStore
+
+
+def _summary(original, action="PASS", score=0.0, tags=(), path="FULL"):
+    return {
+        "original": original, "processed": original, "action": action, "risk_score": score,
+        "violation_tags": list(tags), "pipeline_path": path, "degraded": False,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.sqlite3"))
+
+
+def test_same_comment_is_kept_per_channel(store):
+    store.save("v1", [("c1", "h1", _summary("바보야", "AUTO_HIDE", 0.7, ["USER_BLACKLIST"]), None, 0)], "chan-a")
+    store.save("v1", [("c1", "h1", _summary("바보야"), None, 0)], "chan-b")
+    store.save("v1", [("c1", "h1", _summary("바보야"), None, 0)])
+
+    total, records = store.query(tenant_id="chan-a")
+    assert total == 1 and records[0]["action"] == "AUTO_HIDE" and records[0]["tenant_id"] == "chan-a"
+    assert [r["tenant_id"] for r in store.query(tenant_id="")[1]] == [None]
+    assert store.query()[0] == 3
+
+    # 태그 조건도 같은 채널의 기록에만 적용
+    assert store.query(tag="USER_BLACKLIST", tenant_id="chan-b")[0] == 0
+    assert store.query(tag="USER_BLACKLIST")[0] == 1
+
+
+def test_video_summary_is_scoped_to_channel(store):
+    store.save("v1", [
+        ("c1", "h1", _summary("씨발", "AUTO_HIDE", 0.65, ["SYSTEM_KEYWORD"], "EARLY_EXIT_BLOCK"), None, 0),
+        ("c2", "h2", _summary("좋아요"), None, 1),
+    ], "chan-a")
+    store.save_video("v1", "채널 A 제목", "chan-a")
+    store.save("v1", [("c1", "h1", _summary("씨발"), None, 0)], "chan-b")
+
+    summary = store.video_summary("v1", "chan-a")
+    assert summary["video_info"] == {"title": "채널 A 제목", "id": "v1"}
+    assert summary["stats"]["total_comments"] == 2
+    assert summary["stats"]["blocked_comments"] == 1
+    assert summary["stats"]["early_exit_comments"] == 1
+
+    other = store.video_summary("v1", "chan-b")
+    assert other["video_info"]["title"] == "Unknown" and other["stats"]["blocked_comments"] == 0
+    assert store.video_summary("v1") is None
+
+
+def test_resave_overwrites_verdict_and_tags(store):
+    store.save("v1", [("c1", "h1", _summary("댓글", "AUTO_HIDE", 0.7, ["SPAM"]), None, 0)])
+    store.save("v1", [("c1", "h2", _summary("수정된 댓글", "PASS", 0.0, ["PRIVACY"]), None, 0)])
+
+    assert store.query(tag="SPAM")[0] == 0
+    total, records = store.query(tag="PRIVACY")
+    assert total == 1 and records[0]["original"] == "수정된 댓글"
+
+
+def test_reused_verdicts_only_update_collection_order(store):
+    store.save("v1", [("c1", "h1", _summary("첫 댓글", "AUTO_HIDE", 0.7), None, 0)], "chan-a")
+    store.save("v1", [
+        ("c1", "h1", _summary("첫 댓글", "PASS"), None, 1),
+        ("c2", "h2", _summary("둘째 댓글"), None, 0),
+    ], "chan-a", reused=True)
+
+    _, records = store.query(order="collected", tenant_id="chan-a")
+    assert [(r["comment_id"], r["action"]) for r in records] == [("c2", "PASS"), ("c1", "AUTO_HIDE")]
+
+
+def test_query_pages_and_rejects_unknown_order(store):
+    store.save("v1", [(f"c{n}", f"h{n}", _summary(f"댓글 {n}", score=n / 10), None, n) for n in range(5)])
+
+    total, records = store.query(order="score", offset=1, limit=2)
+    assert total == 5
+    assert [r["comment_id"] for r in records] == ["c3", "c2"]
+    assert store.query(min_score=0.3)[0] == 2
+    with pytest.raises(ValueError):
+        store.query(order="random")
@@ -0,0 +1,32 @@
+import pytest
+
+from filter_api.core import spans as span_utils
+from filter_api.core.risk_scorer import RiskScorer
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    return RiskScorer()
+
+
+@pytest.mark.parametrize("text", ["씨 발 진짜", "병 신 같은 소리 하네", "시발 병신", "영상 재밌네요 씨 발"])
+def test_span_features_match_placeholder_text(first_filter, scorer, text):
+    # span에서 바로 계산한 값이 자리표시자 텍스트에서 계산한 값과 같아야 함 (공백이 들어간 구간 포함)
+    result = first_filter.execute(text)
+    assert result['detected_words']
+    rendered = span_utils.render(result['normalized_text'], result['spans'])
+    from_spans = scorer._span_features(result['normalized_text'], result['spans'], result['detected_words'])
+    from_text = scorer._text_features(rendered, result['detected_words'])
+    assert from_spans[0] == pytest.approx(from_text[0])
+    # 연속성 점수는 2개 이상 이어진 시퀀스만 반영
+    assert [n for n in from_spans[1] if n >= 2] == [n for n in from_text[1] if n >= 2]
+    assert scorer.execute(result) == scorer.execute({**result, 'spans': None, 'text_for_filtering': rendered})
+
+
+def test_spaced_span_density(scorer):
+    normalized = "씨 발 진짜"
+    found = [(0, 3, 'SYSTEM_KEYWORD', 'fuck')]
+    density, sequences = scorer._span_features(normalized, found, [{'word': "씨 발", 'type': 'SYSTEM_KEYWORD'}])
+    # '__F__진짜' -> 7글자
+    assert density == pytest.approx(3 / 7)
+    assert sequences == [1]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.second_pass_filter import SecondPassFilter
+
+# 응답 형식이 예상과 달라 적용 중에 예외가 나는 항목 (keyword 없음)
+BROKEN_ITEMS = {"detected_items": [None]}
+
+
+def _first_pass(text="진짜 재밌네요"):
+    return {
+        'original_text': text,
+        'status': 'PASSED',
+        'detected_words': [],
+        'text_for_filtering': text,
+        'tags': [],
+        'normalized_text': text,
+        'spans': [],
+    }
+
+
+@pytest.fixture
+def second_pass():
+    return SecondPassFilter()
+
+
+def test_unexpected_error_degrades_single_call(second_pass, monkeypatch):
+    monkeypatch.setattr(second_pass, "_call_openai_api", lambda prompt: BROKEN_ITEMS)
+    result = second_pass._execute_gpt(_first_pass())
+    assert result['status'] == SecondPassFilter.DEGRADED
+    assert result['degraded_reason'] == "error"
+
+
+def test_unexpected_error_degrades_async_call(second_pass, monkeypatch):
+    async def broken(prompt):
+        return BROKEN_ITEMS
+
+    monkeypatch.setattr(second_pass, "_call_openai_api_async", broken)
+    result = asyncio.run(second_pass._execute_gpt_async(_first_pass()))
+    assert result['status'] == SecondPassFilter.DEGRADED
+    assert result['degraded_reason'] == "error"
+
+
+def test_unexpected_error_in_batch_item_degrades_only_that_item(second_pass, monkeypatch):
+    async def answer(prompt):
+        return {"results": [
+            {"id": 0, "detected_items": [None]},
+            {"id": 1, "detected_items": []},
+        ]}
+
+    monkeypatch.setattr(second_pass, "_call_openai_api_async", answer)
+    results = asyncio.run(second_pass._execute_gpt_batch_async([_first_pass("하나"), _first_pass("둘")]))
+    assert results[0]['status'] == SecondPassFilter.DEGRADED
+    assert results[1]['status'] != SecondPassFilter.DEGRADED
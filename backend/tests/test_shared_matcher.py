@@ -0,0 +1,58 @@
+import pytest
+
+from filter_api.core import shared_matcher
+from filter_api.core.aho_corasick import AhoCorasickMatcher
+
+WHITE = ('USER_WHITELIST', 0)
+BLACK = ('USER_BLACKLIST', 1)
+SYSTEM = ('SYSTEM_KEYWORD', 2)
+TEXTS = ["이 시발놈아", "좋은 영상이네요", "병신 같은 시발 놈", "", "ㅅㅂ 시발시발"]
+
+
+@pytest.fixture
+def matcher():
+    return AhoCorasickMatcher({'시발': SYSTEM, '발놈': BLACK, '시발놈': SYSTEM, '병신': SYSTEM, '좋은 영상': WHITE})
+
+
+def test_mapped_matcher_matches_like_in_memory_matcher(tmp_path, matcher):
+    path = str(tmp_path / "matcher.bin")
+    assert shared_matcher.save(path, "v1", {"system": matcher})
+    version, loaded = shared_matcher.load(path, "v1")
+
+    mapped = loaded["system"]
+    assert version == "v1" and len(mapped) == len(matcher)
+    for text in TEXTS:
+        assert sorted(mapped.iter_matches(text)) == sorted(matcher.iter_matches(text))
+        assert mapped.find_longest(text) == matcher.find_longest(text)
+
+
+def test_real_dictionary_round_trip(tmp_path, first_filter):
+    snapshot = first_filter.snapshot
+    path = str(tmp_path / "matcher.bin")
+    shared_matcher.save(path, snapshot.version, {"system": snapshot.matcher})
+    _, loaded = shared_matcher.load(path)
+
+    for text in ["야이 개새끼야 ㅋㅋ 니네 집 주소 다 털었다", "씨발 좆같네 개새끼", "오늘 영상 편집 정말 깔끔하네요"]:
+        normalized = first_filter.normalize_text(text)
+        assert list(loaded["system"].iter_matches(normalized)) == list(snapshot.matcher.iter_matches(normalized))
+
+
+def test_load_rejects_other_versions_and_broken_files(tmp_path, matcher):
+    path = tmp_path / "matcher.bin"
+    shared_matcher.save(str(path), "v1", {"system": matcher})
+
+    assert shared_matcher.load(str(path), "v2") is None
+    assert shared_matcher.load(str(tmp_path / "missing.bin")) is None
+    path.write_bytes(b"NERVMMAP\xff\xff")
+    assert shared_matcher.load(str(path)) is None
+    path.write_bytes(b"")
+    assert shared_matcher.load(str(path)) is None
+
+
+def test_mapped_matcher_is_not_serialized(tmp_path, matcher):
+    path = str(tmp_path / "matcher.bin")
+    shared_matcher.save(path, "v1", {"system": matcher})
+    _, loaded = shared_matcher.load(path)
+
+    with pytest.raises(TypeError):
+        loaded["system"].to_state()
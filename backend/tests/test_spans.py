@@ -0,0 +1,32 @@
+from filter_api.core import spans
+
+
+def test_render_replaces_spans_with_placeholders():
+    text = spans.normalize('씨#발 진짜 병신!')
+    found = [(6, 8, 'USER_BLACKLIST', '욕설'), (0, 2, 'SYSTEM_KEYWORD', '욕설')]
+    assert text == '씨발 진짜 병신'
+    assert spans.render(text, found) == '__F__ 진짜 __B__'
+    assert spans.render(text, []) == text
+
+
+def test_locate_skips_existing_spans_and_placeholders():
+    text = '시발 시발'
+    assert spans.locate(text, '__F__시발', [(0, 2, 'SYSTEM_KEYWORD', '욕설')]) == [(3, 5)]
+    assert spans.locate(text, '__S__', []) == []
+
+
+def test_original_offsets_follow_normalize():
+    original = 'A#b 씨!발'
+    offsets = spans.original_offsets(original)
+    normalized = spans.normalize(original)
+    assert len(offsets) == len(normalized)
+    assert ''.join(original[i].lower() for i in offsets) == normalized
+
+
+def test_mask_covers_removed_characters():
+    original = '씨#발 진짜!'
+    normalized = spans.normalize(original)
+    found = [(0, 2, 'SYSTEM_KEYWORD', '욕설')]
+    assert spans.mask(original, normalized, found) == '*** 진짜!'
+    assert spans.mask(original, normalized, [(0, 2, 'USER_WHITELIST', '')]) == original
+    assert spans.mask(original, normalized + 'x', found) is None
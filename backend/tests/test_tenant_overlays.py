@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from filter_api.core.tenants import TenantRegistry
+from filter_api.core.verdict_cache import VerdictCache
+
+BLOCKED = "씨발 좆같네 개새끼"
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = TenantRegistry(str(tmp_path), check_interval=0.0)
+    registry.update("chan-a", ["시발"], ["바보"], admin=True)
+    registry.update("chan-b", [], [], security_level=5, admin=True)
+    return registry
+
+
+def _run(pipeline, texts, tenant_id=None):
+    return asyncio.run(pipeline.run_batch_async(texts, tenant_id))
+
+
+def test_channel_lists_apply_only_to_that_channel(make_pipeline, registry):
+    pipeline = make_pipeline(tenant_registry=registry)
+    texts = ["바보야", "시발 진짜"]
+
+    own = _run(pipeline, texts, "chan-a")
+    base = _run(pipeline, texts)
+    other = _run(pipeline, texts, "chan-b")
+
+    assert [w['type'] for w in own[0]['details']['detected_words']] == ["USER_BLACKLIST"]
+    assert own[1]['details']['detected_words'] == []
+    for results in (base, other):
+        assert results[0]['details']['detected_words'] == []
+        assert [w['word'] for w in results[1]['details']['detected_words']] == ["시발"]
+
+
+def test_channel_security_level_overrides_default(make_pipeline, registry):
+    pipeline = make_pipeline(tenant_registry=registry)
+    assert _run(pipeline, [BLOCKED])[0]['action'] == "AUTO_HIDE"
+    assert _run(pipeline, [BLOCKED], "chan-b")[0]['action'] == "PERMANENT_DELETE"
+
+
+def test_unknown_channel_uses_shared_dictionary(make_pipeline, registry):
+    pipeline = make_pipeline(tenant_registry=registry)
+    assert pipeline.fingerprint("chan-unknown") == pipeline.fingerprint()
+    assert pipeline.fingerprint("chan-a") != pipeline.fingerprint()
+    assert _run(pipeline, [BLOCKED], "chan-unknown")[0]['action'] == _run(pipeline, [BLOCKED])[0]['action']
+
+
+def test_verdict_cache_is_not_shared_across_channels(make_pipeline, registry):
+    pipeline = make_pipeline(verdict_cache=VerdictCache(), tenant_registry=registry)
+    _run(pipeline, ["바보야"], "chan-a")
+
+    assert _run(pipeline, ["바보야"])[0]['details']['detected_words'] == []
+    assert _run(pipeline, ["바보야"], "chan-a")[0]['details']['detected_words'] != []
+
+
+def test_channel_update_is_picked_up(make_pipeline, registry):
+    pipeline = make_pipeline(tenant_registry=registry)
+    assert _run(pipeline, ["멍청이"], "chan-a")[0]['details']['detected_words'] == []
+
+    registry.update("chan-a", ["시발"], ["바보", "멍청이"], admin=True)
+    assert [w['word'] for w in _run(pipeline, ["멍청이"], "chan-a")[0]['details']['detected_words']] == ["멍청이"]
+
+
+def test_tenant_requires_registry(make_pipeline):
+    with pytest.raises(ValueError):
+        _run(make_pipeline(), ["바보야"], "chan-a")
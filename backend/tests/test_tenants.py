@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from filter_api.core.tenants import TenantAccessDenied, TenantLimitExceeded, TenantRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return TenantRegistry(str(tmp_path), check_interval=0.0, max_tenants=2, max_words=3, max_word_length=5)
+
+
+def test_new_tenant_requires_owner_key(registry):
+    with pytest.raises(TenantAccessDenied):
+        registry.update("chan-a", [], ["바보"])
+    overlay, changed = registry.update("chan-a", [], ["바보"], owner_key="key-a")
+    assert changed and overlay.blacklist == frozenset({"바보"})
+
+
+def test_only_owner_or_admin_can_update(registry):
+    registry.update("chan-a", [], ["바보"], owner_key="key-a")
+    with pytest.raises(TenantAccessDenied):
+        registry.update("chan-a", [], ["멍청이"], owner_key="key-b")
+    with pytest.raises(TenantAccessDenied):
+        registry.update("chan-a", [], ["멍청이"])
+
+    overlay, _ = registry.update("chan-a", [], ["멍청이"], owner_key="key-a")
+    assert overlay.blacklist == frozenset({"멍청이"})
+    overlay, _ = registry.update("chan-a", ["좋아요"], [], admin=True)
+    assert overlay.whitelist == frozenset({"좋아요"})
+    # 관리자가 수정해도 소유자는 그대로
+    registry.update("chan-a", [], [], owner_key="key-a")
+
+
+def test_owner_key_is_not_stored_in_plain_text(registry, tmp_path):
+    registry.update("chan-a", [], ["바보"], owner_key="secret-key")
+    with open(os.path.join(str(tmp_path), "chan-a.json"), encoding="utf-8") as f:
+        assert "secret-key" not in f.read()
+
+
+def test_unchanged_update_keeps_version(registry):
+    first, changed = registry.update("chan-a", [], ["바보", "멍청이"], owner_key="key-a")
+    assert changed
+    second, changed = registry.update("chan-a", [], [" 멍청이", "바보", "바보"], owner_key="key-a")
+    assert not changed
+    assert second.version == first.version
+
+
+def test_empty_new_tenant_is_not_created(registry, tmp_path):
+    overlay, changed = registry.update("chan-a", [], [], owner_key="key-a")
+    assert overlay is None and not changed
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_limits(registry):
+    with pytest.raises(TenantLimitExceeded):
+        registry.update("chan-a", [], ["가", "나", "다", "라"], owner_key="key-a")
+    with pytest.raises(TenantLimitExceeded):
+        registry.update("chan-a", [], ["아주아주긴단어"], owner_key="key-a")
+
+    registry.update("chan-a", [], ["가"], owner_key="key-a")
+    registry.update("chan-b", [], ["가"], owner_key="key-b")
+    with pytest.raises(TenantLimitExceeded):
+        registry.update("chan-c", [], ["가"], owner_key="key-c")
+    # 이미 있는 채널은 상한과 관계없이 수정 가능
+    registry.update("chan-a", [], ["나"], owner_key="key-a")
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+
+import pytest
+
+from filter_api.core.tokenizer import PooledOktTokenizer, TokenizerBusyError
+
+
+class FakeOkt:
+    """JVM 없이 Okt를 흉내: 호출 기록, release가 설정될 때까지 대기"""
+    calls = []
+    release = threading.Event()
+
+    def pos(self, text):
+        FakeOkt.calls.append((text, threading.current_thread().name))
+        FakeOkt.release.wait(5)
+        return [(word, "Noun") for word in text.split()]
+
+
+class BusyTokenizer:
+    """대기열이 항상 가득 찬 형태소 분석기"""
+    uses_morphology = True
+
+    def pos(self, text):
+        raise TokenizerBusyError("형태소 분석 대기열이 가득 찼습니다.")
+
+    def pos_batch(self, texts):
+        raise TokenizerBusyError("형태소 분석 대기열이 가득 찼습니다.")
+
+    async def pos_async(self, text):
+        raise TokenizerBusyError("형태소 분석 대기열이 가득 찼습니다.")
+
+
+@pytest.fixture
+def make_tokenizer():
+    created = []
+    FakeOkt.calls = []
+    FakeOkt.release.set()
+
+    def make(**kwargs):
+        tokenizer = PooledOktTokenizer(lazy=True, **kwargs)
+        tokenizer._okt_class = FakeOkt
+        created.append(tokenizer)
+        return tokenizer
+
+    yield make
+    FakeOkt.release.set()
+    for tokenizer in created:
+        tokenizer.shutdown()
+
+
+def test_pos_runs_on_worker_pool_and_caches(make_tokenizer):
+    tokenizer = make_tokenizer(pool_size=1, cache_size=1)
+
+    assert tokenizer.pos("좋은 영상") == [("좋은", "Noun"), ("영상", "Noun")]
+    assert tokenizer.pos("좋은 영상") == [("좋은", "Noun"), ("영상", "Noun")]
+    assert asyncio.run(tokenizer.pos_async("좋은 영상")) == [("좋은", "Noun"), ("영상", "Noun")]
+    assert [text for text, _ in FakeOkt.calls] == ["좋은 영상"]
+    assert FakeOkt.calls[0][1].startswith("okt")
+
+    # LRU 상한(1개)을 넘으면 오래된 결과부터 다시 분석
+    tokenizer.pos("다른 댓글")
+    tokenizer.pos("좋은 영상")
+    assert [text for text, _ in FakeOkt.calls] == ["좋은 영상", "다른 댓글", "좋은 영상"]
+
+
+def test_pos_batch_keeps_order_and_analyzes_duplicates_once(make_tokenizer):
+    tokenizer = make_tokenizer(pool_size=2)
+    tokenizer.pos("가 나")
+
+    results = tokenizer.pos_batch(["다 라", "가 나", "다 라", "마"])
+
+    assert results == [
+        [("다", "Noun"), ("라", "Noun")], [("가", "Noun"), ("나", "Noun")],
+        [("다", "Noun"), ("라", "Noun")], [("마", "Noun")],
+    ]
+    assert sorted(text for text, _ in FakeOkt.calls) == ["가 나", "다 라", "마"]
+
+
+def test_full_queue_raises_busy(make_tokenizer):
+    tokenizer = make_tokenizer(pool_size=1, queue_limit=0, batch_wait=0.05)
+    FakeOkt.release.clear()
+    blocked = tokenizer._submit("느린 댓글")  # 워커 하나를 붙잡아 둠
+
+    with pytest.raises(TokenizerBusyError):
+        tokenizer.pos("새 댓글")
+    with pytest.raises(TokenizerBusyError):
+        tokenizer.pos_batch(["새 댓글", "또 다른 댓글"])
+
+    # 자리가 나면 다시 받음 (실패한 요청이 자리를 차지하지 않음)
+    FakeOkt.release.set()
+    blocked.result(5)
+    assert tokenizer.pos_batch(["새 댓글"]) == [[("새", "Noun"), ("댓글", "Noun")]]
+
+
+def test_first_pass_falls_back_to_surface_matching_when_busy(first_filter, monkeypatch):
+    monkeypatch.setattr(first_filter, "tokenizer", BusyTokenizer())
+
+    single = first_filter.execute("시발 진짜")
+    batch = first_filter.execute_batch(["시발 진짜", "좋은 영상이네요"])
+    async_result = asyncio.run(first_filter.execute_async("시발 진짜"))
+
+    assert single["status"] == "FILTERED_BY_FIRST_PASS"
+    assert [result["status"] for result in batch] == ["FILTERED_BY_FIRST_PASS", "PASSED"]
+    assert async_result["status"] == "FILTERED_BY_FIRST_PASS"
@@ -0,0 +1,75 @@
+import pytest
+
+from filter_api.core import spans, variants
+
+SYSTEM = ('SYSTEM_KEYWORD', 2, '욕설')
+BLACK = ('USER_BLACKLIST', 1, '욕설')
+
+
+def _canonical(text):
+    return variants.canonicalize(spans.normalize(text))
+
+
+def test_has_variant():
+    assert not variants.has_variant('안녕하세요 좋은 영상이네요')
+    assert variants.has_variant('ㅅ1발')
+    assert variants.has_variant('시 바 ㄹ')
+    assert variants.has_variant('새애끼')
+
+
+def test_confusable_and_jamo_recomposition():
+    assert _canonical('ㅅ1발') == ('시발', [(0, 2), (2, 3)])
+    assert _canonical('시ㅂㅏㄹ') == ('시발', [(0, 1), (1, 4)])
+
+
+def test_confusable_kept_next_to_alnum():
+    assert _canonical('o1o1')[0] == 'o1o1'
+
+
+def test_spaced_single_chars_joined():
+    canonical, positions = _canonical('시 바 ㄹ')
+    assert canonical == '시발'
+    assert positions == [(0, 1), (2, 5)]
+
+
+def test_elongation_and_yaminjeongeum():
+    assert _canonical('개새애끼') == ('개새끼', [(0, 1), (1, 3), (3, 4)])
+    assert _canonical('띵작')[0] == '명작'
+
+
+def test_build_matcher_spans_map_back_to_text():
+    matcher = variants.build_matcher({'시발': SYSTEM, '새끼': SYSTEM, 'ㅗ': SYSTEM})
+    assert len(matcher) == 2  # 표준형이 한 글자인 단어는 제외
+
+    text = spans.normalize('ㅅ1발 새애끼')
+    canonical, positions = variants.canonicalize(text)
+    hits = [
+        (positions[start][0], positions[end - 1][1], payload)
+        for start, end, payload in matcher.find_longest(canonical)
+    ]
+    assert [text[start:end] for start, end, _ in hits] == ['ㅅ1발', '새애끼']
+
+
+def test_build_matcher_keeps_higher_priority_on_same_canonical():
+    matcher = variants.build_matcher({'시발': SYSTEM, '씨발': SYSTEM, 'ㅅㅣ발': BLACK})
+    assert matcher.find_longest('시발') == [(0, 2, BLACK)]
+
+
+@pytest.fixture(scope="module")
+def first_pass():
+    from filter_api.core.first_pass_filter import FirstPassFilter
+    return FirstPassFilter()
+
+
+@pytest.mark.parametrize("text", ["졸 라 서", "전 염 병", "감 염 병", "초 보 지", "보 지 마"])
+def test_spaced_whitelisted_phrase_is_not_a_variant_hit(first_pass, text):
+    # 붙여 쓰면 허용 구문이므로 띄어 써도 회피 표기로 적발하지 않음
+    assert first_pass.execute(text.replace(' ', ''))['status'] == 'PASSED'
+    assert first_pass.execute(text)['status'] == 'PASSED'
+
+
+@pytest.mark.parametrize("text, word", [("졸 라 짜증", "졸 라"), ("시 바 ㄹ", "시 바 ㄹ")])
+def test_spaced_variant_outside_whitelist_is_detected(first_pass, text, word):
+    result = first_pass.execute(text)
+    assert result['status'] == 'FILTERED_BY_FIRST_PASS'
+    assert [(w['word'], w.get('variant')) for w in result['detected_words']] == [(word, True)]
@@ -0,0 +1,78 @@
+import asyncio
+
+from filter_api.core.verdict_cache import VerdictCache
+
+
+def _gpt_calls(pipeline):
+    return pipeline.second_filter.async_client.chat.completions.calls
+
+
+def _summary(results):
+    return [(res['original_text'], res['action'], res['score'], res['details']['status']) for res in results]
+
+
+def test_repeated_text_is_served_from_cache(make_pipeline):
+    cache = VerdictCache()
+    pipeline = make_pipeline(verdict_cache=cache)
+    texts = ["연락주세요 010-1234-5678", "좋은 영상이네요"]
+
+    first = asyncio.run(pipeline.run_batch_async(texts))
+    calls = _gpt_calls(pipeline)
+    second = asyncio.run(pipeline.run_batch_async(texts))
+
+    assert _gpt_calls(pipeline) == calls
+    assert _summary(second) == _summary(first)
+    assert cache.stats()["hits"] == 2
+
+
+def test_duplicates_in_one_batch_are_analyzed_once(make_pipeline, monkeypatch):
+    pipeline = make_pipeline(verdict_cache=VerdictCache())
+    seen = []
+    original = pipeline.first_filter.execute_batch
+
+    def execute_batch(texts, **kwargs):
+        seen.extend(texts)
+        return original(texts, **kwargs)
+
+    monkeypatch.setattr(pipeline.first_filter, "execute_batch", execute_batch)
+    texts = ["좋은 영상이네요", "연락주세요 010-1234-5678", "좋은 영상이네요", "연락주세요 010-1234-5678"]
+    results = asyncio.run(pipeline.run_batch_async(texts))
+
+    assert sorted(seen) == sorted(texts[:2])
+    assert [res['original_text'] for res in results] == texts
+    assert results[3]['details'] == results[1]['details']
+
+
+def test_degraded_verdict_is_not_cached(make_pipeline, monkeypatch):
+    cache = VerdictCache()
+    pipeline = make_pipeline(verdict_cache=cache)
+
+    async def unavailable(prompt):
+        raise RuntimeError("LLM unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pipeline.second_filter, "_call_openai_api_async", unavailable)
+        degraded = asyncio.run(pipeline.run_async("좋은 영상이네요"))
+    assert degraded['degraded']
+    assert cache.stats()["memory_entries"] == 0
+
+    # 복구 후에는 다시 분석하여 정상 판정을 저장
+    recovered = asyncio.run(pipeline.run_async("좋은 영상이네요"))
+    assert not recovered['degraded']
+    assert cache.stats()["memory_entries"] == 1
+
+
+def test_disk_cache_survives_restart_and_drops_old_versions(tmp_path):
+    db_path = str(tmp_path / "verdicts.sqlite3")
+    cache = VerdictCache(db_path=db_path)
+    cache.sync_version("v1")
+    key = cache.make_key("좋은 영상이네요", "v1", "config")
+    cache.put(key, {"status": "PASSED"})
+
+    restarted = VerdictCache(db_path=db_path)
+    restarted.sync_version("v1")
+    assert restarted.get(key) == {"status": "PASSED"}
+    assert restarted.stats()["disk_hits"] == 1
+
+    restarted.sync_version("v2")
+    assert restarted.get(key) is None
@@ -0,0 +1,42 @@
+import sqlite3
+
+from filter_api.core.video_state import VideoStateStore
+
+
+def _store(tmp_path):
+    return VideoStateStore(str(tmp_path / "state.sqlite3"))
+
+
+def test_tenants_keep_separate_state(tmp_path):
+    store = _store(tmp_path)
+    store.save("v1", "fp-a", [("c1", "h1", {"action": "PASS"})], tenant_id="chan-a")
+    store.save("v1", "fp-b", [("c1", "h1", {"action": "DELETE"})], tenant_id="chan-b")
+
+    assert store.load("v1", "fp-a", "chan-a") == {"c1": ("h1", {"action": "PASS"})}
+    assert store.load("v1", "fp-b", "chan-b") == {"c1": ("h1", {"action": "DELETE"})}
+    # 다른 채널의 분석이 이 채널의 상태를 지우지 않음
+    assert store.load("v1", "fp-a", "chan-a") == {"c1": ("h1", {"action": "PASS"})}
+    assert store.load("v1", "fp-a") == {}
+
+
+def test_stale_fingerprint_save_is_never_served(tmp_path):
+    # A가 fp1로 로드 -> B가 fp2로 저장 -> A가 늦게 fp1로 저장해도, fp2 판정이 fp1 판정으로 읽히지 않음
+    store = _store(tmp_path)
+    store.save("v1", "fp2", [("c1", "h1", {"action": "DELETE"}), ("c2", "h2", {"action": "PASS"})])
+    store.save("v1", "fp1", [("c1", "h1", {"action": "PASS"})])
+
+    assert store.load("v1", "fp1") == {"c1": ("h1", {"action": "PASS"})}
+    assert store.load("v1", "fp2") == {"c2": ("h2", {"action": "PASS"})}
+
+
+def test_legacy_schema_is_replaced(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE video_state (video_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, analyzed_at REAL NOT NULL)")
+    db.execute("INSERT INTO video_state VALUES ('v1', 'fp', 0)")
+    db.commit()
+    db.close()
+
+    store = VideoStateStore(path)
+    store.save("v1", "fp", [("c1", "h1", {"action": "PASS"})], tenant_id="chan-a")
+    assert store.load("v1", "fp", "chan-a") == {"c1": ("h1", {"action": "PASS"})}
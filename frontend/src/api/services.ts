@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { YoutubeAnalysisResponse } from './types';
+import type { YoutubeAnalysisResponse, YoutubeStreamFrame } from './types';
 
 const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -51,7 +51,10 @@ const MOCK_DATA: YoutubeAnalysisResponse = {
 
 // --- API FUNCTIONS ---
 
-export const fetchAnalysis = async (videoId: string): Promise<YoutubeAnalysisResponse> => {
+// 영상(+채널 사전)별 마지막 분석 응답과 ETag (다시 요청할 때 If-None-Match로 보내고, 바뀌지 않았으면(304) 그대로 재사용)
+const analysisEtags = new Map<string, { etag: string; data: YoutubeAnalysisResponse }>();
+
+export const fetchAnalysis = async (videoId: string, tenantId?: string): Promise<YoutubeAnalysisResponse> => {
   // 로컬 개발 환경이거나 videoId가 테스트용이면 Mock 데이터 반환
   if (!import.meta.env.PROD || videoId === 'test_video_id') {
     console.log(`[Mock API] Fetching analysis for ${videoId}`);
@@ -59,9 +62,96 @@ export const fetchAnalysis = async (videoId: string): Promise<YoutubeAnalysisRes
     return MOCK_DATA;
   }
 
-  // 실제 API 호출
+  // 항상 분석 API 호출 (서버는 증분 분석 + 응답 캐시를 쓰므로 새 댓글/사전 변경만 반영되고, 여러 관리자가 보고 있어도 분석은 한 번)
+  const cacheKey = `${videoId}:${tenantId ?? ''}`;
+  const previous = analysisEtags.get(cacheKey);
   const response = await client.post(`/api/workflow/analyze-youtube`, null, {
-    params: { video_id: videoId, max_pages: 1 },
+    params: { video_id: videoId, max_pages: 1, tenant_id: tenantId },
+    headers: previous ? { 'If-None-Match': previous.etag } : undefined,
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
   });
+  if (response.status === 304 && previous) return previous.data;
+
+  const etag = response.headers['etag'];
+  if (etag) analysisEtags.set(cacheKey, { etag, data: response.data });
   return response.data;
-};
\ No newline at end of file
+};
+
+// 저장된 판정 기록 조회 (기록 화면용, 재분석 없음), 기록이 없거나(404) 저장소가 비활성(503)이면 null
+export const fetchStoredAnalysis = async (videoId: string): Promise<YoutubeAnalysisResponse | null> => {
+  try {
+    const stored = await client.get(`/api/results/videos/${encodeURIComponent(videoId)}`);
+    return stored.data;
+  } catch (error) {
+    if (axios.isAxiosError(error) && [404, 503].includes(error.response?.status ?? 0)) return null;
+    throw error;
+  }
+};
+
+// 스트리밍 분석: 댓글이 분석되는 즉시 onFrame으로 전달 (NDJSON)
+export const streamAnalysis = async (
+  videoId: string,
+  onFrame: (frame: YoutubeStreamFrame) => void,
+  signal?: AbortSignal,
+  tenantId?: string,
+): Promise<void> => {
+  if (!import.meta.env.PROD || videoId === 'test_video_id') {
+    console.log(`[Mock API] Streaming analysis for ${videoId}`);
+    onFrame({ type: 'video_info', video_info: MOCK_DATA.video_info });
+    for (const [index, result] of MOCK_DATA.results.entries()) {
+      await new Promise((resolve) => setTimeout(resolve, 300));
+      if (signal?.aborted) return;
+      onFrame({ type: 'comment', index, result });
+    }
+    onFrame({ type: 'stats', stats: MOCK_DATA.stats });
+    return;
+  }
+
+  // axios는 응답 스트림을 읽을 수 없으므로 fetch 사용
+  const params = new URLSearchParams({ video_id: videoId, max_pages: '1', format: 'ndjson' });
+  if (tenantId) params.set('tenant_id', tenantId);
+  const response = await fetch(`${BASE_URL}/api/workflow/analyze-youtube/stream?${params}`, {
+    method: 'POST',
+    signal,
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`[API Error] ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const lines = buffer.split('\n');
+    buffer = lines.pop() ?? '';
+    for (const line of lines) {
+      if (line.trim()) onFrame(JSON.parse(line) as YoutubeStreamFrame);
+    }
+  }
+  if (buffer.trim()) onFrame(JSON.parse(buffer) as YoutubeStreamFrame);
+};
+
+// 사용자 화이트/블랙리스트를 서버의 이 사용자 채널 사전(오버레이)에 반영 (공용 사전은 그대로, tenant_id로 분석할 때만 적용)
+// - tenantKey: 채널 사전을 처음 만들 때 등록되는 소유자 키 (이후 수정은 같은 키로만 가능)
+export const syncTenantDictionary = async (
+  tenantId: string,
+  tenantKey: string,
+  whiteList: string[],
+  blackList: string[],
+): Promise<void> => {
+  if (!import.meta.env.PROD) {
+    console.log(`[Mock API] Syncing tenant dictionary ${tenantId} (white ${whiteList.length}, black ${blackList.length})`);
+    return;
+  }
+
+  await client.put(
+    `/api/system/tenants/${encodeURIComponent(tenantId)}`,
+    { user_whitelist: whiteList, user_blacklist: blackList },
+    { headers: { 'X-Tenant-Key': tenantKey } },
+  );
+};
@@ -22,6 +22,12 @@ export interface YoutubeAnalysisResponse {
   results: YoutubeCommentSummary[];
 }
 
+// 스트리밍 분석(/api/workflow/analyze-youtube/stream) 프레임
+export type YoutubeStreamFrame =
+  | { type: 'video_info'; video_info: YoutubeAnalysisResponse['video_info'] }
+  | { type: 'comment'; index: number; result: YoutubeCommentSummary }
+  | { type: 'stats'; stats: YoutubeAnalysisResponse['stats'] };
+
 export interface AppSettings {
   intensity: number; // 1~5
   modules: {
@@ -33,4 +39,7 @@ export interface AppSettings {
   };
   whiteList: string[];
   blackList: string[];
+  tenantId?: string; // 서버 채널 사전(오버레이) ID, 화이트/블랙리스트를 처음 저장할 때 생성
+  tenantKey?: string; // 채널 사전 소유자 키 (서버는 해시만 저장, 이 키로만 채널 사전을 수정 가능)
+  syncedDictionary?: string; // 마지막으로 서버에 반영한 화이트/블랙리스트 (같으면 다시 보내지 않음)
 }
\ No newline at end of file
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import { useYoutubeAnalysis, useSettings } from '../../hooks/useYoutubeQuery';
+import { useYoutubeAnalysisStream, useSettings } from '../../hooks/useYoutubeQuery';
 
 const ChatTab = () => {
   const [videoId, setVideoId] = useState<string | null>(null);
@@ -23,9 +23,9 @@ const ChatTab = () => {
     }
   }, []);
 
-  // 2. TanStack Query로 데이터 가져오기
-  const { data, isLoading, isError } = useYoutubeAnalysis(videoId);
-  const { data: settings } = useSettings(); // 설정값도 가져옴 (필터링 로직용)
+  // 2. 스트리밍으로 데이터 가져오기 (분석된 댓글부터 바로 표시)
+  const { data: settings } = useSettings(); // 설정값도 가져옴 (필터링 로직 + 채널 사전 ID)
+  const { data, isLoading, isError } = useYoutubeAnalysisStream(videoId, settings?.tenantId);
 
   if (errorMsg) return <div className="p-4 text-center text-gray-500">{errorMsg}</div>;
   if (isLoading) return <div className="p-8 text-center">분석 중입니다... 🛡️</div>;
@@ -1,19 +1,77 @@
+import { useEffect, useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { fetchAnalysis } from '../api/services';
-import type { AppSettings } from '../api/types';
+import { fetchAnalysis, streamAnalysis, syncTenantDictionary } from '../api/services';
+import type { AppSettings, YoutubeAnalysisResponse, YoutubeCommentSummary } from '../api/types';
 
 // 1. 유튜브 분석 데이터 쿼리
-export const useYoutubeAnalysis = (videoId: string | null) => {
+// tenantId가 있으면 서버에 저장한 이 사용자의 화이트/블랙리스트(채널 사전)를 적용해 분석
+export const useYoutubeAnalysis = (videoId: string | null, tenantId?: string) => {
   return useQuery({
-    queryKey: ['youtube-analysis', videoId],
-    queryFn: () => fetchAnalysis(videoId!),
+    queryKey: ['youtube-analysis', videoId, tenantId],
+    queryFn: () => fetchAnalysis(videoId!, tenantId),
     enabled: !!videoId,
     staleTime: 1000 * 60,
   });
 };
 
+// 1-1. 유튜브 분석 스트리밍 (댓글이 분석되는 즉시 화면에 반영)
+export const useYoutubeAnalysisStream = (videoId: string | null, tenantId?: string) => {
+  const [data, setData] = useState<YoutubeAnalysisResponse | null>(null);
+  const [isStreaming, setIsStreaming] = useState(false);
+  const [isError, setIsError] = useState(false);
+
+  useEffect(() => {
+    if (!videoId) return;
+
+    const controller = new AbortController();
+    const results: YoutubeCommentSummary[] = [];
+    let videoInfo: YoutubeAnalysisResponse['video_info'] = {};
+    setData(null);
+    setIsError(false);
+    setIsStreaming(true);
+
+    streamAnalysis(
+      videoId,
+      (frame) => {
+        if (frame.type === 'video_info') {
+          videoInfo = frame.video_info;
+          setData({ video_info: videoInfo, stats: {}, results: [] });
+        } else if (frame.type === 'comment') {
+          // 분석이 끝나는 순서대로 오므로 index 위치에 채워 넣어 원래 순서를 유지
+          results[frame.index] = frame.result;
+          setData((prev) => ({
+            video_info: prev?.video_info ?? videoInfo,
+            stats: prev?.stats ?? {},
+            results: results.filter(Boolean),
+          }));
+        } else {
+          setData((prev) => ({
+            video_info: prev?.video_info ?? videoInfo,
+            stats: frame.stats,
+            results: results.filter(Boolean),
+          }));
+        }
+      },
+      controller.signal,
+      tenantId,
+    )
+      .catch((error) => {
+        if (!controller.signal.aborted) {
+          console.error('[API Error] 스트리밍 분석 실패:', error);
+          setIsError(true);
+        }
+      })
+      .finally(() => setIsStreaming(false));
+
+    return () => controller.abort();
+  }, [videoId, tenantId]);
+
+  return { data, isLoading: isStreaming && !data, isStreaming, isError };
+};
+
 // 2. 설정값 관리 (Chrome Storage 연동)
-// API 서버에 설정 저장 기능이 없으므로, 로컬 스토리지(확장프로그램 스토리지)를 사용합니다.
+// 설정은 로컬 스토리지(확장프로그램 스토리지)에 저장하고, 화이트/블랙리스트는 API 서버의 이 사용자 채널 사전에도 반영합니다.
+// (공용 사용자 사전은 모든 사용자의 판정에 적용되므로 확장프로그램에서 바꾸지 않습니다)
 const STORAGE_KEY = 'guard-filter-settings';
 
 const defaultSettings: AppSettings = {
@@ -34,8 +92,34 @@ const getSettingsFromStorage = async (): Promise<AppSettings> => {
   return stored ? JSON.parse(stored) : defaultSettings;
 };
 
+// 설치별 채널 사전 ID (서버 채널 ID 규칙: 영문/숫자/_/- 64자 이내)와 소유자 키
+const createTenantId = () => `ext-${crypto.randomUUID()}`;
+const createTenantKey = () => crypto.randomUUID();
+
+// 서버에 반영할 화이트/블랙리스트 (순서/중복과 관계없이 같은 목록이면 같은 값)
+const dictionarySignature = (settings: AppSettings) =>
+  JSON.stringify([[...new Set(settings.whiteList)].sort(), [...new Set(settings.blackList)].sort()]);
+
 // 설정을 저장하는 가짜 비동기 함수
-const saveSettingsToStorage = async (newSettings: AppSettings) => {
+const saveSettingsToStorage = async (settings: AppSettings) => {
+  let newSettings = settings;
+  const signature = dictionarySignature(settings);
+  const empty = settings.whiteList.length === 0 && settings.blackList.length === 0;
+
+  // 목록이 바뀐 경우에만 서버에 반영 (아직 채널 사전이 없고 목록도 비어 있으면 만들지 않음)
+  if (signature !== settings.syncedDictionary && !(empty && !settings.tenantId)) {
+    const tenantId = settings.tenantId ?? createTenantId();
+    const tenantKey = settings.tenantKey ?? createTenantKey();
+    newSettings = { ...settings, tenantId, tenantKey };
+    // 서버 반영에 실패해도 로컬 설정은 유지 (다음 저장 때 다시 반영)
+    try {
+      await syncTenantDictionary(tenantId, tenantKey, settings.whiteList, settings.blackList);
+      newSettings = { ...newSettings, syncedDictionary: signature };
+    } catch (error) {
+      console.error('[Settings] 채널 사전 서버 반영 실패:', error);
+    }
+  }
+
   if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
     await chrome.storage.local.set({ [STORAGE_KEY]: newSettings });
   } else {